@@ -0,0 +1,30 @@
+"""
+Library-specific tooling (not synced from the starter kit).
+
+Contains:
+    - catalog: Compiled, incrementally refreshed evaluator catalog snapshot
+    - fingerprint: Content-addressed evaluator fingerprints and drift checks
+    - prompt_template: Prompt compilation into static segments and content slots
+    - request_body: Streaming, memory-mapped JSON request body assembly
+    - index_query: Inverted indexes for category/provider/family/tier queries
+    - validation: Single-pass evaluator, index and registry validation (validate CLI)
+    - index_builder: Incremental evaluators/index.json generator
+    - registry: Compiled provider registry, overrides merge and resolver
+    - chunking: Context-window-aware document chunking
+    - findings: Finding and verdict parsing for evaluator output
+    - map_reduce: Parallel chunk evaluation with a deterministic merged report
+    - tokens: Offline, calibratable token estimates per model family
+    - compositions: Composition file loading (panel and staged layouts)
+    - cost: Registry-priced cost estimates and spend log
+    - rate_limit: Registry rate limits and shared token-bucket scheduler
+    - providers: Provider API request/response formats and urllib transport
+    - runner: Asyncio evaluator runner with per-provider concurrency limits
+    - panel: Concurrent panel composition executor with in-memory synthesis
+    - gates: Machine-readable composition gate expressions
+    - pipeline: Staged composition executor with gates and speculative stages
+    - response_cache: On-disk LRU/TTL cache of provider responses
+    - incremental: Section-level incremental re-evaluation with carried-forward findings
+    - batch: Provider batch-API submission, polling and result collection
+    - http_pool: Shared keep-alive HTTP connection pools with metrics (optional HTTP/2)
+    - resilience: Classified retries with jittered backoff and shared circuit breakers
+"""
@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""
+Provider Batch Execution
+========================
+
+Run many (evaluator, document) reviews through the providers' batch APIs,
+for bulk runs (nightly re-review of a docs tree) where latency does not
+matter. Batch calls are billed at half the list price and have their own,
+much higher throughput ceilings.
+
+    Provider    Submit                              Results
+    openai      POST /v1/files, POST /v1/batches    GET /v1/files/{id}/content
+    anthropic   POST /v1/messages/batches           GET results_url
+
+Each request body is exactly what the in-process runner would send
+(``providers.build_call``), wrapped in the provider's batch envelope and
+tagged with a ``custom_id``. Jobs are grouped per provider and API key into
+batches of at most ``MAX_BATCH_REQUESTS``.
+
+Submission state lives in ``.adversarial/batches/<run>.json`` (written
+atomically after every change), so ``poll`` can run from a later process:
+
+    submit   build jobs, serve cached responses, upload the rest
+    poll     check each provider batch; when it has ended, write every
+             result to its usual ``<stem><output_suffix>`` log, record
+             spend at the batch price and store it in the response cache
+
+Jobs for providers without a batch API (gemini, mistral) run through the
+interactive ``AsyncRunner`` at submission, unless ``--batch-only``.
+
+Usage:
+    from scripts.local.batch import BatchExecutor
+
+    executor = BatchExecutor()
+    run = executor.submit(["claude-quick", "gpt52-reasoning"], documents)
+    run = executor.wait(run)
+
+    python -m scripts.local.batch submit claude-quick gpt52-reasoning -d docs/
+    python -m scripts.local.batch poll nightly --wait
+    python -m scripts.local.batch list
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from scripts.local.cost import record_spend
+from scripts.local.http_pool import HttpPool
+from scripts.local.providers import (
+    ApiCall,
+    Completion,
+    ProviderError,
+    Transport,
+    api_key_for,
+    base_url,
+    build_call,
+    endpoint,
+    parse_completion,
+    provider_for,
+)
+from scripts.local.runner import (
+    AsyncRunner,
+    Job,
+    JobResult,
+    add_cache_arguments,
+    cache_from_args,
+    write_output,
+)
+
+DEFAULT_BATCH_DIR = Path(".adversarial") / "batches"
+
+BATCH_PROVIDERS = ("openai", "anthropic")
+MAX_BATCH_REQUESTS = {"openai": 50_000, "anthropic": 100_000}
+
+# Batch calls cost this fraction of list price
+BATCH_PRICE_FACTOR = 0.5
+
+# Bump if the state file format changes
+STATE_VERSION = 1
+
+# BatchRequest.status / ProviderBatch.status values
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+# =============================================================================
+# STATE
+# =============================================================================
+
+
+@dataclass
+class BatchRequest:
+    """One evaluator run on one document inside a provider batch."""
+
+    custom_id: str
+    evaluator: str
+    document: str
+    output_path: str
+    cache_key: Optional[str] = None
+    status: str = PENDING
+    error: Optional[str] = None
+
+
+@dataclass
+class ProviderBatch:
+    """A batch job submitted to one provider."""
+
+    provider: str
+    batch_id: str
+    auth_env: str  # Environment variable holding the API key (never the key)
+    requests: List[BatchRequest]
+    status: str = PENDING
+    provider_status: str = ""  # As last reported by the provider
+
+    @property
+    def finished(self) -> bool:
+        return self.status != PENDING
+
+
+@dataclass
+class BatchRun:
+    """Every provider batch submitted by one ``submit``."""
+
+    name: str
+    created: str
+    batches: List[ProviderBatch] = field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        return all(batch.finished for batch in self.batches)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        for batch in self.batches:
+            for request in batch.requests:
+                counts[request.status] += 1
+        return counts
+
+    def save(self, directory: Path) -> Path:
+        path = Path(directory) / f"{self.name}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"version": STATE_VERSION, **asdict(self)}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "BatchRun":
+        """
+        Raises:
+            ValueError: If the file is not a batch state file of this version
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.pop("version", None) != STATE_VERSION:
+            raise ValueError(f"{path}: unsupported batch state version")
+        batches = [
+            ProviderBatch(
+                **{
+                    **batch,
+                    "requests": [BatchRequest(**r) for r in batch["requests"]],
+                }
+            )
+            for batch in data.pop("batches")
+        ]
+        return cls(batches=batches, **data)
+
+
+# =============================================================================
+# PROVIDER CLIENT
+# =============================================================================
+
+
+def request_json(call: ApiCall) -> Dict[str, Any]:
+    """The JSON body the in-process runner would send for ``call``."""
+    return json.loads(b"".join(call.body_chunks()))
+
+
+class BatchClient:
+    """Submit, poll and download provider batch jobs over a ``Transport``."""
+
+    def __init__(self, transport: Optional[Transport] = None, timeout: float = 120):
+        self.transport = transport or HttpPool.shared().transport
+        self.timeout = timeout
+
+    def _send(
+        self,
+        provider: str,
+        api_key: str,
+        method: str,
+        url: str,
+        body: bytes = b"",
+        content_type: str = "application/json",
+    ) -> bytes:
+        _, headers = endpoint(provider, "", api_key)
+        headers["Content-Type"] = content_type
+        if method != "GET":
+            headers["Content-Length"] = str(len(body))
+        call = ApiCall(provider, "", url, headers, body, self.timeout, method=method)
+        _, _, payload = self.transport(call)
+        return payload
+
+    def _json(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        payload = self._send(*args, **kwargs)
+        try:
+            return json.loads(payload)
+        except ValueError:
+            raise ProviderError("Batch API returned non-JSON response") from None
+
+    # -------------------------------------------------------------------------
+    # Submit
+    # -------------------------------------------------------------------------
+
+    def submit(
+        self, provider: str, api_key: str, calls: Sequence[Tuple[str, ApiCall]]
+    ) -> str:
+        """Submit ``(custom_id, call)`` pairs as one batch; returns its id."""
+        root = base_url(provider)
+        if provider == "anthropic":
+            requests = [
+                {"custom_id": custom_id, "params": request_json(call)}
+                for custom_id, call in calls
+            ]
+            body = json.dumps({"requests": requests}).encode("utf-8")
+            reply = self._json(
+                provider, api_key, "POST", f"{root}/v1/messages/batches", body
+            )
+            return str(reply["id"])
+        if provider == "openai":
+            lines = [
+                json.dumps(
+                    {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": request_json(call),
+                    }
+                )
+                for custom_id, call in calls
+            ]
+            upload, content_type = _multipart(
+                {"purpose": "batch"}, "batch.jsonl", "\n".join(lines).encode("utf-8")
+            )
+            reply = self._json(
+                provider, api_key, "POST", f"{root}/v1/files", upload, content_type
+            )
+            body = json.dumps(
+                {
+                    "input_file_id": reply["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h",
+                }
+            ).encode("utf-8")
+            reply = self._json(provider, api_key, "POST", f"{root}/v1/batches", body)
+            return str(reply["id"])
+        raise ProviderError(f"{provider} has no batch API support")
+
+    # -------------------------------------------------------------------------
+    # Poll and results
+    # -------------------------------------------------------------------------
+
+    def status(self, provider: str, api_key: str, batch_id: str) -> Dict[str, Any]:
+        """The provider's batch object."""
+        root = base_url(provider)
+        if provider == "anthropic":
+            url = f"{root}/v1/messages/batches/{batch_id}"
+        else:
+            url = f"{root}/v1/batches/{batch_id}"
+        return self._json(provider, api_key, "GET", url)
+
+    @staticmethod
+    def state(provider: str, info: Dict[str, Any]) -> str:
+        """Provider status string from a batch object."""
+        if provider == "anthropic":
+            return str(info.get("processing_status") or "")
+        return str(info.get("status") or "")
+
+    @staticmethod
+    def ended(provider: str, info: Dict[str, Any]) -> bool:
+        """Whether the batch will make no further progress."""
+        if provider == "anthropic":
+            return info.get("processing_status") == "ended"
+        return info.get("status") in ("completed", "failed", "expired", "cancelled")
+
+    def results(
+        self, provider: str, api_key: str, info: Dict[str, Any]
+    ) -> Iterator[Tuple[str, Optional[Completion], Optional[str]]]:
+        """``(custom_id, completion, error)`` for each result of an ended batch."""
+        if provider == "anthropic":
+            if not info.get("results_url"):
+                return
+            payload = self._send(provider, api_key, "GET", info["results_url"])
+            for line in payload.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                result = entry.get("result") or {}
+                if result.get("type") == "succeeded":
+                    completion = parse_completion(provider, result["message"])
+                    yield entry["custom_id"], completion, None
+                else:
+                    error = result.get("error") or result.get("type")
+                    yield entry["custom_id"], None, f"{result.get('type')}: {error}"
+            return
+        root = base_url(provider)
+        for file_key in ("output_file_id", "error_file_id"):
+            if not info.get(file_key):
+                continue
+            url = f"{root}/v1/files/{info[file_key]}/content"
+            for line in self._send(provider, api_key, "GET", url).splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") == 200 and not entry.get("error"):
+                    completion = parse_completion(provider, response["body"])
+                    yield entry["custom_id"], completion, None
+                else:
+                    error = entry.get("error") or response.get("body")
+                    status = response.get("status_code")
+                    yield entry["custom_id"], None, f"HTTP {status}: {error}"
+
+
+def _multipart(
+    fields: Dict[str, str], filename: str, content: bytes
+) -> Tuple[bytes, str]:
+    """``multipart/form-data`` body with text fields and one file."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"'
+            f"\r\n\r\n{value}\r\n".encode("utf-8")
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+        f'filename="{filename}"\r\nContent-Type: application/jsonl\r\n\r\n'.encode(
+            "utf-8"
+        )
+    )
+    parts += [content, f"\r\n--{boundary}--\r\n".encode("utf-8")]
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+# =============================================================================
+# EXECUTOR
+# =============================================================================
+
+
+class BatchExecutor:
+    """Submits evaluator jobs as provider batches and collects the results."""
+
+    def __init__(
+        self,
+        runner: Optional[AsyncRunner] = None,
+        client: Optional[BatchClient] = None,
+        state_dir: Path = DEFAULT_BATCH_DIR,
+    ):
+        self.runner = runner or AsyncRunner()
+        self.client = client or BatchClient()
+        self.state_dir = Path(state_dir)
+        self.interactive: List[JobResult] = []  # Jobs run outside batches
+
+    def _auth_env(self, job: Job) -> str:
+        return str(
+            job.config.get("api_key_env")
+            or (job.model.auth_env if job.model else "")
+            or ""
+        )
+
+    def submit(
+        self,
+        evaluators: Sequence[Any],
+        documents: Sequence[Path],
+        name: Optional[str] = None,
+        batch_only: bool = False,
+    ) -> BatchRun:
+        """
+        Submit every (evaluator, document) job that needs a provider call.
+
+        Cached responses are served immediately; jobs for providers without
+        a batch API run interactively (skipped with ``batch_only``). Both
+        land in ``self.interactive``.
+
+        Raises:
+            ValueError: If an evaluator is unknown, or ``name`` belongs to a
+                run that still has pending requests
+            ProviderError: If an API key is missing or a submission fails
+        """
+        jobs = self.runner.jobs(evaluators, [Path(d) for d in documents])
+        cache = self.runner.cache
+        now = datetime.now(timezone.utc)
+        run = BatchRun(
+            name=self._run_name(name, now.strftime("%Y%m%d-%H%M%S")),
+            created=now.isoformat(timespec="seconds"),
+        )
+
+        groups: Dict[Tuple[str, str], List[Job]] = {}
+        interactive: List[Job] = []
+        for job in jobs:
+            provider = provider_for(str(job.config.get("model") or ""))
+            cached = cache is not None and cache.get(self.runner.cache_key(job))
+            if cached or provider not in BATCH_PROVIDERS:
+                if cached or not batch_only:
+                    interactive.append(job)
+                continue
+            groups.setdefault((provider, self._auth_env(job)), []).append(job)
+        if interactive:
+            self.interactive = asyncio.run(self.runner.run_jobs(interactive))
+
+        for (provider, auth_env), group in groups.items():
+            size = MAX_BATCH_REQUESTS[provider]
+            for start in range(0, len(group), size):
+                run.batches.append(
+                    self._submit(provider, auth_env, group[start : start + size])
+                )
+                run.save(self.state_dir)
+        run.save(self.state_dir)
+        return run
+
+    def _run_name(self, name: Optional[str], default: str) -> str:
+        """
+        ``name``, or a default not yet used in the state directory.
+
+        Overwriting a state file with pending requests would orphan provider
+        batches that are already submitted (and billed), so that is refused.
+        """
+        if name is None:
+            name, n = default, 1
+            while (self.state_dir / f"{name}.json").exists():
+                n += 1
+                name = f"{default}-{n}"
+            return name
+        path = self.state_dir / f"{name}.json"
+        if path.exists():
+            pending = BatchRun.load(path).counts()[PENDING]
+            if pending:
+                raise ValueError(
+                    f"Batch run '{name}' still has {pending} pending requests "
+                    f"(poll it first or choose another --name)"
+                )
+        return name
+
+    def _submit(self, provider: str, auth_env: str, jobs: List[Job]) -> ProviderBatch:
+        api_key = api_key_for({}, auth_env)
+        requests, calls = [], []
+        for index, job in enumerate(jobs):
+            custom_id = f"req-{index:06d}"
+            call = build_call(
+                job.config, job.source, api_key, self.runner.max_output_tokens
+            )
+            calls.append((custom_id, call))
+            requests.append(
+                BatchRequest(
+                    custom_id=custom_id,
+                    evaluator=job.evaluator,
+                    document=str(job.document),
+                    output_path=str(job.output_path),
+                    cache_key=self.runner.cache_key(job) if self.runner.cache else None,
+                )
+            )
+        batch_id = self.client.submit(provider, api_key, calls)
+        return ProviderBatch(provider, batch_id, auth_env, requests)
+
+    # -------------------------------------------------------------------------
+    # Collect
+    # -------------------------------------------------------------------------
+
+    def poll(self, run: BatchRun) -> BatchRun:
+        """Check unfinished batches once; write the results of ended ones."""
+        for batch in run.batches:
+            if batch.finished:
+                continue
+            api_key = api_key_for({}, batch.auth_env)
+            info = self.client.status(batch.provider, api_key, batch.batch_id)
+            batch.provider_status = self.client.state(batch.provider, info)
+            if self.client.ended(batch.provider, info):
+                self._collect(run, batch, api_key, info)
+            run.save(self.state_dir)
+        return run
+
+    def _collect(
+        self, run: BatchRun, batch: ProviderBatch, api_key: str, info: Dict[str, Any]
+    ) -> None:
+        requests = {r.custom_id: r for r in batch.requests}
+        for custom_id, completion, error in self.client.results(
+            batch.provider, api_key, info
+        ):
+            request = requests.get(custom_id)
+            if request is None:
+                continue
+            if completion is None:
+                request.status, request.error = FAILED, error
+                continue
+            self._store(run, request, completion)
+        for request in batch.requests:
+            if request.status == PENDING:  # No result line: expired or cancelled
+                request.status = FAILED
+                request.error = f"No result (batch {batch.provider_status})"
+        failed = all(r.status == FAILED for r in batch.requests)
+        batch.status = FAILED if failed else DONE
+
+    def _store(
+        self, run: BatchRun, request: BatchRequest, completion: Completion
+    ) -> None:
+        job = self.runner.job(
+            request.evaluator, Path(request.document), Path(request.output_path)
+        )
+        write_output(job.output_path, completion.text)
+        record_spend(
+            job.evaluator,
+            job.model,
+            completion.input_tokens,
+            completion.output_tokens,
+            document=request.document,
+            run_id=f"batch:{run.name}",
+            log=self.runner.spend_log,
+            price_factor=BATCH_PRICE_FACTOR,
+        )
+        if self.runner.cache is not None and request.cache_key:
+            self.runner.cache.put(
+                request.cache_key,
+                completion.text,
+                job.evaluator,
+                str(job.config.get("model")),
+                completion.input_tokens,
+                completion.output_tokens,
+            )
+        request.status = DONE
+
+    def wait(
+        self, run: BatchRun, interval: float = 60, timeout: Optional[float] = None
+    ) -> BatchRun:
+        """Poll until every batch has ended (or ``timeout`` seconds pass)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.poll(run)
+            if run.finished:
+                return run
+            if deadline is not None and time.monotonic() + interval > deadline:
+                return run
+            time.sleep(interval)
+
+    def load(self, name: str) -> BatchRun:
+        return BatchRun.load(self.state_dir / f"{name}.json")
+
+    def runs(self) -> List[BatchRun]:
+        """Saved runs, oldest first."""
+        runs = []
+        for path in sorted(self.state_dir.glob("*.json")):
+            try:
+                runs.append(BatchRun.load(path))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        return sorted(runs, key=lambda r: r.created)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def _print_run(run: BatchRun) -> None:
+    counts = run.counts()
+    icon = "✅" if run.finished else "⏳"
+    print(
+        f"{icon} {run.name}: {counts[DONE]} done, {counts[PENDING]} pending, "
+        f"{counts[FAILED]} failed ({len(run.batches)} batches)"
+    )
+    for batch in run.batches:
+        print(
+            f"   {batch.provider:<10} {batch.batch_id:<32} "
+            f"{batch.provider_status or batch.status}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Submit and collect provider batch runs."""
+    parser = argparse.ArgumentParser(
+        prog="batch", description="Bulk evaluator runs through provider batch APIs"
+    )
+    parser.add_argument("--state-dir", default=str(DEFAULT_BATCH_DIR))
+    sub = parser.add_subparsers(dest="command", required=True)
+    submit = sub.add_parser("submit", help="Submit evaluators x documents")
+    submit.add_argument("evaluators", nargs="+", help="Evaluator names")
+    submit.add_argument(
+        "-d", "--documents", nargs="+", required=True, help="Documents or directories"
+    )
+    submit.add_argument("--name", help="Run name (default: UTC timestamp)")
+    submit.add_argument(
+        "--batch-only",
+        action="store_true",
+        help="Skip evaluators whose provider has no batch API",
+    )
+    add_cache_arguments(submit)
+    poll = sub.add_parser("poll", help="Collect finished batches of a run")
+    poll.add_argument("name", help="Run name")
+    poll.add_argument("--wait", action="store_true", help="Poll until finished")
+    poll.add_argument("--interval", type=float, default=60, help="Seconds")
+    add_cache_arguments(poll)
+    sub.add_parser("list", help="Saved runs")
+    args = parser.parse_args(argv)
+
+    state_dir = Path(args.state_dir)
+    if args.command == "list":
+        for run in BatchExecutor(AsyncRunner(), state_dir=state_dir).runs():
+            _print_run(run)
+        return 0
+
+    executor = BatchExecutor(
+        AsyncRunner(cache=cache_from_args(args)), state_dir=state_dir
+    )
+    try:
+        if args.command == "submit":
+            documents: List[Path] = []
+            for raw in args.documents:
+                path = Path(raw)
+                documents.extend(
+                    sorted(path.rglob("*.md")) if path.is_dir() else [path]
+                )
+            run = executor.submit(
+                args.evaluators, documents, args.name, args.batch_only
+            )
+            for result in executor.interactive:
+                icon = "📦" if result.cached else ("✅" if result.ok else "❌")
+                print(
+                    f"  {icon} {result.job.evaluator:<20} "
+                    f"{result.job.document.name:<30} {result.error or 'interactive'}"
+                )
+        else:
+            run = executor.load(args.name)
+            run = executor.wait(run, args.interval) if args.wait else executor.poll(run)
+    except (OSError, ValueError, ProviderError) as e:
+        print(f"❌ {e}")
+        return 1
+    _print_run(run)
+    failed = run.counts()[FAILED] + sum(1 for r in executor.interactive if not r.ok)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
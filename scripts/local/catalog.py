@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Evaluator Catalog
+=================
+
+Compiled, incrementally refreshed snapshot of every evaluator definition.
+
+Parsing 28 ``evaluator.yml`` files plus ``index.json`` on every lookup is the
+slowest part of listing, filtering and validating evaluators. The catalog keeps
+a single JSON snapshot of the parsed definitions, keyed by each file's mtime,
+size and SHA-256. On load, files whose stat is unchanged are served straight
+from the snapshot; only new or modified files are re-read and re-parsed.
+
+Prompt bodies are the bulk of each definition but are not needed for listing,
+filtering or model resolution. The snapshot therefore holds metadata only
+(name, model, model_requirement, timeout, output_suffix, ...); each prompt is
+stored as a separate content-addressed blob and read on first access to
+``entry.prompt``.
+
+Usage:
+    from scripts.local.catalog import EvaluatorCatalog
+
+    catalog = EvaluatorCatalog.load()
+    for entry in catalog.entries():
+        print(entry.name, entry.config["model"])
+
+    python -m scripts.local.catalog list
+    python -m scripts.local.catalog list --category code-review
+    python -m scripts.local.catalog show claude-adversarial
+
+Snapshot location:
+    .adversarial/cache/catalog.json (override with EVALUATOR_CATALOG_CACHE)
+    .adversarial/cache/catalog-<dir-hash>.json for other trees (installed copies)
+    .adversarial/cache/prompts/<sha256>.txt (prompt blobs, next to the snapshot)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from scripts.local.fingerprint import fingerprint
+
+# =============================================================================
+# PATHS
+# =============================================================================
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+EVALUATORS_DIR = REPO_ROOT / "evaluators"
+INDEX_FILENAME = "index.json"
+DEFAULT_CACHE_DIR = REPO_ROOT / ".adversarial" / "cache"
+DEFAULT_SNAPSHOT = DEFAULT_CACHE_DIR / "catalog.json"
+
+# Bump when the snapshot layout changes; older snapshots are discarded
+SNAPSHOT_VERSION = 5  # 5: fingerprints cover prompt_layout
+
+
+# =============================================================================
+# FILE FINGERPRINTS
+# =============================================================================
+
+
+def default_snapshot_path(evaluators_dir: Path) -> Path:
+    """The library tree gets catalog.json; any other tree gets its own file."""
+    resolved = Path(evaluators_dir).resolve()
+    if resolved == EVALUATORS_DIR.resolve():
+        return DEFAULT_SNAPSHOT
+    tag = hashlib.sha256(str(resolved).encode("utf-8")).hexdigest()[:12]
+    return DEFAULT_CACHE_DIR / f"catalog-{tag}.json"
+
+
+def _parse_definition(raw: bytes) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Parse evaluator YAML, returning ``(config, error)`` instead of raising."""
+    try:
+        config = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        return {}, f"Invalid YAML: {e}"
+    if config is None:
+        return {}, "Empty evaluator definition"
+    if not isinstance(config, dict):
+        return {}, f"Expected a mapping, got {type(config).__name__}"
+    return config, None
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@dataclass
+class FileStamp:
+    """Cheap change-detection key for a file on disk."""
+
+    mtime_ns: int
+    size: int
+
+    @classmethod
+    def of(cls, path: Path) -> "FileStamp":
+        st = path.stat()
+        return cls(mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+
+# =============================================================================
+# CATALOG ENTRIES
+# =============================================================================
+
+
+@dataclass
+class EvaluatorEntry:
+    """
+    A parsed evaluator definition plus the stamp it was parsed from.
+
+    ``config`` holds every field except ``prompt``, which is loaded lazily.
+    ``fingerprint`` is computed at parse time so it never needs the prompt.
+    ``error`` is set (and ``config`` empty) if the file is not a valid mapping.
+    """
+
+    path: str  # Relative to evaluators/, e.g. "openai/o3-chain/evaluator.yml"
+    sha256: str
+    mtime_ns: int
+    size: int
+    config: Dict[str, Any]
+    fingerprint: str = ""
+    error: Optional[str] = None
+    _prompt: Optional[str] = field(default=None, repr=False, compare=False)
+    _prompt_loader: Optional[Callable[["EvaluatorEntry"], Optional[str]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    @property
+    def name(self) -> str:
+        return self.config.get("name") or Path(self.path).parent.name
+
+    @property
+    def provider(self) -> str:
+        return Path(self.path).parts[0]
+
+    @property
+    def prompt_loaded(self) -> bool:
+        return self._prompt is not None
+
+    @property
+    def prompt(self) -> Optional[str]:
+        """The prompt template, loaded on first access."""
+        if self._prompt is None and self._prompt_loader is not None:
+            self._prompt = self._prompt_loader(self)
+        return self._prompt
+
+    def full_config(self) -> Dict[str, Any]:
+        """Metadata plus prompt, as it appears in ``evaluator.yml``."""
+        prompt = self.prompt  # Loading may refresh a stale config
+        return {**self.config, "prompt": prompt}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sha256": self.sha256,
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "config": self.config,
+            "fingerprint": self.fingerprint,
+            "error": self.error,
+        }
+
+
+# =============================================================================
+# CATALOG
+# =============================================================================
+
+
+class EvaluatorCatalog:
+    """
+    Snapshot-backed view of all evaluators in an evaluators directory.
+
+    Args:
+        evaluators_dir: Directory containing ``<provider>/<name>/evaluator.yml``
+        snapshot_path: JSON snapshot file; None disables persistence
+    """
+
+    def __init__(
+        self,
+        evaluators_dir: Path = EVALUATORS_DIR,
+        snapshot_path: Optional[Path] = DEFAULT_SNAPSHOT,
+    ):
+        self.evaluators_dir = Path(evaluators_dir)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._entries: Dict[str, EvaluatorEntry] = {}
+        self._index: Optional[Dict[str, Any]] = None
+        self._index_stamp: Optional[Dict[str, Any]] = None
+        self.parsed_count = 0  # Files (re)parsed during the last refresh
+
+    @property
+    def prompt_dir(self) -> Optional[Path]:
+        if not self.snapshot_path:
+            return None
+        return self.snapshot_path.parent / "prompts"
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def load(
+        cls,
+        evaluators_dir: Path = EVALUATORS_DIR,
+        snapshot_path: Optional[Path] = None,
+    ) -> "EvaluatorCatalog":
+        """Load the snapshot, refresh changed files, and persist if needed."""
+        if snapshot_path is None:
+            env_path = os.getenv("EVALUATOR_CATALOG_CACHE")
+            snapshot_path = (
+                Path(env_path) if env_path else default_snapshot_path(evaluators_dir)
+            )
+        catalog = cls(evaluators_dir, snapshot_path)
+        catalog._read_snapshot()
+        if catalog.refresh():
+            catalog.save()
+        return catalog
+
+    def _read_snapshot(self) -> None:
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return  # Corrupt snapshot: rebuild from scratch
+        if data.get("snapshot_version") != SNAPSHOT_VERSION:
+            return
+        if data.get("evaluators_dir") != str(self.evaluators_dir.resolve()):
+            return
+        for rel, item in data.get("files", {}).items():
+            self._entries[rel] = EvaluatorEntry(
+                path=rel, _prompt_loader=self._load_prompt, **item
+            )
+        self._index_stamp = data.get("index")
+
+    def refresh(self) -> bool:
+        """
+        Bring the catalog in line with the files on disk.
+
+        Returns:
+            True if anything changed (and the snapshot should be saved)
+        """
+        self.parsed_count = 0
+        changed = False
+        seen = set()
+
+        for yaml_path in sorted(self.evaluators_dir.glob("**/evaluator.yml")):
+            rel = yaml_path.relative_to(self.evaluators_dir).as_posix()
+            seen.add(rel)
+            stamp = FileStamp.of(yaml_path)
+            cached = self._entries.get(rel)
+            if (
+                cached
+                and cached.mtime_ns == stamp.mtime_ns
+                and cached.size == stamp.size
+            ):
+                continue
+
+            raw = yaml_path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if cached and cached.sha256 == digest:
+                # Touched but not modified - keep the parsed config
+                cached.mtime_ns, cached.size = stamp.mtime_ns, stamp.size
+            else:
+                config, error = _parse_definition(raw)
+                fp = fingerprint(config) if error is None else ""
+                prompt = config.pop("prompt", None)
+                self._entries[rel] = EvaluatorEntry(
+                    path=rel,
+                    sha256=digest,
+                    mtime_ns=stamp.mtime_ns,
+                    size=stamp.size,
+                    config=config,
+                    fingerprint=fp,
+                    error=error,
+                    _prompt=prompt,
+                    _prompt_loader=self._load_prompt,
+                )
+                self._store_prompt(digest, prompt)
+                self.parsed_count += 1
+            changed = True
+
+        for rel in set(self._entries) - seen:
+            del self._entries[rel]
+            changed = True
+
+        return self._refresh_index() or changed
+
+    def _refresh_index(self) -> bool:
+        index_path = self.evaluators_dir / INDEX_FILENAME
+        if not index_path.exists():
+            changed = self._index_stamp is not None
+            self._index_stamp, self._index = None, None
+            return changed
+
+        stamp = FileStamp.of(index_path)
+        cached = self._index_stamp
+        if (
+            cached
+            and cached["mtime_ns"] == stamp.mtime_ns
+            and cached["size"] == stamp.size
+        ):
+            self._index = cached["data"]
+            return False
+
+        raw = index_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        data = cached["data"] if cached and cached["sha256"] == digest else None
+        if data is None:
+            data = json.loads(raw)
+        self._index_stamp = {
+            "sha256": digest,
+            "mtime_ns": stamp.mtime_ns,
+            "size": stamp.size,
+            "data": data,
+        }
+        self._index = data
+        return True
+
+    # -------------------------------------------------------------------------
+    # Prompt blobs
+    # -------------------------------------------------------------------------
+
+    def _store_prompt(self, digest: str, prompt: Optional[str]) -> None:
+        if self.prompt_dir is None or prompt is None:
+            return
+        blob = self.prompt_dir / f"{digest}.txt"
+        if blob.exists():
+            return
+        self.prompt_dir.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_suffix(".tmp")
+        tmp.write_text(prompt, encoding="utf-8")
+        os.replace(tmp, blob)
+
+    def _load_prompt(self, entry: EvaluatorEntry) -> Optional[str]:
+        """
+        Read a prompt blob, falling back to the source YAML if it is gone.
+
+        If the YAML changed since the snapshot, the entry is re-parsed in place
+        so its config and fingerprint describe the prompt that is returned.
+        """
+        if self.prompt_dir is not None:
+            blob = self.prompt_dir / f"{entry.sha256}.txt"
+            try:
+                return blob.read_text(encoding="utf-8")
+            except OSError:
+                pass
+        source = self.evaluators_dir / entry.path
+        raw = source.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        config, error = _parse_definition(raw)
+        fp = fingerprint(config) if error is None else ""
+        prompt = config.pop("prompt", None)
+        self._store_prompt(digest, prompt)
+        if digest != entry.sha256:
+            stamp = FileStamp.of(source)
+            entry.sha256, entry.mtime_ns, entry.size = (
+                digest,
+                stamp.mtime_ns,
+                stamp.size,
+            )
+            entry.config, entry.fingerprint, entry.error = config, fp, error
+            if self._entries.get(entry.path) is entry:
+                self.save()
+        return prompt
+
+    def save(self) -> None:
+        """Atomically write the snapshot to disk."""
+        if not self.snapshot_path:
+            return
+        payload = {
+            "snapshot_version": SNAPSHOT_VERSION,
+            "evaluators_dir": str(self.evaluators_dir.resolve()),
+            "files": {rel: e.to_dict() for rel, e in sorted(self._entries.items())},
+            "index": self._index_stamp,
+        }
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        os.replace(tmp, self.snapshot_path)
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def entries(self) -> List[EvaluatorEntry]:
+        """All evaluators, ordered by path."""
+        return [self._entries[rel] for rel in sorted(self._entries)]
+
+    def names(self) -> List[str]:
+        return [e.name for e in self.entries()]
+
+    def filter(
+        self, category: Optional[str] = None, provider: Optional[str] = None
+    ) -> List[EvaluatorEntry]:
+        """Evaluators matching an index.json category and/or provider directory."""
+        results = []
+        for entry in self.entries():
+            if provider and entry.provider != provider:
+                continue
+            if category:
+                record = self.index_record(entry.name) or {}
+                if record.get("category") != category:
+                    continue
+            results.append(entry)
+        return results
+
+    def get(self, name: str) -> Optional[EvaluatorEntry]:
+        """Find an evaluator by name or by ``provider/name`` path."""
+        for entry in self._entries.values():
+            if entry.name == name or entry.path == f"{name}/evaluator.yml":
+                return entry
+        return None
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        """Parsed ``index.json`` (empty dict if missing)."""
+        return self._index or {}
+
+    def index_record(self, name: str) -> Optional[Dict[str, Any]]:
+        """The ``index.json`` record for an evaluator, if any."""
+        for record in self.index.get("evaluators", []):
+            if record.get("name") == name:
+                return record
+        return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """List or show evaluators from the compiled catalog."""
+    parser = argparse.ArgumentParser(
+        prog="catalog", description="Browse the compiled evaluator catalog"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = sub.add_parser("list", help="List evaluators")
+    list_cmd.add_argument("--category", help="Filter by index.json category")
+    list_cmd.add_argument("--provider", help="Filter by provider directory")
+
+    show_cmd = sub.add_parser("show", help="Show one evaluator's metadata")
+    show_cmd.add_argument("name")
+
+    args = parser.parse_args(argv)
+    catalog = EvaluatorCatalog.load()
+
+    if args.command == "list":
+        for entry in catalog.filter(args.category, args.provider):
+            record = catalog.index_record(entry.name) or {}
+            print(
+                f"{entry.name:24} {entry.provider:10} "
+                f"{record.get('category', '-'):20} {entry.config.get('model', '')}"
+            )
+        return 0
+
+    entry = catalog.get(args.name)
+    if entry is None:
+        print(f"❌ Unknown evaluator: {args.name}")
+        return 1
+    print(
+        yaml.safe_dump({"path": entry.path, **entry.config}, sort_keys=False).rstrip()
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
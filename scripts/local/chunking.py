@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Context-Window Chunking
+=======================
+
+Split documents that do not fit an evaluator's model into overlapping chunks.
+
+The token budget for the document is derived from the registry:
+
+    budget = context_window            (resolved model, providers/registry.yml)
+           - prompt tokens             (the evaluator's static instructions)
+           - output reserve            (room for the review itself)
+
+The explicit ``model`` field is looked up first (it takes priority at run
+time, ADV-0032); ``model_requirement`` resolution is the fallback.
+
+Documents within budget are returned as a single chunk. Larger documents are
+cut at the best boundary available, in order of preference:
+
+    1. Markdown headings (outside fenced code blocks)
+    2. Around fenced code blocks (a block is never split if it fits)
+    3. Blank lines (paragraph breaks)
+    4. Line breaks (only for a single paragraph bigger than the budget)
+
+Each chunk after the first starts with the last ``overlap`` tokens' worth of
+lines from the previous chunk, so findings near a boundary keep their context.
+
+Token counts come from a ``count_tokens`` callable. ``plan_for_evaluator``
+defaults to the offline estimator for the model's family (``tokens.py``);
+``chunk_document`` on its own defaults to a characters-per-token estimate.
+
+Usage:
+    from scripts.local.chunking import chunk_document, plan_for_evaluator
+
+    plan = plan_for_evaluator(entry.full_config(), text)
+    for chunk in plan.chunks:
+        run(chunk.text)
+
+    python -m scripts.local.chunking claude-quick big-spec.md
+    python -m scripts.local.chunking o3-chain big-spec.md --out-dir chunks/
+"""
+
+import argparse
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+
+from scripts.local.prompt_template import compile_evaluator
+from scripts.local.registry import CompiledRegistry, ResolvedModel
+from scripts.local.tokens import estimator_for
+
+TokenCounter = Callable[[str], int]
+
+# Rough English/markdown average; user-tunable via count_tokens
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Tokens kept free for the model's response
+DEFAULT_OUTPUT_RESERVE = 8192
+
+# Share of the budget repeated from the previous chunk
+DEFAULT_OVERLAP_RATIO = 0.05
+
+# A heading cut is preferred if it keeps at least this share of a full chunk
+_MIN_FILL = 0.5
+
+_HEADING_RE = re.compile(r"^ {0,3}#{1,6}(\s|$)")
+_FENCE_RE = re.compile(r"^ {0,3}(```|~~~)")
+
+
+class ChunkingError(ValueError):
+    """Raised when an evaluator leaves no room for any document text."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Characters-per-token estimate (never zero for non-empty text)."""
+    return math.ceil(len(text) / DEFAULT_CHARS_PER_TOKEN)
+
+
+# =============================================================================
+# DATA
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """One piece of a document, plus the overlap carried from its predecessor."""
+
+    index: int
+    text: str  # overlap + body, ready to substitute for {content}
+    start: int  # Character offset of the body in the document
+    end: int
+    overlap: int  # Characters of ``text`` repeated from the previous chunk
+    tokens: int
+
+    @property
+    def body(self) -> str:
+        return self.text[self.overlap :]
+
+
+@dataclass
+class ChunkPlan:
+    """How a document is split for one evaluator."""
+
+    context_window: int
+    prompt_tokens: int
+    budget: int
+    document_tokens: int
+    chunks: List[Chunk] = field(default_factory=list)
+
+    @property
+    def needs_chunking(self) -> bool:
+        return len(self.chunks) > 1
+
+
+@dataclass
+class _Block:
+    """A run of lines that should stay together."""
+
+    start: int  # Character offsets in the document
+    end: int
+    heading: bool  # Starts with a markdown heading (preferred cut point)
+    tokens: int
+
+
+# =============================================================================
+# SPLITTING
+# =============================================================================
+
+
+def _blocks(text: str, count: TokenCounter) -> List[_Block]:
+    """Group lines into paragraphs and fenced code blocks."""
+    blocks: List[_Block] = []
+    start = 0
+    heading = False
+    in_fence = False
+    offset = 0
+
+    def close(end: int) -> None:
+        nonlocal start
+        if end > start:
+            blocks.append(_Block(start, end, heading, count(text[start:end])))
+        start = end
+
+    for line in text.splitlines(keepends=True):
+        line_start, offset = offset, offset + len(line)
+        if in_fence:
+            if _FENCE_RE.match(line):
+                in_fence = False
+                close(offset)
+                heading = False
+            continue
+        if _FENCE_RE.match(line):
+            close(line_start)
+            heading = False
+            in_fence = True
+        elif _HEADING_RE.match(line):
+            close(line_start)
+            heading = True
+        elif not line.strip():
+            close(offset)  # Blank line ends a paragraph
+            heading = False
+    close(len(text))
+    return blocks
+
+
+def _split_lines(
+    text: str, block: _Block, budget: int, count: TokenCounter
+) -> List[_Block]:
+    """Split one oversized block at line breaks (or hard, for giant lines)."""
+    pieces: List[_Block] = []
+    start = block.start
+    tokens = 0
+    offset = block.start
+    for line in text[block.start : block.end].splitlines(keepends=True):
+        line_tokens = count(line)
+        if tokens and tokens + line_tokens > budget:
+            pieces.append(_Block(start, offset, False, tokens))
+            start, tokens = offset, 0
+        while line_tokens > budget:
+            # A single line larger than the budget: cut it by characters
+            width = max(1, len(line) * budget // line_tokens)
+            pieces.append(_Block(offset, offset + width, False, count(line[:width])))
+            offset, line = offset + width, line[width:]
+            start, line_tokens = offset, count(line)
+        tokens += line_tokens
+        offset += len(line)
+    if offset > start:
+        pieces.append(_Block(start, offset, False, tokens))
+    if pieces:
+        pieces[0].heading = block.heading
+    return pieces
+
+
+def _halve(text: str, block: _Block, count: TokenCounter) -> List[_Block]:
+    """Cut a block in two, at the line break before its middle if it has one."""
+    middle = (block.start + block.end) // 2
+    cut = text.rfind("\n", block.start, middle) + 1
+    if cut <= block.start:
+        cut = middle
+    return [
+        _Block(block.start, cut, block.heading, count(text[block.start : cut])),
+        _Block(cut, block.end, False, count(text[cut : block.end])),
+    ]
+
+
+def _overlap_start(
+    text: str, start: int, end: int, limit: int, count: TokenCounter
+) -> int:
+    """Offset where the trailing ``limit`` tokens of whole lines begin."""
+    if limit <= 0:
+        return end
+    position = end
+    lines = text[start:end].splitlines(keepends=True)
+    tokens = 0
+    for line in reversed(lines):
+        tokens += count(line)
+        if tokens > limit:
+            break
+        position -= len(line)
+    return position
+
+
+def chunk_document(
+    text: str,
+    budget: int,
+    overlap: Optional[int] = None,
+    count_tokens: TokenCounter = estimate_tokens,
+) -> List[Chunk]:
+    """
+    Split ``text`` into chunks of at most ``budget`` tokens (overlap included).
+
+    Args:
+        text: Document text
+        budget: Maximum tokens per chunk
+        overlap: Tokens repeated from the previous chunk
+            (default: 5% of the budget)
+        count_tokens: Token counter
+    """
+    if budget <= 0:
+        raise ChunkingError(f"Chunk budget must be positive, got {budget}")
+    total = count_tokens(text)
+    if total <= budget:
+        return [Chunk(0, text, 0, len(text), 0, total)]
+
+    if overlap is None:
+        overlap = int(budget * DEFAULT_OVERLAP_RATIO)
+    overlap = min(overlap, budget // 2)
+    body_budget = budget - overlap
+
+    blocks: List[_Block] = []
+    for block in _blocks(text, count_tokens):
+        if block.tokens > body_budget:
+            blocks.extend(_split_lines(text, block, body_budget, count_tokens))
+        else:
+            blocks.append(block)
+
+    # Greedy packing, backing up to the last heading if it is not too early
+    spans: List[Tuple[int, int]] = []
+    i = 0
+    while i < len(blocks):
+        j, tokens = i, 0
+        while j < len(blocks) and tokens + blocks[j].tokens <= body_budget:
+            tokens += blocks[j].tokens
+            j += 1
+        j = max(j, i + 1)
+        if j < len(blocks) and not blocks[j].heading:
+            cut, filled = None, 0
+            for k in range(i + 1, j):
+                filled += blocks[k - 1].tokens
+                if blocks[k].heading and filled >= _MIN_FILL * body_budget:
+                    cut = k
+            if cut is not None:
+                j = cut
+        spans.append((i, j))
+        i = j
+
+    # Token counts need not add up across pieces: re-count each assembled
+    # chunk, trimming its overlap and then its tail until it fits
+    groups = [blocks[a:b] for a, b in spans]
+    chunks: List[Chunk] = []
+    previous: Optional[Tuple[int, int]] = None
+    while len(chunks) < len(groups):
+        group = groups[len(chunks)]
+        start, end = group[0].start, group[-1].end
+        lead, limit = start, overlap
+        if previous is not None:
+            lead = _overlap_start(text, *previous, limit, count_tokens)
+        tokens = count_tokens(text[lead:end])
+        while tokens > budget and lead < start:
+            limit -= tokens - budget
+            lead = _overlap_start(text, *previous, limit, count_tokens)
+            tokens = count_tokens(text[lead:end])
+        if tokens > budget and end - start > 1:
+            if len(group) == 1:
+                group[:] = _halve(text, group[0], count_tokens)
+            if len(groups) == len(chunks) + 1:
+                groups.append([])
+            groups[len(chunks) + 1].insert(0, group.pop())
+            continue
+        chunks.append(
+            Chunk(
+                index=len(chunks),
+                text=text[lead:end],
+                start=start,
+                end=end,
+                overlap=start - lead,
+                tokens=tokens,
+            )
+        )
+        previous = (start, end)
+    return chunks
+
+
+# =============================================================================
+# EVALUATOR PLANNING
+# =============================================================================
+
+
+def model_for(
+    config: Mapping[str, Any], registry: CompiledRegistry
+) -> Optional[ResolvedModel]:
+    """Registry entry for the model an evaluator will run on."""
+    model = (
+        registry.model(str(config.get("model", ""))) if config.get("model") else None
+    )
+    if model is None and config.get("model_requirement"):
+        model = registry.resolve_requirement(config["model_requirement"])
+    return model
+
+
+def context_window_for(
+    config: Mapping[str, Any], registry: CompiledRegistry
+) -> Optional[int]:
+    """Context window of the model an evaluator will run on."""
+    model = model_for(config, registry)
+    return model.context_window if model else None
+
+
+def plan_for_evaluator(
+    config: Mapping[str, Any],
+    text: str,
+    registry: Optional[CompiledRegistry] = None,
+    output_reserve: int = DEFAULT_OUTPUT_RESERVE,
+    overlap: Optional[int] = None,
+    count_tokens: Optional[TokenCounter] = None,
+) -> ChunkPlan:
+    """
+    Chunk ``text`` to fit the evaluator's model.
+
+    ``count_tokens`` defaults to the calibrated estimator for the model's
+    family.
+
+    Raises:
+        ChunkingError: If the model is unknown or the prompt leaves no room
+    """
+    registry = registry or CompiledRegistry.load()
+    model = model_for(config, registry)
+    window = model.context_window if model else None
+    if not window:
+        raise ChunkingError(
+            f"No context_window for {config.get('name')} ({config.get('model')})"
+        )
+    count_tokens = count_tokens or estimator_for(model.family)
+    compiled = compile_evaluator(config)
+    prompt_tokens = count_tokens(compiled.static_prefix + compiled.static_suffix)
+    budget = int(window) - prompt_tokens - output_reserve
+    if budget <= 0:
+        raise ChunkingError(
+            f"{config.get('name')}: prompt ({prompt_tokens}) and output reserve "
+            f"({output_reserve}) exceed the {window}-token context window"
+        )
+    return ChunkPlan(
+        context_window=int(window),
+        prompt_tokens=prompt_tokens,
+        budget=budget,
+        document_tokens=count_tokens(text),
+        chunks=chunk_document(text, budget, overlap, count_tokens),
+    )
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Show (and optionally write) the chunk plan for an evaluator/document."""
+    from scripts.local.catalog import EvaluatorCatalog
+
+    parser = argparse.ArgumentParser(
+        prog="chunking", description="Split a document for an evaluator's model"
+    )
+    parser.add_argument("evaluator", help="Evaluator name or provider/name")
+    parser.add_argument("document", help="Document to split")
+    parser.add_argument("--overlap", type=int, help="Overlap tokens per chunk")
+    parser.add_argument(
+        "--output-reserve",
+        type=int,
+        default=DEFAULT_OUTPUT_RESERVE,
+        help="Tokens reserved for the response",
+    )
+    parser.add_argument("--out-dir", help="Write chunks as <stem>.part-NN.md here")
+    args = parser.parse_args(argv)
+
+    entry = EvaluatorCatalog.load().get(args.evaluator)
+    if entry is None:
+        print(f"❌ Unknown evaluator: {args.evaluator}")
+        return 1
+    document = Path(args.document)
+    text = document.read_text(encoding="utf-8")
+    try:
+        plan = plan_for_evaluator(
+            entry.full_config(),
+            text,
+            output_reserve=args.output_reserve,
+            overlap=args.overlap,
+        )
+    except ChunkingError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(
+        f"{entry.name}: window {plan.context_window}, prompt {plan.prompt_tokens}, "
+        f"budget {plan.budget}, document {plan.document_tokens} tokens"
+    )
+    for chunk in plan.chunks:
+        print(
+            f"  part {chunk.index + 1:02d}: {chunk.tokens:>8} tokens  "
+            f"chars {chunk.start}-{chunk.end} (+{chunk.overlap} overlap)"
+        )
+    if args.out_dir:
+        out_dir = Path(args.out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for chunk in plan.chunks:
+            target = out_dir / f"{document.stem}.part-{chunk.index + 1:02d}.md"
+            target.write_text(chunk.text, encoding="utf-8")
+        print(f"✅ Wrote {len(plan.chunks)} chunks to {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
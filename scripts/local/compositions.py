@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Composition Definitions
+=======================
+
+Load ``compositions/*.yml`` into a uniform list of stages.
+
+Two layouts exist in the library:
+
+    evaluators:            A panel; every evaluator runs on the document
+      - openai/gpt52-reasoning
+      - google/gemini-deep
+
+    stages:                A pipeline; later stages may be conditional
+      - name: quick-check
+        evaluator: openai/fast-check
+        gate:
+          stop_if: {contains: "✅ PASSED"}
+      - name: deep-review
+        evaluator: openai/gpt52-reasoning
+        condition: "Only if quick-check found issues"
+
+A stage with a ``condition`` is conditional: it may not run, so cost and
+time estimates give a range. Mapping gates are compiled with ``gates.py``
+into ``Stage.rule``; free-text gates are kept for reference only.
+
+Usage:
+    from scripts.local.compositions import load_composition
+
+    composition = load_composition("quick-then-deep")
+    for stage in composition.stages:
+        print(stage.name, stage.evaluator, stage.conditional)
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import yaml
+
+from scripts.local.catalog import REPO_ROOT
+from scripts.local.gates import Gate, GateError, parse_gate
+
+COMPOSITIONS_DIR = REPO_ROOT / "compositions"
+
+
+class CompositionError(ValueError):
+    """Raised when a composition file is missing or malformed."""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One evaluator run within a composition."""
+
+    name: str
+    evaluator: str  # provider/name, as written in the composition
+    conditional: bool = False
+    gate: Any = None  # As written: free text or a gate mapping
+    condition: Optional[str] = None
+    rule: Optional[Gate] = None  # Compiled mapping gate
+
+
+@dataclass
+class Composition:
+    """A parsed composition file."""
+
+    name: str
+    description: str
+    stages: List[Stage]
+    path: Optional[Path] = None
+    config: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def evaluators(self) -> List[str]:
+        return [stage.evaluator for stage in self.stages]
+
+
+def parse_composition(
+    config: Dict[str, Any], path: Optional[Path] = None
+) -> Composition:
+    """Normalise a parsed composition mapping into stages."""
+    if not isinstance(config, dict):
+        raise CompositionError(f"{path or 'composition'}: expected a mapping")
+    stages: List[Stage] = []
+    for evaluator in config.get("evaluators") or []:
+        stages.append(
+            Stage(name=str(evaluator).rsplit("/", 1)[-1], evaluator=evaluator)
+        )
+    for position, spec in enumerate(config.get("stages") or []):
+        if not isinstance(spec, dict) or not spec.get("evaluator"):
+            raise CompositionError(
+                f"{path or 'composition'}: stage {position + 1} has no evaluator"
+            )
+        name = spec.get("name") or str(spec["evaluator"]).rsplit("/", 1)[-1]
+        try:
+            rule = parse_gate(spec.get("gate"))
+        except GateError as e:
+            raise CompositionError(
+                f"{path or 'composition'}: stage '{name}' gate: {e}"
+            ) from e
+        stages.append(
+            Stage(
+                name=name,
+                evaluator=spec["evaluator"],
+                conditional=bool(spec.get("condition")),
+                gate=spec.get("gate"),
+                condition=spec.get("condition"),
+                rule=rule,
+            )
+        )
+    if not stages:
+        raise CompositionError(f"{path or 'composition'}: no evaluators or stages")
+    return Composition(
+        name=config.get("name") or (path.stem if path else ""),
+        description=config.get("description", ""),
+        stages=stages,
+        path=path,
+        config=config,
+    )
+
+
+def load_composition(
+    name: Union[str, Path], compositions_dir: Path = COMPOSITIONS_DIR
+) -> Composition:
+    """Load a composition by name (``quick-then-deep``) or file path."""
+    path = Path(name)
+    if not path.suffix:
+        path = Path(compositions_dir) / f"{name}.yml"
+    if not path.exists():
+        raise CompositionError(f"Composition not found: {name}")
+    try:
+        config = yaml.safe_load(path.read_text(encoding="utf-8"))
+    except yaml.YAMLError as e:
+        raise CompositionError(f"{path}: {e}") from e
+    return parse_composition(config, path)
+
+
+def list_compositions(compositions_dir: Path = COMPOSITIONS_DIR) -> List[str]:
+    return sorted(p.stem for p in Path(compositions_dir).glob("*.yml"))
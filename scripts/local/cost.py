@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Cost Estimation and Spend Tracking
+==================================
+
+Predict what an evaluator or a composition will cost on a document set
+before running it, and record what runs actually cost.
+
+Estimates combine:
+
+    tokens    offline estimator for the model's family (``tokens.py``), with
+              oversized documents chunked exactly as a run would chunk them
+              (each chunk pays for the prompt again)
+    output    average output tokens per call from the spend log for that
+              evaluator, else ``DEFAULT_OUTPUT_TOKENS``
+    prices    ``input_price_per_mtok`` / ``output_price_per_mtok`` of the
+              resolved registry model; unpriced models are reported, not
+              guessed (and ``--budget`` refuses to pass with any unpriced)
+
+Each document is read and scanned once per estimate, however many evaluators
+it is estimated for; only documents that need chunking are read again.
+
+Spend is appended to ``.adversarial/logs/spend.jsonl``, one JSON object per
+evaluator call, with the cost computed from the same registry prices.
+
+Usage:
+    from scripts.local.cost import CostEstimator, record_spend
+
+    estimator = CostEstimator()
+    documents = estimator.scan(paths)
+    estimate = estimator.composition("adversarial-trio", documents)
+    print(estimate.min_cost, estimate.max_cost)
+
+    python -m scripts.local.cost estimate claude-quick docs/
+    python -m scripts.local.cost composition quick-then-deep docs/ --budget 25
+    python -m scripts.local.cost record claude-quick 12000 1800 --document spec.md
+    python -m scripts.local.cost spend
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from scripts.local.chunking import (
+    ChunkingError,
+    chunk_document,
+    model_for,
+    plan_for_evaluator,
+)
+from scripts.local.compositions import CompositionError, load_composition
+from scripts.local.registry import CompiledRegistry, ResolvedModel
+from scripts.local.tokens import (
+    DEFAULT_CALIBRATION,
+    TextStats,
+    TokenCalibration,
+    TokenEstimator,
+    estimator_for,
+)
+
+DEFAULT_SPEND_LOG = Path(".adversarial") / "logs" / "spend.jsonl"
+
+# Output tokens per call assumed until the spend log has data for an evaluator
+DEFAULT_OUTPUT_TOKENS = 2000
+
+# Document types picked up when a directory is given
+DEFAULT_PATTERNS = ("*.md", "*.txt", "*.py")
+
+
+def price(
+    model: Optional[ResolvedModel], input_tokens: int, output_tokens: int
+) -> Optional[float]:
+    """USD cost of one or more calls, or None if the model has no prices."""
+    if model is None or not model.priced:
+        return None
+    return (
+        input_tokens * float(model.input_price)
+        + output_tokens * float(model.output_price)
+    ) / 1_000_000
+
+
+# =============================================================================
+# SPEND LOG
+# =============================================================================
+
+
+@dataclass
+class SpendRecord:
+    """Actual usage of one evaluator call."""
+
+    timestamp: str
+    evaluator: str
+    model: Optional[str]
+    input_tokens: int
+    output_tokens: int
+    cost: Optional[float]
+    document: Optional[str] = None
+    run_id: Optional[str] = None
+
+
+class SpendLog:
+    """Append-only JSONL log of actual spend."""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_SPEND_LOG):
+        self.path = Path(path) if path else None
+
+    def append(self, record: SpendRecord) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(record), sort_keys=True) + "\n")
+
+    def records(self) -> List[SpendRecord]:
+        if not self.path or not self.path.exists():
+            return []
+        records = []
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                records.append(SpendRecord(**json.loads(line)))
+            except (ValueError, TypeError):
+                continue  # Partial line from an interrupted write
+        return records
+
+    def summary(self, since: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Totals per evaluator (records with ``timestamp >= since``)."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for record in self.records():
+            if since and record.timestamp < since:
+                continue
+            entry = totals.setdefault(
+                record.evaluator,
+                {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0},
+            )
+            entry["calls"] += 1
+            entry["input_tokens"] += record.input_tokens
+            entry["output_tokens"] += record.output_tokens
+            entry["cost"] += record.cost or 0.0
+        return totals
+
+    def average_output_tokens(self) -> Dict[str, int]:
+        """Mean output tokens per call, per evaluator."""
+        return {
+            name: round(t["output_tokens"] / t["calls"])
+            for name, t in self.summary().items()
+            if t["calls"]
+        }
+
+
+def record_spend(
+    evaluator: str,
+    model: Optional[ResolvedModel],
+    input_tokens: int,
+    output_tokens: int,
+    document: Optional[str] = None,
+    run_id: Optional[str] = None,
+    log: Union[SpendLog, Path, None] = DEFAULT_SPEND_LOG,
+    price_factor: float = 1.0,
+) -> SpendRecord:
+    """
+    Append one call's provider-reported usage to the spend log.
+
+    ``price_factor`` scales list prices (e.g. 0.5 for batch API calls).
+    """
+    if not isinstance(log, SpendLog):
+        log = SpendLog(log)
+    cost = price(model, input_tokens, output_tokens)
+    record = SpendRecord(
+        timestamp=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        evaluator=evaluator,
+        model=model.litellm_id if model else None,
+        input_tokens=int(input_tokens),
+        output_tokens=int(output_tokens),
+        cost=None if cost is None else cost * price_factor,
+        document=document,
+        run_id=run_id,
+    )
+    log.append(record)
+    return record
+
+
+# =============================================================================
+# ESTIMATES
+# =============================================================================
+
+
+@dataclass
+class Document:
+    """A document scanned once for token statistics."""
+
+    name: str
+    stats: TextStats
+    path: Optional[Path] = None
+    content: Optional[str] = field(default=None, repr=False)  # In-memory text
+
+    def text(self) -> str:
+        if self.content is not None or self.path is None:
+            return self.content or ""
+        return self.path.read_text(encoding="utf-8", errors="replace")
+
+
+@dataclass
+class CostEstimate:
+    """Predicted usage and cost of one evaluator over a document set."""
+
+    evaluator: str
+    model: Optional[str]
+    documents: int = 0
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def priced(self) -> bool:
+        return self.cost is not None
+
+
+@dataclass
+class CompositionEstimate:
+    """Per-stage estimates; conditional stages give a cost range."""
+
+    name: str
+    stages: List[CostEstimate]
+    conditional: List[bool]
+
+    def _total(self, include_conditional: bool) -> float:
+        return sum(
+            e.cost or 0.0
+            for e, cond in zip(self.stages, self.conditional)
+            if include_conditional or not cond
+        )
+
+    @property
+    def min_cost(self) -> float:
+        """Cost if no conditional stage runs (priced stages only)."""
+        return self._total(False)
+
+    @property
+    def max_cost(self) -> float:
+        """Cost if every stage runs (priced stages only)."""
+        return self._total(True)
+
+    @property
+    def unpriced(self) -> List[str]:
+        return [e.evaluator for e in self.stages if not e.priced]
+
+
+class CostEstimator:
+    """Estimate evaluator and composition cost on document sets."""
+
+    def __init__(
+        self,
+        registry: Optional[CompiledRegistry] = None,
+        calibration: Union[TokenCalibration, Path, None] = DEFAULT_CALIBRATION,
+        spend_log: Union[SpendLog, Path, None] = DEFAULT_SPEND_LOG,
+        output_tokens: Optional[int] = None,
+        catalog: Any = None,
+    ):
+        self.registry = registry or CompiledRegistry.load()
+        self.calibration = (
+            calibration
+            if isinstance(calibration, TokenCalibration)
+            else TokenCalibration(calibration)
+        )
+        log = spend_log if isinstance(spend_log, SpendLog) else SpendLog(spend_log)
+        self._observed_output = log.average_output_tokens()
+        self.output_tokens = output_tokens
+        self._catalog = catalog
+
+    @property
+    def catalog(self) -> Any:
+        if self._catalog is None:
+            from scripts.local.catalog import EvaluatorCatalog
+
+            self._catalog = EvaluatorCatalog.load()
+        return self._catalog
+
+    @staticmethod
+    def scan(
+        paths: Iterable[Union[str, Path]], patterns: Iterable[str] = DEFAULT_PATTERNS
+    ) -> List[Document]:
+        """Read each file once (directories: recursively, by ``patterns``)."""
+        documents = []
+        for raw in paths:
+            path = Path(raw)
+            files = (
+                sorted({f for p in patterns for f in path.rglob(p) if f.is_file()})
+                if path.is_dir()
+                else [path]
+            )
+            for file in files:
+                documents.append(
+                    Document(str(file), TextStats.of(file.read_bytes()), path=file)
+                )
+        return documents
+
+    @staticmethod
+    def document(text: str, name: str = "<text>") -> Document:
+        return Document(name, TextStats.of(text), content=text)
+
+    def evaluator(
+        self, config: Mapping[str, Any], documents: Iterable[Document]
+    ) -> CostEstimate:
+        """Estimate one evaluator (``entry.full_config()``) over ``documents``."""
+        name = str(config.get("name", ""))
+        model = model_for(config, self.registry)
+        if model is None:
+            return CostEstimate(name, None, error="model not in registry")
+        count: TokenEstimator = estimator_for(model.family, self.calibration)
+        try:
+            plan = plan_for_evaluator(config, "", self.registry, count_tokens=count)
+        except ChunkingError as e:
+            return CostEstimate(name, model.litellm_id, error=str(e))
+        per_call_output = (
+            self.output_tokens
+            or self._observed_output.get(name)
+            or DEFAULT_OUTPUT_TOKENS
+        )
+
+        estimate = CostEstimate(name, model.litellm_id)
+        for document in documents:
+            tokens = count.count_stats(document.stats)
+            if tokens <= plan.budget:
+                chunk_tokens = [tokens]
+            else:
+                chunks = chunk_document(
+                    document.text(), plan.budget, count_tokens=count
+                )
+                chunk_tokens = [c.tokens for c in chunks]
+            estimate.documents += 1
+            estimate.calls += len(chunk_tokens)
+            estimate.input_tokens += sum(chunk_tokens) + plan.prompt_tokens * len(
+                chunk_tokens
+            )
+        estimate.output_tokens = estimate.calls * per_call_output
+        estimate.cost = price(model, estimate.input_tokens, estimate.output_tokens)
+        return estimate
+
+    def named(self, evaluator: str, documents: Iterable[Document]) -> CostEstimate:
+        """Estimate a catalog evaluator by name or ``provider/name``."""
+        entry = self.catalog.get(evaluator)
+        if entry is None:
+            return CostEstimate(evaluator, None, error="unknown evaluator")
+        return self.evaluator(entry.full_config(), documents)
+
+    def composition(
+        self, name: Union[str, Path], documents: Iterable[Document]
+    ) -> CompositionEstimate:
+        """Estimate every stage of a composition on the same documents."""
+        composition = load_composition(name)
+        documents = list(documents)
+        return CompositionEstimate(
+            name=composition.name,
+            stages=[self.named(s.evaluator, documents) for s in composition.stages],
+            conditional=[s.conditional for s in composition.stages],
+        )
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def _money(value: Optional[float]) -> str:
+    return "unpriced" if value is None else f"${value:,.4f}"
+
+
+def _print_estimate(estimate: CostEstimate, suffix: str = "") -> None:
+    if estimate.error:
+        print(f"  ❌ {estimate.evaluator}: {estimate.error}")
+        return
+    print(
+        f"  {estimate.evaluator:<22} {estimate.model or '-':<34} "
+        f"{estimate.calls:>6} calls {estimate.input_tokens:>12,} in "
+        f"{estimate.output_tokens:>10,} out  {_money(estimate.cost)}{suffix}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Estimate cost before a run; record and summarise actual spend."""
+    parser = argparse.ArgumentParser(
+        prog="cost", description="Evaluator cost estimates and spend tracking"
+    )
+    parser.add_argument("--spend-log", default=str(DEFAULT_SPEND_LOG))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for command, target in (("estimate", "evaluator"), ("composition", "name")):
+        cmd = sub.add_parser(command, help=f"Estimate a {target} on documents")
+        cmd.add_argument(target)
+        cmd.add_argument("documents", nargs="+", help="Files or directories")
+        cmd.add_argument(
+            "--budget",
+            type=float,
+            help="Fail if cost exceeds (USD) or any stage is unpriced",
+        )
+        cmd.add_argument(
+            "--output-tokens", type=int, help="Output tokens per call override"
+        )
+
+    record_cmd = sub.add_parser("record", help="Record actual usage of one call")
+    record_cmd.add_argument("evaluator")
+    record_cmd.add_argument("input_tokens", type=int)
+    record_cmd.add_argument("output_tokens", type=int)
+    record_cmd.add_argument("--document")
+    record_cmd.add_argument("--run-id")
+
+    spend_cmd = sub.add_parser("spend", help="Summarise recorded spend")
+    spend_cmd.add_argument("--since", help="ISO date, e.g. 2026-10-01")
+    args = parser.parse_args(argv)
+
+    log = SpendLog(Path(args.spend_log))
+
+    if args.command == "record":
+        estimator = CostEstimator(spend_log=log)
+        entry = estimator.catalog.get(args.evaluator)
+        if entry is None:
+            print(f"❌ Unknown evaluator: {args.evaluator}")
+            return 1
+        model = model_for(entry.full_config(), estimator.registry)
+        record = record_spend(
+            entry.name,
+            model,
+            args.input_tokens,
+            args.output_tokens,
+            args.document,
+            args.run_id,
+            log,
+        )
+        print(f"✅ Recorded {entry.name}: {_money(record.cost)}")
+        return 0
+
+    if args.command == "spend":
+        summary = log.summary(args.since)
+        if not summary:
+            print("No spend recorded")
+            return 0
+        for name, t in sorted(summary.items()):
+            print(
+                f"  {name:<22} {t['calls']:>6} calls {t['input_tokens']:>12,} in "
+                f"{t['output_tokens']:>10,} out  {_money(t['cost'])}"
+            )
+        print(f"Total: {_money(sum(t['cost'] for t in summary.values()))}")
+        return 0
+
+    estimator = CostEstimator(spend_log=log, output_tokens=args.output_tokens)
+    documents = estimator.scan(args.documents)
+    print(f"{len(documents)} documents")
+
+    if args.command == "estimate":
+        estimate = estimator.named(args.evaluator, documents)
+        _print_estimate(estimate)
+        if estimate.error:
+            return 1
+        total: Optional[float] = estimate.cost
+        unpriced = [] if estimate.priced else [estimate.evaluator]
+        print(f"Total: {_money(total)}")
+    else:
+        try:
+            result = estimator.composition(args.name, documents)
+        except CompositionError as e:
+            print(f"❌ {e}")
+            return 1
+        for estimate, conditional in zip(result.stages, result.conditional):
+            _print_estimate(estimate, " (conditional)" if conditional else "")
+        total = result.max_cost
+        if result.min_cost != result.max_cost:
+            print(f"Total: {_money(result.min_cost)} - {_money(result.max_cost)}")
+        else:
+            print(f"Total: {_money(total)}")
+        unpriced = result.unpriced
+        if unpriced:
+            print(f"⚠️  Unpriced (not in total): {', '.join(unpriced)}")
+
+    if args.budget is None:
+        return 0
+    if unpriced:
+        # A partial total could pass while the real cost is far over budget
+        print(f"❌ Cannot check budget: no price for {', '.join(unpriced)}")
+        return 1
+    if total > args.budget:
+        print(f"❌ Over budget: {_money(total)} > {_money(args.budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
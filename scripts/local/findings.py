@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Evaluator Output Parsing
+========================
+
+Extract findings and the verdict from an evaluator's markdown response.
+
+Library evaluators use two finding formats:
+
+    ### [HIGH]: Finding Title             (severity heading)
+    **[COUPLING]: Finding Title**         (category line, optional
+                                           "- **Severity**: Major" bullet)
+
+and write their verdict as ``**Verdict**: VALUE`` (older prompts use a bold
+verdict token under a ``### Verdict`` heading instead). Verdict vocabularies
+differ per evaluator; ``VERDICT_RANKS`` maps each one onto a common scale so
+results from different evaluators (or chunks) can be compared.
+
+``FindingStream`` parses a response while it is still streaming: it reports
+each finding as soon as its header (and severity) is complete and each
+verdict line as soon as it is written, so callers can react before the
+response ends.
+
+Usage:
+    from scripts.local.findings import FindingStream, parse_findings, parse_verdict
+
+    findings = parse_findings(output)
+    verdict = parse_verdict(output)        # e.g. "NEEDS_REVISION" or None
+
+    stream = FindingStream()
+    for delta in deltas:
+        for event in stream.feed(delta):
+            print(event.kind, event.finding or event.verdict)
+    stream.close()
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Most severe first
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+# Wording used by "- **Severity**:" bullets and older prompts
+_SEVERITY_ALIASES = {
+    "CRITICAL": "CRITICAL",
+    "BLOCKER": "CRITICAL",
+    "HIGH": "HIGH",
+    "MAJOR": "HIGH",
+    "MEDIUM": "MEDIUM",
+    "MODERATE": "MEDIUM",
+    "LOW": "LOW",
+    "MINOR": "LOW",
+}
+
+# 0 = proceed, 1 = revise, 2 = block
+VERDICT_RANKS: Dict[str, int] = {
+    "APPROVED": 0,
+    "PASS": 0,
+    "SOUND": 0,
+    "REVISION_SUGGESTED": 1,
+    "NEEDS_REVISION": 1,
+    "CHANGES_REQUESTED": 1,
+    "CONCERNS": 1,
+    "RESTRUCTURE_NEEDED": 2,
+    "REJECT": 2,
+    "FAIL": 2,
+    "UNRELIABLE": 2,
+}
+
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s")
+# "### [HIGH] - Title" or "### HIGH: Title"; a bare tag needs the colon so
+# ordinary headings such as "## High-Level Summary" are not findings
+_SEVERITY_HEADING_RE = re.compile(
+    r"^\s{0,3}#{2,6}\s*"
+    r"(?:\[(?P<bracketed>[A-Za-z]+)\]\s*[:\-–—]?|(?P<tag>[A-Za-z]+)\s*:)"
+    r"\s*(?P<title>.+?)\s*$"
+)
+_CATEGORY_LINE_RE = re.compile(
+    r"^\s{0,3}\*\*\[?(?P<tag>[A-Z][A-Z_/ -]*?)\]?(?::\s*(?P<t1>.+?))?\*\*"
+    r"(?:\s*[:\-–—]?\s*(?P<t2>.+?))?\s*$"
+)
+_SEVERITY_BULLET_RE = re.compile(
+    r"^\s*[-*]\s*\*\*Severity\*\*\s*:\s*\**(?P<value>[A-Za-z]+)", re.MULTILINE
+)
+_VERDICT_LINE_RE = re.compile(
+    r"^\W*(?:\*\*)?Verdict(?:\*\*)?\s*:\s*(?:\*\*)?\s*(?P<value>[A-Z_]+)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_BOLD_TOKEN_RE = re.compile(r"\*\*(?P<value>[A-Z_]+)\*\*")
+
+
+# =============================================================================
+# FINDINGS
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Finding:
+    """One finding from an evaluator response."""
+
+    title: str
+    severity: Optional[str]  # One of SEVERITIES, if stated
+    category: Optional[str]  # e.g. COUPLING, for category-style findings
+    body: str
+
+    @property
+    def key(self) -> str:
+        """Normalised title used to recognise the same finding twice."""
+        return " ".join(re.findall(r"[a-z0-9]+", self.title.lower()))
+
+    @property
+    def severity_rank(self) -> int:
+        """Position in SEVERITIES (unstated severities sort last)."""
+        if self.severity in SEVERITIES:
+            return SEVERITIES.index(self.severity)
+        return len(SEVERITIES)
+
+
+def normalize_severity(value: str) -> Optional[str]:
+    """Map severity wording (``Major``, ``minor``...) onto SEVERITIES."""
+    return _SEVERITY_ALIASES.get(value.strip().upper())
+
+
+def _finding_header(line: str) -> Optional[Dict[str, Optional[str]]]:
+    """Parse a finding header line, or return None."""
+    match = _SEVERITY_HEADING_RE.match(line)
+    tag = match and (match.group("bracketed") or match.group("tag"))
+    if tag and normalize_severity(tag):
+        return {
+            "title": match.group("title").strip("*[] "),
+            "severity": normalize_severity(tag),
+            "category": None,
+        }
+    match = _CATEGORY_LINE_RE.match(line)
+    if match:
+        tag = match.group("tag").strip()
+        title = (match.group("t1") or match.group("t2") or "").strip("*[] ")
+        if not title or tag in VERDICT_RANKS:
+            return None
+        severity = normalize_severity(tag)
+        return {
+            "title": title,
+            "severity": severity,
+            "category": None if severity else tag,
+        }
+    return None
+
+
+def parse_findings(text: str) -> List[Finding]:
+    """
+    Extract findings in the order they appear.
+
+    A finding's body runs until the next finding header or markdown heading.
+    """
+    findings: List[Finding] = []
+    current: Optional[Dict[str, Optional[str]]] = None
+    body: List[str] = []
+
+    def close() -> None:
+        if current is None:
+            return
+        text_body = "\n".join(body).strip()
+        severity = current["severity"]
+        if severity is None:
+            bullet = _SEVERITY_BULLET_RE.search(text_body)
+            if bullet:
+                severity = normalize_severity(bullet.group("value"))
+        findings.append(
+            Finding(
+                title=str(current["title"]),
+                severity=severity,
+                category=current["category"],
+                body=text_body,
+            )
+        )
+
+    for line in text.splitlines():
+        header = _finding_header(line)
+        if header is not None:
+            close()
+            current, body = header, []
+        elif _HEADING_RE.match(line):
+            close()
+            current, body = None, []
+        elif current is not None:
+            body.append(line)
+    close()
+    return findings
+
+
+# =============================================================================
+# VERDICT
+# =============================================================================
+
+
+def parse_verdict(text: str) -> Optional[str]:
+    """
+    Return the verdict token, or None if none is recognisable.
+
+    The last ``Verdict: VALUE`` line wins; otherwise the last bold verdict
+    token (``✅ **APPROVED**``) is used.
+    """
+    for match in reversed(list(_VERDICT_LINE_RE.finditer(text))):
+        value = match.group("value").upper()
+        if value in VERDICT_RANKS:
+            return value
+    for match in reversed(list(_BOLD_TOKEN_RE.finditer(text))):
+        if match.group("value") in VERDICT_RANKS:
+            return match.group("value")
+    return None
+
+
+def verdict_rank(verdict: Optional[str]) -> Optional[int]:
+    """Common-scale rank of a verdict (None if unknown)."""
+    return VERDICT_RANKS.get(verdict or "")
+
+
+# =============================================================================
+# STREAMING
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    """A finding or verdict detected in a partial response."""
+
+    kind: str  # "finding" or "verdict"
+    finding: Optional[Finding] = None
+    verdict: Optional[str] = None
+
+
+class FindingStream:
+    """
+    Incremental parser for a streamed response.
+
+    Feed text deltas in order; complete lines are parsed as they arrive.
+    Streamed findings carry title, severity and category but no body (use
+    ``parse_findings`` on the final text for bodies). A header without a
+    severity waits for a ``- **Severity**:`` bullet until the next header or
+    heading.
+    """
+
+    def __init__(self) -> None:
+        self.findings: List[Finding] = []
+        self.verdict: Optional[str] = None
+        self._buffer = ""
+        self._pending: Optional[Dict[str, Optional[str]]] = None
+        self._text: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._text)
+
+    def _emit(
+        self, header: Dict[str, Optional[str]], severity: Optional[str]
+    ) -> StreamEvent:
+        finding = Finding(
+            title=str(header["title"]),
+            severity=severity,
+            category=header["category"],
+            body="",
+        )
+        self.findings.append(finding)
+        return StreamEvent("finding", finding=finding)
+
+    def _flush(self) -> List[StreamEvent]:
+        pending, self._pending = self._pending, None
+        return [self._emit(pending, None)] if pending else []
+
+    def _line(self, line: str) -> List[StreamEvent]:
+        events: List[StreamEvent] = []
+        header = _finding_header(line)
+        if header is not None:
+            events += self._flush()
+            if header["severity"]:
+                events.append(self._emit(header, header["severity"]))
+            else:
+                self._pending = header
+        elif _HEADING_RE.match(line):
+            events += self._flush()
+        elif self._pending is not None:
+            bullet = _SEVERITY_BULLET_RE.match(line)
+            if bullet and normalize_severity(bullet.group("value")):
+                pending, self._pending = self._pending, None
+                events.append(
+                    self._emit(pending, normalize_severity(bullet.group("value")))
+                )
+        match = _VERDICT_LINE_RE.match(line)
+        if match and match.group("value").upper() in VERDICT_RANKS:
+            self.verdict = match.group("value").upper()
+            events.append(StreamEvent("verdict", verdict=self.verdict))
+        return events
+
+    def feed(self, delta: str) -> List[StreamEvent]:
+        """Add streamed text; returns events for lines it completed."""
+        self._text.append(delta)
+        *lines, self._buffer = (self._buffer + delta).split("\n")
+        events: List[StreamEvent] = []
+        for line in lines:
+            events += self._line(line)
+        return events
+
+    def close(self) -> List[StreamEvent]:
+        """End of stream: parse the last line and settle the verdict."""
+        events = self._line(self._buffer) if self._buffer else []
+        self._buffer = ""
+        events += self._flush()
+        if self.verdict is None:
+            verdict = parse_verdict(self.text)  # Bold-token fallback
+            if verdict:
+                self.verdict = verdict
+                events.append(StreamEvent("verdict", verdict=verdict))
+        return events
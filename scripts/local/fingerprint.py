@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Evaluator Fingerprints
+======================
+
+Stable, content-addressed identity for an evaluator's behaviour.
+
+A fingerprint is the SHA-256 of a canonical JSON form of the fields that change
+what an evaluator sends to a provider: ``prompt``, ``model``,
+``model_requirement``, ``timeout`` and ``prompt_layout``. Comments,
+descriptions, key order and line-ending differences do not affect it, so it
+can key response caches, benchmark history and drift checks between the
+library and installed copies.
+
+Usage:
+    from scripts.local.fingerprint import fingerprint
+
+    fp = fingerprint(config)          # "3f9a..." (64 hex chars)
+
+    python -m scripts.local.fingerprint list
+    python -m scripts.local.fingerprint diff .kit/adversarial/evaluators
+
+Exit codes (diff):
+    0 - Installed evaluators match the library
+    1 - Drift detected (changed, missing or extra evaluators)
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+# Fields that define evaluator behaviour, in canonical order
+FINGERPRINT_FIELDS = (
+    "prompt",
+    "model",
+    "model_requirement",
+    "timeout",
+    "prompt_layout",  # prompt_template.LAYOUT_CONFIG_KEY: reorders the request
+)
+
+# Bump if the canonical form changes; included in the hashed payload
+FINGERPRINT_VERSION = 1
+
+SHORT_LENGTH = 12
+
+
+# =============================================================================
+# CANONICAL FORM
+# =============================================================================
+
+
+def _normalize_text(text: str) -> str:
+    """Unify line endings and drop trailing whitespace per line and at the end."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).rstrip("\n")
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return _normalize_text(value)
+    if isinstance(value, Mapping):
+        # YAML may type min_version as a float ("4.7" vs 4.7); compare as strings
+        return {str(k): _normalize_scalar(v) for k, v in value.items()}
+    return value
+
+
+def _normalize_scalar(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int)):
+        return value
+    return str(value).strip()
+
+
+def canonical_form(config: Mapping[str, Any]) -> str:
+    """The canonical JSON string hashed into a fingerprint."""
+    payload: Dict[str, Any] = {"v": FINGERPRINT_VERSION}
+    for key in FINGERPRINT_FIELDS:
+        value = config.get(key)
+        if value in (None, "", {}):
+            continue
+        payload[key] = _normalize_value(value)
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def fingerprint(config: Mapping[str, Any]) -> str:
+    """Hex SHA-256 fingerprint of an evaluator config (must include ``prompt``)."""
+    return hashlib.sha256(canonical_form(config).encode("utf-8")).hexdigest()
+
+
+def short(fp: str) -> str:
+    return fp[:SHORT_LENGTH]
+
+
+# =============================================================================
+# DRIFT DETECTION
+# =============================================================================
+
+
+@dataclass
+class DriftReport:
+    """Fingerprint comparison between a library tree and an installed tree."""
+
+    changed: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)  # In library, not installed
+    extra: List[str] = field(default_factory=list)  # Installed, not in library
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.changed or self.missing or self.extra)
+
+
+def tree_fingerprints(evaluators_dir: Path) -> Dict[str, str]:
+    """Map ``provider/name`` to fingerprint for every evaluator in a tree."""
+    # Imported here: the catalog itself imports this module
+    from scripts.local.catalog import EvaluatorCatalog
+
+    catalog = EvaluatorCatalog.load(evaluators_dir)
+    return {Path(e.path).parent.as_posix(): e.fingerprint for e in catalog.entries()}
+
+
+def compare(library: Mapping[str, str], installed: Mapping[str, str]) -> DriftReport:
+    """Compare two ``{key: fingerprint}`` maps."""
+    report = DriftReport()
+    for key in sorted(set(library) | set(installed)):
+        if key not in installed:
+            report.missing.append(key)
+        elif key not in library:
+            report.extra.append(key)
+        elif library[key] != installed[key]:
+            report.changed.append(key)
+        else:
+            report.unchanged.append(key)
+    return report
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """List fingerprints or diff an installed tree against the library."""
+    from scripts.local.catalog import EVALUATORS_DIR
+
+    parser = argparse.ArgumentParser(
+        prog="fingerprint", description="Content-addressed evaluator fingerprints"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Print each evaluator's fingerprint")
+    diff_cmd = sub.add_parser("diff", help="Compare an installed tree to the library")
+    diff_cmd.add_argument(
+        "installed",
+        nargs="?",
+        default=".kit/adversarial/evaluators",
+        help="Installed evaluators directory",
+    )
+    args = parser.parse_args(argv)
+
+    library = tree_fingerprints(EVALUATORS_DIR)
+    if args.command == "list":
+        for key, fp in sorted(library.items()):
+            print(f"{short(fp)}  {key}")
+        return 0
+
+    installed_dir = Path(args.installed)
+    if not installed_dir.is_dir():
+        print(f"❌ Installed evaluators not found: {installed_dir}")
+        return 1
+
+    report = compare(library, tree_fingerprints(installed_dir))
+    for label, keys in (
+        ("changed", report.changed),
+        ("missing", report.missing),
+        ("extra", report.extra),
+    ):
+        for key in keys:
+            print(f"{label:8} {key}")
+    if report.has_drift:
+        print(
+            f"⚠️  Drift: {len(report.changed)} changed, "
+            f"{len(report.missing)} missing, {len(report.extra)} extra"
+        )
+        return 1
+    print(f"✅ {len(report.unchanged)} evaluators match the library")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
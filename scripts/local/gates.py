@@ -0,0 +1,200 @@
+"""
+Composition Gate Expressions
+============================
+
+Machine-readable ``gate:`` rules for staged compositions. A gate is checked
+against its stage's output and decides whether the pipeline goes on to the
+next stage:
+
+    gate:
+      description: Stop if the quick check passes
+      stop_if:                      # or continue_if:
+        contains: "✅ PASSED"
+
+A condition is a mapping of one or more tests (all must hold):
+
+    contains: "text"                Output contains the text
+    verdict: APPROVED               Parsed verdict is one of these
+    verdict: [APPROVED, PASS]
+    severity:                       At least ``count`` findings at
+      at_least: HIGH                ``at_least`` or worse
+      count: 1
+
+and may combine conditions with ``any: [...]``, ``all: [...]`` and
+``not: {...}``. Verdicts and findings are read with ``findings.py``, so the
+same expressions work across evaluator output formats.
+
+``fail_fast: HIGH`` runs the gated stage in gate mode (see ``runner.py``):
+its response is cancelled at the first finding of that severity or worse
+and the stage ends with a FAIL verdict. Only useful for evaluators that
+emit severity-tagged findings.
+
+Usage:
+    from scripts.local.gates import parse_gate
+
+    gate = parse_gate({"stop_if": {"verdict": "APPROVED"}})
+    if gate.stops(output):
+        ...
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+from scripts.local.findings import (
+    SEVERITIES,
+    normalize_severity,
+    parse_findings,
+    parse_verdict,
+)
+
+
+class GateError(ValueError):
+    """Raised when a gate expression is malformed."""
+
+
+@dataclass(frozen=True)
+class Condition:
+    """A compiled gate test; call it with a stage output."""
+
+    expression: str  # Normalised form, for messages and reports
+    test: Callable[[str], bool]
+
+    def __call__(self, output: str) -> bool:
+        return self.test(output)
+
+
+@dataclass(frozen=True)
+class Gate:
+    """``stop_if`` or ``continue_if`` rule for one stage."""
+
+    condition: Condition
+    stop_when: bool  # True for stop_if, False for continue_if
+    description: str = ""
+    fail_fast: Optional[str] = None  # Severity that cancels the stage early
+
+    def stops(self, output: str) -> bool:
+        """Whether the pipeline stops after a stage that produced ``output``."""
+        return self.condition(output) == self.stop_when
+
+    def __str__(self) -> str:
+        kind = "stop_if" if self.stop_when else "continue_if"
+        return f"{kind} {self.condition.expression}"
+
+
+# =============================================================================
+# PARSING
+# =============================================================================
+
+
+def _contains(value: Any) -> Condition:
+    if not isinstance(value, str) or not value:
+        raise GateError("contains: expected non-empty text")
+    return Condition(f"contains {value!r}", lambda output: value in output)
+
+
+def _verdict(value: Any) -> Condition:
+    values = [value] if isinstance(value, str) else value
+    if not values or not all(isinstance(v, str) for v in values):
+        raise GateError("verdict: expected a verdict or list of verdicts")
+    wanted = {v.strip().upper() for v in values}
+    return Condition(
+        f"verdict in {sorted(wanted)}",
+        lambda output: (parse_verdict(output) or "") in wanted,
+    )
+
+
+def _severity(value: Any) -> Condition:
+    if not isinstance(value, Mapping) or "at_least" not in value:
+        raise GateError("severity: expected {at_least: SEVERITY, count: N}")
+    severity = normalize_severity(str(value["at_least"]))
+    if severity is None:
+        raise GateError(
+            f"severity: unknown severity '{value['at_least']}' "
+            f"(expected one of {', '.join(SEVERITIES)})"
+        )
+    count = value.get("count", 1)
+    if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+        raise GateError("severity: count must be a positive integer")
+    rank = SEVERITIES.index(severity)
+
+    def test(output: str) -> bool:
+        found = sum(1 for f in parse_findings(output) if f.severity_rank <= rank)
+        return found >= count
+
+    return Condition(f"{count}+ findings at {severity} or worse", test)
+
+
+def _combine(name: str, value: Any) -> Condition:
+    if name == "not":
+        inner = parse_condition(value)
+        return Condition(f"not ({inner.expression})", lambda o: not inner(o))
+    if not isinstance(value, list) or not value:
+        raise GateError(f"{name}: expected a non-empty list of conditions")
+    parts: Tuple[Condition, ...] = tuple(parse_condition(v) for v in value)
+    joined = f" {name[:3]} ".join(f"({p.expression})" for p in parts)
+    if name == "any":
+        return Condition(joined, lambda o: any(p(o) for p in parts))
+    return Condition(joined, lambda o: all(p(o) for p in parts))
+
+
+_TESTS = {"contains": _contains, "verdict": _verdict, "severity": _severity}
+
+
+def parse_condition(spec: Any) -> Condition:
+    """
+    Compile a condition mapping.
+
+    Raises:
+        GateError: If the mapping is empty or uses an unknown test
+    """
+    if not isinstance(spec, Mapping) or not spec:
+        raise GateError("condition must be a non-empty mapping")
+    parts = []
+    for name, value in spec.items():
+        if name in _TESTS:
+            parts.append(_TESTS[name](value))
+        elif name in ("any", "all", "not"):
+            parts.append(_combine(name, value))
+        else:
+            raise GateError(f"unknown gate test '{name}'")
+    if len(parts) == 1:
+        return parts[0]
+    return Condition(
+        " and ".join(f"({p.expression})" for p in parts),
+        lambda o: all(p(o) for p in parts),
+    )
+
+
+def parse_gate(spec: Any) -> Optional[Gate]:
+    """
+    Compile a stage ``gate:`` value.
+
+    Returns None for legacy free-text gates, which are documentation only.
+
+    Raises:
+        GateError: If a mapping gate is malformed
+    """
+    if spec is None or isinstance(spec, str):
+        return None
+    if not isinstance(spec, Mapping):
+        raise GateError("gate must be a mapping with stop_if or continue_if")
+    kinds = [k for k in ("stop_if", "continue_if") if k in spec]
+    if len(kinds) != 1:
+        raise GateError("gate needs exactly one of stop_if / continue_if")
+    unknown = set(spec) - {"stop_if", "continue_if", "description", "fail_fast"}
+    if unknown:
+        raise GateError(f"unknown gate keys: {', '.join(sorted(unknown))}")
+    fail_fast = None
+    if spec.get("fail_fast") is not None:
+        fail_fast = normalize_severity(str(spec["fail_fast"]))
+        if fail_fast is None:
+            raise GateError(
+                f"fail_fast: unknown severity '{spec['fail_fast']}' "
+                f"(expected one of {', '.join(SEVERITIES)})"
+            )
+    return Gate(
+        condition=parse_condition(spec[kinds[0]]),
+        stop_when=kinds[0] == "stop_if",
+        description=str(spec.get("description") or "").strip(),
+        fail_fast=fail_fast,
+    )
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Clients
+===================
+
+Long-lived, keep-alive HTTP connections shared by every evaluation in a
+process, so a run over hundreds of documents pays for a handful of TLS
+handshakes per provider instead of one per call.
+
+``HttpPool`` keeps up to ``max_per_host`` ``http.client`` connections per
+(scheme, host, port), handed out most recently used first and shared across
+the runner's worker threads:
+
+    - a connection idle for longer than ``idle_timeout`` is closed rather
+      than reused (providers drop idle keep-alive connections)
+    - a reused connection that turns out to be closed by the server is
+      replaced and the request retried once on a fresh one
+    - a response that is not read to the end (a cancelled stream) closes
+      its connection; everything else goes back to the pool
+    - when every connection to a host is busy, callers wait for one
+    - cancelling a call's ``Abort`` shuts its socket down, so a worker
+      thread blocked on the response returns at once (the connection is
+      discarded)
+
+``transport`` and ``stream`` have the ``providers.Transport`` /
+``StreamTransport`` signatures, so they drop into ``thread_backend`` and
+``BatchClient``. ``AsyncRunner`` uses the process-wide ``HttpPool.shared()``
+by default.
+
+With ``http2=True`` and ``httpx`` (plus ``h2``) installed, ``pool_for``
+returns an ``HttpxPool`` instead: one ``httpx.Client`` per host that
+multiplexes requests over HTTP/2 where the server supports it. Without
+them it falls back to ``HttpPool``. A cancel wakes an HTTP/1.1 response at
+once; an HTTP/2 stream stops at its next line (its socket is shared).
+
+Metrics (``stats()``) are kept per host: requests, connections opened,
+reused and closed, stale connections discarded, waits for a free
+connection, and peak connections in use. ``HttpxPool`` counts requests,
+opened (from httpx connection trace events) and reused; its ``in_use`` and
+``peak`` count requests in flight, since HTTP/2 multiplexes them over one
+connection. httpx manages the rest internally, so those stay at zero.
+
+Usage:
+    from scripts.local.http_pool import HttpPool, PoolConfig
+
+    pool = HttpPool(PoolConfig(max_per_host=16))
+    runner = AsyncRunner(backend=thread_backend(pool.transport, pool.stream))
+    print(pool.stats())
+
+    python -m scripts.local.runner claude-quick -d docs/ --pool-size 16 --pool-stats
+"""
+
+import functools
+import http.client
+import importlib.util
+import socket
+import ssl
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from scripts.local.providers import (
+    CONNECTION,
+    TIMEOUT,
+    ApiCall,
+    ProviderError,
+    transport_error,
+)
+
+try:
+    import httpx
+except ImportError:  # Optional: only needed for HTTP/2
+    httpx = None
+
+DEFAULT_MAX_PER_HOST = 16
+DEFAULT_IDLE_TIMEOUT = 30.0  # Seconds; below typical provider keep-alive limits
+
+HostKey = Tuple[str, str, int]  # scheme, host, port
+
+# Errors that mean a reused keep-alive connection was already closed
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+@dataclass
+class PoolConfig:
+    """Pool size and lifetime settings."""
+
+    max_per_host: int = DEFAULT_MAX_PER_HOST
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT
+    http2: bool = False  # Use HttpxPool when httpx and h2 are installed
+
+
+@dataclass
+class PoolMetrics:
+    """Counters for one host."""
+
+    requests: int = 0
+    opened: int = 0
+    reused: int = 0
+    closed: int = 0
+    stale: int = 0  # Idle too long or closed by the server
+    waits: int = 0  # Requests that waited for a free connection
+    in_use: int = 0
+    idle: int = 0
+    peak: int = 0  # Most connections in use at once
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "reuse_ratio": round(self.reuse_ratio, 3)}
+
+
+def host_key(url: str) -> Tuple[HostKey, str]:
+    """Pool key and request target (path and query) for a URL."""
+    parts = urlsplit(url)
+    scheme = parts.scheme or "https"
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target += f"?{parts.query}"
+    return (scheme, parts.hostname or "", port), target
+
+
+def _shutdown_socket(sock: socket.socket) -> None:
+    """Wake a thread blocked reading ``sock`` (close() would not)."""
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+def _shutdown(connection: http.client.HTTPConnection) -> None:
+    if connection.sock is not None:
+        _shutdown_socket(connection.sock)
+
+
+def _cancelled(call: ApiCall) -> bool:
+    return call.abort is not None and call.abort.cancelled
+
+
+def _error(call: ApiCall, response: Any, body: bytes) -> ProviderError:
+    return ProviderError(
+        f"{call.provider} HTTP {response.status}: "
+        f"{body[:200].decode('utf-8', 'replace')}",
+        status=response.status,
+        headers=dict(response.getheaders()),
+        body=body,
+    )
+
+
+# =============================================================================
+# HTTP/1.1 POOL
+# =============================================================================
+
+
+class _Host:
+    """Idle connections and counters for one host."""
+
+    def __init__(self) -> None:
+        self.idle: List[Tuple[http.client.HTTPConnection, float]] = []
+        self.metrics = PoolMetrics()
+        self.ready = threading.Condition()
+
+
+class HttpPool:
+    """Thread-safe keep-alive connection pool over ``http.client``."""
+
+    _shared: Optional["HttpPool"] = None
+
+    def __init__(
+        self,
+        config: Optional[PoolConfig] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.config = config or PoolConfig()
+        self._ssl = ssl_context or ssl.create_default_context()
+        self._hosts: Dict[HostKey, _Host] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "HttpPool":
+        """Process-wide pool."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _host(self, key: HostKey) -> _Host:
+        with self._lock:
+            if key not in self._hosts:
+                self._hosts[key] = _Host()
+            return self._hosts[key]
+
+    def _connect(self, key: HostKey, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _acquire(
+        self, key: HostKey, timeout: float
+    ) -> Tuple[http.client.HTTPConnection, bool]:
+        """A connection for ``key`` and whether it was reused."""
+        host = self._host(key)
+        metrics = host.metrics
+        deadline = time.monotonic() + timeout
+        with host.ready:
+            waited = False
+            while not host.idle and metrics.in_use >= self.config.max_per_host:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ProviderError(
+                        f"No free connection to {key[1]} after {timeout:.0f}s"
+                    )
+                if not waited:
+                    metrics.waits += 1
+                    waited = True
+                host.ready.wait(remaining)
+            now = time.monotonic()
+            while host.idle:
+                connection, last_used = host.idle.pop()
+                if now - last_used <= self.config.idle_timeout:
+                    metrics.in_use += 1
+                    metrics.idle = len(host.idle)
+                    metrics.peak = max(metrics.peak, metrics.in_use)
+                    metrics.reused += 1
+                    connection.timeout = timeout
+                    if connection.sock is not None:
+                        connection.sock.settimeout(timeout)
+                    return connection, True
+                connection.close()
+                metrics.stale += 1
+                metrics.closed += 1
+            metrics.in_use += 1
+            metrics.idle = 0
+            metrics.peak = max(metrics.peak, metrics.in_use)
+            metrics.opened += 1
+        return self._connect(key, timeout), False
+
+    def _release(
+        self, key: HostKey, connection: http.client.HTTPConnection, reusable: bool
+    ) -> None:
+        host = self._host(key)
+        with host.ready:
+            host.metrics.in_use -= 1
+            if reusable:
+                host.idle.append((connection, time.monotonic()))
+            else:
+                connection.close()
+                host.metrics.closed += 1
+            host.metrics.idle = len(host.idle)
+            host.ready.notify()
+
+    @staticmethod
+    def _watch(
+        call: ApiCall, connection: http.client.HTTPConnection
+    ) -> Optional[Callable[[], None]]:
+        """Let ``call.abort`` shut ``connection`` down while it is in use."""
+        if call.abort is None:
+            return None
+        if connection.sock is None:
+            connection.connect()  # So a cancel always has a socket to shut
+        hook = functools.partial(_shutdown, connection)
+        call.abort.on_cancel(hook)
+        return hook
+
+    @staticmethod
+    def _unwatch(call: ApiCall, hook: Optional[Callable[[], None]]) -> None:
+        if hook is not None and call.abort is not None:
+            call.abort.discard(hook)
+
+    def _open(
+        self, call: ApiCall
+    ) -> Tuple[Any, HostKey, http.client.HTTPConnection, Any]:
+        """
+        Send ``call``; returns the response with its connection checked out
+        and the cancel hook to pass to ``_unwatch`` when done.
+        """
+        key, target = host_key(call.url)
+        host = self._host(key)
+        with host.ready:
+            host.metrics.requests += 1
+        for attempt in range(2):
+            if _cancelled(call):
+                raise ProviderError(f"{call.provider} call cancelled")
+            connection, reused = self._acquire(key, call.timeout)
+            hook = None
+            try:
+                hook = self._watch(call, connection)
+                if _cancelled(call):
+                    raise ProviderError(f"{call.provider} call cancelled")
+                body = None if call.method == "GET" else call.body_chunks()
+                connection.request(call.method, target, body, call.headers)
+                response = connection.getresponse()
+                payload = response.read() if response.status >= 400 else b""
+            except _STALE_ERRORS as e:
+                self._unwatch(call, hook)
+                self._release(key, connection, False)
+                if reused and attempt == 0 and not _cancelled(call):
+                    # Server closed it while idle
+                    with host.ready:
+                        host.metrics.stale += 1
+                    continue
+                raise transport_error(call.provider, "connection", e) from None
+            except (OSError, http.client.HTTPException) as e:
+                self._unwatch(call, hook)
+                self._release(key, connection, False)
+                raise transport_error(call.provider, "connection", e) from None
+            except BaseException:
+                # Anything else (a bad header value...) must still free the slot
+                self._unwatch(call, hook)
+                self._release(key, connection, False)
+                raise
+            if response.status >= 400:
+                self._unwatch(call, hook)
+                self._release(key, connection, not response.will_close)
+                raise _error(call, response, payload)
+            return response, key, connection, hook
+        raise AssertionError("unreachable")
+
+    # -------------------------------------------------------------------------
+    # Transports
+    # -------------------------------------------------------------------------
+
+    def transport(self, call: ApiCall) -> Tuple[int, Dict[str, str], bytes]:
+        """``providers.Transport`` over pooled connections."""
+        response, key, connection, hook = self._open(call)
+        reusable = False
+        try:
+            payload = response.read()
+            reusable = not response.will_close and not _cancelled(call)
+        except (OSError, http.client.HTTPException) as e:
+            raise transport_error(call.provider, "read", e) from None
+        finally:
+            self._unwatch(call, hook)
+            self._release(key, connection, reusable)
+        return response.status, dict(response.getheaders()), payload
+
+    def stream(self, call: ApiCall) -> Iterator[bytes]:
+        """``providers.StreamTransport`` over pooled connections."""
+        response, key, connection, hook = self._open(call)
+        finished = False
+        try:
+            for line in response:
+                yield line
+            if response.length:  # Line reads end quietly at a premature EOF
+                raise http.client.IncompleteRead(b"", response.length)
+            response.read()  # Marks the response complete on the connection
+            finished = True
+        except (OSError, http.client.HTTPException) as e:
+            raise transport_error(call.provider, "stream", e) from None
+        finally:
+            # A stream abandoned midway leaves unread data: drop the connection
+            self._unwatch(call, hook)
+            reusable = finished and not response.will_close and not _cancelled(call)
+            self._release(key, connection, reusable)
+
+    # -------------------------------------------------------------------------
+    # Metrics and shutdown
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, PoolMetrics]:
+        """Metrics per ``scheme://host:port``."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {f"{s}://{h}:{p}": host.metrics for (s, h, p), host in hosts.items()}
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            hosts = list(self._hosts.values())
+        for host in hosts:
+            with host.ready:
+                for connection, _ in host.idle:
+                    connection.close()
+                    host.metrics.closed += 1
+                host.idle.clear()
+                host.metrics.idle = 0
+
+
+# =============================================================================
+# HTTP/2 POOL (optional)
+# =============================================================================
+
+
+def http2_available() -> bool:
+    return httpx is not None and importlib.util.find_spec("h2") is not None
+
+
+def _httpx_error(call: ApiCall, action: str, error: Any) -> ProviderError:
+    timed_out = isinstance(error, httpx.TimeoutException)
+    return ProviderError(
+        f"{call.provider} {action} failed: {error}",
+        kind=TIMEOUT if timed_out else CONNECTION,
+    )
+
+
+class HttpxPool:
+    """One multiplexing ``httpx.Client`` per host (HTTP/2 where supported)."""
+
+    def __init__(self, config: Optional[PoolConfig] = None):
+        if httpx is None:
+            raise ProviderError("HttpxPool needs httpx (pip install 'httpx[http2]')")
+        self.config = config or PoolConfig(http2=True)
+        self._clients: Dict[HostKey, Any] = {}
+        self._metrics: Dict[HostKey, PoolMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _client(self, key: HostKey) -> Tuple[Any, PoolMetrics]:
+        with self._lock:
+            if key not in self._clients:
+                limits = httpx.Limits(
+                    max_connections=self.config.max_per_host,
+                    max_keepalive_connections=self.config.max_per_host,
+                    keepalive_expiry=self.config.idle_timeout,
+                )
+                self._clients[key] = httpx.Client(
+                    http2=self.config.http2 and http2_available(), limits=limits
+                )
+                self._metrics[key] = PoolMetrics()
+            metrics = self._metrics[key]
+            metrics.requests += 1
+            metrics.in_use += 1
+            metrics.peak = max(metrics.peak, metrics.in_use)
+            return self._clients[key], metrics
+
+    def _done(
+        self,
+        call: ApiCall,
+        metrics: PoolMetrics,
+        response: Any,
+        hook: Optional[Callable[[], None]],
+    ) -> None:
+        """Drop the cancel hook, close ``response`` and free the in-use count."""
+        if hook is not None and call.abort is not None:
+            call.abort.discard(hook)
+        if response is not None:
+            response.close()
+        with self._lock:
+            metrics.in_use -= 1
+
+    @staticmethod
+    def _watch(call: ApiCall, response: Any) -> Optional[Callable[[], None]]:
+        """
+        Let ``call.abort`` wake a thread blocked reading an HTTP/1.1 response.
+
+        HTTP/2 responses share their connection, so shutting its socket would
+        fail every sibling request; ``stream`` checks the abort between lines
+        instead. (``response.close()`` from another thread is not safe either:
+        httpcore does not lock it against the reader.)
+        """
+        if call.abort is None or response.http_version == "HTTP/2":
+            return None
+        network = response.extensions.get("network_stream")
+        sock = network.get_extra_info("socket") if network is not None else None
+        if sock is None:
+            return None
+        hook = functools.partial(_shutdown_socket, sock)
+        call.abort.on_cancel(hook)
+        return hook
+
+    def _request(
+        self, call: ApiCall
+    ) -> Tuple[Any, PoolMetrics, Optional[Callable[[], None]]]:
+        """
+        Send ``call``; returns the streaming response, and the host metrics
+        and cancel hook to pass to ``_done``.
+        """
+        key, _ = host_key(call.url)
+        client, metrics = self._client(key)
+        connected: List[bool] = []
+
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                connected.append(True)
+
+        response = hook = None
+        try:
+            if _cancelled(call):
+                raise ProviderError(f"{call.provider} call cancelled")
+            body = None if call.method == "GET" else b"".join(call.body_chunks())
+            request = client.build_request(
+                call.method,
+                call.url,
+                headers=call.headers,
+                content=body,
+                timeout=call.timeout,
+                extensions={"trace": trace},
+            )
+            try:
+                response = client.send(request, stream=True)
+            except httpx.HTTPError as e:
+                raise _httpx_error(call, "connection", e) from None
+            with self._lock:
+                if connected:
+                    metrics.opened += 1
+                else:
+                    metrics.reused += 1
+            hook = self._watch(call, response)
+            if response.status_code >= 400:
+                payload = response.read()
+                raise ProviderError(
+                    f"{call.provider} HTTP {response.status_code}: "
+                    f"{payload[:200].decode('utf-8', 'replace')}",
+                    status=response.status_code,
+                    headers=dict(response.headers),
+                    body=payload,
+                )
+        except BaseException:
+            self._done(call, metrics, response, hook)
+            raise
+        return response, metrics, hook
+
+    def transport(self, call: ApiCall) -> Tuple[int, Dict[str, str], bytes]:
+        response, metrics, hook = self._request(call)
+        try:
+            return response.status_code, dict(response.headers), response.read()
+        except httpx.HTTPError as e:
+            raise _httpx_error(call, "read", e) from None
+        finally:
+            self._done(call, metrics, response, hook)
+
+    def stream(self, call: ApiCall) -> Iterator[bytes]:
+        response, metrics, hook = self._request(call)
+        try:
+            for line in response.iter_lines():
+                if _cancelled(call):
+                    raise ProviderError(f"{call.provider} call cancelled")
+                yield line.encode("utf-8")
+        except httpx.HTTPError as e:
+            raise _httpx_error(call, "stream", e) from None
+        finally:
+            self._done(call, metrics, response, hook)
+
+    def stats(self) -> Dict[str, PoolMetrics]:
+        with self._lock:
+            return {f"{s}://{h}:{p}": m for (s, h, p), m in self._metrics.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+def pool_for(config: PoolConfig) -> Any:
+    """``HttpxPool`` for ``http2`` configs when available, else ``HttpPool``."""
+    if config.http2 and http2_available():
+        return HttpxPool(config)
+    return HttpPool(config)
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Incremental Section Re-Evaluation
+=================================
+
+Re-review only the parts of a long markdown document that changed since the
+last review, and carry forward the findings for everything else.
+
+The document is split into sections at headings up to ``level`` (``#`` and
+``##`` by default; headings inside fenced code blocks are ignored), and each
+section is hashed. State from the previous run, kept per (evaluator,
+document) under ``.adversarial/cache/incremental/``, records the section
+hashes, the findings attributed to them and the verdict each got.
+
+On the next run:
+
+    1. Sections whose hash is not in the state are changed
+    2. Changed sections, plus ``context`` neighbouring sections on each side,
+       are sent to the evaluator as an excerpt; HTML comments mark which
+       sections are under review and which are context only
+    3. Fresh findings are attributed to the changed section whose heading
+       they mention, or to all changed sections if they mention none
+    4. Cached findings are kept while every section they belong to is
+       unchanged, and merged with the fresh ones (same title and category:
+       the higher severity wins)
+    5. The verdict is the worst over all sections' latest verdicts
+
+Nothing is sent when no section changed. The whole document is sent when
+there is no usable state (first run, edited prompt or model) or when more
+than ``full_threshold`` of the sections changed. The merged report goes to
+the evaluator's usual ``<stem><output_suffix>`` log; the raw excerpt review
+goes next to it as ``...-delta.md``.
+
+Usage:
+    from scripts.local.incremental import IncrementalEvaluator
+
+    result = IncrementalEvaluator().run_sync("claude-quick", Path("spec.md"))
+    print(result.changed, "of", len(result.sections), "sections reviewed")
+
+    python -m scripts.local.incremental claude-quick spec.md
+    python -m scripts.local.incremental claude-quick spec.md --context 2 --full
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from scripts.local.findings import Finding, parse_findings, parse_verdict, verdict_rank
+from scripts.local.fingerprint import fingerprint
+from scripts.local.runner import (
+    DEFAULT_LOG_DIR,
+    AsyncRunner,
+    Job,
+    add_cache_arguments,
+    cache_from_args,
+    write_output,
+)
+
+DEFAULT_STATE_DIR = Path(".adversarial") / "cache" / "incremental"
+DEFAULT_LEVEL = 2
+DEFAULT_CONTEXT = 1
+
+# Above this share of changed sections, review the whole document
+DEFAULT_FULL_THRESHOLD = 0.5
+
+# Bump if section splitting or the state format changes
+STATE_VERSION = 1
+
+_HEADING_RE = re.compile(r"^ {0,3}(#{1,6})(?:\s+(.*?))?\s*#*\s*$")
+_FENCE_RE = re.compile(r"^ {0,3}(```|~~~)")
+
+
+# =============================================================================
+# SECTIONS
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Section:
+    """A heading-delimited part of a document."""
+
+    index: int
+    title: str  # Heading text ("" for text before the first heading)
+    start: int  # Character offsets in the document
+    end: int
+    text: str
+    digest: str  # SHA-256 of the section text, trailing whitespace ignored
+
+
+def split_sections(text: str, level: int = DEFAULT_LEVEL) -> List[Section]:
+    """Split markdown at headings of ``level`` or shallower."""
+    cuts = [(0, "")]
+    in_fence = False
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        line_start, offset = offset, offset + len(line)
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else _HEADING_RE.match(line)
+        if match and len(match.group(1)) <= level:
+            if line_start == 0:
+                cuts[0] = (0, match.group(2) or "")
+            else:
+                cuts.append((line_start, match.group(2) or ""))
+    ends = [start for start, _ in cuts[1:]] + [len(text)]
+    sections: List[Section] = []
+    for (start, title), end in zip(cuts, ends):
+        body = text[start:end]
+        if not body.strip() and (sections or end < len(text)):
+            continue  # Blank lines before the first heading
+        normalized = "\n".join(line.rstrip() for line in body.splitlines()).strip()
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        sections.append(Section(len(sections), title, start, end, body, digest))
+    return sections
+
+
+def excerpt(
+    document: str, sections: List[Section], review: Sequence[int], shown: Sequence[int]
+) -> str:
+    """Sections ``shown``, marked as under review (``review``) or context."""
+    under_review = set(review)
+    lines = [
+        f"<!-- Excerpt of {document}: {len(under_review)} of {len(sections)} "
+        f"sections changed since the last review. Review only sections marked "
+        f"CHANGED; the others are included for context. -->",
+        "",
+    ]
+    for section in (sections[i] for i in shown):
+        if section.index in under_review:
+            lines.append(f"<!-- CHANGED: section {section.index + 1} -->")
+        else:
+            lines.append(f"<!-- CONTEXT ONLY: section {section.index + 1} -->")
+        lines.append(section.text.rstrip("\n"))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def with_context(changed: Sequence[int], count: int, context: int) -> List[int]:
+    """Indexes of changed sections widened by ``context`` on each side."""
+    wanted = set()
+    for index in changed:
+        wanted.update(range(max(0, index - context), min(count, index + context + 1)))
+    return sorted(wanted)
+
+
+# =============================================================================
+# STATE
+# =============================================================================
+
+
+@dataclass
+class TrackedFinding:
+    """A finding and the section hashes it belongs to."""
+
+    finding: Finding
+    sections: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self.finding), "sections": self.sections}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrackedFinding":
+        sections = data.pop("sections", [])
+        return cls(Finding(**data), sections)
+
+
+@dataclass
+class SectionState:
+    """What the last run knew about a document for one evaluator."""
+
+    fingerprint: str = ""
+    model: str = ""
+    verdicts: Dict[str, Optional[str]] = field(default_factory=dict)
+    findings: List[TrackedFinding] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> "SectionState":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != STATE_VERSION:
+            return cls()
+        return cls(
+            data.get("fingerprint", ""),
+            data.get("model", ""),
+            data.get("verdicts", {}),
+            [TrackedFinding.from_dict(f) for f in data.get("findings", [])],
+        )
+
+    def save(self, path: Path) -> None:
+        payload = {
+            "version": STATE_VERSION,
+            "fingerprint": self.fingerprint,
+            "model": self.model,
+            "verdicts": self.verdicts,
+            "findings": [f.to_dict() for f in self.findings],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def attribute(finding: Finding, changed: List[Section]) -> List[str]:
+    """Hashes of the changed sections a finding refers to (all if unclear)."""
+    text = f"{finding.title}\n{finding.body}".lower()
+    named = [s.digest for s in changed if s.title and s.title.lower() in text]
+    return named or [s.digest for s in changed]
+
+
+def merge(tracked: List[TrackedFinding]) -> List[TrackedFinding]:
+    """Deduplicate by (category, title); the higher severity wins."""
+    merged: Dict[tuple, TrackedFinding] = {}
+    for item in tracked:
+        key = (item.finding.category, item.finding.key)
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = TrackedFinding(item.finding, list(item.sections))
+            continue
+        existing.sections += [s for s in item.sections if s not in existing.sections]
+        if item.finding.severity_rank < existing.finding.severity_rank:
+            existing.finding = item.finding
+    order = {key: position for position, key in enumerate(merged)}
+    return sorted(
+        merged.values(),
+        key=lambda t: (
+            t.finding.severity_rank,
+            order[(t.finding.category, t.finding.key)],
+        ),
+    )
+
+
+# =============================================================================
+# EVALUATION
+# =============================================================================
+
+
+@dataclass
+class IncrementalResult:
+    """Outcome of an incremental run on one document."""
+
+    evaluator: str
+    document: Path
+    sections: List[Section]
+    changed: int  # Sections sent for review as changed
+    sent: int  # Sections sent including context (0 = nothing sent)
+    full: bool  # Whole document was reviewed
+    findings: List[TrackedFinding] = field(default_factory=list)
+    verdict: Optional[str] = None
+    error: Optional[str] = None
+    report_path: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def render(self) -> str:
+        """Merged report in the evaluators' own finding/verdict format."""
+        if self.full:
+            scope = f"Whole document reviewed ({len(self.sections)} sections)."
+        elif self.sent:
+            scope = (
+                f"{self.changed} of {len(self.sections)} sections changed and "
+                f"were re-reviewed ({self.sent} sent with context); findings "
+                f"for unchanged sections are carried forward."
+            )
+        else:
+            scope = "No sections changed; all findings carried forward."
+        lines = [
+            f"# {self.evaluator}: incremental evaluation of {self.document.name}",
+            "",
+            scope,
+            "",
+            "## Findings",
+            "",
+        ]
+        if not self.findings:
+            lines += ["No findings reported.", ""]
+        titles = {s.digest: s.title or "(preamble)" for s in self.sections}
+        for tracked in self.findings:
+            finding = tracked.finding
+            if finding.category:
+                lines.append(f"**[{finding.category}]: {finding.title}**")
+            else:
+                lines.append(f"### [{finding.severity or 'UNRATED'}]: {finding.title}")
+            where = [titles[h] for h in tracked.sections if h in titles]
+            if where:
+                lines.append(f"- **Sections**: {', '.join(where)}")
+            if finding.body:
+                lines.append(finding.body)
+            lines.append("")
+        lines += [f"**Verdict**: {self.verdict or 'INCOMPLETE'}", ""]
+        return "\n".join(lines)
+
+
+def _worst(verdicts: Sequence[Optional[str]]) -> Optional[str]:
+    """Most severe verdict; None if any section has none."""
+    worst: Optional[str] = None
+    for verdict in verdicts:
+        rank = verdict_rank(verdict)
+        if rank is None:
+            return None
+        if worst is None or rank > (verdict_rank(worst) or 0):
+            worst = verdict
+    return worst
+
+
+class IncrementalEvaluator:
+    """Section-level incremental evaluation on an ``AsyncRunner``."""
+
+    def __init__(
+        self,
+        runner: Optional[AsyncRunner] = None,
+        level: int = DEFAULT_LEVEL,
+        context: int = DEFAULT_CONTEXT,
+        full_threshold: float = DEFAULT_FULL_THRESHOLD,
+        state_dir: Path = DEFAULT_STATE_DIR,
+    ):
+        self.runner = runner or AsyncRunner()
+        self.level = level
+        self.context = context
+        self.full_threshold = full_threshold
+        self.state_dir = Path(state_dir)
+
+    def state_path(self, evaluator: str, document: Path) -> Path:
+        where = hashlib.sha256(str(document.resolve()).encode("utf-8")).hexdigest()
+        return self.state_dir / evaluator / f"{where[:16]}.json"
+
+    async def run(
+        self, evaluator: Any, document: Path, full: bool = False
+    ) -> IncrementalResult:
+        """Review the changed sections of ``document`` (all of them if ``full``)."""
+        document = Path(document)
+        text = document.read_text(encoding="utf-8")
+        sections = split_sections(text, self.level)
+        job = self.runner.job(evaluator, document)
+        state_path = self.state_path(job.evaluator, document)
+        model = job.model.litellm_id if job.model else str(job.config.get("model"))
+        evaluator_fp = fingerprint(job.config)
+
+        state = SectionState.load(state_path)
+        usable = not full and state.fingerprint == evaluator_fp and state.model == model
+        known = set(state.verdicts) if usable else set()
+        changed = [s for s in sections if s.digest not in known]
+        full = not usable or len(changed) > self.full_threshold * len(sections)
+        result = IncrementalResult(
+            evaluator=job.evaluator,
+            document=document,
+            sections=sections,
+            changed=len(changed),
+            sent=0,
+            full=full,
+        )
+
+        current = {s.digest for s in sections}
+        stale = {s.digest for s in changed}
+        kept: List[TrackedFinding] = []
+        verdicts: Dict[str, Optional[str]] = {}
+        if not full:
+            kept = [
+                t
+                for t in state.findings
+                if t.sections and all(h in current - stale for h in t.sections)
+            ]
+            verdicts = {h: v for h, v in state.verdicts.items() if h in current}
+
+        if changed:
+            content = None
+            if full:
+                changed = list(sections)
+                result.sent = len(sections)
+            else:
+                review = [s.index for s in changed]
+                shown = with_context(review, len(sections), self.context)
+                content = excerpt(document.name, sections, review, shown).encode(
+                    "utf-8"
+                )
+                result.sent = len(shown)
+            outcome = await self.runner.run_job(
+                self.runner.job(evaluator, document, self._delta_path(job), content)
+            )
+            if not outcome.ok:
+                result.error = outcome.error
+                return result
+            verdict = parse_verdict(outcome.output)
+            for section in changed:
+                verdicts[section.digest] = verdict
+            kept += [
+                TrackedFinding(f, attribute(f, changed))
+                for f in parse_findings(outcome.output)
+            ]
+
+        result.findings = merge(kept)
+        result.verdict = _worst([verdicts.get(s.digest) for s in sections])
+        SectionState(evaluator_fp, model, verdicts, result.findings).save(state_path)
+        result.report_path = job.output_path
+        write_output(job.output_path, result.render())
+        return result
+
+    @staticmethod
+    def _delta_path(job: Job) -> Path:
+        path = job.output_path
+        return path.with_name(f"{path.stem}-delta{path.suffix}")
+
+    def run_sync(
+        self, evaluator: Any, document: Path, full: bool = False
+    ) -> IncrementalResult:
+        return asyncio.run(self.run(evaluator, document, full))
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Incrementally re-evaluate changed sections of documents."""
+    parser = argparse.ArgumentParser(
+        prog="incremental", description="Section-level incremental re-evaluation"
+    )
+    parser.add_argument("evaluator", help="Evaluator name")
+    parser.add_argument("documents", nargs="+", help="Markdown documents")
+    parser.add_argument(
+        "--level",
+        type=int,
+        default=DEFAULT_LEVEL,
+        help=f"Deepest heading level that starts a section (default: {DEFAULT_LEVEL})",
+    )
+    parser.add_argument(
+        "--context",
+        type=int,
+        default=DEFAULT_CONTEXT,
+        help="Neighbouring sections sent with each changed section",
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Review whole documents, reset state"
+    )
+    parser.add_argument("--log-dir", default=str(DEFAULT_LOG_DIR))
+    add_cache_arguments(parser)
+    args = parser.parse_args(argv)
+
+    runner = AsyncRunner(log_dir=Path(args.log_dir), cache=cache_from_args(args))
+    evaluator = IncrementalEvaluator(runner, level=args.level, context=args.context)
+
+    async def run_all() -> List[IncrementalResult]:
+        return list(
+            await asyncio.gather(
+                *(
+                    evaluator.run(args.evaluator, Path(d), args.full)
+                    for d in args.documents
+                )
+            )
+        )
+
+    started = time.monotonic()
+    try:
+        results = asyncio.run(run_all())
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    for result in results:
+        if not result.ok:
+            print(f"  ❌ {result.document.name:<30} {result.error}")
+            continue
+        scope = "full" if result.full else f"{result.changed}/{len(result.sections)}"
+        print(
+            f"  ✅ {result.document.name:<30} sections {scope:<8} "
+            f"{len(result.findings):>3} findings  {result.verdict or '-'}"
+        )
+    print(f"Done in {time.monotonic() - started:.1f}s")
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Index Builder
+=============
+
+Regenerate ``evaluators/index.json`` from the evaluator directories.
+
+The ``evaluators``, ``categories`` and ``providers`` sections are rebuilt from
+the catalog, so only ``evaluator.yml`` files whose hash changed since the last
+build are re-read. Derived fields come from the definitions:
+
+    name, model      evaluator.yml
+    provider, path   directory layout (``<provider>/<name>/evaluator.yml``)
+    api_key_env      first evaluator of the provider (new providers only)
+
+Curated fields that ``evaluator.yml`` does not carry are kept from the
+existing index:
+
+    category         index record (or an optional ``category:`` key in
+                     evaluator.yml, which takes precedence)
+    description      index record (new evaluators use evaluator.yml's)
+    categories       descriptions; categories newly in use are added empty
+    version          never changed by the builder
+
+Existing evaluators keep their order; new ones are appended sorted by path.
+Output is deterministic: the same tree and index always produce the same
+bytes, and ``updated`` only moves when a section actually changes.
+
+Usage:
+    python -m scripts.local.index_builder           # rewrite if out of date
+    python -m scripts.local.index_builder --check   # exit 1 if out of date
+
+Exit codes:
+    0 - index.json is up to date (or was rewritten)
+    1 - index.json is out of date (--check) or cannot be built
+"""
+
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from scripts.local.catalog import EVALUATORS_DIR, INDEX_FILENAME, EvaluatorCatalog
+
+INDEX_SECTIONS = ("evaluators", "categories", "providers")
+RECORD_FIELDS = ("name", "provider", "path", "model", "category", "description")
+
+# Lists of strings (provider evaluator names) are written on one line
+_STRING_LIST_RE = re.compile(r'\[\n\s+"[^\]]*?"\n\s+\]')
+
+
+class IndexBuildError(ValueError):
+    """Raised when the evaluator tree cannot be turned into an index."""
+
+
+@dataclass
+class BuildResult:
+    """Outcome of one index build."""
+
+    index: Dict[str, Any]
+    changed: bool
+    parsed: int  # evaluator.yml files re-read for this build
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+
+def build_index(
+    catalog: EvaluatorCatalog, today: Optional[datetime.date] = None
+) -> BuildResult:
+    """Rebuild the index sections from ``catalog`` on top of its current index."""
+    previous = catalog.index
+    by_path = {r.get("path"): r for r in previous.get("evaluators", [])}
+
+    broken = [f"{e.path}: {e.error}" for e in catalog.entries() if e.error]
+    if broken:
+        raise IndexBuildError(
+            "Cannot index invalid evaluators:\n  " + "\n  ".join(broken)
+        )
+
+    entries = {e.path: e for e in catalog.entries()}
+    order = [p for p in by_path if p in entries]
+    order += sorted(p for p in entries if p not in by_path)
+
+    records = []
+    for path in order:
+        entry, old = entries[path], by_path.get(path, {})
+        category = entry.config.get("category") or old.get("category")
+        if not category:
+            raise IndexBuildError(
+                f"{path}: no category (add 'category:' to evaluator.yml)"
+            )
+        values = {
+            "name": entry.name,
+            "provider": entry.provider,
+            "path": path,
+            "model": entry.config.get("model", ""),
+            "category": category,
+            "description": old.get("description")
+            or entry.config.get("description", ""),
+        }
+        records.append({f: values[f] for f in RECORD_FIELDS})
+
+    categories = dict(previous.get("categories", {}))
+    for record in records:
+        categories.setdefault(record["category"], "")
+
+    old_providers = previous.get("providers", {})
+    provider_order = list(old_providers)
+    provider_order += sorted({r["provider"] for r in records} - set(old_providers))
+    providers = {}
+    for provider in provider_order:
+        names = [r["name"] for r in records if r["provider"] == provider]
+        if not names:
+            continue
+        api_key_env = old_providers.get(provider, {}).get("api_key_env") or next(
+            entries[r["path"]].config.get("api_key_env", "")
+            for r in records
+            if r["provider"] == provider
+        )
+        providers[provider] = {"api_key_env": api_key_env, "evaluators": names}
+
+    sections = {
+        "evaluators": records,
+        "categories": categories,
+        "providers": providers,
+    }
+    changed = any(previous.get(s) != sections[s] for s in INDEX_SECTIONS)
+
+    index = {k: v for k, v in previous.items() if k not in INDEX_SECTIONS}
+    if changed:
+        index["updated"] = (today or datetime.date.today()).isoformat()
+    index.update(sections)
+
+    return BuildResult(
+        index=index,
+        changed=changed,
+        parsed=catalog.parsed_count,
+        added=[p for p in order if p not in by_path],
+        removed=[p for p in by_path if p not in entries],
+    )
+
+
+def dumps(index: Dict[str, Any]) -> str:
+    """Serialise an index the way ``index.json`` is laid out in the repo."""
+    text = json.dumps(index, indent=2, ensure_ascii=False)
+    text = _STRING_LIST_RE.sub(lambda m: json.dumps(json.loads(m.group())), text)
+    return text + "\n"
+
+
+def write_index(catalog: EvaluatorCatalog, check: bool = False) -> BuildResult:
+    """
+    Build the index and write it if its bytes differ from the file on disk.
+
+    With ``check=True`` nothing is written; ``result.changed`` reports drift.
+    """
+    result = build_index(catalog)
+    path = catalog.evaluators_dir / INDEX_FILENAME
+    text = dumps(result.index)
+    current = path.read_text(encoding="utf-8") if path.exists() else None
+    result.changed = text != current
+    if result.changed and not check:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    return result
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Rebuild evaluators/index.json from the evaluator directories."""
+    parser = argparse.ArgumentParser(
+        prog="index_builder", description="Regenerate evaluators/index.json"
+    )
+    parser.add_argument(
+        "evaluators_dir",
+        nargs="?",
+        default=str(EVALUATORS_DIR),
+        help="Evaluators directory (default: library evaluators/)",
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Exit 1 if index.json is out of date"
+    )
+    args = parser.parse_args(argv)
+
+    evaluators_dir = Path(args.evaluators_dir)
+    if not evaluators_dir.is_dir():
+        print(f"❌ Evaluators directory not found: {evaluators_dir}")
+        return 1
+
+    try:
+        result = write_index(EvaluatorCatalog.load(evaluators_dir), check=args.check)
+    except IndexBuildError as e:
+        print(f"❌ {e}")
+        return 1
+
+    for path in result.added:
+        print(f"added    {path}")
+    for path in result.removed:
+        print(f"removed  {path}")
+    summary = f"{len(result.index['evaluators'])} evaluators, {result.parsed} re-read"
+    if not result.changed:
+        print(f"✅ index.json up to date ({summary})")
+        return 0
+    if args.check:
+        print(
+            "⚠️  index.json is out of date (run: python -m scripts.local.index_builder)"
+        )
+        return 1
+    print(f"✅ Wrote index.json ({summary})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Evaluator Index Queries
+=======================
+
+Inverted indexes over the evaluator catalog for routing lookups.
+
+``evaluators/index.json`` is a flat list, so every "which evaluators are
+code-review and not OpenAI?" question is a linear scan. ``EvaluatorIndex``
+builds posting sets once per process, keyed by:
+
+    category   index.json category (code-review, quick-check, ...)
+    provider   provider directory (openai, anthropic, google, mistral)
+    family     model_requirement.family (gpt, o, claude, gemini, ...)
+    tier       model_requirement.tier (flagship, mini, opus, haiku, ...)
+    keyword    lower-cased words from the description
+
+Keys are lower-cased, so lookups are case-insensitive. Every posting list is
+kept in cost-rank order: queries walk the shortest list and test membership in
+the others, so results come out cheapest first without re-sorting, and
+``cheapest()`` only skips excluded providers.
+
+Cost rank is the registry list price of one reference call
+(``REFERENCE_INPUT_TOKENS`` in, ``cost.DEFAULT_OUTPUT_TOKENS`` out) on the
+model the evaluator resolves to. Priced evaluators rank before unpriced ones,
+which fall back to the tier's ``capability_level`` (lower = cheaper); the
+evaluator name breaks ties.
+
+Usage:
+    from scripts.local.index_query import EvaluatorIndex
+
+    index = EvaluatorIndex.load()
+    index.cheapest("code-review", exclude_providers={"openai"})
+    index.query(category="arch-review", family="claude")
+
+    python -m scripts.local.index_query --category code-review \\
+        --exclude-provider openai --cheapest
+"""
+
+import argparse
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from scripts.local.catalog import EvaluatorCatalog
+from scripts.local.chunking import model_for
+from scripts.local.cost import DEFAULT_OUTPUT_TOKENS, price
+from scripts.local.registry import REGISTRY_PATH, CompiledRegistry
+
+INDEXED_FIELDS = ("category", "provider", "family", "tier", "keyword")
+
+# Capability level assumed for tiers missing from the registry
+UNKNOWN_CAPABILITY = 99
+
+# Prompt size of the call priced for cost ranking
+REFERENCE_INPUT_TOKENS = 10_000
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9.+-]*")
+_STOPWORDS = frozenset(
+    "a an and as at by for from in of on or the to using with via".split()
+)
+
+
+def keywords(text: str) -> Set[str]:
+    """Lower-cased description words, minus stopwords and trailing punctuation."""
+    words = (w.rstrip(".-") for w in _WORD_RE.findall(text.lower()))
+    return {w for w in words if w and w not in _STOPWORDS}
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class IndexedEvaluator:
+    """The routing-relevant facts about one evaluator."""
+
+    name: str
+    provider: str
+    category: str
+    family: str
+    tier: str
+    model: str
+    description: str
+    capability_level: int
+    price: Optional[float] = None  # USD per reference call, if priced
+
+    @property
+    def cost_rank(self) -> Tuple[bool, float, int, str]:
+        return (
+            self.price is None,
+            self.price or 0.0,
+            self.capability_level,
+            self.name,
+        )
+
+
+class EvaluatorIndex:
+    """Inverted indexes over a set of evaluators."""
+
+    def __init__(self, evaluators: Iterable[IndexedEvaluator]):
+        self.evaluators: Dict[str, IndexedEvaluator] = {e.name: e for e in evaluators}
+        self._ranked: Tuple[IndexedEvaluator, ...] = tuple(
+            sorted(self.evaluators.values(), key=lambda e: e.cost_rank)
+        )
+        # Filled in cost order, so every posting list stays sorted
+        ranked: Dict[str, Dict[str, List[IndexedEvaluator]]] = {
+            f: defaultdict(list) for f in INDEXED_FIELDS
+        }
+        for e in self._ranked:
+            ranked["category"][e.category.lower()].append(e)
+            ranked["provider"][e.provider.lower()].append(e)
+            ranked["family"][e.family.lower()].append(e)
+            ranked["tier"][e.tier.lower()].append(e)
+            for word in keywords(e.description):
+                ranked["keyword"][word].append(e)
+        self._by_cost: Dict[str, Dict[str, Tuple[IndexedEvaluator, ...]]] = {
+            f: {k: tuple(v) for k, v in values.items()} for f, values in ranked.items()
+        }
+        self._postings: Dict[str, Dict[str, FrozenSet[str]]] = {
+            f: {k: frozenset(e.name for e in v) for k, v in values.items()}
+            for f, values in self._by_cost.items()
+        }
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_sources(
+        cls,
+        catalog: EvaluatorCatalog,
+        registry: CompiledRegistry,
+    ) -> "EvaluatorIndex":
+        levels = registry.capability_levels()
+        evaluators = []
+        for entry in catalog.entries():
+            record = catalog.index_record(entry.name) or {}
+            requirement = entry.config.get("model_requirement") or {}
+            family = str(requirement.get("family", ""))
+            tier = str(requirement.get("tier", ""))
+            evaluators.append(
+                IndexedEvaluator(
+                    name=entry.name,
+                    provider=record.get("provider", entry.provider),
+                    category=record.get("category", ""),
+                    family=family,
+                    tier=tier,
+                    model=str(entry.config.get("model", "")),
+                    description=record.get(
+                        "description", entry.config.get("description", "")
+                    ),
+                    capability_level=levels.get((family, tier), UNKNOWN_CAPABILITY),
+                    price=price(
+                        model_for(entry.config, registry),
+                        REFERENCE_INPUT_TOKENS,
+                        DEFAULT_OUTPUT_TOKENS,
+                    ),
+                )
+            )
+        return cls(evaluators)
+
+    @classmethod
+    def load(
+        cls,
+        catalog: Optional[EvaluatorCatalog] = None,
+        registry_path: Path = REGISTRY_PATH,
+    ) -> "EvaluatorIndex":
+        """Build from the catalog snapshot and the compiled provider registry."""
+        catalog = catalog or EvaluatorCatalog.load()
+        return cls.from_sources(catalog, CompiledRegistry.load(registry_path))
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def values(self, field: str) -> List[str]:
+        """All distinct values indexed for a field."""
+        return sorted(self._postings[field])
+
+    def postings(self, field: str, value: str) -> FrozenSet[str]:
+        return self._postings[field].get(value.lower(), frozenset())
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        provider: Optional[str] = None,
+        family: Optional[str] = None,
+        tier: Optional[str] = None,
+        keyword: Optional[str] = None,
+        exclude_providers: Iterable[str] = (),
+    ) -> List[IndexedEvaluator]:
+        """
+        Evaluators matching every given filter, cheapest first.
+
+        Keywords may contain several words; all must match.
+        """
+        filters = [
+            (f, v)
+            for f, v in (
+                ("category", category),
+                ("provider", provider),
+                ("family", family),
+                ("tier", tier),
+            )
+            if v
+        ]
+        filters += [("keyword", w) for w in keywords(keyword or "")]
+
+        if filters:
+            filters.sort(key=lambda fv: len(self.postings(*fv)))
+            field, value = filters[0]
+            candidates = self._by_cost[field].get(value.lower(), ())
+            required = [self.postings(f, v) for f, v in filters[1:]]
+        else:
+            candidates, required = self._ranked, []
+        excluded = {p.lower() for p in exclude_providers}
+        return [
+            e
+            for e in candidates
+            if e.provider.lower() not in excluded
+            and all(e.name in names for names in required)
+        ]
+
+    def cheapest(
+        self, category: str, exclude_providers: Iterable[str] = ()
+    ) -> Optional[IndexedEvaluator]:
+        """Lowest-cost evaluator in a category, skipping excluded providers."""
+        excluded = {p.lower() for p in exclude_providers}
+        for evaluator in self._by_cost["category"].get(category.lower(), ()):
+            if evaluator.provider.lower() not in excluded:
+                return evaluator
+        return None
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Query evaluators by category, provider, family, tier and keyword."""
+    parser = argparse.ArgumentParser(
+        prog="index_query", description="Query the evaluator index"
+    )
+    for field in ("category", "provider", "family", "tier", "keyword"):
+        parser.add_argument(f"--{field}")
+    parser.add_argument(
+        "--exclude-provider", action="append", default=[], dest="exclude"
+    )
+    parser.add_argument(
+        "--cheapest", action="store_true", help="Only print the cheapest match"
+    )
+    args = parser.parse_args(argv)
+
+    index = EvaluatorIndex.load()
+    results = index.query(
+        category=args.category,
+        provider=args.provider,
+        family=args.family,
+        tier=args.tier,
+        keyword=args.keyword,
+        exclude_providers=args.exclude,
+    )
+    if args.cheapest:
+        results = results[:1]
+    if not results:
+        print("❌ No matching evaluators")
+        return 1
+    for e in results:
+        print(f"{e.name:24} {e.provider:10} {e.category:20} {e.family}/{e.tier}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
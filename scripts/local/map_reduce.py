@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Map-Reduce Evaluation
+=====================
+
+Evaluate documents larger than an evaluator's context window in two steps:
+
+    map     Each chunk from ``chunking.plan_for_evaluator`` is evaluated
+            concurrently, as if it were the whole document.
+    reduce  Per-chunk findings are merged into one report with one verdict.
+            The reduce is local and deterministic (no extra model call):
+
+              - findings with the same normalised title (and category) are
+                merged, keeping the highest severity and the chunks they
+                came from -- overlap between chunks produces such repeats
+              - findings are ordered by severity, then by first appearance
+              - the overall verdict is the most severe chunk verdict
+                (``findings.VERDICT_RANKS``); a missing or failed chunk can
+                never produce a passing verdict
+
+The report reuses the evaluator's own formats (``### [HIGH]: Title``,
+``**Verdict**: VALUE``) so anything that reads a single-pass log can read it.
+
+Usage:
+    from scripts.local.map_reduce import cli_evaluator, map_reduce
+
+    result = map_reduce(config, text, cli_evaluator(evaluator_yml))
+    print(result.verdict)
+    Path("review.md").write_text(result.render())
+
+    python -m scripts.local.map_reduce arch-review big-design.md
+    python -m scripts.local.map_reduce claude-adversarial spec.md --workers 8
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from scripts.local.chunking import (
+    DEFAULT_OUTPUT_RESERVE,
+    Chunk,
+    ChunkingError,
+    ChunkPlan,
+    plan_for_evaluator,
+)
+from scripts.local.findings import (
+    SEVERITIES,
+    Finding,
+    parse_findings,
+    parse_verdict,
+    verdict_rank,
+)
+from scripts.local.registry import CompiledRegistry
+
+ChunkEvaluator = Callable[[Chunk], str]
+
+DEFAULT_WORKERS = 4
+DEFAULT_LOG_DIR = Path(".adversarial") / "logs"
+
+# Seconds per chunk when the evaluator does not set ``timeout``
+DEFAULT_TIMEOUT = 180
+
+
+# =============================================================================
+# DATA
+# =============================================================================
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of evaluating one chunk."""
+
+    chunk: Chunk
+    output: str = ""
+    error: Optional[str] = None
+    verdict: Optional[str] = None
+    findings: List[Finding] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class MergedFinding:
+    """A finding after merging repeats across chunks."""
+
+    finding: Finding
+    chunks: List[int]  # Zero-based chunk indexes, ascending
+
+
+@dataclass
+class MapReduceResult:
+    """Merged outcome of a map-reduce evaluation."""
+
+    evaluator: str
+    plan: ChunkPlan
+    chunks: List[ChunkResult]
+    findings: List[MergedFinding]
+    verdict: Optional[str]
+
+    @property
+    def complete(self) -> bool:
+        """True if every chunk ran and produced a verdict."""
+        return all(r.ok and r.verdict for r in self.chunks)
+
+    def render(self) -> str:
+        """Markdown report in the evaluators' own finding/verdict formats."""
+        lines = [
+            f"# {self.evaluator}: map-reduce evaluation",
+            "",
+            f"Document evaluated in {len(self.chunks)} chunks "
+            f"({self.plan.document_tokens} tokens, budget {self.plan.budget} "
+            f"per chunk).",
+            "",
+            "## Findings",
+            "",
+        ]
+        if not self.findings:
+            lines += ["No findings reported.", ""]
+        for merged in self.findings:
+            finding = merged.finding
+            parts = ", ".join(str(i + 1) for i in merged.chunks)
+            if finding.category:
+                lines.append(f"**[{finding.category}]: {finding.title}**")
+            else:
+                lines.append(f"### [{finding.severity or 'UNRATED'}]: {finding.title}")
+            lines.append(f"- **Chunks**: {parts}")
+            if finding.body:
+                lines.append(finding.body)
+            lines.append("")
+
+        lines += ["## Chunks", "", "| Chunk | Verdict | Findings |", "|---|---|---|"]
+        for result in self.chunks:
+            status = result.verdict or ("ERROR" if result.error else "UNKNOWN")
+            lines.append(
+                f"| {result.chunk.index + 1} | {status} | {len(result.findings)} |"
+            )
+        errors = [r for r in self.chunks if r.error]
+        if errors:
+            lines += ["", "### Errors", ""]
+            lines += [f"- Chunk {r.chunk.index + 1}: {r.error}" for r in errors]
+        lines += ["", f"**Verdict**: {self.verdict or 'INCOMPLETE'}", ""]
+        return "\n".join(lines)
+
+
+# =============================================================================
+# REDUCE
+# =============================================================================
+
+
+def merge_findings(results: List[ChunkResult]) -> List[MergedFinding]:
+    """Merge repeated findings and order by severity, then first appearance."""
+    merged: Dict[Tuple[Optional[str], str], MergedFinding] = {}
+    for result in sorted(results, key=lambda r: r.chunk.index):
+        for finding in result.findings:
+            key = (finding.category, finding.key)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = MergedFinding(finding, [result.chunk.index])
+                continue
+            if result.chunk.index not in existing.chunks:
+                existing.chunks.append(result.chunk.index)
+            if finding.severity_rank < existing.finding.severity_rank:
+                existing.finding = finding
+    order = {key: position for position, key in enumerate(merged)}
+    return sorted(
+        merged.values(),
+        key=lambda m: (
+            m.finding.severity_rank,
+            order[(m.finding.category, m.finding.key)],
+        ),
+    )
+
+
+def reduce_verdict(results: List[ChunkResult]) -> Optional[str]:
+    """
+    Most severe chunk verdict (earliest chunk wins ties).
+
+    Returns None when a chunk failed or gave no verdict and the others all
+    pass, since the missing part cannot be assumed clean.
+    """
+    worst: Optional[str] = None
+    missing = False
+    for result in sorted(results, key=lambda r: r.chunk.index):
+        rank = verdict_rank(result.verdict)
+        if rank is None:
+            missing = True
+        elif worst is None or rank > (verdict_rank(worst) or 0):
+            worst = result.verdict
+    if missing and (worst is None or verdict_rank(worst) == 0):
+        return None
+    return worst
+
+
+# =============================================================================
+# MAP
+# =============================================================================
+
+
+def _evaluate_chunk(evaluate: ChunkEvaluator, chunk: Chunk) -> ChunkResult:
+    try:
+        output = evaluate(chunk)
+    except Exception as e:  # One failed chunk must not lose the others
+        return ChunkResult(chunk, error=f"{type(e).__name__}: {e}")
+    return ChunkResult(
+        chunk,
+        output=output,
+        verdict=parse_verdict(output),
+        findings=parse_findings(output),
+    )
+
+
+def map_reduce(
+    config: Mapping[str, Any],
+    text: str,
+    evaluate: ChunkEvaluator,
+    registry: Optional[CompiledRegistry] = None,
+    max_workers: int = DEFAULT_WORKERS,
+    output_reserve: int = DEFAULT_OUTPUT_RESERVE,
+    overlap: Optional[int] = None,
+) -> MapReduceResult:
+    """
+    Chunk ``text`` for the evaluator, evaluate chunks concurrently and merge.
+
+    Args:
+        config: Evaluator definition (``entry.full_config()``)
+        text: Document text
+        evaluate: Runs the evaluator on one chunk and returns its output
+        registry: Compiled registry for the context window
+        max_workers: Chunks evaluated at once
+        output_reserve: Tokens kept free for each chunk's response
+        overlap: Tokens repeated between chunks (default: chunking's)
+
+    Raises:
+        ChunkingError: If the evaluator's model leaves no room for the document
+    """
+    plan = plan_for_evaluator(config, text, registry, output_reserve, overlap)
+    workers = max(1, min(max_workers, len(plan.chunks)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so the reduce input is stable
+        results = list(
+            pool.map(lambda chunk: _evaluate_chunk(evaluate, chunk), plan.chunks)
+        )
+    return MapReduceResult(
+        evaluator=str(config.get("name", "")),
+        plan=plan,
+        chunks=results,
+        findings=merge_findings(results),
+        verdict=reduce_verdict(results),
+    )
+
+
+def cli_evaluator(
+    evaluator_path: Path,
+    timeout: Optional[int] = None,
+    stem: str = "chunk",
+) -> ChunkEvaluator:
+    """
+    Chunk evaluator that shells out to ``adversarial evaluate``.
+
+    Each chunk is written to a temporary ``<stem>.part-NN.md`` file; the
+    evaluator's ``timeout`` applies per chunk.
+    """
+
+    def evaluate(chunk: Chunk) -> str:
+        with tempfile.TemporaryDirectory(prefix="map-reduce-") as tmp:
+            part = Path(tmp) / f"{stem}.part-{chunk.index + 1:02d}.md"
+            part.write_text(chunk.text, encoding="utf-8")
+            result = subprocess.run(
+                ["adversarial", "evaluate", str(evaluator_path), str(part)],
+                capture_output=True,
+                text=True,
+                timeout=timeout or DEFAULT_TIMEOUT,
+            )
+        if result.returncode != 0:
+            raise RuntimeError(
+                result.stderr.strip() or f"exit status {result.returncode}"
+            )
+        return result.stdout
+
+    return evaluate
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run an evaluator over a large document in map-reduce mode."""
+    from scripts.local.catalog import EvaluatorCatalog
+
+    parser = argparse.ArgumentParser(
+        prog="map_reduce", description="Chunked (map-reduce) evaluation"
+    )
+    parser.add_argument("evaluator", help="Evaluator name or provider/name")
+    parser.add_argument("document", help="Document to evaluate")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Chunks evaluated concurrently",
+    )
+    parser.add_argument("--overlap", type=int, help="Overlap tokens per chunk")
+    parser.add_argument(
+        "--output-reserve",
+        type=int,
+        default=DEFAULT_OUTPUT_RESERVE,
+        help="Tokens reserved for each response",
+    )
+    parser.add_argument(
+        "--log-dir",
+        default=str(DEFAULT_LOG_DIR),
+        help="Where the merged report is written",
+    )
+    args = parser.parse_args(argv)
+
+    catalog = EvaluatorCatalog.load()
+    entry = catalog.get(args.evaluator)
+    if entry is None:
+        print(f"❌ Unknown evaluator: {args.evaluator}")
+        return 1
+    config = entry.full_config()
+    document = Path(args.document)
+    text = document.read_text(encoding="utf-8")
+    evaluate = cli_evaluator(
+        catalog.evaluators_dir / entry.path, config.get("timeout"), document.stem
+    )
+    try:
+        result = map_reduce(
+            config,
+            text,
+            evaluate,
+            max_workers=args.workers,
+            output_reserve=args.output_reserve,
+            overlap=args.overlap,
+        )
+    except ChunkingError as e:
+        print(f"❌ {e}")
+        return 1
+
+    suffix = config.get("output_suffix") or f"-{entry.name}.md"
+    log_dir = Path(args.log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    target = log_dir / f"{document.stem}{suffix}"
+    target.write_text(result.render(), encoding="utf-8")
+
+    for chunk in result.chunks:
+        mark = "✅" if chunk.ok else "❌"
+        detail = chunk.verdict or chunk.error or "no verdict"
+        print(f"  {mark} part {chunk.chunk.index + 1:02d}: {detail}")
+    severities = [m.finding.severity for m in result.findings]
+    counts = ", ".join(
+        f"{severities.count(s)} {s}" for s in SEVERITIES if s in severities
+    )
+    print(f"{entry.name}: {len(result.findings)} findings ({counts or 'none'})")
+    print(f"Verdict: {result.verdict or 'INCOMPLETE'}")
+    print(f"✅ Report written to {target}")
+    return 0 if result.complete else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
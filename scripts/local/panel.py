@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Panel Composition Executor
+==========================
+
+Run every member of a panel composition (``evaluators:`` list, e.g.
+``high-stakes-panel``, ``adversarial-trio``) concurrently and synthesize the
+results, instead of running the members one after another.
+
+All members of all documents are jobs on one ``AsyncRunner``, so they share
+its per-provider semaphores, rate limiters and HTTP transport. Panel wall
+time is the slowest member's latency rather than the sum of all three.
+
+Member outputs are collected in memory (and still written to their usual
+``<stem><output_suffix>`` logs). For each document the executor then builds
+the synthesis input - the composition's ``synthesis_prompt`` (or
+``synthesis_approach``) followed by every member's output - and writes it to
+``<log_dir>/<stem>-<composition>.md``. With a synthesizer evaluator, that
+input is sent to it directly from memory and the result is written to
+``<log_dir>/<stem>-<composition>-synthesis.md``.
+
+Staged compositions (``stages:``, e.g. ``quick-then-deep``) have
+conditional steps and are not panels; they are rejected here.
+
+Usage:
+    from scripts.local.panel import PanelExecutor
+
+    results = PanelExecutor(synthesizer="gpt5-synthesis").run_sync(
+        "high-stakes-panel", [Path("doc.md")]
+    )
+
+    python -m scripts.local.panel high-stakes-panel doc.md
+    python -m scripts.local.panel adversarial-trio docs/*.md -s gpt5-synthesis
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from scripts.local.compositions import (
+    Composition,
+    CompositionError,
+    Stage,
+    load_composition,
+)
+from scripts.local.runner import (
+    DEFAULT_LOG_DIR,
+    AsyncRunner,
+    JobResult,
+    add_cache_arguments,
+    cache_from_args,
+    parse_concurrency,
+    write_output,
+)
+
+DEFAULT_SYNTHESIS_PROMPT = (
+    "Review the evaluation outputs below and synthesize them: consensus "
+    "issues (found by 2+ evaluators), unique findings, contradictions, and "
+    "recommended actions in priority order."
+)
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+
+@dataclass
+class PanelResult:
+    """Outputs of one panel run on one document."""
+
+    composition: Composition
+    document: Path
+    members: List[Tuple[Stage, JobResult]]
+    report_path: Path
+    synthesis: Optional[JobResult] = None
+
+    @property
+    def outputs(self) -> Dict[str, str]:
+        """Member output text by evaluator (successful members only)."""
+        return {stage.evaluator: r.output for stage, r in self.members if r.ok}
+
+    @property
+    def complete(self) -> bool:
+        return all(r.ok for _, r in self.members)
+
+    @property
+    def duration(self) -> float:
+        """Panel wall time: the slowest member (plus synthesis)."""
+        slowest = max((r.duration for _, r in self.members), default=0.0)
+        return slowest + (self.synthesis.duration if self.synthesis else 0.0)
+
+
+def synthesis_input(
+    composition: Composition, document: Path, members: List[Tuple[Stage, JobResult]]
+) -> str:
+    """Synthesis instructions followed by every member's output."""
+    config = composition.config
+    instructions = (
+        config.get("synthesis_prompt")
+        or config.get("synthesis_approach")
+        or DEFAULT_SYNTHESIS_PROMPT
+    )
+    lines = [
+        f"# {composition.name}: panel review of {document.name}",
+        "",
+        instructions.strip(),
+        "",
+    ]
+    for stage, result in members:
+        lines += [f"## Evaluation: {stage.evaluator}", ""]
+        if result.ok:
+            lines += [result.output.strip(), ""]
+        else:
+            lines += [f"_No output: {result.error}_", ""]
+    return "\n".join(lines)
+
+
+# =============================================================================
+# EXECUTOR
+# =============================================================================
+
+
+class PanelExecutor:
+    """Runs panel compositions on an ``AsyncRunner``."""
+
+    def __init__(
+        self, runner: Optional[AsyncRunner] = None, synthesizer: Optional[str] = None
+    ):
+        self.runner = runner or AsyncRunner()
+        self.synthesizer = synthesizer
+
+    async def run(
+        self, composition: Union[str, Path, Composition], documents: Sequence[Path]
+    ) -> List[PanelResult]:
+        """Run every member on every document at once, then synthesize."""
+        if not isinstance(composition, Composition):
+            composition = load_composition(composition)
+        if any(stage.conditional or stage.gate for stage in composition.stages):
+            raise CompositionError(
+                f"{composition.name} is a staged composition, not a panel"
+            )
+        documents = [Path(d) for d in documents]
+        stages = composition.stages
+        jobs = self.runner.jobs([s.evaluator for s in stages], documents)
+        # jobs() is evaluator-major: (stage i, document j) is at i * n + j
+        outcomes = await self.runner.run_jobs(jobs)
+
+        results = []
+        synthesis_jobs = []
+        for j, document in enumerate(documents):
+            members = [
+                (stage, outcomes[i * len(documents) + j])
+                for i, stage in enumerate(stages)
+            ]
+            content = synthesis_input(composition, document, members)
+            report = self.runner.log_dir / f"{document.stem}-{composition.name}.md"
+            write_output(report, content)
+            results.append(PanelResult(composition, document, members, report))
+            if self.synthesizer:
+                output = self.runner.log_dir / (
+                    f"{document.stem}-{composition.name}-synthesis.md"
+                )
+                synthesis_jobs.append(
+                    self.runner.job(
+                        self.synthesizer, document, output, content.encode("utf-8")
+                    )
+                )
+
+        if synthesis_jobs:
+            for result, synthesis in zip(
+                results, await self.runner.run_jobs(synthesis_jobs)
+            ):
+                result.synthesis = synthesis
+        return results
+
+    def run_sync(
+        self, composition: Union[str, Path, Composition], documents: Sequence[Path]
+    ) -> List[PanelResult]:
+        return asyncio.run(self.run(composition, documents))
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a panel composition on documents."""
+    parser = argparse.ArgumentParser(
+        prog="panel", description="Run panel compositions concurrently"
+    )
+    parser.add_argument("composition", help="Composition name or file")
+    parser.add_argument("documents", nargs="+", help="Documents to review")
+    parser.add_argument(
+        "-s",
+        "--synthesizer",
+        help="Evaluator that synthesizes the member outputs (e.g. gpt5-synthesis)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        action="append",
+        default=[],
+        help="Per-provider limit, e.g. anthropic=2 (repeatable)",
+    )
+    parser.add_argument("--log-dir", default=str(DEFAULT_LOG_DIR))
+    add_cache_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        runner = AsyncRunner(
+            concurrency=parse_concurrency(args.concurrency),
+            log_dir=Path(args.log_dir),
+            cache=cache_from_args(args),
+        )
+        executor = PanelExecutor(runner, synthesizer=args.synthesizer)
+        started = time.monotonic()
+        results = executor.run_sync(args.composition, args.documents)
+    except (argparse.ArgumentTypeError, CompositionError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    failed = False
+    for result in results:
+        print(f"📋 {result.document.name}")
+        for stage, member in result.members:
+            if member.ok:
+                print(
+                    f"  {'📦' if member.cached else '✅'} {stage.evaluator:<28} "
+                    f"{member.verdict or '-':<18} {member.duration:6.1f}s"
+                )
+            else:
+                failed = True
+                print(f"  ❌ {stage.evaluator:<28} {member.error}")
+        if result.synthesis is not None:
+            status = "✅" if result.synthesis.ok else "❌"
+            failed = failed or not result.synthesis.ok
+            print(f"  {status} synthesis -> {result.synthesis.job.output_path}")
+        print(f"  📄 {result.report_path}")
+    print(f"Panel finished in {time.monotonic() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
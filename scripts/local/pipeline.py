@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Staged Composition Executor
+===========================
+
+Run staged compositions (``stages:``, e.g. ``quick-then-deep``) with their
+gates evaluated natively, instead of grepping logs between manual steps.
+
+Stages run in order on an ``AsyncRunner``. After a stage with a compiled
+gate (``gates.py``), the gate is checked against the stage output; if it
+stops, the remaining stages are skipped. A stage that fails leaves its gate
+undecided, so the pipeline goes on to the next stage rather than assuming
+the document is clean.
+
+Speculative mode starts the stage after a gate at the same time as the gated
+stage, and cancels it if the gate stops. When the gate continues, the next
+stage is already under way, so "issues found" latency drops from the sum of
+both stages to roughly the longer one. The cost is the cancelled call: its
+request has already been sent, and the provider may bill the tokens it
+processed. Cancelling reaches the transport: ``thread_backend`` aborts the
+call, the pooled connection is shut down and dropped, and the job's
+provider slot is only released once the worker thread has let go.
+
+Documents run concurrently; each runs its own pipeline. Speculation can be
+enabled per run (``--speculative``) or per composition (``speculative:
+true`` in the composition file).
+
+A gated stage with ``fail_fast: SEVERITY`` in its gate (or every gated stage
+with ``--fail-fast SEVERITY``) runs in the runner's gate mode: it stops at
+the first finding that severe and its gate sees the partial output with a
+FAIL verdict.
+
+Usage:
+    from scripts.local.pipeline import PipelineExecutor
+
+    results = PipelineExecutor(speculative=True).run_sync(
+        "quick-then-deep", [Path("doc.md")]
+    )
+
+    python -m scripts.local.pipeline quick-then-deep doc.md --speculative
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+from scripts.local.compositions import (
+    Composition,
+    CompositionError,
+    Stage,
+    load_composition,
+)
+from scripts.local.runner import (
+    DEFAULT_LOG_DIR,
+    AsyncRunner,
+    JobResult,
+    add_cache_arguments,
+    cache_from_args,
+    parse_concurrency,
+    parse_severity,
+)
+
+# StageResult.status values
+RAN = "ran"
+SKIPPED = "skipped"  # A gate stopped the pipeline first
+CANCELLED = "cancelled"  # Started speculatively, then a gate stopped it
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+
+@dataclass
+class StageResult:
+    """What happened to one stage for one document."""
+
+    stage: Stage
+    status: str
+    result: Optional[JobResult] = None
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a staged composition on one document."""
+
+    composition: Composition
+    document: Path
+    stages: List[StageResult] = field(default_factory=list)
+    stopped_at: Optional[str] = None  # Stage whose gate stopped the pipeline
+    duration: float = 0.0
+
+    @property
+    def ran(self) -> List[StageResult]:
+        return [s for s in self.stages if s.status == RAN]
+
+    @property
+    def ok(self) -> bool:
+        return all(s.result.ok for s in self.ran if s.result)
+
+    @property
+    def failed(self) -> bool:
+        """A stage errored or was stopped by a blocking finding (FAIL)."""
+        return any(s.result.failed for s in self.ran if s.result)
+
+    @property
+    def verdict(self) -> Optional[str]:
+        """Verdict of the last stage that ran."""
+        for stage in reversed(self.ran):
+            if stage.result and stage.result.verdict:
+                return stage.result.verdict
+        return None
+
+
+# =============================================================================
+# EXECUTOR
+# =============================================================================
+
+
+class PipelineExecutor:
+    """Runs staged compositions with executable gates."""
+
+    def __init__(
+        self,
+        runner: Optional[AsyncRunner] = None,
+        speculative: Optional[bool] = None,
+        fail_fast: Optional[str] = None,
+    ):
+        self.runner = runner or AsyncRunner()
+        self.speculative = speculative  # None = composition's own setting
+        self.fail_fast = fail_fast  # Default for gates without fail_fast
+
+    def fail_at(self, stage: Stage) -> Optional[str]:
+        """Gate-mode severity for a stage (gated stages only)."""
+        if stage.rule is None:
+            return None
+        return stage.rule.fail_fast or self.fail_fast
+
+    @staticmethod
+    def check(composition: Composition) -> None:
+        """
+        Reject compositions the executor cannot run faithfully.
+
+        Raises:
+            CompositionError: If a stage gate is free text
+        """
+        for stage in composition.stages:
+            if stage.gate is not None and stage.rule is None:
+                raise CompositionError(
+                    f"{composition.name}: stage '{stage.name}' has a free-text "
+                    f"gate; use stop_if / continue_if to make it executable"
+                )
+
+    async def run_document(
+        self, composition: Composition, document: Path, speculative: bool
+    ) -> PipelineResult:
+        """Run the stages on one document, honouring gates."""
+        started = time.monotonic()
+        result = PipelineResult(composition, Path(document))
+        stages = composition.stages
+
+        def start(index: int) -> "asyncio.Task[JobResult]":
+            stage = stages[index]
+            job = self.runner.job(
+                stage.evaluator, document, fail_at=self.fail_at(stage)
+            )
+            return asyncio.ensure_future(self.runner.run_job(job))
+
+        ahead: Optional["asyncio.Task[JobResult]"] = None
+        for index, stage in enumerate(stages):
+            task = ahead or start(index)
+            ahead = None
+            has_next = index + 1 < len(stages)
+            if speculative and stage.rule is not None and has_next:
+                ahead = start(index + 1)
+            outcome = await task
+            result.stages.append(StageResult(stage, RAN, outcome))
+            if stage.rule is None or not outcome.ok:
+                continue
+            if stage.rule.stops(outcome.output):
+                result.stopped_at = stage.name
+                if ahead is not None:
+                    ahead.cancel()
+                    await asyncio.gather(ahead, return_exceptions=True)
+                    result.stages.append(StageResult(stages[index + 1], CANCELLED))
+                done = len(result.stages)
+                result.stages += [StageResult(s, SKIPPED) for s in stages[done:]]
+                break
+        result.duration = time.monotonic() - started
+        return result
+
+    async def run(
+        self, composition: Union[str, Path, Composition], documents: Sequence[Path]
+    ) -> List[PipelineResult]:
+        """Run the composition on every document concurrently."""
+        if not isinstance(composition, Composition):
+            composition = load_composition(composition)
+        self.check(composition)
+        speculative = self.speculative
+        if speculative is None:
+            speculative = bool(composition.config.get("speculative"))
+        return list(
+            await asyncio.gather(
+                *(
+                    self.run_document(composition, Path(d), speculative)
+                    for d in documents
+                )
+            )
+        )
+
+    def run_sync(
+        self, composition: Union[str, Path, Composition], documents: Sequence[Path]
+    ) -> List[PipelineResult]:
+        return asyncio.run(self.run(composition, documents))
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a staged composition on documents."""
+    parser = argparse.ArgumentParser(
+        prog="pipeline", description="Run staged compositions with gates"
+    )
+    parser.add_argument("composition", help="Composition name or file")
+    parser.add_argument("documents", nargs="+", help="Documents to review")
+    parser.add_argument(
+        "--speculative",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Start the stage after each gate early; cancel it if the gate stops",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        metavar="SEVERITY",
+        type=parse_severity,
+        help="Stop gated stages at the first finding this severe or worse",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        action="append",
+        default=[],
+        help="Per-provider limit, e.g. openai=4 (repeatable)",
+    )
+    parser.add_argument("--log-dir", default=str(DEFAULT_LOG_DIR))
+    add_cache_arguments(parser)
+    args = parser.parse_args(argv)
+
+    icons = {RAN: "✅", SKIPPED: "⏭️ ", CANCELLED: "🚫"}
+    try:
+        runner = AsyncRunner(
+            concurrency=parse_concurrency(args.concurrency),
+            log_dir=Path(args.log_dir),
+            cache=cache_from_args(args),
+        )
+        executor = PipelineExecutor(
+            runner, speculative=args.speculative, fail_fast=args.fail_fast
+        )
+        results = executor.run_sync(args.composition, args.documents)
+    except (argparse.ArgumentTypeError, CompositionError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    for result in results:
+        print(f"📋 {result.document.name} ({result.duration:.1f}s)")
+        for stage in result.stages:
+            outcome = stage.result
+            if outcome is not None and not outcome.ok:
+                print(f"  ❌ {stage.stage.name:<16} {outcome.error}")
+                continue
+            detail = (outcome.verdict or "-") if outcome else ""
+            icon = "📦" if outcome and outcome.cached else icons[stage.status]
+            if outcome is not None and outcome.stopped_by is not None:
+                finding = outcome.stopped_by
+                icon = "⛔"
+                detail += f" (stopped at [{finding.severity}] {finding.title})"
+            print(f"  {icon} {stage.stage.name:<16} {detail}")
+        if result.stopped_at:
+            print(f"  🛑 Stopped by gate after {result.stopped_at}")
+    return 1 if any(r.failed for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
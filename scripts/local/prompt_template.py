@@ -0,0 +1,237 @@
+"""
+Prompt Templates
+================
+
+Compile evaluator prompts into static segments and content slots.
+
+Every library prompt places ``{content}`` in the middle, with the long analysis
+framework *after* the reviewed text. Providers can only reuse a cached prompt
+prefix when the bytes before the first dynamic value are identical across
+requests, so as written only the short preamble is cacheable.
+
+``compile_prompt`` splits a template once into ``Segment`` objects using
+``str.format`` rules (``{{``/``}}`` escapes, ``{content}`` slot). Two layouts
+are supported:
+
+    as-written    Segments in template order (default; byte-identical to
+                  ``prompt.format(content=...)``)
+    static-first  Opt-in. All static text is moved ahead of the content slot,
+                  followed by a short bridge heading, so the whole instruction
+                  block becomes one cacheable prefix and only the document
+                  varies per request.
+
+The compiled form exposes ``cache_breakpoints`` (character offsets where the
+static prefix ends), ``blocks(content)`` and ``split_prefix()``.
+``providers.build_call`` uses the split to send the prefix to Anthropic as its
+own content block marked with ``cache_control``; OpenAI and Gemini cache
+matching prefixes implicitly.
+
+Usage:
+    from scripts.local.prompt_template import compile_evaluator
+
+    compiled = compile_evaluator(entry.full_config(), layout="static-first")
+    for block in compiled.blocks(document_text):
+        send(block.text, cache=block.cache_breakpoint)
+"""
+
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional, Tuple
+
+CONTENT_SLOT = "content"
+
+LAYOUT_AS_WRITTEN = "as-written"
+LAYOUT_STATIC_FIRST = "static-first"
+LAYOUTS = (LAYOUT_AS_WRITTEN, LAYOUT_STATIC_FIRST)
+
+# Evaluator YAML key that opts an evaluator into a layout
+LAYOUT_CONFIG_KEY = "prompt_layout"
+
+# Inserted between the relocated instructions and the document (static-first)
+CONTENT_BRIDGE = (
+    "## Content Under Review\n\n"
+    "Apply the instructions above to the following content.\n\n"
+)
+
+
+class TemplateError(ValueError):
+    """Raised for prompts that cannot be compiled."""
+
+
+# =============================================================================
+# SEGMENTS
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Segment:
+    """A static text run, or a named slot filled at render time."""
+
+    text: str = ""
+    slot: Optional[str] = None
+
+    @property
+    def is_static(self) -> bool:
+        return self.slot is None
+
+
+@dataclass(frozen=True)
+class PromptBlock:
+    """A contiguous piece of rendered prompt; ``cache_breakpoint`` marks its end."""
+
+    text: str
+    cache_breakpoint: bool = False
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """A prompt template split into static segments and slots."""
+
+    segments: Tuple[Segment, ...]
+    layout: str = LAYOUT_AS_WRITTEN
+
+    @property
+    def slots(self) -> List[str]:
+        return [s.slot for s in self.segments if s.slot is not None]
+
+    @property
+    def static_prefix(self) -> str:
+        """All static text before the first slot - the cacheable part."""
+        parts = []
+        for segment in self.segments:
+            if not segment.is_static:
+                break
+            parts.append(segment.text)
+        return "".join(parts)
+
+    @property
+    def static_suffix(self) -> str:
+        """All static text after the last slot."""
+        parts = []
+        for segment in reversed(self.segments):
+            if not segment.is_static:
+                break
+            parts.append(segment.text)
+        return "".join(reversed(parts))
+
+    @property
+    def cache_breakpoints(self) -> List[int]:
+        """
+        Character offsets in the rendered prompt where a cache breakpoint ends.
+
+        Only the static prefix is guaranteed identical across documents, so at
+        most one breakpoint is reported (none if the prompt starts with a slot).
+        """
+        prefix = self.static_prefix
+        return [len(prefix)] if prefix else []
+
+    def split_prefix(self) -> Tuple[str, "CompiledPrompt"]:
+        """Static prefix, and the prompt that renders everything after it."""
+        prefix = self.static_prefix
+        rest = self.segments
+        while rest and rest[0].is_static:
+            rest = rest[1:]
+        return prefix, CompiledPrompt(segments=rest, layout=self.layout)
+
+    def render(self, **values: str) -> str:
+        """Fill all slots; equivalent to ``str.format`` for as-written."""
+        try:
+            return "".join(
+                s.text if s.is_static else values[s.slot] for s in self.segments
+            )
+        except KeyError as e:
+            raise TemplateError(f"Missing value for slot {e}") from None
+
+    def blocks(self, content: str) -> List[PromptBlock]:
+        """
+        Render into blocks, marking the end of the static prefix as cacheable.
+
+        Returns:
+            [prefix (cache_breakpoint=True), rest] or [whole prompt] if there is
+            no static prefix
+        """
+        prefix = self.static_prefix
+        rendered = self.render(**{CONTENT_SLOT: content})
+        if not prefix:
+            return [PromptBlock(rendered)]
+        return [
+            PromptBlock(prefix, cache_breakpoint=True),
+            PromptBlock(rendered[len(prefix) :]),
+        ]
+
+
+# =============================================================================
+# COMPILATION
+# =============================================================================
+
+
+def _parse(template: str) -> List[Segment]:
+    segments: List[Segment] = []
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as e:
+        raise TemplateError(f"Invalid prompt template: {e}") from None
+
+    for literal, field_name, format_spec, conversion in parsed:
+        if literal:
+            if segments and segments[-1].is_static:
+                literal = segments.pop().text + literal
+            segments.append(Segment(text=literal))
+        if field_name is None:
+            continue
+        if field_name != CONTENT_SLOT or format_spec or conversion:
+            raise TemplateError(
+                f"Unsupported placeholder '{{{field_name}}}' "
+                f"(only {{{CONTENT_SLOT}}} is allowed)"
+            )
+        segments.append(Segment(slot=field_name))
+    return segments
+
+
+def _static_first(segments: List[Segment]) -> List[Segment]:
+    """Move all static text ahead of the slots, joined by CONTENT_BRIDGE."""
+    static = [s.text for s in segments if s.is_static]
+    slots = [s for s in segments if not s.is_static]
+    if not slots:
+        return segments
+    instructions = "\n\n".join(text.strip("\n") for text in static if text.strip())
+    reordered = [Segment(text=f"{instructions}\n\n{CONTENT_BRIDGE}")]
+    for i, slot in enumerate(slots):
+        if i:
+            reordered.append(Segment(text="\n\n"))
+        reordered.append(slot)
+    return reordered
+
+
+@lru_cache(maxsize=256)
+def compile_prompt(template: str, layout: str = LAYOUT_AS_WRITTEN) -> CompiledPrompt:
+    """
+    Compile a prompt template (memoized on template text and layout).
+
+    Raises:
+        TemplateError: Unknown layout, malformed braces, or a placeholder other
+            than ``{content}``
+    """
+    if layout not in LAYOUTS:
+        raise TemplateError(f"Unknown prompt layout '{layout}' (use {LAYOUTS})")
+    segments = _parse(template)
+    if layout == LAYOUT_STATIC_FIRST:
+        segments = _static_first(segments)
+    return CompiledPrompt(segments=tuple(segments), layout=layout)
+
+
+def compile_evaluator(
+    config: Mapping[str, Any], layout: Optional[str] = None
+) -> CompiledPrompt:
+    """
+    Compile an evaluator's prompt.
+
+    The layout comes from the ``layout`` argument, then the evaluator's
+    ``prompt_layout`` key, then defaults to as-written.
+    """
+    prompt = config.get("prompt")
+    if not prompt:
+        raise TemplateError(f"Evaluator '{config.get('name')}' has no prompt")
+    chosen = layout or config.get(LAYOUT_CONFIG_KEY) or LAYOUT_AS_WRITTEN
+    return compile_prompt(prompt, chosen)
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Provider Wire Formats
+=====================
+
+Request and response shapes for the four provider APIs that library
+evaluators run on, so runners can call them in-process instead of spawning
+``adversarial evaluate`` per document.
+
+    Provider    Model ids              Endpoint
+    openai      gpt-5.4, o3            POST /v1/chat/completions
+    anthropic   anthropic/claude-*     POST /v1/messages
+    gemini      gemini/gemini-*        POST /v1beta/models/{id}:generateContent
+    mistral     mistral/*              POST /v1/chat/completions
+
+The provider is chosen by the model's litellm prefix (``anthropic/``,
+``gemini/``, ``mistral/``; none for OpenAI), matching how
+``adversarial-workflow`` routes the ``model`` field.
+
+Request bodies are ``request_body.PromptBody`` instances, so the document is
+streamed from a memory map rather than copied into the JSON. The HTTP
+transport is a plain function (``urllib_transport`` by default) and can be
+swapped for the pooled clients in ``http_pool.py``.
+
+With ``stream=True`` the request asks for server-sent events (``stream`` in
+the body; ``:streamGenerateContent?alt=sse`` for Gemini) and ``stream_call``
+hands each text delta to a callback as it arrives. The callback may raise to
+stop reading, which closes the connection.
+
+A call may carry an ``Abort``: cancelling it from another thread runs the
+hooks the transport registered for the in-flight request (``HttpPool``
+shuts its socket down), so the blocked read ends instead of running to
+completion after the caller has gone.
+
+Usage:
+    from scripts.local.providers import ApiCall, build_call, parse_completion
+
+    call = build_call(config, document_path, api_key)
+    status, headers, payload = urllib_transport(call)
+    completion = parse_completion(call.provider, payload)
+
+    call = build_call(config, document_path, api_key, stream=True)
+    completion = stream_call(call, on_text=print)
+"""
+
+import http.client
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from scripts.local.chunking import DEFAULT_OUTPUT_RESERVE
+from scripts.local.prompt_template import compile_evaluator
+from scripts.local.request_body import PromptBody
+
+PROVIDERS = ("openai", "anthropic", "gemini", "mistral")
+
+# litellm prefix -> provider API
+_PREFIXES = {"anthropic/": "anthropic", "gemini/": "gemini", "mistral/": "mistral"}
+
+DEFAULT_BASE_URLS = {
+    "openai": "https://api.openai.com",
+    "anthropic": "https://api.anthropic.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+    "mistral": "https://api.mistral.ai",
+}
+
+# Per-provider base URL override, e.g. ADVERSARIAL_OPENAI_BASE_URL
+BASE_URL_ENV = "ADVERSARIAL_{provider}_BASE_URL"
+
+ANTHROPIC_VERSION = "2023-06-01"
+
+Body = Union[bytes, PromptBody]
+Transport = Callable[["ApiCall"], Tuple[int, Dict[str, str], bytes]]
+StreamTransport = Callable[["ApiCall"], Iterable[bytes]]  # Response lines
+
+
+# ProviderError.kind for failures without an HTTP status
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+SERVER = "server"  # Error event in an otherwise successful response
+
+
+class ProviderError(RuntimeError):
+    """A provider call failed (HTTP error status or malformed response)."""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        body: bytes = b"",
+        kind: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.body = body
+        self.kind = kind
+
+
+def transport_error(provider: str, action: str, error: BaseException) -> ProviderError:
+    """``ProviderError`` for a network failure, tagged timeout or connection."""
+    reason = getattr(error, "reason", None)
+    timed_out = isinstance(error, TimeoutError) or isinstance(reason, TimeoutError)
+    return ProviderError(
+        f"{provider} {action} failed: {error}",
+        kind=TIMEOUT if timed_out else CONNECTION,
+    )
+
+
+class Abort:
+    """Cross-thread cancellation of an in-flight call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hooks: List[Callable[[], None]] = []
+        self.cancelled = False
+
+    def on_cancel(self, hook: Callable[[], None]) -> None:
+        """Run ``hook`` on cancel (immediately if already cancelled)."""
+        with self._lock:
+            if not self.cancelled:
+                self._hooks.append(hook)
+                return
+        hook()
+
+    def discard(self, hook: Callable[[], None]) -> None:
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            hooks, self._hooks = self._hooks, []
+        for hook in hooks:
+            hook()
+
+
+@dataclass
+class ApiCall:
+    """One HTTP request to a provider."""
+
+    provider: str
+    model: str  # Provider-side model id (prefix stripped)
+    url: str
+    headers: Dict[str, str]
+    body: Body
+    timeout: float
+    stream: bool = False
+    method: str = "POST"
+    abort: Optional[Abort] = field(default=None, repr=False, compare=False)
+
+    def body_chunks(self) -> Iterable[bytes]:
+        return [self.body] if isinstance(self.body, bytes) else iter(self.body)
+
+    def body_length(self) -> int:
+        return len(self.body)
+
+
+@dataclass
+class Completion:
+    """Text and usage from one provider response."""
+
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+
+# =============================================================================
+# REQUESTS
+# =============================================================================
+
+
+def provider_for(model: str) -> str:
+    """API provider for a ``model`` field (litellm-style id)."""
+    for prefix, provider in _PREFIXES.items():
+        if model.startswith(prefix):
+            return provider
+    if "/" in model:
+        raise ProviderError(f"No in-process provider for model '{model}'")
+    return "openai"
+
+
+def provider_model_id(model: str) -> str:
+    """Model id as the provider API expects it (litellm prefix removed)."""
+    for prefix in _PREFIXES:
+        if model.startswith(prefix):
+            return model[len(prefix) :]
+    return model
+
+
+def base_url(provider: str) -> str:
+    env = os.environ.get(BASE_URL_ENV.format(provider=provider.upper()))
+    return (env or DEFAULT_BASE_URLS[provider]).rstrip("/")
+
+
+def envelope(
+    provider: str,
+    model: str,
+    max_output_tokens: int,
+    stream: bool = False,
+    cache_prefix: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Request JSON with ``PromptBody.PROMPT`` where the prompt goes.
+
+    ``cache_prefix`` (Anthropic only) is sent as a separate content block
+    marked ``cache_control`` ahead of the prompt, which then holds only the
+    text after the prefix.
+    """
+    message: Dict[str, Any] = {"role": "user", "content": PromptBody.PROMPT}
+    if provider == "anthropic":
+        if cache_prefix:
+            message["content"] = [
+                {
+                    "type": "text",
+                    "text": cache_prefix,
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {"type": "text", "text": PromptBody.PROMPT},
+            ]
+        body = {"model": model, "max_tokens": max_output_tokens, "messages": [message]}
+        return {**body, "stream": True} if stream else body
+    if provider == "gemini":
+        return {
+            "contents": [{"role": "user", "parts": [{"text": PromptBody.PROMPT}]}],
+            "generationConfig": {"maxOutputTokens": max_output_tokens},
+        }
+    # OpenAI reasoning models only accept max_completion_tokens
+    cap = "max_completion_tokens" if provider == "openai" else "max_tokens"
+    body = {"model": model, cap: max_output_tokens, "messages": [message]}
+    if stream:
+        body["stream"] = True
+        if provider == "openai":
+            body["stream_options"] = {"include_usage": True}
+    return body
+
+
+def endpoint(
+    provider: str, model: str, api_key: str, stream: bool = False
+) -> Tuple[str, Dict[str, str]]:
+    """URL and auth headers for a provider."""
+    root = base_url(provider)
+    headers = {"Content-Type": "application/json"}
+    if stream:
+        headers["Accept"] = "text/event-stream"
+    if provider == "anthropic":
+        headers.update({"x-api-key": api_key, "anthropic-version": ANTHROPIC_VERSION})
+        return f"{root}/v1/messages", headers
+    if provider == "gemini":
+        headers["x-goog-api-key"] = api_key
+        if stream:
+            return (
+                f"{root}/v1beta/models/{model}:streamGenerateContent?alt=sse",
+                headers,
+            )
+        return f"{root}/v1beta/models/{model}:generateContent", headers
+    headers["Authorization"] = f"Bearer {api_key}"
+    return f"{root}/v1/chat/completions", headers
+
+
+def build_call(
+    config: Mapping[str, Any],
+    document: Union[Path, bytes],
+    api_key: str,
+    max_output_tokens: int = DEFAULT_OUTPUT_RESERVE,
+    stream: bool = False,
+) -> ApiCall:
+    """
+    Build the request for running an evaluator on one document file (or on
+    in-memory UTF-8 content).
+
+    Raises:
+        ProviderError: If the evaluator's model has no in-process provider
+    """
+    model_field = str(config.get("model") or "")
+    provider = provider_for(model_field)
+    model = provider_model_id(model_field)
+    url, headers = endpoint(provider, model, api_key, stream)
+    compiled = compile_evaluator(config)
+    prefix = None
+    if provider == "anthropic" and compiled.cache_breakpoints:
+        prefix, compiled = compiled.split_prefix()
+    body = PromptBody(
+        compiled,
+        document,
+        envelope(provider, model, max_output_tokens, stream, cache_prefix=prefix),
+    )
+    headers["Content-Length"] = str(len(body))
+    return ApiCall(
+        provider=provider,
+        model=model,
+        url=url,
+        headers=headers,
+        body=body,
+        timeout=float(config.get("timeout") or 180),
+        stream=stream,
+    )
+
+
+def api_key_for(config: Mapping[str, Any], default_env: Optional[str] = None) -> str:
+    """API key from the evaluator's ``api_key_env`` (or the registry default)."""
+    name = config.get("api_key_env") or default_env
+    value = os.environ.get(name or "")
+    if not value:
+        raise ProviderError(f"API key not set: {name or 'no api_key_env'}")
+    return value
+
+
+# =============================================================================
+# RESPONSES
+# =============================================================================
+
+
+def parse_completion(provider: str, payload: Mapping[str, Any]) -> Completion:
+    """
+    Extract text and token usage from a provider response body.
+
+    Raises:
+        ProviderError: If the response has no text content
+    """
+    try:
+        if provider == "anthropic":
+            text = "".join(
+                block.get("text", "")
+                for block in payload["content"]
+                if block.get("type", "text") == "text"
+            )
+            usage = payload.get("usage") or {}
+            tokens = (usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+        elif provider == "gemini":
+            parts = payload["candidates"][0]["content"]["parts"]
+            text = "".join(part.get("text", "") for part in parts)
+            usage = payload.get("usageMetadata") or {}
+            tokens = (
+                usage.get("promptTokenCount", 0),
+                usage.get("candidatesTokenCount", 0),
+            )
+        else:
+            text = payload["choices"][0]["message"]["content"] or ""
+            usage = payload.get("usage") or {}
+            tokens = (usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+    except (KeyError, IndexError, TypeError) as e:
+        raise ProviderError(f"Unexpected {provider} response: missing {e}") from None
+    return Completion(text, int(tokens[0]), int(tokens[1]), dict(payload))
+
+
+def _urlopen(call: ApiCall) -> Any:
+    data = call.body_chunks() if call.method != "GET" else None
+    request = urllib.request.Request(
+        call.url, data=data, headers=call.headers, method=call.method
+    )
+    try:
+        return urllib.request.urlopen(request, timeout=call.timeout)
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        raise ProviderError(
+            f"{call.provider} HTTP {e.code}: {body[:200].decode('utf-8', 'replace')}",
+            status=e.code,
+            headers=dict(e.headers or {}),
+            body=body,
+        ) from None
+    except (urllib.error.URLError, OSError) as e:
+        raise transport_error(call.provider, "connection", e) from None
+
+
+def urllib_transport(call: ApiCall) -> Tuple[int, Dict[str, str], bytes]:
+    """Send ``call`` with urllib (streams the body); raise on HTTP errors."""
+    with _urlopen(call) as response:
+        try:
+            return response.status, dict(response.headers), response.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise transport_error(call.provider, "read", e) from None
+
+
+def urllib_stream(call: ApiCall) -> Iterator[bytes]:
+    """Send ``call`` with urllib and yield response lines as they arrive."""
+    with _urlopen(call) as response:
+        try:
+            yield from response
+            if response.length:  # Line reads end quietly at a premature EOF
+                raise http.client.IncompleteRead(b"", response.length)
+        except (OSError, http.client.HTTPException) as e:
+            raise transport_error(call.provider, "stream", e) from None
+
+
+def send(call: ApiCall, transport: Transport = urllib_transport) -> Completion:
+    """Send a call and parse its completion."""
+    _, _, payload = transport(call)
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        raise ProviderError(f"{call.provider} returned non-JSON response") from None
+    return parse_completion(call.provider, data)
+
+
+# =============================================================================
+# STREAMING
+# =============================================================================
+
+
+def sse_events(lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """JSON payloads of server-sent ``data:`` lines (``[DONE]`` ends the stream)."""
+    lines = iter(lines)
+    for raw in lines:
+        line = raw.strip()
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            for _ in lines:  # Read to the end so the connection can be reused
+                pass
+            return
+        try:
+            yield json.loads(data)
+        except ValueError:
+            raise ProviderError("Malformed server-sent event") from None
+
+
+def parse_stream_event(
+    provider: str, event: Mapping[str, Any]
+) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    Text delta and any usage counts (None if absent) from one stream event.
+
+    Raises:
+        ProviderError: If the event reports an error
+    """
+    if event.get("error") or event.get("type") == "error":
+        raise ProviderError(
+            f"{provider} stream error: {event.get('error')}", kind=SERVER
+        )
+    if provider == "anthropic":
+        kind = event.get("type")
+        if kind == "content_block_delta":
+            return (event.get("delta") or {}).get("text", ""), None, None
+        if kind == "message_start":
+            usage = (event.get("message") or {}).get("usage") or {}
+            return "", usage.get("input_tokens"), usage.get("output_tokens")
+        if kind == "message_delta":
+            return "", None, (event.get("usage") or {}).get("output_tokens")
+        return "", None, None
+    if provider == "gemini":
+        text = ""
+        for candidate in event.get("candidates") or []:
+            parts = (candidate.get("content") or {}).get("parts") or []
+            text += "".join(part.get("text", "") for part in parts)
+        usage = event.get("usageMetadata") or {}
+        return (
+            text,
+            usage.get("promptTokenCount"),
+            usage.get("candidatesTokenCount"),
+        )
+    text = "".join(
+        (choice.get("delta") or {}).get("content") or ""
+        for choice in event.get("choices") or []
+    )
+    usage = event.get("usage") or {}
+    return text, usage.get("prompt_tokens"), usage.get("completion_tokens")
+
+
+def stream_call(
+    call: ApiCall,
+    on_text: Optional[Callable[[str], None]] = None,
+    transport: StreamTransport = urllib_stream,
+) -> Completion:
+    """
+    Send a streaming call, passing each text delta to ``on_text``.
+
+    An exception raised by ``on_text`` stops the stream (the connection is
+    closed) and propagates to the caller.
+    """
+    pieces = []
+    input_tokens = output_tokens = 0
+    lines = transport(call)
+    try:
+        for event in sse_events(lines):
+            text, tokens_in, tokens_out = parse_stream_event(call.provider, event)
+            input_tokens = tokens_in if tokens_in is not None else input_tokens
+            output_tokens = tokens_out if tokens_out is not None else output_tokens
+            if text:
+                pieces.append(text)
+                if on_text is not None:
+                    on_text(text)
+    finally:
+        close = getattr(lines, "close", None)
+        if close is not None:
+            close()
+    return Completion("".join(pieces), input_tokens, output_tokens)
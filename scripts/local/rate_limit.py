@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Client-Side Rate Limiting
+=========================
+
+Token-bucket pacing for provider requests-per-minute and tokens-per-minute
+limits, so concurrent evaluations stay at a model's limit instead of
+bouncing off it with 429s and retries.
+
+Limits come from optional ``rate_limits`` in ``providers/registry.yml`` (or,
+for account-specific limits, ``.adversarial/registry-overrides.yml``):
+
+    claude:
+      rate_limits:                 # default for every claude model
+        requests_per_minute: 50
+        tokens_per_minute: 40000
+      tiers:
+        opus:
+          models:
+            - id: claude-opus-4-7
+              rate_limits:         # model-level keys win
+                tokens_per_minute: 30000
+
+Every model with limits gets one ``RateLimiter`` per (API key env, model) in
+a process-wide ``RateScheduler``; all evaluations that share that key draw
+from the same two buckets. Reservations are handed out in arrival order: a
+request that cannot go now is given a delay and leaves the bucket in debt,
+so later callers queue behind it rather than racing for the next refill.
+
+Usage:
+    from scripts.local.rate_limit import RateScheduler
+
+    limiter = RateScheduler.shared().for_model(model)
+    if limiter:
+        await limiter.acquire_async(estimated_tokens)   # or limiter.acquire()
+
+    python -m scripts.local.rate_limit          # effective limits per evaluator
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from scripts.local.registry import CompiledRegistry, ResolvedModel
+
+Clock = Callable[[], float]
+
+# Bucket capacity as a share of the per-minute limit (allowed burst)
+DEFAULT_BURST_FRACTION = 0.1
+
+
+# =============================================================================
+# BUCKETS
+# =============================================================================
+
+
+class TokenBucket:
+    """Thread-safe token bucket that allows debt for in-order reservations."""
+
+    def __init__(self, rate: float, capacity: float, clock: Clock = time.monotonic):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+        self.rate = rate  # Units per second
+        self.capacity = capacity
+        self._clock = clock
+        self._level = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(
+            self.capacity, self._level + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def level(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._level
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` now; return the seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            self._level -= amount
+            return max(0.0, -self._level / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) after the actual size is known."""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - amount)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every reservation for at least ``seconds`` (e.g. Retry-After)."""
+        with self._lock:
+            self._refill()
+            self._level = min(self._level, -seconds * self.rate)
+
+
+# =============================================================================
+# LIMITERS
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Per-minute limits for one key (None = unlimited)."""
+
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+    @classmethod
+    def from_mapping(cls, limits: Optional[Mapping[str, Any]]) -> "RateLimit":
+        limits = limits or {}
+        return cls(limits.get("requests_per_minute"), limits.get("tokens_per_minute"))
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.requests_per_minute or self.tokens_per_minute)
+
+
+class RateLimiter:
+    """Request and token buckets for one (API key, model) key."""
+
+    def __init__(
+        self,
+        key: str,
+        limit: RateLimit,
+        burst_fraction: float = DEFAULT_BURST_FRACTION,
+        clock: Clock = time.monotonic,
+    ):
+        self.key = key
+        self.limit = limit
+        self.waits = 0
+        self.waited = 0.0
+        self._buckets: Dict[str, TokenBucket] = {}
+        for name, per_minute in (
+            ("requests", limit.requests_per_minute),
+            ("tokens", limit.tokens_per_minute),
+        ):
+            if per_minute:
+                capacity = max(1.0, per_minute * burst_fraction)
+                self._buckets[name] = TokenBucket(per_minute / 60.0, capacity, clock)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve one request and ``tokens``; return the delay to honour."""
+        delays = [0.0]
+        if "requests" in self._buckets:
+            delays.append(self._buckets["requests"].reserve(1))
+        if "tokens" in self._buckets and tokens:
+            delays.append(self._buckets["tokens"].reserve(tokens))
+        delay = max(delays)
+        if delay > 0:
+            self.waits += 1
+            self.waited += delay
+        return delay
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until the request may be sent; return the seconds waited."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """``acquire`` for asyncio callers (sleeps without blocking the loop)."""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once the provider reports actual usage."""
+        if "tokens" in self._buckets and actual != estimated:
+            self._buckets["tokens"].adjust(actual - estimated)
+
+    def pause(self, seconds: float) -> None:
+        """Back off every caller sharing this key (after a 429)."""
+        for bucket in self._buckets.values():
+            bucket.pause(seconds)
+
+
+class RateScheduler:
+    """Shares one ``RateLimiter`` per key across all concurrent evaluations."""
+
+    _shared: Optional["RateScheduler"] = None
+
+    def __init__(
+        self,
+        burst_fraction: float = DEFAULT_BURST_FRACTION,
+        clock: Clock = time.monotonic,
+    ):
+        self.burst_fraction = burst_fraction
+        self._clock = clock
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "RateScheduler":
+        """Process-wide scheduler."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def key_for(model: ResolvedModel) -> str:
+        return f"{model.auth_env or '-'}:{model.litellm_id}"
+
+    def limiter(self, key: str, limit: RateLimit) -> RateLimiter:
+        """The limiter for ``key``, created on first use."""
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(key, limit, self.burst_fraction, self._clock)
+                self._limiters[key] = limiter
+            return limiter
+
+    def for_model(self, model: Optional[ResolvedModel]) -> Optional[RateLimiter]:
+        """Limiter for a resolved model, or None if it has no limits."""
+        if model is None:
+            return None
+        limit = RateLimit.from_mapping(model.rate_limits)
+        if not limit.limited:
+            return None
+        return self.limiter(self.key_for(model), limit)
+
+    def limiters(self) -> List[RateLimiter]:
+        with self._lock:
+            return list(self._limiters.values())
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Show the effective rate limits for every library evaluator."""
+    from scripts.local.catalog import EvaluatorCatalog
+    from scripts.local.chunking import model_for
+
+    parser = argparse.ArgumentParser(
+        prog="rate_limit", description="Effective rate limits per evaluator"
+    )
+    parser.parse_args(argv)
+
+    registry = CompiledRegistry.load()
+    for entry in EvaluatorCatalog.load().entries():
+        model = model_for(entry.config, registry)
+        limit = RateLimit.from_mapping(model.rate_limits if model else None)
+        rpm = limit.requests_per_minute or "-"
+        tpm = limit.tokens_per_minute or "-"
+        target = model.litellm_id if model else "unresolved"
+        print(f"  {entry.name:<22} {target:<36} rpm {rpm:<8} tpm {tpm}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
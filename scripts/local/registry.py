@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Compiled Provider Registry
+==========================
+
+Precomputed ``model_requirement`` resolution over ``providers/registry.yml``.
+
+ADR-0005's ``RESOLVE`` step scans the registry for a model matching family,
+tier, min_version and status. ``CompiledRegistry`` does that work once: the
+registry is compiled into tables keyed by ``(family, tier)``, partitioned by
+lifecycle status and by version line, each sorted newest first. Resolution
+is then a dictionary lookup plus one comparison against the head of a list.
+
+Versions are parsed into a *line* and a numeric tuple so mixed schemes
+compare sensibly within a tier:
+
+    "4.7"          line ""        (4, 7)
+    "5.4-nano"     line "nano"    (5, 4)
+    "large-2512"   line "large"   (2512,)
+    "latest"       line "latest"  ()
+
+``min_version`` only matches models on the same line; the best match is the
+highest version on that line (ties broken by ``released``).
+
+Project overrides in ``.adversarial/registry-overrides.yml`` (relative to the
+working directory) are merged in before compiling, following ADR-0005:
+
+    Provider level   deep merge (mappings merge key by key, override wins)
+    Model level      ``models`` lists merge by ``id``: a matching id is
+                     deep-merged (so an override can change just ``status``),
+                     a new id is appended
+
+Models may carry list prices (``input_price_per_mtok``/``output_price_per_mtok``,
+USD per million tokens); ``ResolvedModel.input_price``/``output_price`` expose
+them and compiling rejects non-numeric values. Optional ``rate_limits``
+(``requests_per_minute``/``tokens_per_minute``) may be set per provider, as a
+default for each of its models, or per model; see ``rate_limit.py``.
+
+The compiled tables are cached as JSON next to the catalog snapshot, keyed by
+``schema_version`` and the SHA-256 of the registry (and of the overrides file,
+if any), so a process that only needs resolution never loads or merges YAML:
+
+    .adversarial/cache/registry-<schema_version>-<sha16>[-<overrides sha16>].json
+
+Usage:
+    from scripts.local.registry import CompiledRegistry
+
+    registry = CompiledRegistry.load()
+    model = registry.resolve("claude", "opus", min_version="4.5")
+    model.litellm_id        # "anthropic/claude-opus-4-7"
+
+    python -m scripts.local.registry resolve claude opus 4.5
+    python -m scripts.local.registry evaluators
+    python -m scripts.local.registry --no-overrides evaluators
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+from scripts.local.catalog import DEFAULT_CACHE_DIR, REPO_ROOT
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_PATH = REPO_ROOT / "providers" / "registry.yml"
+DEFAULT_OVERRIDES = Path(".adversarial") / "registry-overrides.yml"
+
+# Bump when the compiled layout changes; older cache files are ignored
+COMPILER_VERSION = 2
+
+# Newest registry schema major this resolver understands (ADR-0005 section 5)
+SUPPORTED_SCHEMA_MAJOR = 1
+
+# Optional per-model list prices, USD per million tokens
+PRICE_FIELDS = ("input_price_per_mtok", "output_price_per_mtok")
+
+# Optional ``rate_limits`` keys, at provider (default for each model) or model level
+RATE_LIMIT_FIELDS = ("requests_per_minute", "tokens_per_minute")
+
+STATUSES = ("active", "deprecated", "legacy", "sunset")
+
+_SCHEMA_RE = re.compile(rb"^schema_version:\s*[\"']?([\w.-]+)", re.MULTILINE)
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)*")
+
+VersionKey = Tuple[str, Tuple[int, ...]]
+
+
+class RegistryError(ValueError):
+    """Raised when a registry or overrides file has the wrong shape."""
+
+
+def parse_version(version: Any) -> VersionKey:
+    """Split a registry version string into ``(line, numbers)``."""
+    text = str(version).strip().lower()
+    match = _NUMBER_RE.search(text)
+    if not match:
+        return text, ()
+    numbers = tuple(int(n) for n in match.group().split("."))
+    line = (text[: match.start()] + text[match.end() :]).strip(" -.")
+    return line, numbers
+
+
+# =============================================================================
+# RESOLVED MODEL
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class ResolvedModel:
+    """A registry model chosen for a ``model_requirement``."""
+
+    id: str
+    version: str
+    family: str
+    tier: str
+    status: str
+    context_window: Optional[int]
+    litellm_prefix: str
+    auth_env: Optional[str]
+    spec: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+    provider_rate_limits: Optional[Dict[str, Any]] = field(
+        default=None, compare=False, repr=False
+    )
+
+    @property
+    def litellm_id(self) -> str:
+        return f"{self.litellm_prefix}{self.id}"
+
+    @property
+    def input_price(self) -> Optional[float]:
+        """USD per million input tokens, if the registry prices this model."""
+        return self.spec.get("input_price_per_mtok")
+
+    @property
+    def output_price(self) -> Optional[float]:
+        """USD per million output tokens, if the registry prices this model."""
+        return self.spec.get("output_price_per_mtok")
+
+    @property
+    def priced(self) -> bool:
+        return self.input_price is not None and self.output_price is not None
+
+    @property
+    def rate_limits(self) -> Dict[str, Any]:
+        """Model ``rate_limits`` over the provider's defaults (may be empty)."""
+        return {
+            **(self.provider_rate_limits or {}),
+            **(self.spec.get("rate_limits") or {}),
+        }
+
+
+# =============================================================================
+# OVERRIDES
+# =============================================================================
+
+
+def _deep_merge(base: Any, override: Any) -> Any:
+    if not isinstance(base, dict) or not isinstance(override, dict):
+        return override
+    merged = dict(base)
+    for key, value in override.items():
+        if key == "models" and isinstance(value, list):
+            merged[key] = _merge_models(base.get(key) or [], value)
+        else:
+            merged[key] = _deep_merge(base.get(key), value) if key in base else value
+    return merged
+
+
+def _merge_models(base: List[Any], override: List[Any]) -> List[Any]:
+    merged = list(base)
+    position = {m.get("id"): i for i, m in enumerate(merged) if isinstance(m, dict)}
+    for model in override:
+        if not isinstance(model, dict) or "id" not in model:
+            raise RegistryError(f"Override model needs an 'id': {model!r}")
+        if model["id"] in position:
+            i = position[model["id"]]
+            merged[i] = _deep_merge(merged[i], model)
+        else:
+            position[model["id"]] = len(merged)
+            merged.append(model)
+    return merged
+
+
+def merge_registry(
+    registry: Mapping[str, Any], overrides: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """Apply ``registry-overrides.yml`` to a parsed registry (inputs unchanged)."""
+    if not isinstance(overrides, Mapping):
+        raise RegistryError("Registry overrides must be a mapping")
+    return _deep_merge(dict(registry), dict(overrides))
+
+
+# =============================================================================
+# COMPILATION
+# =============================================================================
+
+
+def _check_number(where: str, name: str, value: Any, minimum: float) -> None:
+    """Reject non-numeric (or too small) optional numeric fields."""
+    if value is None:
+        return
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, (int, float))
+        or value < minimum
+    ):
+        bound = "non-negative" if minimum == 0 else f">= {minimum}"
+        raise RegistryError(f"{where}: {name} must be a {bound} number, got {value!r}")
+
+
+def _check_rate_limits(where: str, limits: Any) -> None:
+    if limits is None:
+        return
+    if not isinstance(limits, dict):
+        raise RegistryError(f"{where}: rate_limits must be a mapping")
+    for name in RATE_LIMIT_FIELDS:
+        _check_number(where, f"rate_limits.{name}", limits.get(name), minimum=1)
+
+
+def _compile(registry: Mapping[str, Any], sha256: str) -> Dict[str, Any]:
+    """Build the JSON-serialisable lookup tables for a parsed registry."""
+    families: Dict[str, Any] = {}
+    tiers: Dict[str, Any] = {}
+    for family, provider in (registry.get("providers") or {}).items():
+        _check_rate_limits(family, provider.get("rate_limits"))
+        families[family] = {
+            "vendor": provider.get("vendor"),
+            "litellm_prefix": provider.get("litellm_prefix") or "",
+            "auth_env_default": provider.get("auth_env_default"),
+            "rate_limits": provider.get("rate_limits"),
+        }
+        for tier, spec in (provider.get("tiers") or {}).items():
+            models = [dict(m) for m in (spec.get("models") or [])]
+            for m in models:
+                m["version"] = str(m.get("version", ""))
+                m.setdefault("status", "active")
+                where = f"{family}/{tier} {m.get('id')}"
+                for name in PRICE_FIELDS:
+                    _check_number(where, name, m.get(name), minimum=0)
+                _check_rate_limits(where, m.get("rate_limits"))
+            models.sort(
+                key=lambda m: (parse_version(m["version"])[1], str(m.get("released"))),
+                reverse=True,
+            )
+            by_status: Dict[str, Dict[str, List[int]]] = {}
+            for position, m in enumerate(models):
+                line = parse_version(m["version"])[0]
+                lines = by_status.setdefault(m["status"], {})
+                lines.setdefault(line, []).append(position)
+                lines.setdefault("*", []).append(position)
+            tiers[f"{family}/{tier}"] = {
+                "capability_level": spec.get("capability_level"),
+                "models": models,
+                "by_status": by_status,
+            }
+    compiled = {
+        "compiler_version": COMPILER_VERSION,
+        "schema_version": str(registry.get("schema_version", "")),
+        "sha256": sha256,
+        "families": families,
+        "tiers": tiers,
+    }
+    # Normalise YAML dates etc. so fresh and cached forms are identical
+    return json.loads(json.dumps(compiled, default=str))
+
+
+def _cache_name(raw: bytes, digest: str, overrides_digest: Optional[str]) -> str:
+    """Cache file name for a registry, without parsing the YAML."""
+    match = _SCHEMA_RE.search(raw)
+    schema = match.group(1).decode("ascii") if match else "unknown"
+    suffix = f"-{overrides_digest[:16]}" if overrides_digest else ""
+    return f"registry-{schema}-{digest[:16]}{suffix}.json"
+
+
+def _read_compiled(cache_file: Path) -> Optional[Dict[str, Any]]:
+    try:
+        compiled = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if compiled.get("compiler_version") != COMPILER_VERSION:
+        return None
+    return compiled
+
+
+# =============================================================================
+# COMPILED REGISTRY
+# =============================================================================
+
+
+class CompiledRegistry:
+    """Constant-time lookups over a compiled provider registry."""
+
+    # In-process memo of loaded registries, keyed by cache file name
+    _loaded: Dict[str, "CompiledRegistry"] = {}
+
+    from_cache = False  # True if load() read the compiled JSON instead of YAML
+
+    def __init__(self, compiled: Mapping[str, Any]):
+        self.schema_version: str = compiled["schema_version"]
+        self.sha256: str = compiled["sha256"]
+        self.overrides_sha256: Optional[str] = compiled.get("overrides_sha256")
+        self._families: Dict[str, Dict[str, Any]] = dict(compiled["families"])
+        self._tiers: Dict[Tuple[str, str], Dict[str, Any]] = {
+            tuple(key.split("/", 1)): value  # type: ignore[misc]
+            for key, value in compiled["tiers"].items()
+        }
+        # Explicit evaluator ``model`` fields are looked up by (litellm) id
+        self._by_id: Dict[str, Tuple[str, str, Dict[str, Any]]] = {}
+        for (family, tier), table in self._tiers.items():
+            prefix = self._families.get(family, {}).get("litellm_prefix") or ""
+            for spec in table["models"]:
+                for key in (spec["id"], f"{prefix}{spec['id']}"):
+                    self._by_id.setdefault(key, (family, tier, spec))
+        self._check_schema()
+
+    def _check_schema(self) -> None:
+        major = self.schema_version.split(".")[0]
+        if major.isdigit() and int(major) > SUPPORTED_SCHEMA_MAJOR:
+            logger.warning(
+                "⚠️  Registry schema %s newer than supported (%d.x)",
+                self.schema_version,
+                SUPPORTED_SCHEMA_MAJOR,
+            )
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def compile(
+        cls, registry: Mapping[str, Any], sha256: str = ""
+    ) -> "CompiledRegistry":
+        """Compile an already-parsed registry (no caching)."""
+        return cls(_compile(registry, sha256))
+
+    @classmethod
+    def load(
+        cls,
+        path: Path = REGISTRY_PATH,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        overrides: Optional[Path] = DEFAULT_OVERRIDES,
+    ) -> "CompiledRegistry":
+        """
+        Load the compiled registry, merging, compiling and caching it if needed.
+
+        Args:
+            path: Source ``registry.yml``
+            cache_dir: Directory for compiled JSON; ``None`` disables the disk cache
+            overrides: ``registry-overrides.yml`` to merge if it exists;
+                ``None`` ignores overrides
+        """
+        raw = Path(path).read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        override_raw = None
+        if overrides is not None and Path(overrides).is_file():
+            override_raw = Path(overrides).read_bytes()
+        override_digest = (
+            hashlib.sha256(override_raw).hexdigest() if override_raw else None
+        )
+        name = _cache_name(raw, digest, override_digest)
+        if name in cls._loaded:
+            return cls._loaded[name]
+
+        cache_file = Path(cache_dir) / name if cache_dir is not None else None
+        compiled = _read_compiled(cache_file) if cache_file else None
+        from_cache = compiled is not None
+        if compiled is None:
+            registry_data = yaml.safe_load(raw) or {}
+            if override_raw:
+                registry_data = merge_registry(
+                    registry_data, yaml.safe_load(override_raw) or {}
+                )
+            compiled = _compile(registry_data, digest)
+            compiled["overrides_sha256"] = override_digest
+            if cache_file is not None:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = cache_file.with_suffix(".tmp")
+                tmp.write_text(json.dumps(compiled), encoding="utf-8")
+                os.replace(tmp, cache_file)
+
+        registry = cls(compiled)
+        registry.from_cache = from_cache
+        cls._loaded[name] = registry
+        return registry
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def families(self) -> List[str]:
+        return list(self._families)
+
+    def family(self, family: str) -> Optional[Dict[str, Any]]:
+        """Provider-level fields (vendor, litellm_prefix, auth, rate_limits)."""
+        return self._families.get(family)
+
+    def tiers(self, family: str) -> List[str]:
+        return [t for f, t in self._tiers if f == family]
+
+    def has_tier(self, family: str, tier: str) -> bool:
+        return (family, tier) in self._tiers
+
+    def capability_level(self, family: str, tier: str) -> Optional[int]:
+        table = self._tiers.get((family, tier))
+        return table["capability_level"] if table else None
+
+    def capability_levels(self) -> Dict[Tuple[str, str], int]:
+        return {
+            key: table["capability_level"]
+            for key, table in self._tiers.items()
+            if table["capability_level"] is not None
+        }
+
+    def models(
+        self, family: str, tier: str, status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Models in a tier, newest first, optionally for one status."""
+        table = self._tiers.get((family, tier))
+        if not table:
+            return []
+        if status is None:
+            return list(table["models"])
+        positions = table["by_status"].get(status, {}).get("*", [])
+        return [table["models"][i] for i in positions]
+
+    def versions(self, family: str, tier: str) -> List[str]:
+        return [m["version"] for m in self.models(family, tier)]
+
+    def resolve(
+        self,
+        family: str,
+        tier: str,
+        min_version: Optional[Any] = None,
+        statuses: Sequence[str] = ("active",),
+    ) -> Optional[ResolvedModel]:
+        """
+        Best model for ``family/tier`` at or above ``min_version``.
+
+        ``statuses`` are tried in order, so ``("active", "deprecated")`` falls
+        back to a deprecated model only when no active one qualifies.
+        """
+        table = self._tiers.get((family, tier))
+        if not table:
+            return None
+        line, minimum = ("*", ()) if min_version is None else parse_version(min_version)
+        for status in statuses:
+            positions = table["by_status"].get(status, {}).get(line)
+            if not positions:
+                continue
+            best = table["models"][positions[0]]
+            if parse_version(best["version"])[1] >= minimum:
+                return self._resolved(family, tier, best)
+        return None
+
+    def resolve_requirement(
+        self, requirement: Mapping[str, Any], statuses: Sequence[str] = ("active",)
+    ) -> Optional[ResolvedModel]:
+        """Resolve an evaluator's ``model_requirement`` mapping."""
+        return self.resolve(
+            str(requirement.get("family", "")),
+            str(requirement.get("tier", "")),
+            requirement.get("min_version"),
+            statuses,
+        )
+
+    def model(self, model_id: str) -> Optional[ResolvedModel]:
+        """Look up a model by registry id or litellm id (explicit ``model``)."""
+        found = self._by_id.get(model_id)
+        return self._resolved(*found) if found else None
+
+    def _resolved(self, family: str, tier: str, spec: Dict[str, Any]) -> ResolvedModel:
+        provider = self._families.get(family, {})
+        return ResolvedModel(
+            id=spec["id"],
+            version=spec["version"],
+            family=family,
+            tier=tier,
+            status=spec["status"],
+            context_window=spec.get("context_window"),
+            litellm_prefix=provider.get("litellm_prefix") or "",
+            auth_env=provider.get("auth_env_default"),
+            spec=spec,
+            provider_rate_limits=provider.get("rate_limits"),
+        )
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def _statuses(value: str) -> Iterable[str]:
+    return [s.strip() for s in value.split(",") if s.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Resolve model requirements against the compiled registry."""
+    parser = argparse.ArgumentParser(
+        prog="registry", description="Resolve model requirements"
+    )
+    parser.add_argument(
+        "--overrides",
+        default=str(DEFAULT_OVERRIDES),
+        help="Registry overrides file (default: .adversarial/registry-overrides.yml)",
+    )
+    parser.add_argument(
+        "--no-overrides", action="store_true", help="Ignore registry overrides"
+    )
+    parser.add_argument(
+        "--status",
+        default="active",
+        help="Comma-separated statuses to accept, in preference order",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    resolve_cmd = sub.add_parser("resolve", help="Resolve one family/tier")
+    resolve_cmd.add_argument("family")
+    resolve_cmd.add_argument("tier")
+    resolve_cmd.add_argument("min_version", nargs="?")
+    sub.add_parser("evaluators", help="Resolve every evaluator's model_requirement")
+    args = parser.parse_args(argv)
+
+    overrides = None if args.no_overrides else Path(args.overrides)
+    registry = CompiledRegistry.load(overrides=overrides)
+    statuses = list(_statuses(args.status))
+
+    if args.command == "resolve":
+        model = registry.resolve(args.family, args.tier, args.min_version, statuses)
+        if model is None:
+            print(f"❌ No {'/'.join(statuses)} model for {args.family}/{args.tier}")
+            return 1
+        print(f"{model.litellm_id}  (version {model.version}, {model.status})")
+        return 0
+
+    from scripts.local.catalog import EvaluatorCatalog
+
+    failures = 0
+    for entry in EvaluatorCatalog.load().entries():
+        requirement = entry.config.get("model_requirement")
+        if not requirement:
+            continue
+        model = registry.resolve_requirement(requirement, statuses)
+        resolved = model.litellm_id if model else "❌ unresolved"
+        failures += model is None
+        print(f"{entry.name:24} {resolved:40} (explicit: {entry.config.get('model')})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
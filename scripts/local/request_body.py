@@ -0,0 +1,177 @@
+"""
+Streaming Request Bodies
+========================
+
+Assemble a JSON request body around a very large document without holding
+multiple copies of it in memory.
+
+The naive path - ``path.read_text()``, ``prompt.format(content=...)``,
+``json.dumps(payload)`` - materialises the document three or more times. For
+the 1M-token ``gemini-pro`` evaluator that is several hundred megabytes per
+job. ``PromptBody`` instead:
+
+    1. Memory-maps the document (pages are file-backed, not heap)
+    2. JSON-escapes it window by window, directly on UTF-8 bytes
+    3. Yields envelope head, prompt prefix, escaped document, prompt suffix
+       and envelope tail as a sequence of byte chunks
+
+Peak heap use is one raw and one escaped window (default 1 MiB) regardless
+of document size. The output is byte-identical to
+``json.dumps(envelope, ensure_ascii=False).encode("utf-8")`` with the rendered
+prompt in place, and ``len(body)`` is known up front so it can be sent with a
+Content-Length header.
+
+Usage:
+    from scripts.local.request_body import PromptBody
+
+    body = PromptBody(
+        compiled_prompt,
+        Path("big-spec.md"),
+        envelope={"model": "gemini/gemini-3.1-pro-preview",
+                  "messages": [{"role": "user", "content": PromptBody.PROMPT}]},
+    )
+    conn.request("POST", path, body=iter(body),
+                 headers={"Content-Length": str(len(body))})
+"""
+
+import codecs
+import json
+import mmap
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Mapping, Optional, Union
+
+from scripts.local.prompt_template import CONTENT_SLOT, CompiledPrompt
+
+DEFAULT_WINDOW = 1 << 20  # 1 MiB
+
+# Bytes that JSON requires to be escaped inside a string
+_ESCAPE_RE = re.compile(rb'["\\\x00-\x1f]')
+_SHORT_ESCAPES = {
+    b'"': b'\\"',
+    b"\\": b"\\\\",
+    b"\n": b"\\n",
+    b"\r": b"\\r",
+    b"\t": b"\\t",
+    b"\b": b"\\b",
+    b"\f": b"\\f",
+}
+
+
+def _escape_byte(match: "re.Match[bytes]") -> bytes:
+    char = match.group()
+    return _SHORT_ESCAPES.get(char) or b"\\u%04x" % char[0]
+
+
+def escape_json_bytes(data: bytes) -> bytes:
+    """JSON-escape UTF-8 bytes for use inside a string (ensure_ascii=False)."""
+    return _ESCAPE_RE.sub(_escape_byte, data)
+
+
+def escaped_length(data: bytes) -> int:
+    """Length of ``escape_json_bytes(data)`` without building it."""
+    extra = 0
+    for match in _ESCAPE_RE.finditer(data):
+        extra += 1 if match.group() in _SHORT_ESCAPES else 5
+    return len(data) + extra
+
+
+class PromptBody:
+    """
+    Iterable of byte chunks forming a JSON request body.
+
+    Args:
+        prompt: Compiled evaluator prompt (its ``{content}`` slot is filled
+            with the document)
+        document: Path to the document (memory-mapped), or its UTF-8 bytes
+            when the content is already in memory
+        envelope: Request JSON with ``PromptBody.PROMPT`` where the rendered
+            prompt string belongs
+        window: Bytes of document escaped per chunk
+    """
+
+    PROMPT = "\x00__adversarial_prompt__\x00"
+
+    def __init__(
+        self,
+        prompt: CompiledPrompt,
+        document: Union[Path, bytes],
+        envelope: Mapping[str, Any],
+        window: int = DEFAULT_WINDOW,
+    ):
+        self.prompt = prompt
+        self.document = document if isinstance(document, bytes) else Path(document)
+        self.window = window
+        encoded = json.dumps(envelope, ensure_ascii=False).encode("utf-8")
+        marker = json.dumps(self.PROMPT).encode("utf-8")
+        if encoded.count(marker) != 1:
+            raise ValueError("envelope must contain PromptBody.PROMPT exactly once")
+        head, tail = encoded.split(marker)
+        self._head = head + b'"'
+        self._tail = b'"' + tail
+        self._length: Optional[int] = None
+
+    # -------------------------------------------------------------------------
+    # Document access
+    # -------------------------------------------------------------------------
+
+    def _windows(self) -> Iterator[bytes]:
+        """Yield the document one window at a time, validating UTF-8."""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        if isinstance(self.document, bytes):
+            for start in range(0, len(self.document), self.window):
+                chunk = self.document[start : start + self.window]
+                decoder.decode(chunk, final=start + self.window >= len(self.document))
+                yield chunk
+            return
+        with open(self.document, "rb") as f:
+            size = self.document.stat().st_size
+            if size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, size, self.window):
+                    chunk = mapped[start : start + self.window]
+                    decoder.decode(chunk, final=start + self.window >= size)
+                    yield chunk
+
+    def _static(self, text: str) -> bytes:
+        return escape_json_bytes(text.encode("utf-8"))
+
+    # -------------------------------------------------------------------------
+    # Body protocol
+    # -------------------------------------------------------------------------
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        for segment in self.prompt.segments:
+            if segment.is_static:
+                if segment.text:
+                    yield self._static(segment.text)
+            elif segment.slot == CONTENT_SLOT:
+                for chunk in self._windows():
+                    # Control/quote bytes are ASCII, so a window boundary can
+                    # never split an escape sequence
+                    yield escape_json_bytes(chunk)
+            else:
+                raise ValueError(f"No value for prompt slot '{segment.slot}'")
+        yield self._tail
+
+    def __len__(self) -> int:
+        """Exact body length in bytes, computed with one streaming pass."""
+        if self._length is None:
+            total = len(self._head) + len(self._tail)
+            for segment in self.prompt.segments:
+                if segment.is_static:
+                    total += len(self._static(segment.text))
+                else:
+                    total += sum(escaped_length(c) for c in self._windows())
+            self._length = total
+        return self._length
+
+    def write_to(self, stream: BinaryIO) -> int:
+        """Write the body to a binary stream; returns bytes written."""
+        written = 0
+        for chunk in self:
+            stream.write(chunk)
+            written += len(chunk)
+        return written
@@ -0,0 +1,349 @@
+"""
+Provider Call Resilience
+========================
+
+Retries and circuit breakers around provider calls, so one provider's bad
+minute costs a few delayed calls instead of a failed panel, and concurrent
+evaluations do not retry in lockstep.
+
+Errors are classified from ``ProviderError.status`` / ``.kind``:
+
+    rate_limit    HTTP 429                      retried; pauses the shared
+                                                rate limiter for everyone
+    server        HTTP 408, 5xx (incl. 529),    retried; counts against the
+                  error events in a stream      circuit breaker
+    timeout       socket / read timeouts        retried; counts
+    connection    refused, reset, DNS           retried; counts
+    fatal         other 4xx, malformed output   not retried
+
+Backoff is exponential with full jitter (``uniform(0, min(cap, base *
+2**attempt))``). A ``Retry-After`` (or ``retry-after-ms``) header sets the
+floor instead, with up to ``base`` seconds of jitter on top so waiting
+clients do not all return at once.
+
+Each provider has one ``CircuitBreaker``, shared by every evaluation in the
+process (``CircuitBreakers.shared()``). After ``failure_threshold``
+consecutive server/timeout/connection failures it opens and calls fail fast
+with ``CircuitOpenError``. After ``reset_timeout`` seconds it lets a single
+probe through (half-open): success closes it, failure opens it again.
+
+Usage:
+    from scripts.local.resilience import Resilience, RetryPolicy
+
+    resilience = Resilience(RetryPolicy(max_attempts=5))
+    completion = await resilience.run("anthropic", lambda: backend(call))
+"""
+
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    TypeVar,
+)
+
+from scripts.local.providers import CONNECTION, SERVER, TIMEOUT, ProviderError
+
+T = TypeVar("T")
+
+# classify() results (TIMEOUT, CONNECTION and SERVER come from providers.py)
+RATE_LIMIT = "rate_limit"
+FATAL = "fatal"
+
+RETRYABLE = (RATE_LIMIT, SERVER, TIMEOUT, CONNECTION)
+BREAKER_FAILURES = (SERVER, TIMEOUT, CONNECTION)  # Provider unhealthy, not busy
+
+# CircuitBreaker.state values
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+Clock = Callable[[], float]
+
+
+class CircuitOpenError(ProviderError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+# =============================================================================
+# CLASSIFICATION
+# =============================================================================
+
+
+def classify(error: ProviderError) -> str:
+    """Error class of a failed provider call."""
+    status = error.status
+    if status == 429:
+        return RATE_LIMIT
+    if status == 408:
+        return TIMEOUT
+    if status is not None and status >= 500:
+        return SERVER
+    if status is None and error.kind in (SERVER, TIMEOUT, CONNECTION):
+        return error.kind
+    return FATAL
+
+
+def retry_after(
+    headers: Mapping[str, str], now: Optional[float] = None
+) -> Optional[float]:
+    """Seconds from ``retry-after-ms`` / ``retry-after`` (delta or HTTP date)."""
+    if headers.get("retry-after-ms"):
+        try:
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    current = datetime.now(timezone.utc).timestamp() if now is None else now
+    return max(0.0, when.timestamp() - current)
+
+
+# =============================================================================
+# BACKOFF
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to retry transient failures."""
+
+    max_attempts: int = 4  # Including the first call
+    base: float = 1.0  # Seconds
+    cap: float = 60.0  # Longest computed backoff
+    max_retry_after: float = 300.0  # Give up if the provider asks for longer
+
+    def delay(
+        self, attempt: int, retry_after: Optional[float], rng: random.Random
+    ) -> float:
+        """Seconds to wait after failed attempt ``attempt`` (0-based)."""
+        if retry_after is not None:
+            return retry_after + rng.uniform(0, self.base)
+        return rng.uniform(0, min(self.cap, self.base * 2**attempt))
+
+
+# =============================================================================
+# CIRCUIT BREAKERS
+# =============================================================================
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one provider."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Clock = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.trips = 0  # Times the circuit has opened
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._cooled():
+                return HALF_OPEN
+            return self._state
+
+    def _cooled(self) -> bool:
+        return self._clock() - self._opened_at >= self.reset_timeout
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probing = False
+        self.trips += 1
+
+    def allow(self) -> Optional[float]:
+        """
+        Admit a call: None if it may proceed, else seconds until a probe.
+
+        In the half-open state only one call (the probe) is admitted at a time.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return None
+            if self._state == OPEN:
+                if not self._cooled():
+                    return self.reset_timeout - (self._clock() - self._opened_at)
+                self._state = HALF_OPEN
+            if self._probing:
+                return self.reset_timeout
+            self._probing = True
+            return None
+
+    def success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            self._failures += 1
+            if self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self) -> None:
+        """A call ended without saying anything about provider health."""
+        with self._lock:
+            self._probing = False
+
+
+class CircuitBreakers:
+    """One ``CircuitBreaker`` per provider, shared by every evaluation."""
+
+    _shared: Optional["CircuitBreakers"] = None
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Clock = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "CircuitBreakers":
+        """Process-wide breakers."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def for_provider(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self._clock
+                )
+            return self._breakers[provider]
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {provider: b.state for provider, b in breakers.items()}
+
+
+# =============================================================================
+# RETRYING CALLS
+# =============================================================================
+
+
+class Resilience:
+    """Retries with jittered backoff behind per-provider circuit breakers."""
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        breakers: Optional[CircuitBreakers] = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self.policy = policy or RetryPolicy()
+        self.breakers = breakers or CircuitBreakers.shared()
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self.retries: Dict[str, int] = {}  # Per provider
+
+    async def run(
+        self,
+        provider: str,
+        attempt: Callable[[], Awaitable[T]],
+        limiter: Any = None,
+        retryable: Callable[[], bool] = lambda: True,
+        slot: Optional[Callable[[], AsyncContextManager[Any]]] = None,
+    ) -> T:
+        """
+        Call ``attempt()`` until it succeeds, fails for good or runs out of
+        attempts. ``retryable()`` is asked before each retry (a stream that
+        already delivered text cannot be replayed). A 429 pauses ``limiter``
+        (a ``rate_limit.RateLimiter``) so every caller sharing it backs off.
+
+        Each attempt runs inside ``slot()`` (e.g. a provider semaphore), and
+        the circuit is checked once the slot is held; backoff sleeps happen
+        outside it, so waiting to retry does not block other callers.
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            ProviderError: The last error, once retrying stops
+        """
+        breaker = self.breakers.for_provider(provider)
+        for number in range(self.policy.max_attempts):
+            async with (slot or _no_slot)():
+                wait = breaker.allow()
+                if wait is not None:
+                    raise CircuitOpenError(
+                        f"{provider} circuit open after repeated failures; "
+                        f"next probe in {wait:.0f}s"
+                    )
+                try:
+                    result = await attempt()
+                except ProviderError as e:
+                    kind = classify(e)
+                    if kind in BREAKER_FAILURES:
+                        breaker.failure()
+                    else:
+                        breaker.release()
+                    last = number + 1 >= self.policy.max_attempts
+                    if kind not in RETRYABLE or last or not retryable():
+                        raise
+                    if breaker.state == OPEN:  # This failure tripped it
+                        raise
+                    hint = retry_after(e.headers)
+                    if hint is not None and hint > self.policy.max_retry_after:
+                        raise
+                    delay = self.policy.delay(number, hint, self._rng)
+                    if kind == RATE_LIMIT and limiter is not None:
+                        limiter.pause(delay)
+                except BaseException:  # Cancelled, or stopped by a stream callback
+                    breaker.release()
+                    raise
+                else:
+                    breaker.success()
+                    return result
+            self.retries[provider] = self.retries.get(provider, 0) + 1
+            await self._sleep(delay)
+        raise AssertionError("unreachable")
+
+
+@contextlib.asynccontextmanager
+async def _no_slot() -> AsyncIterator[None]:
+    yield
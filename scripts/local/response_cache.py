@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+==============
+
+On-disk cache of provider responses, so re-running an evaluator on an
+unchanged document (CI re-runs, pre-commit hooks) is served locally instead
+of paying for the same review again.
+
+An entry is keyed by the SHA-256 of:
+
+    evaluator fingerprint   prompt, model, model_requirement, timeout,
+                            prompt_layout
+    resolved model id       what the registry resolved the evaluator to
+    output token limit      max tokens requested from the provider
+    document hash           SHA-256 of the document bytes
+
+so editing the prompt, re-pointing the model or changing one byte of the
+document is a miss. Entries live in ``.adversarial/cache/responses/`` as one
+JSON file each (``<key[:2]>/<key>.json``, written atomically):
+
+    - TTL: entries older than ``ttl`` seconds are misses and are deleted
+    - LRU: a hit touches the file's mtime; when the cache grows past
+      ``max_bytes`` the least recently used entries are evicted
+    - Bypass: ``bypass=True`` skips lookups but still stores fresh responses
+      (``--refresh`` on the runner CLIs; ``--no-cache`` turns caching off)
+
+Usage:
+    from scripts.local.response_cache import ResponseCache
+
+    cache = ResponseCache()
+    key = cache.key(config, "anthropic/claude-haiku-4-5", 4000, document)
+    entry = cache.get(key)
+
+    python -m scripts.local.response_cache stats
+    python -m scripts.local.response_cache prune
+    python -m scripts.local.response_cache clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, List, Mapping, Optional, Tuple, Union
+
+from scripts.local.fingerprint import fingerprint, short
+
+DEFAULT_RESPONSE_CACHE = Path(".adversarial") / "cache" / "responses"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 30 * 24 * 3600  # Seconds
+
+# Bump if the key derivation or entry format changes
+CACHE_VERSION = 1
+
+_READ_SIZE = 1 << 20
+
+
+def document_hash(document: Union[Path, bytes]) -> str:
+    """SHA-256 of a document file (read in blocks) or of in-memory content."""
+    digest = hashlib.sha256()
+    if isinstance(document, bytes):
+        digest.update(document)
+        return digest.hexdigest()
+    with open(document, "rb") as f:
+        for block in iter(lambda: f.read(_READ_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """A stored provider response."""
+
+    key: str
+    text: str
+    evaluator: str
+    model: str
+    created: float  # Unix time
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def stored(self) -> str:
+        return datetime.fromtimestamp(self.created, timezone.utc).isoformat(
+            timespec="seconds"
+        )
+
+    def marker(self) -> str:
+        """Log-file header line that marks output as served from cache."""
+        return (
+            f"<!-- adversarial-cache: hit key={short(self.key)} "
+            f"stored={self.stored} -->"
+        )
+
+
+class ResponseCache:
+    """Size-bounded LRU response cache with TTL."""
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_RESPONSE_CACHE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: Optional[float] = DEFAULT_TTL,
+        bypass: bool = False,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # Bytes on disk, scanned lazily
+
+    @staticmethod
+    def key(
+        config: Mapping[str, Any],
+        model: str,
+        max_output_tokens: int,
+        document: Union[Path, bytes],
+    ) -> str:
+        parts = [
+            f"v{CACHE_VERSION}",
+            fingerprint(config),
+            model,
+            str(max_output_tokens),
+            document_hash(document),
+        ]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _expired(self, entry: CachedResponse, now: float) -> bool:
+        return self.ttl is not None and now - entry.created > self.ttl
+
+    # -------------------------------------------------------------------------
+    # Lookup and store
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """The cached response for ``key``, or None (bypassed, missing, expired)."""
+        if self.bypass:
+            return None
+        path = self._path(key)
+        try:
+            entry = CachedResponse(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        now = time.time()
+        if self._expired(entry, now):
+            self._remove(path)
+            self.misses += 1
+            return None
+        os.utime(path, (now, now))  # Recency for LRU eviction
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        key: str,
+        text: str,
+        evaluator: str,
+        model: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> CachedResponse:
+        """Store a response, then evict least recently used entries if needed."""
+        entry = CachedResponse(
+            key, text, evaluator, model, time.time(), input_tokens, output_tokens
+        )
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(asdict(entry), ensure_ascii=False).encode("utf-8")
+        previous = path.stat().st_size if path.exists() else 0
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+        if self._size is not None:
+            self._size += len(payload) - previous
+        if self.size() > self.max_bytes:
+            self.evict(self.max_bytes)
+        return entry
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """(last used, size, path) for every entry."""
+        entries = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _remove(self, path: Path) -> int:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return 0
+        if self._size is not None:
+            self._size -= size
+        return size
+
+    def size(self) -> int:
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def evict(self, max_bytes: int) -> int:
+        """Remove least recently used entries until under ``max_bytes``."""
+        removed = 0
+        self._size = None
+        for _, _, path in sorted(self._entries()):
+            if self.size() <= max_bytes:
+                break
+            if self._remove(path):
+                removed += 1
+        return removed
+
+    def prune(self) -> int:
+        """Remove expired entries; returns how many were removed."""
+        if self.ttl is None:
+            return 0
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for path in self.root.glob("*/*.json"):
+            try:
+                created = json.loads(path.read_text(encoding="utf-8"))["created"]
+            except (OSError, ValueError, KeyError):
+                created = 0
+            if created < cutoff and self._remove(path):
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        removed = sum(1 for _, _, path in self._entries() if self._remove(path))
+        self._size = 0
+        return removed
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Inspect and maintain the response cache."""
+    parser = argparse.ArgumentParser(
+        prog="response_cache", description="Provider response cache"
+    )
+    parser.add_argument("--cache-dir", default=str(DEFAULT_RESPONSE_CACHE))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entry count and size")
+    prune = sub.add_parser("prune", help="Remove expired entries, enforce size cap")
+    prune.add_argument("--ttl-days", type=float, default=DEFAULT_TTL / 86400)
+    prune.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20)
+    sub.add_parser("clear", help="Remove every entry")
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        cache = ResponseCache(Path(args.cache_dir))
+        entries = cache._entries()
+        print(f"📦 {len(entries)} cached responses, {cache.size() / 2**20:.1f} MiB")
+        if entries:
+            oldest = min(mtime for mtime, _, _ in entries)
+            age = (time.time() - oldest) / 86400
+            print(f"   Least recently used: {age:.1f} days ago")
+    elif args.command == "prune":
+        cache = ResponseCache(
+            Path(args.cache_dir),
+            max_bytes=int(args.max_mb * 2**20),
+            ttl=args.ttl_days * 86400,
+        )
+        expired = cache.prune()
+        evicted = cache.evict(cache.max_bytes)
+        print(f"🧹 Removed {expired} expired and {evicted} least recently used")
+    else:
+        removed = ResponseCache(Path(args.cache_dir)).clear()
+        print(f"🧹 Removed {removed} cached responses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
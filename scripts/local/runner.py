@@ -0,0 +1,758 @@
+#!/usr/bin/env python3
+"""
+Async Evaluation Runner
+=======================
+
+Run one or more evaluators over many documents concurrently, in-process.
+
+Each (evaluator, document) pair is a job. Jobs run on one asyncio loop with
+a concurrency semaphore per provider API (openai, anthropic, gemini,
+mistral), so a slow provider never starves the others and no provider sees
+more parallel requests than it tolerates. Before sending, a job also waits
+on the shared rate limiter for its model (``rate_limit.py``), if the registry
+sets limits.
+
+Each job:
+
+    1. builds the request from the compiled prompt and a memory-mapped
+       document (``providers.build_call``)
+    2. sends it through the backend (HTTP in a worker thread by default)
+    3. writes the response to ``<log_dir>/<document stem><output_suffix>``,
+       the same path ``adversarial evaluate`` uses
+    4. appends provider-reported usage to the spend log (``cost.py``) and
+       settles the rate limiter's token reservation
+
+With a ``ResponseCache`` (on by default in the CLIs; ``--no-cache`` /
+``--refresh``), a job whose evaluator, model and document are unchanged is
+served from disk instead: no provider call, no spend, and its log file
+starts with an ``adversarial-cache: hit`` marker.
+
+In streaming mode (``stream=True``, ``--stream``) the response is written to
+the log file as it arrives, text deltas go to ``on_text`` and a
+``findings.FindingStream`` reports each finding and verdict line to
+``on_event`` the moment it is complete. Both callbacks run on the backend's
+worker thread.
+
+Gate mode (``fail_at="HIGH"``, ``--fail-fast HIGH``) streams the response
+and cancels it as soon as a finding at or above that severity appears. The
+job then counts as a fail: the partial output is saved with a
+``**Verdict**: FAIL`` footer, spend is recorded from token estimates, and
+nothing is cached. Use it where only "is anything serious wrong?" matters
+(gated composition stages, pre-commit) to cut tail latency and output spend.
+
+Provider calls are retried on 429, 5xx, timeouts and connection errors with
+jittered backoff, behind per-provider circuit breakers (``resilience.py``);
+a 429 also pauses the job's shared rate limiter. Every attempt takes its own
+provider slot and rate-limit reservation (refunded if it fails); the backoff
+between attempts holds neither. A stream is only retried if it failed before
+delivering any text.
+
+The default backend sends requests over the process-wide keep-alive pool
+(``http_pool.HttpPool.shared()``), so every job in the process reuses the
+same few connections per provider.
+
+A failed job is reported in its ``JobResult``; it never cancels the others.
+
+Usage:
+    from scripts.local.runner import AsyncRunner
+
+    results = AsyncRunner().run_sync(["claude-quick", "fast-check"], paths)
+
+    python -m scripts.local.runner claude-quick docs/*.md
+    python -m scripts.local.runner claude-quick gemini-flash -d docs/ -c anthropic=2
+    python -m scripts.local.runner o3-chain -d spec.md --stream
+    python -m scripts.local.runner claude-adversarial -d spec.md --fail-fast HIGH
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from scripts.local.chunking import DEFAULT_OUTPUT_RESERVE, model_for
+from scripts.local.cost import DEFAULT_SPEND_LOG, SpendLog, record_spend
+from scripts.local.findings import (
+    SEVERITIES,
+    Finding,
+    FindingStream,
+    StreamEvent,
+    normalize_severity,
+    parse_verdict,
+)
+from scripts.local.http_pool import DEFAULT_MAX_PER_HOST, HttpPool, PoolConfig, pool_for
+from scripts.local.providers import (
+    PROVIDERS,
+    Abort,
+    ApiCall,
+    Completion,
+    StreamTransport,
+    Transport,
+    api_key_for,
+    build_call,
+    provider_for,
+    send,
+    stream_call,
+    urllib_stream,
+    urllib_transport,
+)
+from scripts.local.rate_limit import RateScheduler
+from scripts.local.registry import CompiledRegistry, ResolvedModel
+from scripts.local.resilience import CircuitBreakers, Resilience, RetryPolicy
+from scripts.local.response_cache import ResponseCache
+from scripts.local.tokens import estimator_for
+
+DEFAULT_LOG_DIR = Path(".adversarial") / "logs"
+
+# Parallel requests per provider API
+DEFAULT_CONCURRENCY: Dict[str, int] = {
+    "openai": 8,
+    "anthropic": 4,
+    "gemini": 8,
+    "mistral": 4,
+}
+
+TextHandler = Callable[[str], None]
+
+# backend(call) or, for streaming calls, backend(call, on_text)
+Backend = Callable[..., Awaitable[Completion]]
+
+
+def thread_backend(
+    transport: Transport = urllib_transport,
+    stream_transport: StreamTransport = urllib_stream,
+) -> Backend:
+    """
+    Backend that runs a blocking transport in a worker thread.
+
+    Cancelling the awaiting task cancels the call's ``Abort`` (transports
+    that support it, like ``HttpPool``, drop the connection) and waits for
+    the worker, so a cancelled call never outlives its job.
+    """
+
+    async def backend(
+        call: ApiCall, on_text: Optional[TextHandler] = None
+    ) -> Completion:
+        abort = Abort()
+        call = replace(call, abort=abort)
+        if call.stream:
+            work = asyncio.to_thread(stream_call, call, on_text, stream_transport)
+        else:
+            work = asyncio.to_thread(send, call, transport)
+        worker = asyncio.ensure_future(work)
+        try:
+            return await asyncio.shield(worker)
+        except asyncio.CancelledError:
+            abort.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+            raise
+
+    return backend
+
+
+# =============================================================================
+# DATA
+# =============================================================================
+
+
+@dataclass
+class Job:
+    """One evaluator run on one document."""
+
+    evaluator: str
+    config: Dict[str, Any]
+    document: Path
+    output_path: Path
+    model: Optional[ResolvedModel] = None
+    content: Optional[bytes] = None  # Sent instead of the file when set
+    fail_at: Optional[str] = None  # Gate mode: stop at this severity or worse
+
+    @property
+    def source(self) -> Union[Path, bytes]:
+        return self.document if self.content is None else self.content
+
+
+@dataclass
+class JobResult:
+    """Outcome of a job."""
+
+    job: Job
+    output: str = ""
+    error: Optional[str] = None
+    provider: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    duration: float = 0.0
+    waited: float = 0.0  # Seconds spent waiting on the rate limiter
+    cached: bool = False  # Served from the response cache
+    stopped_by: Optional[Finding] = None  # Gate mode: finding that ended it
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def failed(self) -> bool:
+        """Errored, or stopped by a blocking finding (a FAIL verdict)."""
+        return not self.ok or self.stopped_by is not None
+
+    @property
+    def verdict(self) -> Optional[str]:
+        if self.stopped_by is not None:
+            return "FAIL"
+        return parse_verdict(self.output) if self.output else None
+
+
+def output_path(config: Mapping[str, Any], document: Path, log_dir: Path) -> Path:
+    """``<log_dir>/<document stem><output_suffix>``, as adversarial evaluate."""
+    suffix = config.get("output_suffix") or f"-{config.get('name')}.md"
+    return Path(log_dir) / f"{Path(document).stem}{suffix}"
+
+
+def blocking_finding(
+    findings: Sequence[Finding], fail_at: Optional[str]
+) -> Optional[Finding]:
+    """First finding at or above the ``fail_at`` severity, if any."""
+    if fail_at is None:
+        return None
+    rank = SEVERITIES.index(fail_at)
+    return next((f for f in findings if f.severity_rank <= rank), None)
+
+
+class EarlyStop(Exception):
+    """Raised from a stream callback to cancel a gate-mode request."""
+
+    def __init__(self, finding: Finding):
+        super().__init__(f"{finding.severity} finding: {finding.title}")
+        self.finding = finding
+
+
+def stop_footer(finding: Finding) -> str:
+    """Appended to the partial output of a gate-mode job that stopped early."""
+    return (
+        f"\n\n---\n\n<!-- adversarial-gate: stopped at {finding.severity} "
+        f"finding: {finding.title} -->\n\n**Verdict**: FAIL\n"
+    )
+
+
+class StreamMonitor:
+    """Writes a streamed response to its log file and reports parse events."""
+
+    def __init__(
+        self,
+        job: Job,
+        on_text: Optional[Callable[[Job, str], None]] = None,
+        on_event: Optional[Callable[[Job, StreamEvent], None]] = None,
+        write: bool = True,
+    ):
+        self.job = job
+        self.parser = FindingStream()
+        self._on_text = on_text
+        self._on_event = on_event
+        self._file = None
+        if write:
+            job.output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(job.output_path, "w", encoding="utf-8")
+
+    @property
+    def text(self) -> str:
+        return self.parser.text
+
+    def _dispatch(self, events: List[StreamEvent]) -> None:
+        if self._on_event is not None:
+            for event in events:
+                self._on_event(self.job, event)
+
+    def feed(self, delta: str) -> None:
+        if self._file is not None:
+            self._file.write(delta)
+            self._file.flush()
+        if self._on_text is not None:
+            self._on_text(self.job, delta)
+        events = self.parser.feed(delta)
+        self._dispatch(events)
+        found = blocking_finding(
+            [e.finding for e in events if e.finding], self.job.fail_at
+        )
+        if found is not None:
+            raise EarlyStop(found)
+
+    def stop(self, finding: Finding) -> str:
+        """Record an early stop in the log; returns the saved output."""
+        footer = stop_footer(finding)
+        if self._file is not None:
+            self._file.write(footer)
+        return self.text + footer
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._dispatch(self.parser.close())
+
+
+def write_output(path: Path, text: str) -> None:
+    """Atomically write an evaluation log file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+
+class AsyncRunner:
+    """Concurrent evaluator runner with per-provider limits."""
+
+    def __init__(
+        self,
+        registry: Optional[CompiledRegistry] = None,
+        concurrency: Optional[Mapping[str, int]] = None,
+        backend: Optional[Backend] = None,
+        log_dir: Path = DEFAULT_LOG_DIR,
+        scheduler: Optional[RateScheduler] = None,
+        spend_log: Optional[Path] = DEFAULT_SPEND_LOG,
+        max_output_tokens: int = DEFAULT_OUTPUT_RESERVE,
+        catalog: Any = None,
+        cache: Optional[ResponseCache] = None,
+        stream: bool = False,
+        on_text: Optional[Callable[[Job, str], None]] = None,
+        on_event: Optional[Callable[[Job, StreamEvent], None]] = None,
+        fail_at: Optional[str] = None,
+        pool: Any = None,
+        resilience: Optional[Resilience] = None,
+    ):
+        self.registry = registry or CompiledRegistry.load()
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.pool = pool  # HTTP connection pool behind the default backend
+        if backend is None:
+            self.pool = pool or HttpPool.shared()
+            backend = thread_backend(self.pool.transport, self.pool.stream)
+        self.backend = backend
+        self.resilience = resilience or Resilience()
+        self.log_dir = Path(log_dir)
+        self.scheduler = scheduler or RateScheduler.shared()
+        self.spend_log = SpendLog(spend_log)
+        self.max_output_tokens = max_output_tokens
+        self._catalog = catalog
+        self.cache = cache
+        self.stream = stream
+        self.on_text = on_text
+        self.on_event = on_event
+        self.fail_at = fail_at  # Default gate-mode severity for new jobs
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def catalog(self) -> Any:
+        if self._catalog is None:
+            from scripts.local.catalog import EvaluatorCatalog
+
+            self._catalog = EvaluatorCatalog.load()
+        return self._catalog
+
+    def config(self, evaluator: Any) -> Dict[str, Any]:
+        """Evaluator config from a catalog name (or ``provider/name``) or mapping."""
+        if isinstance(evaluator, Mapping):
+            return dict(evaluator)
+        entry = self.catalog.get(evaluator)
+        if entry is None:
+            raise ValueError(f"Unknown evaluator: {evaluator}")
+        return entry.full_config()
+
+    def job(
+        self,
+        evaluator: Any,
+        document: Path,
+        output: Optional[Path] = None,
+        content: Optional[bytes] = None,
+        fail_at: Optional[str] = None,
+    ) -> Job:
+        """
+        One job; ``output`` defaults to the evaluator's usual log path.
+
+        ``fail_at`` (default: the runner's) runs the job in gate mode.
+        """
+        config = self.config(evaluator)
+        model = model_for(config, self.registry)
+        if not config.get("model") and model is not None:
+            config["model"] = model.litellm_id
+        return Job(
+            evaluator=str(config.get("name")),
+            config=config,
+            document=Path(document),
+            output_path=output or output_path(config, document, self.log_dir),
+            model=model,
+            content=content,
+            fail_at=fail_at or self.fail_at,
+        )
+
+    def jobs(self, evaluators: Sequence[Any], documents: Sequence[Path]) -> List[Job]:
+        """Expand evaluators (names or configs) x documents into jobs."""
+        configs = [self.config(evaluator) for evaluator in evaluators]
+        return [
+            self.job(config, document) for config in configs for document in documents
+        ]
+
+    def semaphores(self) -> Dict[str, asyncio.Semaphore]:
+        """Per-provider semaphores, shared by every job on the running loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphores = {
+                provider: asyncio.Semaphore(max(1, self.concurrency.get(provider, 1)))
+                for provider in PROVIDERS
+            }
+        return self._semaphores
+
+    def cache_key(self, job: Job) -> str:
+        model = job.model.litellm_id if job.model else str(job.config.get("model"))
+        return ResponseCache.key(job.config, model, self.max_output_tokens, job.source)
+
+    async def run_job(self, job: Job) -> JobResult:
+        """Run one job; errors land in the result (cancellation propagates)."""
+        result = JobResult(job)
+        started = time.monotonic()
+        streaming = self.stream or job.fail_at is not None
+        key = None
+        stopped: Optional[EarlyStop] = None
+        try:
+            result.provider = provider_for(str(job.config.get("model") or ""))
+            if self.cache is not None:
+                key = self.cache_key(job)
+                hit = self.cache.get(key)
+                if hit is not None:
+                    result.output = hit.text
+                    result.cached = True
+                    if streaming:  # Replay so callers see the same events
+                        replay = StreamMonitor(job, self.on_text, self.on_event, False)
+                        try:
+                            replay.feed(hit.text)
+                        except EarlyStop as e:  # Same gate verdict as uncached
+                            result.stopped_by = e.finding
+                            result.output = replay.stop(e.finding)
+                        replay.close()
+                    write_output(job.output_path, f"{hit.marker()}\n\n{result.output}")
+                    result.duration = time.monotonic() - started
+                    return result
+            api_key = api_key_for(job.config, job.model.auth_env if job.model else None)
+            call = build_call(
+                job.config,
+                job.source,
+                api_key,
+                self.max_output_tokens,
+                stream=streaming,
+            )
+            limiter = self.scheduler.for_model(job.model)
+            count = estimator_for(job.model.family if job.model else None)
+            # Counted over the body's mmap windows, never the whole document
+            prompt_tokens = count.count_chunks(call.body_chunks()) if limiter else 0
+            estimate = prompt_tokens + self.max_output_tokens if limiter else 0
+            monitor: Optional[StreamMonitor] = None
+
+            async def send_once() -> Completion:
+                nonlocal monitor, stopped
+                if not streaming:
+                    return await self.backend(call)
+                monitor = StreamMonitor(job, self.on_text, self.on_event)
+                try:
+                    return await self.backend(call, monitor.feed)
+                except EarlyStop as e:
+                    # Usage never arrives for a cancelled stream: estimate it
+                    stopped = e
+                    return Completion(
+                        monitor.stop(e.finding),
+                        prompt_tokens or count.count_chunks(call.body_chunks()),
+                        count(monitor.text.encode("utf-8")),
+                    )
+                finally:
+                    result.output = monitor.text  # Partial text on failure
+                    monitor.close()
+
+            reserved = False
+
+            @contextlib.asynccontextmanager
+            async def slot() -> AsyncIterator[None]:
+                # Each attempt reserves its own tokens (a retry is a new
+                # request), before queueing for the provider slot: a job
+                # waiting on one model's bucket must not hold a slot that
+                # jobs for other models or keys could use
+                nonlocal reserved
+                if limiter is not None:
+                    result.waited += await limiter.acquire_async(estimate)
+                    reserved = True
+                try:
+                    async with self.semaphores()[result.provider]:
+                        yield
+                finally:
+                    if reserved:  # The attempt never ran (circuit open, cancel)
+                        limiter.settle(estimate, 0)
+                        reserved = False
+
+            async def attempt() -> Completion:
+                nonlocal reserved
+                reserved = False  # Settled below from here on
+                try:
+                    completion = await send_once()
+                except BaseException:
+                    if limiter is not None:  # Refund; a retry reserves again
+                        limiter.settle(estimate, 0)
+                    raise
+                if limiter is not None:
+                    used = completion.input_tokens + completion.output_tokens
+                    limiter.settle(estimate, used or estimate)
+                return completion
+
+            # Attempts hold a provider slot; backoff between them does not.
+            # A stream that already delivered text cannot be replayed.
+            completion = await self.resilience.run(
+                result.provider,
+                attempt,
+                limiter,
+                retryable=lambda: monitor is None or not monitor.text,
+                slot=slot,
+            )
+        except Exception as e:  # Reported per job; siblings keep running
+            result.error = f"{type(e).__name__}: {e}"
+            result.duration = time.monotonic() - started
+            return result
+
+        result.output = completion.text
+        result.input_tokens = completion.input_tokens
+        result.output_tokens = completion.output_tokens
+        result.duration = time.monotonic() - started
+        result.stopped_by = stopped.finding if stopped else None
+        if not streaming:  # Streamed output is already on disk
+            write_output(job.output_path, completion.text)
+        if self.cache is not None and key is not None and stopped is None:
+            self.cache.put(
+                key,
+                completion.text,
+                job.evaluator,
+                call.model,
+                completion.input_tokens,
+                completion.output_tokens,
+            )
+        record_spend(
+            job.evaluator,
+            job.model,
+            completion.input_tokens,
+            completion.output_tokens,
+            document=str(job.document),
+            log=self.spend_log,
+        )
+        return result
+
+    async def run(
+        self, evaluators: Sequence[Any], documents: Sequence[Path]
+    ) -> List[JobResult]:
+        """Run every evaluator on every document; results in job order."""
+        return await self.run_jobs(self.jobs(evaluators, documents))
+
+    async def run_jobs(self, jobs: Sequence[Job]) -> List[JobResult]:
+        """Run prepared jobs concurrently; results in job order."""
+        return list(await asyncio.gather(*(self.run_job(job) for job in jobs)))
+
+    def run_sync(
+        self, evaluators: Sequence[Any], documents: Sequence[Path]
+    ) -> List[JobResult]:
+        return asyncio.run(self.run(evaluators, documents))
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """``--no-cache`` / ``--refresh`` options shared by the runner CLIs."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--no-cache", action="store_true", help="Do not read or write cached responses"
+    )
+    group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached responses but store the new ones",
+    )
+
+
+def cache_from_args(args: argparse.Namespace) -> Optional[ResponseCache]:
+    if args.no_cache:
+        return None
+    return ResponseCache(bypass=args.refresh)
+
+
+def parse_concurrency(values: List[str]) -> Dict[str, int]:
+    """``PROVIDER=N`` CLI values as a concurrency mapping."""
+    limits = {}
+    for value in values:
+        provider, _, count = value.partition("=")
+        if provider not in PROVIDERS or not count.isdigit():
+            raise argparse.ArgumentTypeError(f"Expected PROVIDER=N, got '{value}'")
+        limits[provider] = int(count)
+    return limits
+
+
+def parse_severity(value: str) -> str:
+    """``--fail-fast`` value as a canonical severity."""
+    severity = normalize_severity(value)
+    if severity is None:
+        raise argparse.ArgumentTypeError(
+            f"Unknown severity '{value}' (expected one of {', '.join(SEVERITIES)})"
+        )
+    return severity
+
+
+def print_event(job: Job, event: StreamEvent) -> None:
+    """One progress line per streamed finding or verdict."""
+    name = f"{job.evaluator:<20} {job.document.name:<30}"
+    if event.kind == "verdict":
+        print(f"  🏁 {name} {event.verdict}", flush=True)
+    else:
+        finding = event.finding
+        print(f"  🔎 {name} [{finding.severity or '-'}] {finding.title}", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run evaluators over documents concurrently."""
+    parser = argparse.ArgumentParser(
+        prog="runner", description="Concurrent in-process evaluator runner"
+    )
+    parser.add_argument("evaluators", nargs="+", help="Evaluator names")
+    parser.add_argument(
+        "-d",
+        "--documents",
+        nargs="+",
+        required=True,
+        help="Documents or directories (*.md)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        action="append",
+        default=[],
+        help="Per-provider limit, e.g. anthropic=2 (repeatable)",
+    )
+    parser.add_argument("--log-dir", default=str(DEFAULT_LOG_DIR))
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream responses; report findings and verdicts as they arrive",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        metavar="SEVERITY",
+        type=parse_severity,
+        help="Gate mode: stop each review at the first finding this severe or worse",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=RetryPolicy.max_attempts - 1,
+        help="Retries per call after 429, 5xx, timeout or connection errors",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_MAX_PER_HOST,
+        help="Keep-alive connections per provider host",
+    )
+    parser.add_argument(
+        "--http2", action="store_true", help="Use HTTP/2 (needs httpx[http2])"
+    )
+    parser.add_argument(
+        "--pool-stats", action="store_true", help="Print connection pool metrics"
+    )
+    add_cache_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        concurrency = parse_concurrency(args.concurrency)
+    except argparse.ArgumentTypeError as e:
+        print(f"❌ {e}")
+        return 1
+    documents: List[Path] = []
+    for raw in args.documents:
+        path = Path(raw)
+        documents.extend(sorted(path.rglob("*.md")) if path.is_dir() else [path])
+
+    runner = AsyncRunner(
+        concurrency=concurrency,
+        log_dir=Path(args.log_dir),
+        cache=cache_from_args(args),
+        stream=args.stream,
+        fail_at=args.fail_fast,
+        pool=pool_for(PoolConfig(max_per_host=args.pool_size, http2=args.http2)),
+        resilience=Resilience(RetryPolicy(max_attempts=max(1, args.retries + 1))),
+    )
+    try:
+        jobs = runner.jobs(args.evaluators, documents)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if args.stream and len(jobs) == 1:
+        runner.on_text = lambda job, text: print(text, end="", flush=True)
+    elif args.stream:
+        runner.on_event = print_event
+    print(f"Running {len(jobs)} evaluations ({len(documents)} documents)")
+    started = time.monotonic()
+    results = asyncio.run(runner.run_jobs(jobs))
+    for result in results:
+        if result.stopped_by is not None:
+            finding = result.stopped_by
+            print(
+                f"  ⛔ {result.job.evaluator:<20} {result.job.document.name:<30} "
+                f"FAIL at [{finding.severity}] {finding.title} "
+                f"({result.duration:.1f}s)"
+            )
+        elif result.ok:
+            print(
+                f"  {'📦' if result.cached else '✅'} "
+                f"{result.job.evaluator:<20} {result.job.document.name:<30} "
+                f"{result.verdict or '-':<18} {result.duration:6.1f}s"
+            )
+        else:
+            print(
+                f"  ❌ {result.job.evaluator:<20} {result.job.document.name:<30} "
+                f"{result.error}"
+            )
+    failed = sum(1 for r in results if r.failed)
+    cached = sum(1 for r in results if r.cached)
+    print(
+        f"{len(results) - failed}/{len(results)} passed ({cached} cached) in "
+        f"{time.monotonic() - started:.1f}s; logs in {args.log_dir}"
+    )
+    for provider, state in CircuitBreakers.shared().states().items():
+        if state != "closed":
+            print(f"⚡ {provider} circuit {state.replace('_', '-')}")
+    if args.pool_stats:
+        for host, metrics in runner.pool.stats().items():
+            print(
+                f"🔌 {host}: {metrics.requests} requests over {metrics.opened} "
+                f"connections ({metrics.reused} reused, peak {metrics.peak} "
+                f"in use, {metrics.waits} waits)"
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Offline Token Estimator
+=======================
+
+Fast, network-free token counts per model family, for context-fit checks,
+cost prediction and scheduling before any API call is made.
+
+Text is reduced to a handful of byte-class counts in a few C-level passes
+(``bytes.translate`` / ``count`` / ``split``; tens of MB/s), and each family
+profile turns those counts into tokens with a linear model:
+
+    tokens = scale * (per_word * words + per_word_byte * word_bytes
+                      + per_punct * punctuation + per_newline * newlines
+                      + per_non_ascii * non_ascii_bytes)
+
+Profiles exist for the tokenizer families in the registry (gpt, claude,
+gemini, mistral); other registry families map onto them (``o`` uses the gpt
+tokenizer, ``magistral``/``codestral`` the mistral one).
+
+Calibration
+-----------
+Estimates can be calibrated against recorded usage. Each recorded sample adds
+the estimate and the provider-reported token count to running totals in
+``.adversarial/token-calibration.json``; the family's correction factor is
+``actual / estimated``. Record the exact text that was sent.
+
+Usage:
+    from scripts.local.tokens import estimator_for
+
+    count = estimator_for("claude")
+    count(text)                      # -> int, usable as a chunking TokenCounter
+
+    python -m scripts.local.tokens count docs/*.md --family claude
+    python -m scripts.local.tokens calibrate claude prompt.md 18234
+    python -m scripts.local.tokens show
+"""
+
+import argparse
+import json
+import math
+import os
+import string
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+DEFAULT_CALIBRATION = Path(".adversarial") / "token-calibration.json"
+
+# Bump when profiles change; recorded totals from older versions are dropped
+ESTIMATOR_VERSION = 1
+
+# Byte classes: a = ASCII letter/digit, . = ASCII punctuation,
+# u = non-ASCII (UTF-8) byte, space = whitespace/control
+_ALNUM = set((string.ascii_letters + string.digits).encode("ascii"))
+_PUNCT = set(string.punctuation.encode("ascii"))
+_CLASSES = bytes(
+    (0x61 if i in _ALNUM else 0x2E if i in _PUNCT else 0x75 if i >= 0x80 else 0x20)
+    for i in range(256)
+)
+_WORDS = bytes((i if i in _ALNUM else 0x20) for i in range(256))
+
+
+# =============================================================================
+# TEXT STATISTICS
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class TextStats:
+    """Byte-class counts that the estimate is computed from."""
+
+    words: int = 0  # Runs of ASCII letters/digits
+    word_bytes: int = 0
+    punctuation: int = 0
+    newlines: int = 0
+    non_ascii_bytes: int = 0
+
+    @classmethod
+    def of(cls, text: Union[str, bytes]) -> "TextStats":
+        data = text.encode("utf-8") if isinstance(text, str) else text
+        classes = data.translate(_CLASSES)
+        return cls(
+            words=len(data.translate(_WORDS).split()),
+            word_bytes=classes.count(b"a"),
+            punctuation=classes.count(b"."),
+            newlines=data.count(b"\n"),
+            non_ascii_bytes=classes.count(b"u"),
+        )
+
+    @classmethod
+    def scan(cls, chunks: Iterable[bytes]) -> "TextStats":
+        """``of`` over a stream of blocks (e.g. an mmap'd request body)."""
+        total = cls()
+        last = 0x20
+        for chunk in chunks:
+            if not chunk:
+                continue
+            stats = cls.of(chunk)
+            split = last in _ALNUM and chunk[0] in _ALNUM  # One word, two blocks
+            total = cls(
+                total.words + stats.words - split,
+                total.word_bytes + stats.word_bytes,
+                total.punctuation + stats.punctuation,
+                total.newlines + stats.newlines,
+                total.non_ascii_bytes + stats.non_ascii_bytes,
+            )
+            last = chunk[-1]
+        return total
+
+
+# =============================================================================
+# PROFILES
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class TokenProfile:
+    """Linear token model for one tokenizer family."""
+
+    per_word: float = 0.6
+    per_word_byte: float = 0.14
+    per_punct: float = 0.7
+    per_newline: float = 0.4
+    per_non_ascii: float = 0.4
+    scale: float = 1.0
+
+    def raw(self, stats: TextStats) -> float:
+        """Uncalibrated estimate."""
+        return self.scale * (
+            self.per_word * stats.words
+            + self.per_word_byte * stats.word_bytes
+            + self.per_punct * stats.punctuation
+            + self.per_newline * stats.newlines
+            + self.per_non_ascii * stats.non_ascii_bytes
+        )
+
+
+# Relative vocabulary efficiency against the gpt (o200k) baseline
+PROFILES: Dict[str, TokenProfile] = {
+    "gpt": TokenProfile(),
+    "claude": TokenProfile(scale=1.15),
+    "gemini": TokenProfile(scale=0.95),
+    "mistral": TokenProfile(scale=1.05),
+}
+
+# Registry families that share another family's tokenizer
+TOKENIZER_FAMILIES = {
+    "o": "gpt",
+    "magistral": "mistral",
+    "codestral": "mistral",
+}
+
+DEFAULT_FAMILY = "gpt"
+
+
+def tokenizer_family(family: Optional[str]) -> str:
+    """Profile name for a registry family (unknown families use gpt's)."""
+    family = TOKENIZER_FAMILIES.get(family or "", family or "")
+    return family if family in PROFILES else DEFAULT_FAMILY
+
+
+# =============================================================================
+# CALIBRATION
+# =============================================================================
+
+
+class TokenCalibration:
+    """Running estimated/actual totals per family, persisted as JSON."""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_CALIBRATION):
+        self.path = Path(path) if path else None
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._dirty = False
+        if self.path and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("estimator_version") == ESTIMATOR_VERSION:
+                self._totals = data.get("families", {})
+
+    def factor(self, family: str) -> float:
+        """Correction applied on top of the profile (1.0 if uncalibrated)."""
+        totals = self._totals.get(tokenizer_family(family))
+        if not totals or totals.get("estimated", 0) <= 0:
+            return 1.0
+        return totals["actual"] / totals["estimated"]
+
+    def samples(self, family: str) -> int:
+        return int(self._totals.get(tokenizer_family(family), {}).get("samples", 0))
+
+    def record(
+        self, family: str, text: Union[str, bytes, TextStats], actual_tokens: int
+    ) -> float:
+        """
+        Add one observed (text, provider token count) pair.
+
+        Returns:
+            The family's updated correction factor
+        """
+        name = tokenizer_family(family)
+        stats = text if isinstance(text, TextStats) else TextStats.of(text)
+        totals = self._totals.setdefault(
+            name, {"estimated": 0.0, "actual": 0, "samples": 0}
+        )
+        totals["estimated"] += PROFILES[name].raw(stats)
+        totals["actual"] += int(actual_tokens)
+        totals["samples"] += 1
+        self._dirty = True
+        return self.factor(name)
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        payload = {"estimator_version": ESTIMATOR_VERSION, "families": self._totals}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# =============================================================================
+# ESTIMATOR
+# =============================================================================
+
+
+class TokenEstimator:
+    """Callable token counter for one family: ``estimator(text) -> int``."""
+
+    def __init__(self, family: Optional[str] = None, factor: float = 1.0):
+        self.family = tokenizer_family(family)
+        self.profile = PROFILES[self.family]
+        self.factor = factor
+
+    def count_stats(self, stats: TextStats) -> int:
+        return math.ceil(self.profile.raw(stats) * self.factor)
+
+    def __call__(self, text: Union[str, bytes]) -> int:
+        if not text:
+            return 0
+        return max(1, self.count_stats(TextStats.of(text)))
+
+    count = __call__
+
+    def count_chunks(self, chunks: Iterable[bytes]) -> int:
+        """Count a stream of blocks without joining them."""
+        stats = TextStats.scan(chunks)
+        if stats == TextStats():
+            return 0
+        return max(1, self.count_stats(stats))
+
+
+def estimator_for(
+    family: Optional[str],
+    calibration: Union[TokenCalibration, Path, None] = DEFAULT_CALIBRATION,
+) -> TokenEstimator:
+    """Estimator for a registry family, with recorded calibration applied."""
+    if not isinstance(calibration, TokenCalibration):
+        calibration = TokenCalibration(calibration)
+    return TokenEstimator(family, calibration.factor(tokenizer_family(family)))
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Count tokens offline, record calibration samples, show profiles."""
+    parser = argparse.ArgumentParser(
+        prog="tokens", description="Offline token estimates per model family"
+    )
+    parser.add_argument(
+        "--calibration",
+        default=str(DEFAULT_CALIBRATION),
+        help="Calibration totals file",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    count_cmd = sub.add_parser("count", help="Estimate tokens for files")
+    count_cmd.add_argument("files", nargs="+")
+    count_cmd.add_argument("--family", default=DEFAULT_FAMILY)
+
+    cal_cmd = sub.add_parser("calibrate", help="Record provider-reported usage")
+    cal_cmd.add_argument("family")
+    cal_cmd.add_argument("file", help="Exact text that was sent")
+    cal_cmd.add_argument("actual", type=int, help="Provider-reported input tokens")
+
+    sub.add_parser("show", help="Show profiles and calibration")
+    args = parser.parse_args(argv)
+
+    calibration = TokenCalibration(Path(args.calibration))
+
+    if args.command == "count":
+        estimator = estimator_for(args.family, calibration)
+        total = size = 0
+        started = time.perf_counter()
+        for name in args.files:
+            data = Path(name).read_bytes()
+            tokens = estimator(data)
+            total += tokens
+            size += len(data)
+            print(f"{tokens:>10}  {name}")
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(
+            f"{total:>10}  total ({estimator.family}, x{estimator.factor:.3f}; "
+            f"{size / elapsed / 1e6:.1f} MB/s)"
+        )
+        return 0
+
+    if args.command == "calibrate":
+        data = Path(args.file).read_bytes()
+        estimate = estimator_for(args.family, calibration)(data)
+        factor = calibration.record(args.family, data, args.actual)
+        calibration.save()
+        print(
+            f"✅ {tokenizer_family(args.family)}: estimated {estimate}, "
+            f"actual {args.actual}; factor now {factor:.3f} "
+            f"({calibration.samples(args.family)} samples)"
+        )
+        return 0
+
+    for name, profile in PROFILES.items():
+        print(
+            f"{name:<8} scale {profile.scale:.2f}  calibration "
+            f"x{calibration.factor(name):.3f} ({calibration.samples(name)} samples)"
+        )
+    aliases = ", ".join(f"{k}->{v}" for k, v in TOKENIZER_FAMILIES.items())
+    print(f"aliases: {aliases}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
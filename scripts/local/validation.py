@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Evaluator Validation
+====================
+
+Single-pass validation of every evaluator definition, shared by the test
+suite and the ``validate`` CLI.
+
+Each ``evaluator.yml`` is parsed once (through the catalog) and every check
+runs against that parsed object:
+
+    Per file (cached by the file's SHA-256)
+        yaml_valid           File parses to a mapping
+        required_fields      name, description, model, api_key_env, prompt
+        content_placeholder  Prompt contains ``{content}``
+        prompt_compiles      Prompt compiles (no stray placeholders/braces)
+
+    Per tree (recomputed every run; stat calls and dict lookups only)
+        readme / changelog   README.md and CHANGELOG.md next to the definition
+        index_schema         index.json has evaluators, categories, providers
+        in_index             Every evaluator.yml is listed in index.json
+        index_path           Every index.json path exists
+        registry_family      model_requirement.family is in the registry
+        registry_tier        model_requirement.tier is in that family
+        min_version          model_requirement.min_version is a model version
+                             of that tier
+
+Per-file results live in ``.adversarial/cache/validation.json`` for the
+library tree and in ``validation-<dir hash>.json`` beside it for any other
+tree, so validating one tree never prunes another's results. A file whose
+hash is unchanged is not re-checked and its prompt is never loaded, so a run
+over an unchanged tree costs one catalog refresh plus the tree checks.
+
+Usage:
+    from scripts.local.validation import validate
+
+    report = validate()
+    for issue in report.issues:
+        print(issue)
+
+    python -m scripts.local.validation
+    python -m scripts.local.validation --no-cache
+
+Exit codes:
+    0 - All checks passed
+    1 - One or more issues found
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from scripts.local.catalog import (
+    DEFAULT_CACHE_DIR,
+    EVALUATORS_DIR,
+    EvaluatorCatalog,
+    EvaluatorEntry,
+)
+from scripts.local.prompt_template import CONTENT_SLOT, TemplateError, compile_prompt
+from scripts.local.registry import REGISTRY_PATH, CompiledRegistry
+
+DEFAULT_RESULTS_CACHE = DEFAULT_CACHE_DIR / "validation.json"
+
+# Required fields in evaluator YAML
+REQUIRED_FIELDS = ["name", "description", "model", "api_key_env", "prompt"]
+INDEX_SECTIONS = ["evaluators", "categories", "providers"]
+
+# Bump when per-file checks change; cached results from older versions are dropped
+VALIDATOR_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Issue:
+    """One failed check. ``path`` is relative to evaluators/ ("" for tree-wide)."""
+
+    check: str
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        where = f"{self.path}: " if self.path else ""
+        return f"[{self.check}] {where}{self.message}"
+
+
+@dataclass
+class ValidationReport:
+    """All issues from one validation run."""
+
+    issues: List[Issue] = field(default_factory=list)
+    checked: int = 0
+    from_cache: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def issues_for(self, path: str = "", check: Optional[str] = None) -> List[Issue]:
+        """Issues for one evaluator path (or tree-wide), optionally one check."""
+        return [
+            i
+            for i in self.issues
+            if i.path == path and (check is None or i.check == check)
+        ]
+
+    def by_check(self, check: str) -> List[Issue]:
+        return [i for i in self.issues if i.check == check]
+
+
+# =============================================================================
+# PER-FILE CHECKS
+# =============================================================================
+
+
+def check_definition(entry: EvaluatorEntry) -> List[Issue]:
+    """Checks that depend only on the file's own contents."""
+    if entry.error:
+        return [Issue("yaml_valid", entry.path, entry.error)]
+
+    issues = []
+    config = entry.full_config()
+    for name in REQUIRED_FIELDS:
+        if config.get(name) is None:
+            issues.append(
+                Issue("required_fields", entry.path, f"Missing required field '{name}'")
+            )
+
+    prompt = config.get("prompt")
+    if not isinstance(prompt, str):
+        return issues
+    if "{" + CONTENT_SLOT + "}" not in prompt:
+        issues.append(
+            Issue(
+                "content_placeholder",
+                entry.path,
+                "Prompt missing {content} placeholder",
+            )
+        )
+    try:
+        compile_prompt(prompt)
+    except TemplateError as e:
+        issues.append(Issue("prompt_compiles", entry.path, str(e)))
+    return issues
+
+
+class _ResultCache:
+    """Per-file issues keyed by the evaluator file's SHA-256."""
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self._results: Dict[str, List[Dict[str, str]]] = {}
+        self._dirty = False
+        if path and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("validator_version") == VALIDATOR_VERSION:
+                self._results = data.get("results", {})
+
+    def get(self, entry: EvaluatorEntry) -> Optional[List[Issue]]:
+        cached = self._results.get(entry.sha256)
+        if cached is None:
+            return None
+        # Same content may live at another path (copied evaluator)
+        return [Issue(r["check"], entry.path, r["message"]) for r in cached]
+
+    def put(self, entry: EvaluatorEntry, issues: List[Issue]) -> None:
+        self._results[entry.sha256] = [
+            {"check": i.check, "message": i.message} for i in issues
+        ]
+        self._dirty = True
+
+    def prune(self, keep: List[str]) -> None:
+        stale = set(self._results) - set(keep)
+        for digest in stale:
+            del self._results[digest]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        payload = {"validator_version": VALIDATOR_VERSION, "results": self._results}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def results_cache_for(evaluators_dir: Path, cache_path: Path) -> Path:
+    """``cache_path`` for the library tree; a per-tree sibling for any other."""
+    resolved = Path(evaluators_dir).resolve()
+    if resolved == EVALUATORS_DIR.resolve():
+        return cache_path
+    digest = hashlib.sha256(str(resolved).encode("utf-8")).hexdigest()[:12]
+    return cache_path.with_name(f"{cache_path.stem}-{digest}{cache_path.suffix}")
+
+
+# =============================================================================
+# TREE CHECKS
+# =============================================================================
+
+
+def check_docs(catalog: EvaluatorCatalog) -> List[Issue]:
+    issues = []
+    for entry in catalog.entries():
+        definition = catalog.evaluators_dir / entry.path
+        for check, filename in (("readme", "README.md"), ("changelog", "CHANGELOG.md")):
+            if not definition.with_name(filename).exists():
+                issues.append(Issue(check, entry.path, f"Missing {filename}"))
+    return issues
+
+
+def check_index(catalog: EvaluatorCatalog) -> List[Issue]:
+    index = catalog.index
+    issues = [
+        Issue("index_schema", "", f"index.json has no '{section}' section")
+        for section in INDEX_SECTIONS
+        if section not in index
+    ]
+    indexed = {r.get("path") for r in index.get("evaluators", [])}
+    for entry in catalog.entries():
+        if entry.path not in indexed:
+            issues.append(Issue("in_index", entry.path, "Not listed in index.json"))
+    for record in index.get("evaluators", []):
+        path = record.get("path", "")
+        if not (catalog.evaluators_dir / path).is_file():
+            issues.append(
+                Issue("index_path", "", f"Index references non-existent path: {path}")
+            )
+    return issues
+
+
+def check_registry(
+    catalog: EvaluatorCatalog, registry: CompiledRegistry
+) -> List[Issue]:
+    """model_requirement family/tier/min_version resolve against the registry."""
+    issues = []
+    for entry in catalog.entries():
+        requirement = entry.config.get("model_requirement")
+        if not requirement:
+            continue
+        if not isinstance(requirement, dict):
+            issues.append(
+                Issue(
+                    "registry_family", entry.path, "model_requirement must be a mapping"
+                )
+            )
+            continue
+        family, tier = requirement.get("family"), requirement.get("tier")
+        if registry.family(family) is None:
+            issues.append(
+                Issue("registry_family", entry.path, f"Family {family} not in registry")
+            )
+            continue
+        if not registry.has_tier(family, tier):
+            issues.append(
+                Issue(
+                    "registry_tier", entry.path, f"Tier {family}/{tier} not in registry"
+                )
+            )
+            continue
+        min_version = requirement.get("min_version")
+        if min_version is None:
+            continue
+        versions = registry.versions(family, tier)
+        if str(min_version) not in versions:
+            issues.append(
+                Issue(
+                    "min_version",
+                    entry.path,
+                    f"min_version {min_version} not found in registry "
+                    f"{family}/{tier}. Available: {versions}",
+                )
+            )
+    return issues
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+
+def validate(
+    catalog: Optional[EvaluatorCatalog] = None,
+    registry_path: Optional[Path] = REGISTRY_PATH,
+    cache_path: Optional[Path] = DEFAULT_RESULTS_CACHE,
+) -> ValidationReport:
+    """
+    Run every check over the catalog.
+
+    Args:
+        catalog: Catalog to validate (default: the library catalog)
+        registry_path: Provider registry; ``None`` skips registry checks
+        cache_path: Per-file results cache for the library tree (other trees
+            use a sibling file, see ``results_cache_for``); the compiled
+            registry is cached in the same directory. ``None`` disables both
+    """
+    catalog = catalog or EvaluatorCatalog.load()
+    cache = _ResultCache(
+        results_cache_for(catalog.evaluators_dir, Path(cache_path))
+        if cache_path
+        else None
+    )
+    report = ValidationReport()
+
+    for entry in catalog.entries():
+        issues = cache.get(entry)
+        if issues is None:
+            issues = check_definition(entry)
+            cache.put(entry, issues)
+        else:
+            report.from_cache += 1
+        report.checked += 1
+        report.issues.extend(issues)
+    cache.prune([e.sha256 for e in catalog.entries()])
+    cache.save()
+
+    report.issues.extend(check_docs(catalog))
+    report.issues.extend(check_index(catalog))
+    if registry_path is not None:
+        # The library registry itself, not a project's overrides
+        registry = CompiledRegistry.load(
+            registry_path,
+            cache_dir=Path(cache_path).parent if cache_path else None,
+            overrides=None,
+        )
+        report.issues.extend(check_registry(catalog, registry))
+    return report
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Validate evaluator definitions, index.json and registry alignment."""
+    parser = argparse.ArgumentParser(
+        prog="validate", description="Validate evaluator definitions"
+    )
+    parser.add_argument(
+        "evaluators_dir",
+        nargs="?",
+        default=str(EVALUATORS_DIR),
+        help="Evaluators directory (default: library evaluators/)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every file")
+    parser.add_argument("--json", action="store_true", help="Print issues as JSON")
+    args = parser.parse_args(argv)
+
+    evaluators_dir = Path(args.evaluators_dir)
+    if not evaluators_dir.is_dir():
+        print(f"❌ Evaluators directory not found: {evaluators_dir}")
+        return 1
+
+    report = validate(
+        EvaluatorCatalog.load(evaluators_dir),
+        cache_path=None if args.no_cache else DEFAULT_RESULTS_CACHE,
+    )
+    if args.json:
+        print(json.dumps([asdict(i) for i in report.issues], indent=2))
+    else:
+        for issue in report.issues:
+            print(f"❌ {issue}")
+        if report.ok:
+            print(
+                f"✅ {report.checked} evaluators valid "
+                f"({report.from_cache} from cache)"
+            )
+        else:
+            print(f"⚠️  {len(report.issues)} issues in {report.checked} evaluators")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
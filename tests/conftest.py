@@ -0,0 +1,80 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from scripts.local.catalog import DEFAULT_CACHE_DIR, EVALUATORS_DIR, EvaluatorCatalog
+from scripts.local.rate_limit import RateScheduler
+from scripts.local.registry import DEFAULT_OVERRIDES, REGISTRY_PATH, CompiledRegistry
+from scripts.local.resilience import CircuitBreakers, Resilience
+from scripts.local.runner import AsyncRunner
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep CLI catalog and registry caches out of .adversarial/cache."""
+    monkeypatch.setenv("EVALUATOR_CATALOG_CACHE", str(tmp_path / "catalog.json"))
+    original = CompiledRegistry.load
+
+    def load(
+        path=REGISTRY_PATH, cache_dir=DEFAULT_CACHE_DIR, overrides=DEFAULT_OVERRIDES
+    ):
+        if cache_dir == DEFAULT_CACHE_DIR:
+            cache_dir = tmp_path / "registry"
+        return original(path, cache_dir, overrides)
+
+    monkeypatch.setattr(CompiledRegistry, "load", load)
+
+
+@pytest.fixture(scope="module")
+def registry():
+    """The library registry, compiled without the disk cache."""
+    return CompiledRegistry.load(REGISTRY_PATH, None)
+
+
+@pytest.fixture(scope="module")
+def catalog(tmp_path_factory):
+    """The library catalog, snapshotted under a tmp dir."""
+    snapshot = tmp_path_factory.mktemp("cache") / "catalog.json"
+    return EvaluatorCatalog.load(EVALUATORS_DIR, snapshot)
+
+
+@pytest.fixture
+def api_keys(monkeypatch):
+    """Placeholder keys for every provider the library evaluators use."""
+    for name in (
+        "ANTHROPIC_API_KEY",
+        "GEMINI_API_KEY",
+        "MISTRAL_API_KEY",
+        "OPENAI_API_KEY",
+    ):
+        monkeypatch.setenv(name, "test-key")
+
+
+async def no_sleep(seconds):
+    pass
+
+
+@pytest.fixture
+def make_runner(registry, catalog, tmp_path):
+    """
+    Factory for an ``AsyncRunner`` that logs under ``tmp_path``.
+
+    Retries skip their backoff and circuit breakers are not shared between
+    tests. Keyword arguments (``registry`` included) override the defaults.
+    """
+
+    def make(backend=None, **kwargs):
+        kwargs.setdefault("registry", registry)
+        kwargs.setdefault(
+            "resilience", Resilience(breakers=CircuitBreakers(), sleep=no_sleep)
+        )
+        return AsyncRunner(
+            backend=backend,
+            log_dir=tmp_path / "logs",
+            scheduler=RateScheduler(),
+            spend_log=tmp_path / "spend.jsonl",
+            catalog=catalog,
+            **kwargs,
+        )
+
+    return make
@@ -0,0 +1,296 @@
+"""
+Tests for provider batch execution against a local fake batch server.
+
+Usage:
+    pytest tests/test_batch.py -v
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.local.batch import DONE, FAILED, PENDING, BatchExecutor, BatchRun
+from scripts.local.cost import SpendLog
+from scripts.local.providers import Completion
+from scripts.local.response_cache import ResponseCache
+
+REVIEW = "### [LOW]: Typo\n\n**Verdict**: APPROVED"
+
+
+class FakeBatchServer:
+    """
+    Stand-in for the OpenAI and Anthropic batch endpoints.
+
+    Batches stay in progress until ``ready`` is set. Requests whose prompt
+    contains FAILME come back as per-request errors.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.batches = {}  # id -> list of (custom_id, request body)
+        self.files = {}  # id -> JSONL bytes
+        self.auth = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, data, status=200):
+                payload = data if isinstance(data, bytes) else json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                server.auth.append(
+                    self.headers.get("x-api-key") or self.headers.get("Authorization")
+                )
+                if self.path == "/v1/messages/batches":
+                    requests = json.loads(body)["requests"]
+                    batch_id = f"msgbatch_{len(server.batches)}"
+                    server.batches[batch_id] = [
+                        (r["custom_id"], r["params"]) for r in requests
+                    ]
+                    self._reply({"id": batch_id, "processing_status": "in_progress"})
+                elif self.path == "/v1/files":
+                    assert b'name="purpose"\r\n\r\nbatch' in body
+                    content = body.split(b"\r\n\r\n", 2)[2].rsplit(b"\r\n--", 1)[0]
+                    file_id = f"file-{len(server.files)}"
+                    server.files[file_id] = content
+                    self._reply({"id": file_id})
+                elif self.path == "/v1/batches":
+                    spec = json.loads(body)
+                    assert spec["endpoint"] == "/v1/chat/completions"
+                    lines = server.files[spec["input_file_id"]].splitlines()
+                    batch_id = f"batch_{len(server.batches)}"
+                    server.batches[batch_id] = [
+                        (entry["custom_id"], entry["body"])
+                        for entry in map(json.loads, lines)
+                    ]
+                    self._reply({"id": batch_id, "status": "validating"})
+                else:
+                    self._reply({"error": "not found"}, 404)
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if self.path.startswith("/v1/messages/batches/"):
+                    info = {"id": parts[-1], "processing_status": "in_progress"}
+                    if server.ready:
+                        info["processing_status"] = "ended"
+                        info["results_url"] = f"{server.url}/results/{parts[-1]}"
+                    self._reply(info)
+                elif self.path.startswith("/v1/batches/"):
+                    info = {"id": parts[-1], "status": "in_progress"}
+                    if server.ready:
+                        info.update(
+                            status="completed",
+                            output_file_id=f"out-{parts[-1]}",
+                            error_file_id=f"err-{parts[-1]}",
+                        )
+                    self._reply(info)
+                elif parts[0] == "results":
+                    self._reply(server.anthropic_results(parts[1]))
+                elif parts[:2] == ["v1", "files"] and parts[-1] == "content":
+                    kind, batch_id = parts[2].split("-", 1)
+                    self._reply(server.openai_results(batch_id, kind == "err"))
+                else:
+                    self._reply({"error": "not found"}, 404)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @staticmethod
+    def failing(body):
+        return "FAILME" in json.dumps(body)
+
+    def anthropic_results(self, batch_id):
+        lines = []
+        for custom_id, body in self.batches[batch_id]:
+            if self.failing(body):
+                result = {"type": "errored", "error": {"type": "invalid_request"}}
+            else:
+                message = {
+                    "content": [{"type": "text", "text": REVIEW}],
+                    "usage": {"input_tokens": 1000, "output_tokens": 200},
+                }
+                result = {"type": "succeeded", "message": message}
+            lines.append(json.dumps({"custom_id": custom_id, "result": result}))
+        return "\n".join(lines).encode()
+
+    def openai_results(self, batch_id, errors):
+        lines = []
+        for custom_id, body in self.batches[batch_id]:
+            if self.failing(body) != errors:
+                continue
+            if errors:
+                response = {"status_code": 400, "body": {"error": "bad request"}}
+            else:
+                response = {
+                    "status_code": 200,
+                    "body": {
+                        "choices": [{"message": {"content": REVIEW}}],
+                        "usage": {"prompt_tokens": 1000, "completion_tokens": 200},
+                    },
+                }
+            lines.append(json.dumps({"custom_id": custom_id, "response": response}))
+        return "\n".join(lines).encode()
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    for name in ("ANTHROPIC_API_KEY", "GEMINI_API_KEY", "OPENAI_API_KEY"):
+        monkeypatch.setenv(name, f"key-{name[:3].lower()}")
+    with FakeBatchServer() as fake:
+        for provider in ("OPENAI", "ANTHROPIC"):
+            monkeypatch.setenv(f"ADVERSARIAL_{provider}_BASE_URL", fake.url)
+        yield fake
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = []
+    for i, text in enumerate(["Fine.", "Has FAILME inside.", "Also fine."]):
+        path = tmp_path / f"doc{i}.md"
+        path.write_text(f"# Doc {i}\n\n{text}\n")
+        paths.append(path)
+    return paths
+
+
+def make_executor(make_runner, tmp_path, **kwargs):
+    live = []
+
+    async def backend(call):
+        live.append(call.provider)
+        await asyncio.sleep(0)
+        return Completion("**Verdict**: APPROVED", 10, 2)
+
+    executor = BatchExecutor(
+        make_runner(backend, **kwargs), state_dir=tmp_path / "batches"
+    )
+    return executor, live
+
+
+class TestAnthropicBatch:
+    def test_submit_poll_and_collect(self, make_runner, tmp_path, server, documents):
+        executor, _ = make_executor(make_runner, tmp_path)
+
+        run = executor.submit(["claude-quick"], documents, name="nightly")
+
+        (batch,) = run.batches
+        assert batch.provider == "anthropic" and len(batch.requests) == 3
+        assert server.auth == ["key-ant"]
+        assert "key-ant" not in (tmp_path / "batches" / "nightly.json").read_text()
+        assert executor.poll(run).counts()[PENDING] == 3
+
+        server.ready = True
+        # A later process picks the run up from its state file
+        later, _ = make_executor(make_runner, tmp_path)
+        run = later.poll(later.load("nightly"))
+
+        assert run.finished
+        assert [r.status for r in run.batches[0].requests] == [DONE, FAILED, DONE]
+        assert "errored" in run.batches[0].requests[1].error
+        log = tmp_path / "logs" / "doc0-claude-quick.md"
+        assert log.read_text() == REVIEW
+        assert not (tmp_path / "logs" / "doc1-claude-quick.md").exists()
+
+    def test_spend_recorded_at_batch_price(
+        self, make_runner, tmp_path, server, documents
+    ):
+        executor, _ = make_executor(make_runner, tmp_path)
+        run = executor.submit(["claude-quick"], documents[:1])
+        server.ready = True
+
+        executor.wait(run, interval=0)
+
+        (record,) = SpendLog(tmp_path / "spend.jsonl").records()
+        # claude-haiku-4-5 lists at $1 / $5 per million tokens
+        assert record.cost == pytest.approx((1000 * 1 + 200 * 5) / 1e6 / 2)
+        assert record.run_id == f"batch:{run.name}"
+
+
+class TestOpenAIBatch:
+    def test_file_upload_and_error_file(self, make_runner, tmp_path, server, documents):
+        executor, _ = make_executor(make_runner, tmp_path)
+        run = executor.submit(["fast-check"], documents)
+        server.ready = True
+
+        run = executor.poll(run)
+
+        (batch_id,) = server.batches
+        assert server.batches[batch_id][0][1]["model"] == "gpt-5.4-nano"
+        assert server.auth == ["Bearer key-ope", "Bearer key-ope"]
+        assert run.counts() == {PENDING: 0, DONE: 2, FAILED: 1}
+        assert "HTTP 400" in run.batches[0].requests[1].error
+        assert (tmp_path / "logs" / "doc2-fast-check.md").read_text() == REVIEW
+
+
+class TestSubmit:
+    def test_unsupported_provider_runs_interactively(
+        self, make_runner, tmp_path, server, documents
+    ):
+        executor, live = make_executor(make_runner, tmp_path)
+
+        run = executor.submit(["claude-quick", "gemini-flash"], documents[:1])
+
+        assert [b.provider for b in run.batches] == ["anthropic"]
+        assert live == ["gemini"]
+        assert [r.ok for r in executor.interactive] == [True]
+
+        executor, live = make_executor(make_runner, tmp_path)
+        executor.submit(["gemini-flash"], documents[:1], batch_only=True)
+        assert live == [] and executor.interactive == []
+
+    def test_collected_results_fill_response_cache(
+        self, make_runner, tmp_path, server, documents
+    ):
+        cache = ResponseCache(tmp_path / "responses")
+        executor, live = make_executor(make_runner, tmp_path, cache=cache)
+        run = executor.submit(["claude-quick"], documents[:1])
+        server.ready = True
+        executor.poll(run)
+
+        again = executor.submit(["claude-quick"], documents[:1])
+
+        assert again.batches == []
+        assert [r.cached for r in executor.interactive] == [True]
+        assert live == []
+
+    def test_pending_run_not_overwritten(
+        self, make_runner, tmp_path, server, documents
+    ):
+        executor, _ = make_executor(make_runner, tmp_path)
+        first = executor.submit(["claude-quick"], documents[:1])
+        second = executor.submit(["claude-quick"], documents[:1])
+        executor.submit(["claude-quick"], documents[:1], name="nightly")
+
+        with pytest.raises(ValueError, match="1 pending"):
+            executor.submit(["claude-quick"], documents[:1], name="nightly")
+        assert first.name != second.name
+        assert len(server.batches) == 3
+
+        server.ready = True
+        executor.poll(executor.load("nightly"))
+        executor.submit(["claude-quick"], documents[:1], name="nightly")
+
+    def test_state_round_trip(self, make_runner, tmp_path, server, documents):
+        executor, _ = make_executor(make_runner, tmp_path)
+        run = executor.submit(["claude-quick"], documents[:2], name="r1")
+
+        loaded = BatchRun.load(tmp_path / "batches" / "r1.json")
+
+        assert loaded == run
+        assert [r.name for r in executor.runs()] == ["r1"]
@@ -0,0 +1,222 @@
+"""
+Tests for the compiled evaluator catalog.
+
+Usage:
+    pytest tests/test_catalog.py -v
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from scripts.local.catalog import (
+    EVALUATORS_DIR,
+    SNAPSHOT_VERSION,
+    EvaluatorCatalog,
+    main,
+)
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def evaluators_dir(tmp_path):
+    """A small evaluators tree copied from the real library."""
+    root = tmp_path / "evaluators"
+    for rel in ["openai/fast-check", "anthropic/claude-quick"]:
+        shutil.copytree(EVALUATORS_DIR / rel, root / rel)
+    shutil.copy(EVALUATORS_DIR / "index.json", root / "index.json")
+    return root
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return tmp_path / "cache" / "catalog.json"
+
+
+# =============================================================================
+# SNAPSHOT TESTS
+# =============================================================================
+
+
+class TestCatalogSnapshot:
+    """Snapshot build and incremental refresh."""
+
+    def test_first_load_parses_everything(self, evaluators_dir, snapshot):
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        assert catalog.parsed_count == 2
+        assert sorted(catalog.names()) == ["claude-quick", "fast-check"]
+        assert snapshot.exists()
+
+    def test_second_load_parses_nothing(self, evaluators_dir, snapshot):
+        EvaluatorCatalog.load(evaluators_dir, snapshot)
+        before = snapshot.stat().st_mtime_ns
+
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        assert catalog.parsed_count == 0
+        assert catalog.get("fast-check").config["model"] == "gpt-5.4-nano"
+        assert snapshot.stat().st_mtime_ns == before  # Not rewritten
+
+    def test_only_modified_file_is_reparsed(self, evaluators_dir, snapshot):
+        EvaluatorCatalog.load(evaluators_dir, snapshot)
+        target = evaluators_dir / "openai/fast-check/evaluator.yml"
+        target.write_text(target.read_text().replace("timeout:", "timeout: 99 #"))
+
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        assert catalog.parsed_count == 1
+        assert catalog.get("fast-check").config["timeout"] == 99
+
+    def test_touched_but_unchanged_file_is_not_reparsed(self, evaluators_dir, snapshot):
+        EvaluatorCatalog.load(evaluators_dir, snapshot)
+        target = evaluators_dir / "openai/fast-check/evaluator.yml"
+        st = target.stat()
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        assert catalog.parsed_count == 0
+
+    def test_removed_evaluator_drops_out(self, evaluators_dir, snapshot):
+        EvaluatorCatalog.load(evaluators_dir, snapshot)
+        shutil.rmtree(evaluators_dir / "anthropic/claude-quick")
+
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        assert catalog.names() == ["fast-check"]
+
+    def test_corrupt_snapshot_is_rebuilt(self, evaluators_dir, snapshot):
+        snapshot.parent.mkdir(parents=True)
+        snapshot.write_text("{not json")
+
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        assert catalog.parsed_count == 2
+        assert json.loads(snapshot.read_text())["snapshot_version"] == SNAPSHOT_VERSION
+
+    def test_index_is_loaded(self, evaluators_dir, snapshot):
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        record = catalog.index_record("fast-check")
+        assert record["category"] == "quick-check"
+
+
+# =============================================================================
+# LAZY PROMPT TESTS
+# =============================================================================
+
+
+class TestLazyPrompts:
+    """Metadata is eager, prompt bodies load on first use."""
+
+    def test_snapshot_excludes_prompts(self, evaluators_dir, snapshot):
+        EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        files = json.loads(snapshot.read_text())["files"]
+        assert all("prompt" not in f["config"] for f in files.values())
+        assert len(list((snapshot.parent / "prompts").glob("*.txt"))) == 2
+
+    def test_prompt_not_loaded_until_accessed(self, evaluators_dir, snapshot):
+        EvaluatorCatalog.load(evaluators_dir, snapshot)
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+        entry = catalog.get("fast-check")
+
+        assert entry.config["output_suffix"]
+        assert not entry.prompt_loaded
+        assert "{content}" in entry.prompt
+        assert entry.prompt_loaded
+
+    def test_missing_blob_falls_back_to_yaml(self, evaluators_dir, snapshot):
+        EvaluatorCatalog.load(evaluators_dir, snapshot)
+        shutil.rmtree(snapshot.parent / "prompts")
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        assert "{content}" in catalog.get("claude-quick").prompt
+        assert (snapshot.parent / "prompts").exists()  # Blob restored
+
+    def test_missing_blob_and_changed_yaml_refresh_entry(
+        self, evaluators_dir, snapshot
+    ):
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+        entry = catalog.get("claude-quick")
+        stale = entry.fingerprint
+        shutil.rmtree(snapshot.parent / "prompts")
+        path = evaluators_dir / entry.path
+        path.write_text(path.read_text().replace("{content}", "EDITED {content}"))
+
+        config = entry.full_config()
+
+        assert "EDITED {content}" in config["prompt"]
+        assert entry.fingerprint != stale
+        fresh = EvaluatorCatalog.load(evaluators_dir, snapshot)
+        assert fresh.parsed_count == 0
+        assert fresh.get("claude-quick").fingerprint == entry.fingerprint
+
+    def test_full_config_includes_prompt(self, evaluators_dir, snapshot):
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+        config = catalog.get("fast-check").full_config()
+
+        assert set(config) >= {"name", "model", "prompt"}
+
+    def test_filter_by_provider_and_category(self, evaluators_dir, snapshot):
+        catalog = EvaluatorCatalog.load(evaluators_dir, snapshot)
+
+        assert [e.name for e in catalog.filter(provider="anthropic")] == [
+            "claude-quick"
+        ]
+        assert len(catalog.filter(category="quick-check")) == 2
+        assert catalog.filter(category="code-review") == []
+
+
+# =============================================================================
+# LOOKUP TESTS
+# =============================================================================
+
+
+class TestCatalogLookup:
+    """Lookups against the real library."""
+
+    @pytest.fixture
+    def catalog(self, tmp_path):
+        return EvaluatorCatalog.load(EVALUATORS_DIR, tmp_path / "catalog.json")
+
+    def test_all_evaluators_present(self, catalog):
+        assert len(catalog) == len(list(EVALUATORS_DIR.glob("**/evaluator.yml")))
+
+    def test_get_by_provider_path(self, catalog):
+        entry = catalog.get("openai/o3-chain")
+
+        assert entry.name == "o3-chain"
+        assert entry.provider == "openai"
+
+    def test_unknown_name(self, catalog):
+        assert catalog.get("does-not-exist") is None
+        assert "does-not-exist" not in catalog
+
+    def test_cli_list_filters_by_category(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setenv("EVALUATOR_CATALOG_CACHE", str(tmp_path / "c.json"))
+
+        assert main(["list", "--category", "arch-review"]) == 0
+
+        out = capsys.readouterr().out
+        assert "claude-arch" in out
+        assert "fast-check" not in out
+
+    def test_cli_show_unknown(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setenv("EVALUATOR_CATALOG_CACHE", str(tmp_path / "c.json"))
+
+        assert main(["show", "nope"]) == 1
+
+
+def test_entry_paths_are_posix(tmp_path):
+    catalog = EvaluatorCatalog.load(EVALUATORS_DIR, tmp_path / "catalog.json")
+    assert all("\\" not in e.path for e in catalog.entries())
+    assert all(Path(e.path).name == "evaluator.yml" for e in catalog.entries())
@@ -0,0 +1,169 @@
+"""
+Tests for context-window-aware document chunking.
+
+Usage:
+    pytest tests/test_chunking.py -v
+"""
+
+import pytest
+
+from scripts.local.chunking import (
+    ChunkingError,
+    chunk_document,
+    context_window_for,
+    estimate_tokens,
+    main,
+    plan_for_evaluator,
+)
+from scripts.local.tokens import estimator_for
+
+FENCE = "```"
+
+
+def _section(i, paragraphs=3, code_lines=20):
+    words = ("word " * 80 + "\n\n") * paragraphs
+    code = f"{FENCE}python\n" + "x = 1\n" * code_lines + f"{FENCE}\n\n"
+    return f"## Section {i}\n\n{words}{code}"
+
+
+DOCUMENT = "# Title\n\nintro\n\n" + "".join(_section(i) for i in range(10))
+
+
+class TestChunkDocument:
+    """Boundary selection, budgets and overlap."""
+
+    def test_small_document_is_one_chunk(self):
+        chunks = chunk_document("# Small\n\ntext\n", budget=100)
+
+        assert len(chunks) == 1
+        assert chunks[0].overlap == 0
+
+    def test_bodies_reassemble_document(self):
+        chunks = chunk_document(DOCUMENT, budget=400, overlap=30)
+
+        assert "".join(c.body for c in chunks) == DOCUMENT
+        assert [c.index for c in chunks] == list(range(len(chunks)))
+
+    def test_chunks_fit_budget(self):
+        for chunk in chunk_document(DOCUMENT, budget=400, overlap=30):
+            assert chunk.tokens <= 400
+
+    def test_prefers_heading_boundaries(self):
+        chunks = chunk_document(DOCUMENT, budget=400, overlap=0)
+
+        assert all(c.body.startswith("## Section") for c in chunks[1:])
+
+    def test_code_blocks_are_not_split(self):
+        for chunk in chunk_document(DOCUMENT, budget=150, overlap=0):
+            assert chunk.body.count(FENCE) % 2 == 0
+
+    def test_overlap_repeats_previous_tail(self):
+        chunks = chunk_document(DOCUMENT, budget=400, overlap=40)
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk.overlap > 0
+            assert previous.text.endswith(chunk.text[: chunk.overlap])
+
+    def test_oversized_paragraph_splits_by_line(self):
+        text = "".join(f"line {i} " * 10 + "\n" for i in range(200))
+
+        chunks = chunk_document(text, budget=100, overlap=0)
+
+        assert len(chunks) > 1
+        assert "".join(c.body for c in chunks) == text
+        assert all(c.body.endswith("\n") for c in chunks)
+
+    def test_single_giant_line(self):
+        text = "x" * 10_000
+
+        chunks = chunk_document(text, budget=500, overlap=0)
+
+        assert "".join(c.body for c in chunks) == text
+        assert all(c.tokens <= 500 for c in chunks)
+
+    @pytest.mark.parametrize("overlap", [0, 2])
+    def test_non_additive_counts_stay_in_budget(self, overlap):
+        # One extra token per paragraph break inside the counted text
+        def count(text):
+            return len(text.split()) + text.strip().count("\n\n")
+
+        text = "".join(f"w{i} w{i}\n\n" for i in range(12))
+
+        chunks = chunk_document(text, budget=4, overlap=overlap, count_tokens=count)
+
+        assert "".join(c.body for c in chunks) == text
+        assert all(c.tokens == count(c.text) <= 4 for c in chunks)
+
+    def test_headings_inside_code_are_ignored(self):
+        text = f"{FENCE}\n# not a heading\n{FENCE}\n"
+
+        assert len(chunk_document(text * 40, budget=30, overlap=0)) > 1
+        for chunk in chunk_document(text * 40, budget=30, overlap=0):
+            assert not chunk.body.startswith("# not")
+
+    def test_non_positive_budget(self):
+        with pytest.raises(ChunkingError):
+            chunk_document("text", budget=0)
+
+
+class TestPlanForEvaluator:
+    """Budgets derived from the registry context_window."""
+
+    def test_explicit_model_window(self, catalog, registry):
+        config = catalog.get("claude-quick").full_config()
+
+        assert context_window_for(config, registry) == 200000
+
+    def test_requirement_fallback(self, registry):
+        config = {"model_requirement": {"family": "o", "tier": "flagship"}}
+
+        assert context_window_for(config, registry) == 200000
+
+    def test_budget_subtracts_prompt_and_reserve(self, catalog, registry):
+        config = catalog.get("codestral-code").full_config()
+
+        plan = plan_for_evaluator(
+            config, "short", registry, output_reserve=1000, count_tokens=estimate_tokens
+        )
+
+        prompt = estimate_tokens(config["prompt"].replace("{content}", ""))
+        assert plan.budget == 32000 - prompt - 1000
+        assert not plan.needs_chunking
+
+    def test_default_counter_is_family_estimator(self, catalog, registry):
+        config = catalog.get("codestral-code").full_config()
+
+        plan = plan_for_evaluator(config, "short", registry, output_reserve=1000)
+
+        count = estimator_for("codestral", calibration=None)
+        prompt = count(config["prompt"].replace("{content}", ""))
+        assert plan.budget == 32000 - prompt - 1000
+
+    def test_large_document_is_chunked(self, catalog, registry):
+        config = catalog.get("codestral-code").full_config()
+        text = DOCUMENT * 40
+
+        plan = plan_for_evaluator(config, text, registry)
+
+        assert plan.needs_chunking
+        assert all(c.tokens <= plan.budget for c in plan.chunks)
+
+    def test_prompt_larger_than_window(self, registry):
+        config = {
+            "name": "tiny",
+            "model": "mistral/codestral-latest",
+            "prompt": "x" * 200_000 + "{content}",
+        }
+
+        with pytest.raises(ChunkingError, match="exceed"):
+            plan_for_evaluator(config, "doc", registry)
+
+    def test_cli_writes_parts(self, tmp_path, capsys):
+        document = tmp_path / "spec.md"
+        document.write_text(DOCUMENT * 40)
+
+        code = main(["codestral-code", str(document), "--out-dir", str(tmp_path)])
+
+        assert code == 0
+        assert (tmp_path / "spec.part-01.md").exists()
+        assert "budget" in capsys.readouterr().out
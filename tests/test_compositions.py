@@ -0,0 +1,58 @@
+"""
+Tests for composition loading.
+
+Usage:
+    pytest tests/test_compositions.py -v
+"""
+
+import pytest
+
+from scripts.local.catalog import EVALUATORS_DIR
+from scripts.local.compositions import (
+    CompositionError,
+    list_compositions,
+    load_composition,
+    parse_composition,
+)
+
+
+class TestLoadComposition:
+    def test_panel_layout(self):
+        composition = load_composition("adversarial-trio")
+
+        assert composition.evaluators == [
+            "openai/gpt52-reasoning",
+            "mistral/mistral-content",
+            "google/gemini-deep",
+        ]
+        assert not any(s.conditional for s in composition.stages)
+
+    def test_pipeline_layout(self):
+        quick, deep = load_composition("quick-then-deep").stages
+
+        assert (quick.name, quick.conditional) == ("quick-check", False)
+        assert quick.rule.stops("✅ PASSED - Document ready for review")
+        assert not quick.rule.stops("⚠️ ISSUES FOUND")
+        assert (deep.evaluator, deep.conditional) == ("openai/gpt52-reasoning", True)
+
+    def test_library_compositions_reference_real_evaluators(self):
+        for name in list_compositions():
+            for evaluator in load_composition(name).evaluators:
+                assert (EVALUATORS_DIR / evaluator / "evaluator.yml").exists(), name
+
+    def test_errors(self):
+        with pytest.raises(CompositionError, match="not found"):
+            load_composition("nope")
+        with pytest.raises(CompositionError, match="no evaluator"):
+            parse_composition({"stages": [{"name": "x"}]})
+        with pytest.raises(CompositionError, match="stage 'a' gate"):
+            parse_composition(
+                {"stages": [{"name": "a", "evaluator": "e", "gate": {"stop_if": {}}}]}
+            )
+
+    def test_free_text_gate_kept_without_rule(self):
+        (stage,) = parse_composition(
+            {"stages": [{"evaluator": "openai/fast-check", "gate": "Stop if clean"}]}
+        ).stages
+
+        assert (stage.gate, stage.rule) == ("Stop if clean", None)
@@ -0,0 +1,207 @@
+"""
+Tests for cost estimation and spend tracking.
+
+Usage:
+    pytest tests/test_cost.py -v
+"""
+
+import pytest
+import yaml
+
+from scripts.local.chunking import model_for
+from scripts.local.cost import (
+    DEFAULT_OUTPUT_TOKENS,
+    CostEstimator,
+    SpendLog,
+    main,
+    price,
+    record_spend,
+)
+from scripts.local.registry import REGISTRY_PATH, CompiledRegistry, RegistryError
+from scripts.local.tokens import TokenEstimator
+
+DOC = "## Section\n\n" + "Plain words in a short review document.\n" * 20
+
+
+@pytest.fixture
+def estimator(registry, catalog, tmp_path):
+    return CostEstimator(
+        registry, calibration=None, spend_log=tmp_path / "spend.jsonl", catalog=catalog
+    )
+
+
+class TestRegistryPrices:
+    def test_priced_model(self, registry):
+        model = registry.model("anthropic/claude-haiku-4-5")
+
+        assert (model.input_price, model.output_price) == (1, 5)
+        assert price(model, 1_000_000, 200_000) == pytest.approx(2.0)
+
+    def test_unpriced_model(self, registry):
+        model = registry.resolve("llama", "large")
+
+        assert not model.priced
+        assert price(model, 1000, 1000) is None
+
+    def test_every_evaluator_model_is_priced(self, registry, catalog):
+        unpriced = [
+            entry.name
+            for entry in catalog.entries()
+            if not model_for(entry.full_config(), registry).priced
+        ]
+
+        assert unpriced == []
+
+    def test_invalid_price_rejected(self):
+        bad = {
+            "providers": {
+                "acme": {
+                    "tiers": {
+                        "big": {
+                            "models": [
+                                {
+                                    "id": "a",
+                                    "version": "1",
+                                    "input_price_per_mtok": "$3",
+                                }
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+
+        with pytest.raises(RegistryError, match="input_price_per_mtok"):
+            CompiledRegistry.compile(bad)
+
+
+class TestEstimate:
+    def test_single_evaluator(self, estimator):
+        documents = [estimator.document(DOC, "a.md"), estimator.document(DOC, "b.md")]
+
+        estimate = estimator.named("claude-quick", documents)
+
+        count = TokenEstimator("claude")
+        assert estimate.model == "anthropic/claude-haiku-4-5"
+        assert (estimate.documents, estimate.calls) == (2, 2)
+        assert estimate.input_tokens > 2 * count(DOC)
+        assert estimate.output_tokens == 2 * DEFAULT_OUTPUT_TOKENS
+        assert estimate.cost == pytest.approx(
+            (estimate.input_tokens * 1 + estimate.output_tokens * 5) / 1e6
+        )
+
+    def test_oversized_document_pays_prompt_per_chunk(self, estimator):
+        big = estimator.document(DOC * 400, "big.md")  # Beyond codestral's 32k
+
+        single = estimator.named("codestral-code", [estimator.document(DOC)])
+        chunked = estimator.named("codestral-code", [big])
+
+        assert chunked.calls > 1
+        prompt = single.input_tokens - TokenEstimator("codestral")(DOC)
+        assert chunked.input_tokens >= prompt * chunked.calls
+
+    def test_observed_output_tokens_used(self, registry, catalog, tmp_path):
+        log = SpendLog(tmp_path / "spend.jsonl")
+        model = registry.model("anthropic/claude-haiku-4-5")
+        record_spend("claude-quick", model, 1000, 300, log=log)
+        record_spend("claude-quick", model, 1000, 500, log=log)
+
+        estimator = CostEstimator(registry, None, log, catalog=catalog)
+        estimate = estimator.named("claude-quick", [estimator.document(DOC)])
+
+        assert estimate.output_tokens == 400
+
+    def test_composition_range(self, estimator):
+        result = estimator.composition("quick-then-deep", [estimator.document(DOC)])
+
+        assert result.conditional == [False, True]
+        assert result.min_cost <= result.max_cost
+        assert result.unpriced == [e.evaluator for e in result.stages if e.cost is None]
+
+    def test_window_too_small_is_unpriced_stage(self, catalog, tmp_path):
+        raw = yaml.safe_load(REGISTRY_PATH.read_text())
+        nano = next(
+            model
+            for tier in raw["providers"]["gpt"]["tiers"].values()
+            for model in tier["models"]
+            if model["id"] == "gpt-5.4-nano"
+        )
+        nano["context_window"] = 500
+        estimator = CostEstimator(
+            CompiledRegistry.compile(raw),
+            calibration=None,
+            spend_log=tmp_path / "spend.jsonl",
+            catalog=catalog,
+        )
+
+        estimate = estimator.named("fast-check", [estimator.document(DOC)])
+        result = estimator.composition("quick-then-deep", [estimator.document(DOC)])
+
+        assert estimate.cost is None
+        assert "context window" in estimate.error
+        assert result.unpriced == ["fast-check"]
+
+    def test_scan_reads_directories(self, tmp_path):
+        (tmp_path / "docs" / "sub").mkdir(parents=True)
+        (tmp_path / "docs" / "a.md").write_text(DOC)
+        (tmp_path / "docs" / "sub" / "b.md").write_text(DOC)
+        (tmp_path / "docs" / "image.png").write_bytes(b"\x89PNG")
+
+        documents = CostEstimator.scan([tmp_path / "docs"])
+
+        assert [d.path.name for d in documents] == ["a.md", "b.md"]
+        assert documents[0].text() == DOC
+
+
+class TestSpend:
+    def test_record_and_summarise(self, registry, tmp_path):
+        log = SpendLog(tmp_path / "logs" / "spend.jsonl")
+        model = registry.model("anthropic/claude-haiku-4-5")
+
+        record = record_spend("claude-quick", model, 10_000, 2_000, "a.md", log=log)
+        record_spend("claude-quick", model, 10_000, 2_000, "b.md", log=log)
+
+        assert record.cost == pytest.approx(0.02)
+        assert log.summary()["claude-quick"]["calls"] == 2
+        assert log.summary()["claude-quick"]["cost"] == pytest.approx(0.04)
+
+    def test_cli_budget(self, tmp_path, capsys, monkeypatch):
+        monkeypatch.setenv("EVALUATOR_CATALOG_CACHE", str(tmp_path / "catalog.json"))
+        document = tmp_path / "doc.md"
+        document.write_text(DOC)
+        log = str(tmp_path / "spend.jsonl")
+
+        assert (
+            main(["--spend-log", log, "estimate", "claude-quick", str(document)]) == 0
+        )
+        assert (
+            main(
+                [
+                    "--spend-log",
+                    log,
+                    "estimate",
+                    "claude-quick",
+                    str(document),
+                    "--budget",
+                    "0",
+                ]
+            )
+            == 1
+        )
+        assert "Over budget" in capsys.readouterr().out
+
+    def test_cli_budget_refuses_unpriced(self, tmp_path, capsys, monkeypatch):
+        monkeypatch.setenv("EVALUATOR_CATALOG_CACHE", str(tmp_path / "catalog.json"))
+        monkeypatch.setattr("scripts.local.cost.price", lambda *args: None)
+        document = tmp_path / "doc.md"
+        document.write_text(DOC)
+        log = str(tmp_path / "spend.jsonl")
+
+        for command in (
+            ["estimate", "claude-quick"],
+            ["composition", "quick-then-deep"],
+        ):
+            argv = ["--spend-log", log, *command, str(document)]
+            assert main(argv) == 0
+            assert main([*argv, "--budget", "1000"]) == 1
+            assert "Cannot check budget" in capsys.readouterr().out
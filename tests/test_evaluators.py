@@ -4,114 +4,118 @@ Smoke tests for evaluator configurations.
 These tests verify:
 1. YAML files are valid and parseable
 2. Required fields are present
-3. Evaluators can be invoked (requires API keys)
+3. Index and registry are consistent with the evaluator files
+4. Evaluators can be invoked (requires API keys)
+
+Checks 1-3 come from a single pass of scripts.local.validation.
 
 Run with: pytest tests/test_evaluators.py -v
 Skip API tests: pytest tests/test_evaluators.py -v -m "not requires_api"
 """
 
-import json
 import os
 import subprocess
 from pathlib import Path
 
 import pytest
-import yaml
+
+from scripts.local.catalog import EvaluatorCatalog
+from scripts.local.validation import REQUIRED_FIELDS, validate
 
 # Path to evaluators directory
 EVALUATORS_DIR = Path(__file__).parent.parent / "evaluators"
-INDEX_FILE = EVALUATORS_DIR / "index.json"
-
-# Required fields in evaluator YAML
-REQUIRED_FIELDS = ["name", "description", "model", "api_key_env", "prompt"]
 
 
 def get_all_evaluator_paths():
-    """Find all evaluator.yml files."""
-    return list(EVALUATORS_DIR.glob("**/evaluator.yml"))
+    """Find all evaluator.yml files, relative to the evaluators directory."""
+    return sorted(
+        p.relative_to(EVALUATORS_DIR).as_posix()
+        for p in EVALUATORS_DIR.glob("**/evaluator.yml")
+    )
+
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory):
+    """One validation pass shared by every test in this module."""
+    cache_dir = tmp_path_factory.mktemp("validation")
+    catalog = EvaluatorCatalog.load(EVALUATORS_DIR, cache_dir / "catalog.json")
+    return validate(catalog, cache_path=cache_dir / "validation.json")
 
 
-def load_index():
-    """Load the evaluator index."""
-    with open(INDEX_FILE) as f:
-        return json.load(f)
+def _messages(issues):
+    return "; ".join(i.message for i in issues)
 
 
 class TestEvaluatorYAML:
     """Test evaluator YAML files are valid."""
 
     @pytest.mark.parametrize("yaml_path", get_all_evaluator_paths())
-    def test_yaml_is_valid(self, yaml_path):
+    def test_yaml_is_valid(self, report, yaml_path):
         """Each evaluator YAML should be parseable."""
-        with open(yaml_path) as f:
-            config = yaml.safe_load(f)
-        assert config is not None, f"Failed to parse {yaml_path}"
+        issues = report.issues_for(yaml_path, "yaml_valid")
+        assert not issues, f"Failed to parse {yaml_path}: {_messages(issues)}"
 
     @pytest.mark.parametrize("yaml_path", get_all_evaluator_paths())
-    def test_required_fields_present(self, yaml_path):
+    def test_required_fields_present(self, report, yaml_path):
         """Each evaluator should have required fields."""
-        with open(yaml_path) as f:
-            config = yaml.safe_load(f)
-
-        for field in REQUIRED_FIELDS:
-            assert field in config, f"Missing required field '{field}' in {yaml_path}"
+        issues = report.issues_for(yaml_path, "required_fields")
+        assert not issues, f"{_messages(issues)} in {yaml_path} ({REQUIRED_FIELDS})"
 
     @pytest.mark.parametrize("yaml_path", get_all_evaluator_paths())
-    def test_prompt_has_content_placeholder(self, yaml_path):
+    def test_prompt_has_content_placeholder(self, report, yaml_path):
         """Prompt should include {content} placeholder."""
-        with open(yaml_path) as f:
-            config = yaml.safe_load(f)
-
-        prompt = config.get("prompt", "")
-        assert (
-            "{content}" in prompt
-        ), f"Prompt missing {{content}} placeholder in {yaml_path}"
+        issues = report.issues_for(yaml_path, "content_placeholder")
+        issues += report.issues_for(yaml_path, "prompt_compiles")
+        assert not issues, f"{_messages(issues)} in {yaml_path}"
 
 
 class TestIndex:
     """Test the evaluator index."""
 
-    def test_index_is_valid_json(self):
+    def test_index_is_valid_json(self, report):
         """Index should be valid JSON."""
-        index = load_index()
-        assert "evaluators" in index
-        assert "categories" in index
-        assert "providers" in index
+        issues = report.by_check("index_schema")
+        assert not issues, _messages(issues)
 
-    def test_all_evaluators_in_index(self):
+    def test_all_evaluators_in_index(self, report):
         """All evaluator files should be listed in index."""
-        index = load_index()
-        indexed_paths = {e["path"] for e in index["evaluators"]}
-
-        for yaml_path in get_all_evaluator_paths():
-            relative = yaml_path.relative_to(EVALUATORS_DIR)
-            assert str(relative) in indexed_paths, f"{relative} not in index"
+        issues = report.by_check("in_index")
+        assert not issues, ", ".join(f"{i.path} not in index" for i in issues)
 
-    def test_index_paths_exist(self):
+    def test_index_paths_exist(self, report):
         """All paths in index should exist."""
-        index = load_index()
+        issues = report.by_check("index_path")
+        assert not issues, _messages(issues)
 
-        for evaluator in index["evaluators"]:
-            path = EVALUATORS_DIR / evaluator["path"]
-            assert (
-                path.exists()
-            ), f"Index references non-existent path: {evaluator['path']}"
+
+class TestRegistryAlignment:
+    """Test model requirements resolve against the provider registry."""
+
+    @pytest.mark.parametrize("yaml_path", get_all_evaluator_paths())
+    def test_requirement_matches_registry(self, report, yaml_path):
+        """Family, tier and min_version should exist in the registry."""
+        issues = [
+            i
+            for check in ("registry_family", "registry_tier", "min_version")
+            for i in report.issues_for(yaml_path, check)
+        ]
+        assert not issues, f"{_messages(issues)} in {yaml_path}"
 
 
 class TestDocumentation:
     """Test evaluator documentation."""
 
     @pytest.mark.parametrize("yaml_path", get_all_evaluator_paths())
-    def test_readme_exists(self, yaml_path):
+    def test_readme_exists(self, report, yaml_path):
         """Each evaluator should have a README."""
-        readme = yaml_path.parent / "README.md"
-        assert readme.exists(), f"Missing README for {yaml_path.parent.name}"
+        issues = report.issues_for(yaml_path, "readme")
+        assert not issues, f"Missing README for {Path(yaml_path).parent.name}"
 
     @pytest.mark.parametrize("yaml_path", get_all_evaluator_paths())
-    def test_changelog_exists(self, yaml_path):
+    def test_changelog_exists(self, report, yaml_path):
         """Each evaluator should have a CHANGELOG."""
-        changelog = yaml_path.parent / "CHANGELOG.md"
-        assert changelog.exists(), f"Missing CHANGELOG for {yaml_path.parent.name}"
+        issues = report.issues_for(yaml_path, "changelog")
+        assert not issues, f"Missing CHANGELOG for {Path(yaml_path).parent.name}"
 
 
 @pytest.mark.requires_api
@@ -0,0 +1,175 @@
+"""
+Tests for evaluator output parsing (findings and verdicts).
+
+Usage:
+    pytest tests/test_findings.py -v
+"""
+
+import pytest
+
+from scripts.local.findings import (
+    FindingStream,
+    parse_findings,
+    parse_verdict,
+    verdict_rank,
+)
+
+ADVERSARIAL_OUTPUT = """\
+## Findings
+
+### [HIGH]: Unverified latency claim
+- **Location**: Section 2
+- **Issue**: No benchmark backs the 10x figure
+
+### MEDIUM: Missing rollback plan
+- **Issue**: Nothing describes how to revert
+
+## Overall Assessment
+
+**Verdict**: NEEDS_REVISION
+"""
+
+ARCH_OUTPUT = """\
+### Architectural Findings
+
+**[COUPLING]: Runner imports CLI helpers**
+- **Location**: scripts/runner.py
+- **Severity**: Major
+
+**[API]: Leaky config object**
+- **Location**: scripts/config.py
+
+### Verdict
+
+**Verdict**: REVISION_SUGGESTED
+"""
+
+
+class TestParseFindings:
+    def test_severity_headings(self):
+        findings = parse_findings(ADVERSARIAL_OUTPUT)
+
+        assert [(f.severity, f.title) for f in findings] == [
+            ("HIGH", "Unverified latency claim"),
+            ("MEDIUM", "Missing rollback plan"),
+        ]
+        assert "10x" in findings[0].body
+        assert "Verdict" not in findings[1].body
+
+    def test_category_lines_with_severity_bullet(self):
+        findings = parse_findings(ARCH_OUTPUT)
+
+        assert [(f.category, f.severity) for f in findings] == [
+            ("COUPLING", "HIGH"),
+            ("API", None),
+        ]
+        assert findings[1].title == "Leaky config object"
+
+    def test_bold_severity_prefix(self):
+        findings = parse_findings("**[CRITICAL]** Off-by-one in pager\n- Fix: x\n")
+
+        assert (findings[0].severity, findings[0].category) == ("CRITICAL", None)
+
+    def test_labels_are_not_findings(self):
+        text = "**Location**: a\n**Verdict**: APPROVED\n**APPROVED** - ok\n"
+
+        assert parse_findings(text) == []
+
+    @pytest.mark.parametrize(
+        "heading",
+        [
+            "## High-Level Summary",
+            "### Low-hanging fruit",
+            "### Medium-term Recommendations",
+            "## Critical — path analysis",
+        ],
+    )
+    def test_hyphenated_headings_are_not_findings(self, heading):
+        assert parse_findings(f"{heading}\n\nText.\n") == []
+
+    def test_bracketed_tag_separators(self):
+        text = "### [HIGH] - Dash title\n### [LOW] Bare title\n"
+
+        assert [(f.severity, f.title) for f in parse_findings(text)] == [
+            ("HIGH", "Dash title"),
+            ("LOW", "Bare title"),
+        ]
+
+    def test_key_ignores_case_and_punctuation(self):
+        a, b = parse_findings("### HIGH: Missing Tests!\n### LOW: missing tests\n")
+
+        assert a.key == b.key == "missing tests"
+
+
+class TestParseVerdict:
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            (ADVERSARIAL_OUTPUT, "NEEDS_REVISION"),
+            ("Verdict: CHANGES_REQUESTED\n", "CHANGES_REQUESTED"),
+            ("### Verdict\n\n✅ **APPROVED** - Ready to merge\n", "APPROVED"),
+            ("**Verdict**: **FAIL**\n", "FAIL"),
+            ("No verdict here.\n", None),
+        ],
+    )
+    def test_formats(self, text, expected):
+        assert parse_verdict(text) == expected
+
+    def test_common_scale(self):
+        assert verdict_rank("SOUND") == verdict_rank("PASS") == 0
+        assert verdict_rank("RESTRUCTURE_NEEDED") == verdict_rank("REJECT") == 2
+        assert verdict_rank(None) is None
+
+
+class TestFindingStream:
+    def feed(self, text, size):
+        stream = FindingStream()
+        events = []
+        for i in range(0, len(text), size):
+            events += [(i, e) for e in stream.feed(text[i : i + size])]
+        return stream, events, stream.close()
+
+    def test_findings_emitted_as_headers_complete(self):
+        stream, events, tail = self.feed(ADVERSARIAL_OUTPUT, 7)
+
+        findings = [e.finding for _, e in events if e.kind == "finding"]
+        assert [(f.severity, f.title) for f in findings] == [
+            ("HIGH", "Unverified latency claim"),
+            ("MEDIUM", "Missing rollback plan"),
+        ]
+        first = next(i for i, e in events if e.kind == "finding")
+        assert first < ADVERSARIAL_OUTPUT.index("No benchmark")
+        assert stream.verdict == "NEEDS_REVISION"
+        assert tail == []
+        assert stream.text == ADVERSARIAL_OUTPUT
+
+    def test_hyphenated_headings_are_not_findings(self):
+        text = (
+            "## High-Level Summary\n\n### Low-hanging fruit\n\n**Verdict**: APPROVED\n"
+        )
+        stream, events, tail = self.feed(text, 5)
+
+        assert [e.kind for _, e in events + [(0, e) for e in tail]] == ["verdict"]
+        assert stream.verdict == "APPROVED"
+
+    def test_severity_bullet_and_unrated_finding(self):
+        stream, events, tail = self.feed(ARCH_OUTPUT, 5)
+
+        assert [(f.category, f.severity) for f in stream.findings] == [
+            ("COUPLING", "HIGH"),
+            ("API", None),
+        ]
+        assert [e.kind for _, e in events] == ["finding", "finding", "verdict"]
+
+    def test_verdict_before_end_of_stream(self):
+        text = "**Verdict**: FAIL\n\nDetails follow"
+        stream, events, _ = self.feed(text, 4)
+
+        assert [e.verdict for _, e in events] == ["FAIL"]
+        assert events[0][0] < text.index("Details")
+
+    def test_close_falls_back_to_bold_verdict(self):
+        stream, events, tail = self.feed("Result: **APPROVED**", 3)
+
+        assert events == []
+        assert [e.verdict for e in tail] == ["APPROVED"]
@@ -0,0 +1,129 @@
+"""
+Tests for content-addressed evaluator fingerprints.
+
+Usage:
+    pytest tests/test_fingerprint.py -v
+"""
+
+import shutil
+
+import pytest
+
+from scripts.local.catalog import EVALUATORS_DIR, EvaluatorCatalog
+from scripts.local.fingerprint import compare, fingerprint, main, tree_fingerprints
+
+BASE_CONFIG = {
+    "name": "example",
+    "description": "Example evaluator",
+    "model": "gpt-5.4",
+    "model_requirement": {
+        "family": "gpt",
+        "tier": "flagship",
+        "min_version": "5.4",
+    },
+    "timeout": 180,
+    "prompt": "Review this:\n\n{content}\n",
+}
+
+
+class TestFingerprint:
+    """Canonical form and hashing."""
+
+    def test_is_stable_hex_digest(self):
+        fp = fingerprint(BASE_CONFIG)
+
+        assert len(fp) == 64
+        assert fp == fingerprint(dict(BASE_CONFIG))
+
+    def test_ignores_non_behavioural_fields(self):
+        other = {**BASE_CONFIG, "description": "Reworded", "output_suffix": "-x.md"}
+
+        assert fingerprint(other) == fingerprint(BASE_CONFIG)
+
+    def test_ignores_key_order_and_line_endings(self):
+        reordered = dict(reversed(list(BASE_CONFIG.items())))
+        reordered["prompt"] = "Review this:  \r\n\r\n{content}\r\n\r\n"
+
+        assert fingerprint(reordered) == fingerprint(BASE_CONFIG)
+
+    def test_min_version_type_is_normalized(self):
+        requirement = {**BASE_CONFIG["model_requirement"], "min_version": 5.4}
+        as_float = {**BASE_CONFIG, "model_requirement": requirement}
+
+        assert fingerprint(as_float) == fingerprint(BASE_CONFIG)
+
+    @pytest.mark.parametrize(
+        "field,value",
+        [
+            ("prompt", "Different prompt {content}"),
+            ("model", "gpt-5.4-mini"),
+            ("timeout", 300),
+            ("model_requirement", {"family": "gpt", "tier": "mini"}),
+            ("prompt_layout", "static-first"),
+        ],
+    )
+    def test_behavioural_fields_change_fingerprint(self, field, value):
+        assert fingerprint({**BASE_CONFIG, field: value}) != fingerprint(BASE_CONFIG)
+
+
+class TestCatalogFingerprints:
+    """Fingerprints are stored in the catalog snapshot."""
+
+    def test_fingerprint_available_without_loading_prompt(self, tmp_path):
+        snapshot = tmp_path / "catalog.json"
+        EvaluatorCatalog.load(EVALUATORS_DIR, snapshot)
+        entry = EvaluatorCatalog.load(EVALUATORS_DIR, snapshot).get("o3-chain")
+
+        assert entry.fingerprint
+        assert not entry.prompt_loaded
+        assert entry.fingerprint == fingerprint(entry.full_config())
+
+
+class TestDrift:
+    """Library vs installed tree comparison."""
+
+    @pytest.fixture
+    def installed(self, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr("scripts.local.catalog.DEFAULT_CACHE_DIR", cache_dir)
+        monkeypatch.setattr(
+            "scripts.local.catalog.DEFAULT_SNAPSHOT", cache_dir / "catalog.json"
+        )
+        root = tmp_path / "installed"
+        for rel in ["openai/fast-check", "openai/o3-chain"]:
+            shutil.copytree(EVALUATORS_DIR / rel, root / rel)
+        return root
+
+    def test_compare_classifies_keys(self):
+        report = compare({"a": "1", "b": "2", "c": "3"}, {"a": "1", "b": "x", "d": "4"})
+
+        assert report.unchanged == ["a"]
+        assert report.changed == ["b"]
+        assert report.missing == ["c"]
+        assert report.extra == ["d"]
+        assert report.has_drift
+
+    def test_detects_changed_prompt(self, installed):
+        target = installed / "openai/fast-check/evaluator.yml"
+        target.write_text(target.read_text().replace("{content}", "{content} NEW"))
+
+        fps = tree_fingerprints(installed)
+        library = tree_fingerprints(EVALUATORS_DIR)
+
+        assert fps["openai/o3-chain"] == library["openai/o3-chain"]
+        assert fps["openai/fast-check"] != library["openai/fast-check"]
+
+    def test_comment_edit_is_not_drift(self, installed):
+        target = installed / "openai/o3-chain/evaluator.yml"
+        target.write_text("# Local note\n" + target.read_text())
+
+        fps = tree_fingerprints(installed)
+
+        assert (
+            fps["openai/o3-chain"]
+            == tree_fingerprints(EVALUATORS_DIR)["openai/o3-chain"]
+        )
+
+    def test_cli_diff_reports_missing(self, installed, capsys):
+        assert main(["diff", str(installed)]) == 1
+        assert "missing  anthropic/claude-quick" in capsys.readouterr().out
@@ -0,0 +1,96 @@
+"""
+Tests for composition gate expressions.
+
+Usage:
+    pytest tests/test_gates.py -v
+"""
+
+import pytest
+
+from scripts.local.gates import GateError, parse_condition, parse_gate
+
+REVIEW = """\
+### [HIGH]: Missing rollback plan
+No rollback described.
+
+### [MEDIUM]: Vague owner
+Who runs this?
+
+### [MINOR]: Typo
+"teh".
+
+**Verdict**: NEEDS_REVISION
+"""
+
+
+class TestConditions:
+    def test_contains(self):
+        condition = parse_condition({"contains": "✅ PASSED"})
+
+        assert condition("✅ PASSED - Document ready")
+        assert not condition("⚠️ ISSUES FOUND")
+
+    def test_verdict_single_and_list(self):
+        assert parse_condition({"verdict": "needs_revision"})(REVIEW)
+        assert not parse_condition({"verdict": ["APPROVED", "PASS"]})(REVIEW)
+
+    @pytest.mark.parametrize(
+        "severity,count,expected",
+        [("HIGH", 1, True), ("HIGH", 2, False), ("MEDIUM", 2, True), ("LOW", 4, False)],
+    )
+    def test_severity_count(self, severity, count, expected):
+        condition = parse_condition(
+            {"severity": {"at_least": severity, "count": count}}
+        )
+
+        assert condition(REVIEW) is expected
+
+    def test_combinators(self):
+        condition = parse_condition(
+            {
+                "any": [{"verdict": "APPROVED"}, {"contains": "rollback"}],
+                "not": {"severity": {"at_least": "critical"}},
+            }
+        )
+
+        assert condition(REVIEW)
+        assert not condition("**Verdict**: REJECT")
+
+    @pytest.mark.parametrize(
+        "spec,message",
+        [
+            ({}, "non-empty"),
+            ({"matches": "x"}, "unknown gate test"),
+            ({"severity": {"at_least": "HUGE"}}, "unknown severity"),
+            ({"severity": {"at_least": "HIGH", "count": 0}}, "positive"),
+            ({"any": []}, "non-empty list"),
+        ],
+    )
+    def test_invalid(self, spec, message):
+        with pytest.raises(GateError, match=message):
+            parse_condition(spec)
+
+
+class TestGate:
+    def test_stop_if_and_continue_if(self):
+        stop = parse_gate({"stop_if": {"verdict": "APPROVED"}})
+        go_on = parse_gate({"continue_if": {"severity": {"at_least": "HIGH"}}})
+
+        assert not stop.stops(REVIEW)
+        assert not go_on.stops(REVIEW)
+        assert stop.stops("**Verdict**: APPROVED")
+        assert go_on.stops("**Verdict**: APPROVED")
+
+    def test_free_text_is_not_executable(self):
+        assert parse_gate("If output contains PASSED: stop") is None
+
+    def test_needs_exactly_one_rule(self):
+        with pytest.raises(GateError, match="exactly one"):
+            parse_gate({"stop_if": {"contains": "a"}, "continue_if": {"contains": "b"}})
+
+    def test_fail_fast_severity(self):
+        gate = parse_gate({"stop_if": {"contains": "ok"}, "fail_fast": "major"})
+
+        assert gate.fail_fast == "HIGH"
+        with pytest.raises(GateError, match="fail_fast"):
+            parse_gate({"stop_if": {"contains": "ok"}, "fail_fast": "HUGE"})
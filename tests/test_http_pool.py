@@ -0,0 +1,277 @@
+"""
+Tests for the pooled HTTP transport.
+
+Usage:
+    pytest tests/test_http_pool.py -v
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.local.http_pool import (
+    HttpPool,
+    HttpxPool,
+    PoolConfig,
+    host_key,
+    http2_available,
+    pool_for,
+)
+from scripts.local.providers import Abort, ApiCall, ProviderError, stream_call
+
+SSE = (
+    b"".join(
+        b"data: " + json.dumps(e).encode() + b"\n\n"
+        for e in [
+            {"choices": [{"delta": {"content": "o"}}]},
+            {"choices": [{"delta": {"content": "k"}}]},
+        ]
+    )
+    + b"data: [DONE]\n\n"
+)
+
+ANTHROPIC = json.dumps(
+    {
+        "content": [{"type": "text", "text": "**Verdict**: APPROVED"}],
+        "usage": {"input_tokens": 10, "output_tokens": 2},
+    }
+).encode()
+
+
+@pytest.fixture
+def server():
+    """Keep-alive HTTP/1.1 server that counts the connections it accepts."""
+    state = {"connections": 0, "release": threading.Event()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            state["connections"] += 1
+
+        def _reply(self, status, payload):
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path == "/slow":
+                time.sleep(0.05)
+            if self.path == "/drop":  # Closes without telling the client
+                self.close_connection = True
+            if self.path == "/long-header":  # LineTooLong in the client
+                self.send_response(200)
+                self.send_header("X-Padding", "x" * 70_000)
+                self.end_headers()
+                return
+            if self.path == "/hang":  # First event, then nothing until released
+                self.send_response(200)
+                self.send_header("Content-Length", "10000")
+                self.end_headers()
+                self.wfile.write(SSE.split(b"\n\n")[0] + b"\n\n")
+                self.wfile.flush()
+                state["release"].wait(5)
+                return
+            if self.path == "/error":
+                return self._reply(429, b'{"error": "slow down"}')
+            if self.path == "/stream":
+                return self._reply(200, SSE)
+            if self.path == "/v1/messages":
+                return self._reply(200, ANTHROPIC)
+            self._reply(200, b'{"ok": true}')
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield state
+    state["release"].set()
+    httpd.shutdown()
+
+
+def call(server, path="/", stream=False):
+    body = b'{"prompt": "x"}'
+    headers = {"Content-Type": "application/json", "Content-Length": str(len(body))}
+    return ApiCall("openai", "m", server["url"] + path, headers, body, 5, stream)
+
+
+def metrics(pool):
+    (only,) = pool.stats().values()
+    return only
+
+
+def test_host_key():
+    assert host_key("https://api.x.com/v1/a?alt=sse") == (
+        ("https", "api.x.com", 443),
+        "/v1/a?alt=sse",
+    )
+
+
+def test_http2_falls_back_without_httpx():
+    pool = pool_for(PoolConfig(http2=True))
+
+    assert isinstance(pool, HttpxPool if http2_available() else HttpPool)
+
+
+class TestReuse:
+    def test_sequential_requests_share_a_connection(self, server):
+        pool = HttpPool()
+
+        for _ in range(5):
+            status, _, payload = pool.transport(call(server))
+            assert (status, payload) == (200, b'{"ok": true}')
+
+        assert server["connections"] == 1
+        m = metrics(pool)
+        assert (m.requests, m.opened, m.reused, m.idle) == (5, 1, 4, 1)
+
+    def test_concurrency_bounded_by_pool_size(self, server):
+        pool = HttpPool(PoolConfig(max_per_host=2))
+
+        with ThreadPoolExecutor(6) as executor:
+            list(
+                executor.map(lambda _: pool.transport(call(server, "/slow")), range(6))
+            )
+
+        m = metrics(pool)
+        assert m.peak == 2 and m.opened == 2 and m.waits > 0
+        assert server["connections"] == 2
+
+    def test_error_response_keeps_connection(self, server):
+        pool = HttpPool()
+
+        with pytest.raises(ProviderError) as error:
+            pool.transport(call(server, "/error"))
+        pool.transport(call(server))
+
+        assert error.value.status == 429
+        assert server["connections"] == 1
+
+
+class TestRelease:
+    def test_protocol_errors_free_the_slot(self, server):
+        pool = HttpPool(PoolConfig(max_per_host=1))
+
+        for _ in range(2):
+            with pytest.raises(ProviderError, match="connection failed"):
+                pool.transport(call(server, "/long-header"))
+        status, _, _ = pool.transport(call(server))
+
+        assert status == 200
+        assert metrics(pool).in_use == 0
+
+    def test_other_errors_free_the_slot(self, server):
+        pool = HttpPool(PoolConfig(max_per_host=1))
+        bad = call(server)
+        bad.headers["X-Name"] = "caf\u00e9\u2603"  # Not latin-1 encodable
+
+        with pytest.raises(UnicodeEncodeError):
+            pool.transport(bad)
+        pool.transport(call(server))
+
+        assert metrics(pool).in_use == 0
+
+
+class TestStale:
+    def test_server_closed_connection_is_replaced(self, server):
+        pool = HttpPool()
+        pool.transport(call(server, "/drop"))
+
+        status, _, _ = pool.transport(call(server))
+
+        assert status == 200
+        assert metrics(pool).stale == 1
+        assert server["connections"] == 2
+
+    def test_idle_timeout(self, server):
+        pool = HttpPool(PoolConfig(idle_timeout=0))
+        pool.transport(call(server))
+        time.sleep(0.01)
+
+        pool.transport(call(server))
+
+        m = metrics(pool)
+        assert (m.opened, m.reused, m.stale) == (2, 0, 1)
+
+
+class TestStreaming:
+    def test_finished_stream_returns_connection(self, server):
+        pool = HttpPool()
+
+        completion = stream_call(call(server, "/stream", True), transport=pool.stream)
+        pool.transport(call(server))
+
+        assert completion.text == "ok"
+        assert server["connections"] == 1
+
+    def test_abandoned_stream_closes_connection(self, server):
+        pool = HttpPool()
+
+        def stop(text):
+            raise RuntimeError("enough")
+
+        with pytest.raises(RuntimeError):
+            stream_call(call(server, "/stream", True), stop, transport=pool.stream)
+        pool.transport(call(server))
+
+        m = metrics(pool)
+        assert (m.opened, m.closed, m.in_use) == (2, 1, 0)
+
+
+@pytest.mark.skipif(not http2_available(), reason="needs httpx and h2")
+class TestHttpx:
+    def test_metrics(self, server):
+        pool = HttpxPool()
+
+        for _ in range(2):
+            assert pool.transport(call(server))[0] == 200
+
+        m = metrics(pool)
+        assert (m.requests, m.opened, m.reused, m.in_use, m.peak) == (2, 1, 1, 0, 1)
+
+    def test_cancel_closes_the_response(self, server):
+        pool = HttpxPool()
+        request = call(server, "/hang", True)
+        request.abort = Abort()
+        lines = pool.stream(request)
+        next(lines)
+
+        threading.Timer(0.1, request.abort.cancel).start()
+        started = time.monotonic()
+        with pytest.raises(ProviderError):
+            list(lines)
+
+        assert time.monotonic() - started < 2
+        assert metrics(pool).in_use == 0
+
+
+def test_runner_jobs_share_pooled_connections(
+    make_runner, server, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("ADVERSARIAL_ANTHROPIC_BASE_URL", server["url"])
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "k")
+    documents = []
+    for i in range(6):
+        path = tmp_path / f"doc{i}.md"
+        path.write_text(f"# Doc {i}\n")
+        documents.append(path)
+    pool = HttpPool()
+    runner = make_runner(concurrency={"anthropic": 2}, pool=pool)
+
+    results = runner.run_sync(["claude-quick"], documents)
+
+    assert all(r.ok for r in results)
+    assert server["connections"] <= 2
+    assert metrics(pool).requests == 6
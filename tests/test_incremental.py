@@ -0,0 +1,158 @@
+"""
+Tests for section-level incremental re-evaluation.
+
+Usage:
+    pytest tests/test_incremental.py -v
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from scripts.local.incremental import IncrementalEvaluator, split_sections
+from scripts.local.providers import Completion
+
+SECTIONS = ["Intro", "Scope", "Design", "Rollout", "Risks", "Appendix"]
+
+
+def spec(bugs=("Design", "Risks"), edits=()):
+    parts = ["Preamble text.\n"]
+    for title in SECTIONS:
+        body = f"Details of {title.lower()}."
+        if title in bugs:
+            body += " XYZZY"
+        if title in edits:
+            body += " Edited."
+        parts.append(f"## {title}\n\n{body}\n")
+    return "\n".join(parts)
+
+
+pytestmark = pytest.mark.usefixtures("api_keys")
+
+
+class FakeBackend:
+    """Reports a HIGH finding for every sent section containing XYZZY."""
+
+    def __init__(self):
+        self.bodies = []
+
+    async def __call__(self, call):
+        payload = json.loads(b"".join(call.body_chunks()))
+        content = payload["messages"][0]["content"]
+        body = "".join(block["text"] for block in content)
+        self.bodies.append(body)
+        await asyncio.sleep(0)
+        titles = re.findall(r"## (\w+)\n\nDetails of \w+\.( XYZZY)?", body)
+        bad = [title for title, bug in titles if bug]
+        lines = [f"### [HIGH]: XYZZY marker in {t}\nRemove it.\n" for t in bad]
+        verdict = "NEEDS_REVISION" if bad else "APPROVED"
+        return Completion("\n".join(lines) + f"\n**Verdict**: {verdict}")
+
+
+@pytest.fixture
+def setup(make_runner, tmp_path):
+    backend = FakeBackend()
+    evaluator = IncrementalEvaluator(make_runner(backend), state_dir=tmp_path / "state")
+    document = tmp_path / "spec.md"
+    document.write_text(spec())
+    return evaluator, backend, document
+
+
+class TestSplitSections:
+    def test_headings_outside_fences(self):
+        text = "Intro\n\n# A\n\n```\n## not a heading\n```\n\n### deep\n\n## B\n"
+
+        sections = split_sections(text)
+
+        assert [s.title for s in sections] == ["", "A", "B"]
+        assert "".join(s.text for s in sections) == text
+
+    def test_level_and_whitespace_insensitive_digest(self):
+        first = split_sections("# A\n\n### C\ntext\n", level=3)
+        second = split_sections("# A  \n\n### C\ntext   \n\n", level=3)
+
+        assert [s.title for s in first] == ["A", "C"]
+        assert [s.digest for s in first] == [s.digest for s in second]
+
+
+class TestIncremental:
+    def test_first_run_reviews_whole_document(self, setup):
+        evaluator, backend, document = setup
+
+        result = evaluator.run_sync("claude-quick", document)
+
+        assert result.full
+        assert [f.finding.title for f in result.findings] == [
+            "XYZZY marker in Design",
+            "XYZZY marker in Risks",
+        ]
+        assert result.verdict == "NEEDS_REVISION"
+        assert result.report_path.name == "spec-claude-quick.md"
+        assert "**Verdict**: NEEDS_REVISION" in result.report_path.read_text()
+
+    def test_unchanged_document_sends_nothing(self, setup):
+        evaluator, backend, document = setup
+        evaluator.run_sync("claude-quick", document)
+
+        result = evaluator.run_sync("claude-quick", document)
+
+        assert (result.sent, len(backend.bodies)) == (0, 1)
+        assert len(result.findings) == 2
+        assert result.verdict == "NEEDS_REVISION"
+
+    def test_only_changed_sections_and_neighbours_sent(self, setup):
+        evaluator, backend, document = setup
+        evaluator.run_sync("claude-quick", document)
+        document.write_text(spec(bugs=("Risks",)))  # Design fixed
+
+        result = evaluator.run_sync("claude-quick", document)
+
+        sent = backend.bodies[-1]
+        assert not result.full
+        assert (result.changed, result.sent) == (1, 3)
+        assert "CHANGED: section 4" in sent
+        assert "## Scope" in sent and "## Rollout" in sent
+        assert "## Risks" not in sent and "## Appendix" not in sent
+        assert [f.finding.title for f in result.findings] == ["XYZZY marker in Risks"]
+        assert result.verdict == "NEEDS_REVISION"
+
+    def test_fresh_findings_merge_with_cached(self, setup):
+        evaluator, backend, document = setup
+        evaluator.run_sync("claude-quick", document)
+        document.write_text(spec(bugs=("Design", "Risks", "Intro")))
+
+        result = evaluator.run_sync("claude-quick", document)
+
+        titles = {f.finding.title for f in result.findings}
+        assert titles == {
+            "XYZZY marker in Intro",
+            "XYZZY marker in Design",
+            "XYZZY marker in Risks",
+        }
+
+    def test_many_changes_fall_back_to_full(self, setup):
+        evaluator, backend, document = setup
+        evaluator.run_sync("claude-quick", document)
+        document.write_text(spec(edits=SECTIONS[:4]))
+
+        assert evaluator.run_sync("claude-quick", document).full
+
+    def test_edited_evaluator_invalidates_state(self, setup, catalog):
+        evaluator, backend, document = setup
+        evaluator.run_sync("claude-quick", document)
+        config = catalog.get("claude-quick").full_config()
+        config["prompt"] += "\nBe terse."
+
+        assert evaluator.run_sync(config, document).full
+
+    def test_failed_review_keeps_state(self, setup, monkeypatch):
+        evaluator, backend, document = setup
+        evaluator.run_sync("claude-quick", document)
+        document.write_text(spec(bugs=("Risks",)))
+        monkeypatch.delenv("ANTHROPIC_API_KEY")
+
+        assert not evaluator.run_sync("claude-quick", document).ok
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "k")
+        assert evaluator.run_sync("claude-quick", document).changed == 1
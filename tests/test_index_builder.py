@@ -0,0 +1,151 @@
+"""
+Tests for the incremental index.json builder.
+
+Usage:
+    pytest tests/test_index_builder.py -v
+"""
+
+import datetime
+import json
+import shutil
+
+import pytest
+
+from scripts.local.catalog import EVALUATORS_DIR, EvaluatorCatalog
+from scripts.local.index_builder import (
+    IndexBuildError,
+    build_index,
+    dumps,
+    main,
+    write_index,
+)
+
+TODAY = datetime.date(2026, 10, 1)
+
+
+@pytest.fixture
+def evaluators_dir(tmp_path):
+    """A full copy of the library evaluators tree."""
+    root = tmp_path / "evaluators"
+    shutil.copytree(EVALUATORS_DIR, root)
+    return root
+
+
+@pytest.fixture
+def load(tmp_path, evaluators_dir):
+    def _load():
+        return EvaluatorCatalog.load(evaluators_dir, tmp_path / "catalog.json")
+
+    return _load
+
+
+def _add_evaluator(evaluators_dir, rel, name, extra=""):
+    target = evaluators_dir / rel
+    shutil.copytree(evaluators_dir / "openai/fast-check", target)
+    path = target / "evaluator.yml"
+    text = path.read_text().replace("name: fast-check", f"name: {name}{extra}")
+    path.write_text(text)
+
+
+class TestBuild:
+    """Sections rebuilt from the evaluator directories."""
+
+    def test_library_index_is_reproduced_byte_for_byte(self):
+        catalog = EvaluatorCatalog.load(EVALUATORS_DIR, None)
+
+        result = build_index(catalog)
+
+        assert not result.changed
+        assert dumps(result.index) == (EVALUATORS_DIR / "index.json").read_text()
+
+    def test_new_evaluator_is_appended(self, load, evaluators_dir):
+        _add_evaluator(
+            evaluators_dir, "openai/nano-lint", "nano-lint", "\ncategory: quick-check"
+        )
+
+        result = build_index(load(), today=TODAY)
+
+        last = result.index["evaluators"][-1]
+        assert last["path"] == "openai/nano-lint/evaluator.yml"
+        assert last["category"] == "quick-check"
+        assert last["description"] == "Fast validation using GPT-5.4 Nano"
+        assert result.index["providers"]["openai"]["evaluators"][-1] == "nano-lint"
+        assert result.index["updated"] == TODAY.isoformat()
+        assert result.added == ["openai/nano-lint/evaluator.yml"]
+
+    def test_removed_evaluator_is_dropped(self, load, evaluators_dir):
+        shutil.rmtree(evaluators_dir / "anthropic/claude-quick")
+
+        result = build_index(load(), today=TODAY)
+
+        assert (
+            "claude-quick" not in result.index["providers"]["anthropic"]["evaluators"]
+        )
+        assert result.removed == ["anthropic/claude-quick/evaluator.yml"]
+
+    def test_model_change_is_picked_up(self, load, evaluators_dir):
+        path = evaluators_dir / "google/gemini-flash/evaluator.yml"
+        path.write_text(path.read_text().replace("gemini-2.5-flash", "gemini-3-flash"))
+
+        records = build_index(load()).index["evaluators"]
+
+        assert records[0]["model"] == "gemini/gemini-3-flash"
+
+    def test_new_provider_and_category(self, load, evaluators_dir):
+        _add_evaluator(evaluators_dir, "acme/acme-check", "acme-check", "\ncategory: x")
+
+        index = build_index(load()).index
+
+        assert index["providers"]["acme"] == {
+            "api_key_env": "OPENAI_API_KEY",
+            "evaluators": ["acme-check"],
+        }
+        assert index["categories"]["x"] == ""
+
+    def test_uncategorised_evaluator_is_rejected(self, load, evaluators_dir):
+        _add_evaluator(evaluators_dir, "openai/nano-lint", "nano-lint")
+
+        with pytest.raises(IndexBuildError, match="no category"):
+            build_index(load())
+
+    def test_invalid_yaml_is_rejected(self, load, evaluators_dir):
+        (evaluators_dir / "openai/fast-check/evaluator.yml").write_text("a: [")
+
+        with pytest.raises(IndexBuildError, match="fast-check"):
+            build_index(load())
+
+
+class TestWrite:
+    """Rewrites are incremental and idempotent."""
+
+    def test_rebuild_reads_only_changed_files(self, load, evaluators_dir):
+        load()
+        _add_evaluator(
+            evaluators_dir, "openai/nano-lint", "nano-lint", "\ncategory: quick-check"
+        )
+
+        result = write_index(load())
+
+        assert result.parsed == 1
+        assert result.changed
+
+    def test_second_write_is_noop(self, load, evaluators_dir):
+        shutil.rmtree(evaluators_dir / "mistral/mistral-fast")
+        write_index(load())
+        before = (evaluators_dir / "index.json").read_bytes()
+
+        result = write_index(load())
+
+        assert not result.changed
+        assert (evaluators_dir / "index.json").read_bytes() == before
+
+    def test_check_does_not_write(self, tmp_path, evaluators_dir, monkeypatch):
+        monkeypatch.setenv("EVALUATOR_CATALOG_CACHE", str(tmp_path / "catalog.json"))
+        shutil.rmtree(evaluators_dir / "mistral/mistral-fast")
+        before = (evaluators_dir / "index.json").read_bytes()
+
+        assert main([str(evaluators_dir), "--check"]) == 1
+        assert (evaluators_dir / "index.json").read_bytes() == before
+        assert main([str(evaluators_dir)]) == 0
+        names = json.loads((evaluators_dir / "index.json").read_text())["providers"]
+        assert "mistral-fast" not in names["mistral"]["evaluators"]
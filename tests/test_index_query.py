@@ -0,0 +1,159 @@
+"""
+Tests for inverted-index evaluator queries.
+
+Usage:
+    pytest tests/test_index_query.py -v
+"""
+
+import pytest
+
+from scripts.local.catalog import EVALUATORS_DIR, EvaluatorCatalog
+from scripts.local.index_query import EvaluatorIndex, IndexedEvaluator, keywords, main
+
+
+def _evaluator(
+    name, provider, category, level, family="f", tier="t", desc="", price=None
+):
+    return IndexedEvaluator(
+        name=name,
+        provider=provider,
+        category=category,
+        family=family,
+        tier=tier,
+        model=f"{name}-model",
+        description=desc,
+        capability_level=level,
+        price=price,
+    )
+
+
+@pytest.fixture
+def small_index():
+    return EvaluatorIndex(
+        [
+            _evaluator("a-openai", "openai", "code-review", 3, desc="Fast code check"),
+            _evaluator("b-claude", "anthropic", "code-review", 4, "claude", "sonnet"),
+            _evaluator("c-gemini", "google", "code-review", 5, "gemini", "pro"),
+            _evaluator("d-mistral", "mistral", "quick-check", 3, desc="Fast review"),
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def library_index(tmp_path_factory):
+    snapshot = tmp_path_factory.mktemp("cache") / "catalog.json"
+    return EvaluatorIndex.load(EvaluatorCatalog.load(EVALUATORS_DIR, snapshot))
+
+
+class TestEvaluatorIndex:
+    """Posting-set queries on a hand-built index."""
+
+    def test_cheapest_excluding_provider(self, small_index):
+        result = small_index.cheapest("code-review", exclude_providers={"openai"})
+
+        assert result.name == "b-claude"
+
+    def test_price_outranks_capability_level(self):
+        index = EvaluatorIndex(
+            [
+                _evaluator("a-pricey", "openai", "code-review", 3, price=0.05),
+                _evaluator("b-unpriced", "google", "code-review", 1),
+                _evaluator("c-cheap", "anthropic", "code-review", 5, price=0.01),
+            ]
+        )
+
+        ranked = [e.name for e in index.query(category="code-review")]
+
+        assert ranked == ["c-cheap", "a-pricey", "b-unpriced"]
+        assert index.cheapest("code-review").name == "c-cheap"
+
+    def test_cheapest_with_everything_excluded(self, small_index):
+        excluded = {"openai", "anthropic", "google"}
+
+        assert small_index.cheapest("code-review", excluded) is None
+
+    def test_query_intersects_filters(self, small_index):
+        names = [e.name for e in small_index.query(category="code-review", tier="pro")]
+
+        assert names == ["c-gemini"]
+
+    def test_query_by_keyword_across_categories(self, small_index):
+        names = [e.name for e in small_index.query(keyword="fast")]
+
+        assert names == ["a-openai", "d-mistral"]
+
+    def test_multi_word_keyword_requires_all(self, small_index):
+        assert [e.name for e in small_index.query(keyword="fast code")] == ["a-openai"]
+
+    def test_results_sorted_by_cost(self, small_index):
+        levels = [e.capability_level for e in small_index.query(category="code-review")]
+
+        assert levels == sorted(levels)
+
+    def test_lookups_ignore_case(self):
+        index = EvaluatorIndex(
+            [
+                _evaluator("a-fork", "Acme", "Code-Review", 3, "GPT", "Mini"),
+                _evaluator("b-fork", "openai", "code-review", 4),
+            ]
+        )
+
+        assert [e.name for e in index.query(category="code-review")] == [
+            "a-fork",
+            "b-fork",
+        ]
+        assert [e.name for e in index.query(family="gpt", tier="MINI")] == ["a-fork"]
+        assert index.cheapest("CODE-REVIEW", exclude_providers={"acme"}).name == (
+            "b-fork"
+        )
+
+    def test_unknown_value_returns_empty(self, small_index):
+        assert small_index.query(category="nope") == []
+
+    def test_keywords_drop_stopwords(self):
+        assert keywords("Review using the Gemini 2.5 Flash model.") == {
+            "review",
+            "gemini",
+            "2.5",
+            "flash",
+            "model",
+        }
+
+
+class TestLibraryIndex:
+    """Queries against the real catalog and registry."""
+
+    def test_every_evaluator_indexed(self, library_index):
+        assert len(library_index.evaluators) == len(
+            list(EVALUATORS_DIR.glob("**/evaluator.yml"))
+        )
+
+    def test_capability_levels_resolved(self, library_index):
+        assert library_index.evaluators["claude-quick"].capability_level == 3
+        assert library_index.evaluators["claude-adversarial"].capability_level == 5
+
+    def test_prices_resolved(self, library_index):
+        prices = {name: e.price for name, e in library_index.evaluators.items()}
+
+        assert None not in prices.values()
+        assert prices["claude-quick"] < prices["claude-adversarial"]
+
+    def test_cheapest_non_openai_code_review(self, library_index):
+        result = library_index.cheapest("code-review", exclude_providers={"openai"})
+
+        assert result.provider != "openai"
+        assert result.category == "code-review"
+
+    def test_family_index(self, library_index):
+        names = {e.name for e in library_index.query(family="claude")}
+
+        assert names == {
+            "claude-adversarial",
+            "claude-arch",
+            "claude-code",
+            "claude-quick",
+        }
+
+    def test_cli_cheapest(self, capsys):
+        assert main(["--category", "arch-review", "--cheapest"]) == 0
+        assert len(capsys.readouterr().out.strip().splitlines()) == 1
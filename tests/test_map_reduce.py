@@ -0,0 +1,117 @@
+"""
+Tests for map-reduce evaluation of chunked documents.
+
+Usage:
+    pytest tests/test_map_reduce.py -v
+"""
+
+import threading
+
+from scripts.local.findings import parse_findings, parse_verdict
+from scripts.local.map_reduce import map_reduce
+
+CONFIG = {
+    "name": "tiny-review",
+    "model": "mistral/codestral-latest",
+    "prompt": "Review:\n{content}\n",
+}
+
+# 32k-token window minus a 30k reserve leaves ~2k tokens per chunk
+RESERVE = 30_000
+
+DOCUMENT = "".join(f"## Part {i}\n\n" + ("word " * 60 + "\n\n") * 8 for i in range(12))
+
+
+def _run(evaluate, registry, **kwargs):
+    return map_reduce(
+        CONFIG, DOCUMENT, evaluate, registry, output_reserve=RESERVE, **kwargs
+    )
+
+
+def _output(verdict, *findings):
+    body = "".join(
+        f"### [{sev}]: {title}\n- **Issue**: x\n\n" for sev, title in findings
+    )
+    return f"## Findings\n\n{body}**Verdict**: {verdict}\n"
+
+
+class TestMap:
+    def test_chunks_run_concurrently(self, registry):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def evaluate(chunk):
+            if chunk.index < 2:
+                barrier.wait()  # Deadlocks unless two chunks run at once
+            return _output("APPROVED")
+
+        result = _run(evaluate, registry, max_workers=2)
+
+        assert len(result.chunks) > 2
+        assert result.verdict == "APPROVED"
+        assert result.complete
+
+    def test_results_in_chunk_order(self, registry):
+        result = _run(lambda c: _output("APPROVED", ("LOW", f"c{c.index}")), registry)
+
+        assert [r.chunk.index for r in result.chunks] == list(range(len(result.chunks)))
+        assert [m.finding.title for m in result.findings][:3] == ["c0", "c1", "c2"]
+
+
+class TestReduce:
+    def test_repeated_findings_merge_at_highest_severity(self, registry):
+        def evaluate(chunk):
+            severity = "HIGH" if chunk.index == 1 else "MEDIUM"
+            return _output("APPROVED", (severity, "No error handling"))
+
+        result = _run(evaluate, registry)
+
+        assert len(result.findings) == 1
+        merged = result.findings[0]
+        assert merged.finding.severity == "HIGH"
+        assert merged.chunks == list(range(len(result.chunks)))
+
+    def test_findings_sorted_by_severity(self, registry):
+        def evaluate(chunk):
+            if chunk.index == 0:
+                return _output("NEEDS_REVISION", ("LOW", "Typos"))
+            return _output("APPROVED", ("CRITICAL", f"Broken {chunk.index}"))
+
+        severities = [m.finding.severity for m in _run(evaluate, registry).findings]
+
+        assert severities[0] == "CRITICAL"
+        assert severities[-1] == "LOW"
+
+    def test_most_severe_verdict_wins(self, registry):
+        verdicts = {1: "NEEDS_REVISION", 2: "REJECT"}
+        result = _run(lambda c: _output(verdicts.get(c.index, "APPROVED")), registry)
+
+        assert result.verdict == "REJECT"
+
+    def test_failed_chunk_blocks_approval(self, registry):
+        def evaluate(chunk):
+            if chunk.index == 1:
+                raise TimeoutError("chunk timed out")
+            return _output("APPROVED")
+
+        result = _run(evaluate, registry)
+
+        assert result.verdict is None
+        assert not result.complete
+        assert "TimeoutError" in result.chunks[1].error
+
+    def test_deterministic(self, registry):
+        def evaluate(chunk):
+            return _output("APPROVED", ("MEDIUM", "Shared"), ("LOW", f"c{chunk.index}"))
+
+        first = _run(evaluate, registry, max_workers=8).render()
+
+        assert _run(evaluate, registry, max_workers=1).render() == first
+
+    def test_report_round_trips_through_parsers(self, registry):
+        result = _run(lambda c: _output("NEEDS_REVISION", ("HIGH", "Gap")), registry)
+        report = result.render()
+
+        assert parse_verdict(report) == "NEEDS_REVISION"
+        assert [(f.severity, f.title) for f in parse_findings(report)] == [
+            ("HIGH", "Gap")
+        ]
@@ -0,0 +1,107 @@
+"""
+Tests for the panel composition executor.
+
+Usage:
+    pytest tests/test_panel.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from scripts.local.compositions import CompositionError
+from scripts.local.panel import PanelExecutor, main
+from scripts.local.providers import Completion
+
+LATENCY = {"openai": 0.15, "mistral": 0.1, "gemini": 0.05}
+
+pytestmark = pytest.mark.usefixtures("api_keys")
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "plan.md"
+    path.write_text("# Plan\n\nShip it.\n")
+    return path
+
+
+class FakeBackend:
+    def __init__(self):
+        self.bodies = []
+
+    async def __call__(self, call):
+        body = b"".join(call.body_chunks()).decode("utf-8")
+        self.bodies.append((call.provider, body))
+        await asyncio.sleep(LATENCY.get(call.provider, 0))
+        if "Evaluation: " in body:
+            return Completion("## Consensus Issues\n\n**Verdict**: NEEDS_REVISION")
+        return Completion(f"{call.provider} says fine\n\n**Verdict**: APPROVED")
+
+
+def make_executor(make_runner, backend, synthesizer=None):
+    return PanelExecutor(make_runner(backend), synthesizer=synthesizer)
+
+
+class TestPanelExecutor:
+    def test_members_run_concurrently(self, make_runner, tmp_path, document):
+        executor = make_executor(make_runner, FakeBackend())
+
+        started = time.monotonic()
+        (result,) = executor.run_sync("high-stakes-panel", [document])
+        elapsed = time.monotonic() - started
+
+        assert result.complete
+        assert elapsed < sum(LATENCY.values())
+        assert list(result.outputs) == [
+            "openai/gpt52-reasoning",
+            "mistral/mistral-content",
+            "google/gemini-deep",
+        ]
+        assert (tmp_path / "logs" / "plan-gpt52-reasoning.md").exists()
+
+    def test_report_collects_outputs_in_memory(self, make_runner, tmp_path, document):
+        executor = make_executor(make_runner, FakeBackend())
+
+        (result,) = executor.run_sync("high-stakes-panel", [document])
+
+        report = result.report_path.read_text()
+        assert result.report_path == tmp_path / "logs" / "plan-high-stakes-panel.md"
+        assert "## Consensus Issues (found by 2+ models)" in report
+        assert "## Evaluation: mistral/mistral-content" in report
+        assert "gemini says fine" in report
+
+    def test_synthesizer_receives_outputs(self, make_runner, tmp_path, document):
+        backend = FakeBackend()
+        executor = make_executor(make_runner, backend, synthesizer="gpt5-synthesis")
+
+        (result,) = executor.run_sync("adversarial-trio", [document])
+
+        provider, body = backend.bodies[-1]
+        assert "Weight consensus heavily" in body
+        assert "openai says fine" in body
+        assert result.synthesis.ok
+        assert result.synthesis.verdict == "NEEDS_REVISION"
+        assert result.synthesis.job.output_path.name == (
+            "plan-adversarial-trio-synthesis.md"
+        )
+
+    def test_failed_member_noted(self, make_runner, tmp_path, document, monkeypatch):
+        monkeypatch.delenv("MISTRAL_API_KEY")
+        executor = make_executor(make_runner, FakeBackend())
+
+        (result,) = executor.run_sync("high-stakes-panel", [document])
+
+        assert not result.complete
+        assert "_No output: ProviderError" in result.report_path.read_text()
+
+    def test_staged_composition_rejected(self, make_runner, tmp_path, document):
+        executor = make_executor(make_runner, FakeBackend())
+
+        with pytest.raises(CompositionError, match="staged"):
+            executor.run_sync("quick-then-deep", [document])
+
+
+def test_cli_rejects_unknown_composition(capsys):
+    assert main(["no-such-panel", "doc.md"]) == 1
+    assert "not found" in capsys.readouterr().out
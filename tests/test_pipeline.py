@@ -0,0 +1,234 @@
+"""
+Tests for the staged composition executor.
+
+Usage:
+    pytest tests/test_pipeline.py -v
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.local.compositions import CompositionError, parse_composition
+from scripts.local.http_pool import HttpPool
+from scripts.local.pipeline import CANCELLED, RAN, SKIPPED, PipelineExecutor
+from scripts.local.providers import Completion
+from scripts.local.runner import thread_backend
+
+QUICK, DEEP = 0.05, 0.2  # fast-check and gpt52-reasoning latencies
+
+pytestmark = pytest.mark.usefixtures("api_keys")
+
+
+@pytest.fixture
+def documents(tmp_path):
+    clean = tmp_path / "clean.md"
+    clean.write_text("# Clean\n")
+    messy = tmp_path / "messy.md"
+    messy.write_text("# Messy\n\nFIXME\n")
+    return clean, messy
+
+
+class FakeBackend:
+    """fast-check passes documents without FIXME; the deep review is slow."""
+
+    def __init__(self):
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, call):
+        body = b"".join(call.body_chunks()).decode("utf-8")
+        deep = call.model != "gpt-5.4-nano"
+        self.started.append(call.model)
+        try:
+            await asyncio.sleep(DEEP if deep else QUICK)
+        except asyncio.CancelledError:
+            self.cancelled.append(call.model)
+            raise
+        if deep:
+            return Completion("### [HIGH]: FIXME left\n\n**Verdict**: NEEDS_REVISION")
+        if "FIXME" in body:
+            return Completion("⚠️ ISSUES FOUND\n- Issue: FIXME marker")
+        return Completion("✅ PASSED - Document ready for review")
+
+
+def make_executor(make_runner, backend, speculative=None):
+    return PipelineExecutor(make_runner(backend), speculative=speculative)
+
+
+@pytest.fixture
+def slow_server(monkeypatch):
+    """OpenAI stand-in: fast-check answers at once, the deep model hangs."""
+    state = {"deep": threading.Event(), "release": threading.Event()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if body["model"] != "gpt-5.4-nano":
+                state["deep"].set()
+                state["release"].wait(5)
+            text = "✅ PASSED - Document ready for review"
+            payload = json.dumps(
+                {
+                    "choices": [{"message": {"content": text}}],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    monkeypatch.setenv(
+        "ADVERSARIAL_OPENAI_BASE_URL", f"http://127.0.0.1:{httpd.server_address[1]}"
+    )
+    yield state
+    state["release"].set()
+    httpd.shutdown()
+
+
+class TestSequential:
+    def test_gate_stops_clean_document(self, make_runner, tmp_path, documents):
+        backend = FakeBackend()
+        executor = make_executor(make_runner, backend)
+
+        (result,) = executor.run_sync("quick-then-deep", documents[:1])
+
+        assert [s.status for s in result.stages] == [RAN, SKIPPED]
+        assert result.stopped_at == "quick-check"
+        assert backend.started == ["gpt-5.4-nano"]
+
+    def test_gate_continues_on_issues(self, make_runner, tmp_path, documents):
+        executor = make_executor(make_runner, FakeBackend())
+
+        (result,) = executor.run_sync("quick-then-deep", documents[1:])
+
+        assert [s.status for s in result.stages] == [RAN, RAN]
+        assert result.stopped_at is None
+        assert result.verdict == "NEEDS_REVISION"
+        assert result.duration >= QUICK + DEEP
+        assert (tmp_path / "logs" / "messy-gpt52-reasoning.md").exists()
+
+
+class TestSpeculative:
+    def test_deep_stage_cancelled_when_gate_stops(
+        self, make_runner, tmp_path, documents
+    ):
+        backend = FakeBackend()
+        executor = make_executor(make_runner, backend, True)
+
+        (result,) = executor.run_sync("quick-then-deep", documents[:1])
+
+        assert [s.status for s in result.stages] == [RAN, CANCELLED]
+        assert backend.cancelled == ["gpt-5.4"]
+        assert result.duration < DEEP
+        assert not (tmp_path / "logs" / "clean-gpt52-reasoning.md").exists()
+
+    def test_cancel_reaches_the_transport(
+        self, make_runner, tmp_path, documents, slow_server
+    ):
+        pool = HttpPool()
+        backend = thread_backend(pool.transport, pool.stream)
+        executor = make_executor(make_runner, backend, True)
+
+        started = time.monotonic()
+        (result,) = executor.run_sync("quick-then-deep", documents[:1])
+
+        # run_sync returns without waiting for the hung deep request
+        assert time.monotonic() - started < 2
+        assert slow_server["deep"].is_set()
+        assert [s.status for s in result.stages] == [RAN, CANCELLED]
+        (metrics,) = pool.stats().values()
+        assert (metrics.in_use, metrics.closed) == (0, 1)
+
+    def test_issues_latency_is_deep_stage_alone(self, make_runner, tmp_path, documents):
+        executor = make_executor(make_runner, FakeBackend(), True)
+
+        started = time.monotonic()
+        results = executor.run_sync("quick-then-deep", documents)
+        elapsed = time.monotonic() - started
+
+        clean, messy = results
+        assert clean.stopped_at == "quick-check"
+        assert [s.status for s in messy.stages] == [RAN, RAN]
+        assert elapsed < QUICK + DEEP
+
+    def test_composition_setting_used_by_default(
+        self, make_runner, tmp_path, documents
+    ):
+        composition = parse_composition(
+            {
+                "name": "spec",
+                "speculative": True,
+                "stages": [
+                    {
+                        "evaluator": "openai/fast-check",
+                        "gate": {"stop_if": {"contains": "PASSED"}},
+                    },
+                    {"evaluator": "openai/gpt52-reasoning", "condition": "if issues"},
+                ],
+            }
+        )
+        backend = FakeBackend()
+        executor = make_executor(make_runner, backend)
+
+        executor.run_sync(composition, documents[:1])
+
+        assert backend.cancelled == ["gpt-5.4"]
+
+
+def test_free_text_gate_rejected(make_runner, tmp_path, documents):
+    composition = parse_composition(
+        {"stages": [{"evaluator": "openai/fast-check", "gate": "stop if clean"}]}
+    )
+    executor = make_executor(make_runner, FakeBackend())
+
+    with pytest.raises(CompositionError, match="free-text"):
+        executor.run_sync(composition, documents[:1])
+
+
+def test_fail_fast_gate_stops_stage_early(make_runner, tmp_path, documents):
+    composition = parse_composition(
+        {
+            "name": "strict",
+            "stages": [
+                {
+                    "name": "quick-check",
+                    "evaluator": "openai/fast-check",
+                    "gate": {"stop_if": {"verdict": "APPROVED"}, "fail_fast": "HIGH"},
+                },
+                {"evaluator": "openai/gpt52-reasoning", "condition": "if issues"},
+            ],
+        }
+    )
+    streamed = []
+
+    async def backend(call, on_text=None):
+        if not call.stream:
+            return Completion("**Verdict**: NEEDS_REVISION")
+        for line in ["### [HIGH]: FIXME left\n", "More detail\n", "**Verdict**: OK\n"]:
+            streamed.append(line)
+            on_text(line)
+        return Completion("".join(streamed))
+
+    (result,) = make_executor(make_runner, backend).run_sync(composition, documents[1:])
+
+    quick = result.stages[0].result
+    assert quick.verdict == "FAIL" and quick.stopped_by.title == "FIXME left"
+    assert streamed == ["### [HIGH]: FIXME left\n"]
+    assert [s.status for s in result.stages] == [RAN, RAN]
+    assert result.ok and result.failed
@@ -0,0 +1,118 @@
+"""
+Tests for compiled prompt templates.
+
+Usage:
+    pytest tests/test_prompt_template.py -v
+"""
+
+import pytest
+
+from scripts.local.prompt_template import (
+    CONTENT_BRIDGE,
+    LAYOUT_STATIC_FIRST,
+    TemplateError,
+    compile_evaluator,
+    compile_prompt,
+)
+
+TEMPLATE = "You are a reviewer.\n\n{content}\n\n## Framework\n- Check {{braces}}\n"
+DOCUMENT = "# Spec\nSome text with {braces} of its own."
+
+
+class TestAsWritten:
+    """Default layout matches str.format exactly."""
+
+    def test_segments(self):
+        compiled = compile_prompt(TEMPLATE)
+
+        assert compiled.slots == ["content"]
+        assert compiled.static_prefix == "You are a reviewer.\n\n"
+        assert compiled.static_suffix == "\n\n## Framework\n- Check {braces}\n"
+
+    def test_render_matches_format(self):
+        compiled = compile_prompt(TEMPLATE)
+
+        assert compiled.render(content=DOCUMENT) == TEMPLATE.format(content=DOCUMENT)
+
+    def test_all_library_prompts_round_trip(self, catalog):
+        for entry in catalog.entries():
+            compiled = compile_evaluator(entry.full_config())
+            expected = entry.prompt.format(content=DOCUMENT)
+
+            assert compiled.render(content=DOCUMENT) == expected, entry.name
+
+    def test_blocks_mark_prefix(self):
+        blocks = compile_prompt(TEMPLATE).blocks(DOCUMENT)
+
+        assert blocks[0].cache_breakpoint
+        assert blocks[0].text == "You are a reviewer.\n\n"
+        assert "".join(b.text for b in blocks) == TEMPLATE.format(content=DOCUMENT)
+
+    def test_split_prefix(self):
+        prefix, rest = compile_prompt(TEMPLATE).split_prefix()
+
+        assert prefix == "You are a reviewer.\n\n"
+        assert prefix + rest.render(content=DOCUMENT) == TEMPLATE.format(
+            content=DOCUMENT
+        )
+
+    def test_slot_first_has_no_breakpoint(self):
+        compiled = compile_prompt("{content}\nReview the above.")
+
+        assert compiled.cache_breakpoints == []
+        assert len(compiled.blocks("x")) == 1
+
+
+class TestStaticFirst:
+    """Opt-in layout moves instructions into the cacheable prefix."""
+
+    def test_instructions_precede_content(self):
+        compiled = compile_prompt(TEMPLATE, LAYOUT_STATIC_FIRST)
+        rendered = compiled.render(content=DOCUMENT)
+
+        assert rendered.endswith(DOCUMENT)
+        assert rendered.index("## Framework") < rendered.index(DOCUMENT)
+        assert compiled.static_prefix.endswith(CONTENT_BRIDGE)
+        assert compiled.cache_breakpoints == [len(compiled.static_prefix)]
+
+    def test_prefix_is_identical_across_documents(self):
+        compiled = compile_prompt(TEMPLATE, LAYOUT_STATIC_FIRST)
+
+        first = compiled.blocks("doc one")[0]
+        second = compiled.blocks("a different doc")[0]
+
+        assert first == second
+
+    def test_library_prompt_prefix_grows(self, catalog):
+        config = catalog.get("claude-adversarial").full_config()
+
+        as_written = compile_evaluator(config)
+        static_first = compile_evaluator(config, layout=LAYOUT_STATIC_FIRST)
+
+        assert "## Analysis Framework" in static_first.static_prefix
+        assert len(static_first.static_prefix) > 3 * len(as_written.static_prefix)
+
+    def test_layout_from_config_key(self):
+        config = {"name": "x", "prompt": TEMPLATE, "prompt_layout": "static-first"}
+
+        assert compile_evaluator(config).layout == LAYOUT_STATIC_FIRST
+
+
+class TestErrors:
+    """Invalid templates are rejected at compile time."""
+
+    def test_unknown_placeholder(self):
+        with pytest.raises(TemplateError, match="Unsupported placeholder"):
+            compile_prompt("Review {document}")
+
+    def test_unbalanced_brace(self):
+        with pytest.raises(TemplateError, match="Invalid prompt template"):
+            compile_prompt("Review {content")
+
+    def test_unknown_layout(self):
+        with pytest.raises(TemplateError, match="Unknown prompt layout"):
+            compile_prompt(TEMPLATE, "reversed")
+
+    def test_missing_prompt(self):
+        with pytest.raises(TemplateError, match="has no prompt"):
+            compile_evaluator({"name": "empty"})
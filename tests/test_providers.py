@@ -0,0 +1,260 @@
+"""
+Tests for provider wire formats and the urllib transport.
+
+Usage:
+    pytest tests/test_providers.py -v
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.local.providers import (
+    ProviderError,
+    build_call,
+    envelope,
+    parse_completion,
+    provider_for,
+    send,
+    stream_call,
+)
+
+CONFIG = {
+    "name": "demo",
+    "model": "anthropic/claude-haiku-4-5",
+    "prompt": 'Review "this":\n{content}\nEnd.',
+    "timeout": 5,
+}
+
+RESPONSES = {
+    "anthropic": {
+        "content": [{"type": "text", "text": "**Verdict**: APPROVED"}],
+        "usage": {"input_tokens": 12, "output_tokens": 3},
+    },
+    "openai": {
+        "choices": [{"message": {"content": "ok"}}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 1},
+    },
+    "gemini": {
+        "candidates": [{"content": {"parts": [{"text": "a"}, {"text": "b"}]}}],
+        "usageMetadata": {"promptTokenCount": 7, "candidatesTokenCount": 2},
+    },
+}
+
+STREAMS = {
+    "anthropic": [
+        {"type": "message_start", "message": {"usage": {"input_tokens": 12}}},
+        {"type": "content_block_delta", "delta": {"text": "### [HIGH]: "}},
+        {"type": "content_block_delta", "delta": {"text": "Bad\n"}},
+        {"type": "message_delta", "usage": {"output_tokens": 4}},
+    ],
+    "openai": [
+        {"choices": [{"delta": {"content": "o"}}]},
+        {"choices": [{"delta": {"content": "k"}}]},
+        {"choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 1}},
+    ],
+    "gemini": [
+        {"candidates": [{"content": {"parts": [{"text": "a"}]}}]},
+        {
+            "candidates": [{"content": {"parts": [{"text": "b"}]}}],
+            "usageMetadata": {"promptTokenCount": 7, "candidatesTokenCount": 2},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Local HTTP server that records requests and replies per path."""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            headers = {k.lower(): v for k, v in self.headers.items()}
+            received.append((self.path, headers, json.loads(body)))
+            if "fail" in self.path:
+                self.send_response(429)
+                self.send_header("Retry-After", "3")
+                self.end_headers()
+                self.wfile.write(b'{"error": "slow down"}')
+                return
+            provider = "anthropic" if "messages" in self.path else "openai"
+            if "enerateContent" in self.path:
+                provider = "gemini"
+            if "alt=sse" in self.path or json.loads(body).get("stream"):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for event in STREAMS[provider]:
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                    self.wfile.flush()
+                if provider == "openai":
+                    self.wfile.write(b"data: [DONE]\n\n")
+                return
+            payload = json.dumps(RESPONSES[provider]).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    for provider in ("OPENAI", "ANTHROPIC", "GEMINI", "MISTRAL"):
+        monkeypatch.setenv(f"ADVERSARIAL_{provider}_BASE_URL", url)
+    yield received
+    httpd.shutdown()
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text('Line with "quotes"\nand ünïcode\n')
+    return path
+
+
+class TestRouting:
+    @pytest.mark.parametrize(
+        "model,provider",
+        [
+            ("gpt-5.4", "openai"),
+            ("o3", "openai"),
+            ("anthropic/claude-opus-4-7", "anthropic"),
+            ("gemini/gemini-2.5-pro", "gemini"),
+            ("mistral/codestral-latest", "mistral"),
+        ],
+    )
+    def test_provider_for(self, model, provider):
+        assert provider_for(model) == provider
+
+    def test_unknown_prefix(self):
+        with pytest.raises(ProviderError):
+            provider_for("together/llama-4")
+
+
+class TestRoundTrip:
+    def test_anthropic_request(self, server, document):
+        call = build_call(CONFIG, document, "sk-test", max_output_tokens=100)
+
+        completion = send(call)
+
+        path, headers, body = server[0]
+        assert path == "/v1/messages"
+        assert headers["x-api-key"] == "sk-test"
+        assert body["model"] == "claude-haiku-4-5"
+        assert body["max_tokens"] == 100
+        prefix, rest = body["messages"][0]["content"]
+        assert prefix == {
+            "type": "text",
+            "text": 'Review "this":\n',
+            "cache_control": {"type": "ephemeral"},
+        }
+        assert prefix["text"] + rest["text"] == CONFIG["prompt"].format(
+            content=document.read_text()
+        )
+        assert (completion.input_tokens, completion.output_tokens) == (12, 3)
+
+    def test_no_cache_block_without_static_prefix(self, server, document):
+        config = {**CONFIG, "prompt": "{content}\nEnd."}
+
+        send(build_call(config, document, "k"))
+        send(build_call({**CONFIG, "model": "gpt-5.4"}, document, "o"))
+
+        assert server[0][2]["messages"][0]["content"] == document.read_text() + (
+            "\nEnd."
+        )
+        assert isinstance(server[1][2]["messages"][0]["content"], str)
+
+    def test_gemini_and_openai_requests(self, server, document):
+        gemini = send(
+            build_call({**CONFIG, "model": "gemini/gemini-2.5-pro"}, document, "g")
+        )
+        openai = send(build_call({**CONFIG, "model": "gpt-5.4"}, document, "o"))
+
+        assert server[0][0] == "/v1beta/models/gemini-2.5-pro:generateContent"
+        assert server[0][1]["x-goog-api-key"] == "g"
+        assert server[1][1]["authorization"] == "Bearer o"
+        assert (gemini.text, openai.text) == ("ab", "ok")
+
+    def test_http_error_carries_status_and_headers(self, server, document):
+        call = build_call(CONFIG, document, "k")
+        call.url += "?fail"
+
+        with pytest.raises(ProviderError) as error:
+            send(call)
+
+        assert error.value.status == 429
+        assert error.value.headers["retry-after"] == "3"
+
+    @pytest.mark.parametrize(
+        "provider,cap",
+        [
+            ("anthropic", lambda b: b["max_tokens"]),
+            ("openai", lambda b: b["max_completion_tokens"]),
+            ("mistral", lambda b: b["max_tokens"]),
+            ("gemini", lambda b: b["generationConfig"]["maxOutputTokens"]),
+        ],
+    )
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_envelope_caps_output_tokens(self, provider, cap, stream):
+        assert cap(envelope(provider, "m", 321, stream)) == 321
+
+    def test_malformed_response(self):
+        with pytest.raises(ProviderError, match="missing"):
+            parse_completion("openai", {"choices": []})
+
+
+class TestStreaming:
+    def test_anthropic_stream(self, server, document):
+        call = build_call(CONFIG, document, "k", stream=True)
+        deltas = []
+
+        completion = stream_call(call, deltas.append)
+
+        assert server[0][2]["stream"] is True
+        assert server[0][1]["accept"] == "text/event-stream"
+        assert deltas == ["### [HIGH]: ", "Bad\n"]
+        assert completion.text == "### [HIGH]: Bad\n"
+        assert (completion.input_tokens, completion.output_tokens) == (12, 4)
+
+    def test_gemini_and_openai_streams(self, server, document):
+        gemini = stream_call(
+            build_call(
+                {**CONFIG, "model": "gemini/gemini-2.5-pro"}, document, "g", stream=True
+            )
+        )
+        openai = stream_call(
+            build_call({**CONFIG, "model": "gpt-5.4"}, document, "o", stream=True)
+        )
+
+        assert server[0][0] == (
+            "/v1beta/models/gemini-2.5-pro:streamGenerateContent?alt=sse"
+        )
+        assert server[1][2]["stream_options"] == {"include_usage": True}
+        assert (gemini.text, gemini.output_tokens) == ("ab", 2)
+        assert (openai.text, openai.input_tokens) == ("ok", 5)
+
+    def test_handler_error_aborts_stream(self, document):
+        call = build_call(CONFIG, document, "k", stream=True)
+        closed = []
+
+        def lines(call):
+            try:
+                yield b'data: {"type": "content_block_delta", "delta": {"text": "x"}}'
+                yield b'data: {"type": "content_block_delta", "delta": {"text": "y"}}'
+            finally:
+                closed.append(True)
+
+        def stop(text):
+            raise RuntimeError("stop")
+
+        with pytest.raises(RuntimeError, match="stop"):
+            stream_call(call, stop, transport=lines)
+        assert closed == [True]
@@ -0,0 +1,147 @@
+"""
+Tests for registry rate limits and the token-bucket scheduler.
+
+Usage:
+    pytest tests/test_rate_limit.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from scripts.local.rate_limit import RateLimit, RateScheduler, TokenBucket
+from scripts.local.registry import CompiledRegistry, RegistryError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+REGISTRY = {
+    "schema_version": "1.0.4",
+    "providers": {
+        "acme": {
+            "auth_env_default": "ACME_API_KEY",
+            "rate_limits": {"requests_per_minute": 60, "tokens_per_minute": 6000},
+            "tiers": {
+                "big": {
+                    "models": [
+                        {
+                            "id": "acme-2",
+                            "version": "2",
+                            "rate_limits": {"tokens_per_minute": 1200},
+                        },
+                        {"id": "acme-1", "version": "1"},
+                    ]
+                }
+            },
+        },
+        "free": {"tiers": {"any": {"models": [{"id": "f-1", "version": "1"}]}}},
+    },
+}
+
+
+@pytest.fixture
+def registry():
+    return CompiledRegistry.compile(REGISTRY)
+
+
+class TestTokenBucket:
+    def test_burst_then_paced(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+
+        assert [bucket.reserve(1) for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+
+    def test_refill_over_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=10, clock=clock)
+        bucket.reserve(10)
+
+        clock.now = 3.0
+
+        assert bucket.level == pytest.approx(6.0)
+
+    def test_pause_and_refund(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=5, clock=clock)
+
+        bucket.pause(4)
+        assert bucket.reserve(1) == pytest.approx(5.0)
+
+        bucket.adjust(-5)  # Refund
+        assert bucket.level == pytest.approx(0.0)
+
+
+class TestRegistryLimits:
+    def test_model_overrides_provider_default(self, registry):
+        model = registry.model("acme-2")
+
+        assert model.rate_limits == {
+            "requests_per_minute": 60,
+            "tokens_per_minute": 1200,
+        }
+        assert registry.model("acme-1").rate_limits["tokens_per_minute"] == 6000
+
+    def test_invalid_limit_rejected(self):
+        bad = {"providers": {"x": {"rate_limits": {"requests_per_minute": 0}}}}
+
+        with pytest.raises(RegistryError, match="requests_per_minute"):
+            CompiledRegistry.compile(bad)
+
+
+class TestScheduler:
+    def test_shared_key_across_callers(self, registry):
+        scheduler = RateScheduler(clock=FakeClock())
+        model = registry.model("acme-2")
+
+        first = scheduler.for_model(model)
+        second = scheduler.for_model(registry.model("acme-2"))
+
+        assert first is second
+        assert first.key == "ACME_API_KEY:acme-2"
+        assert scheduler.for_model(registry.model("acme-1")) is not first
+
+    def test_unlimited_model_has_no_limiter(self, registry):
+        assert RateScheduler().for_model(registry.model("f-1")) is None
+
+    def test_tokens_per_minute_paces_requests(self, registry):
+        clock = FakeClock()
+        limiter = RateScheduler(clock=clock).for_model(registry.model("acme-2"))
+
+        # 1200 TPM = 20 tokens/s with a 120-token burst
+        delays = [limiter.reserve(tokens=100) for _ in range(3)]
+
+        assert delays == pytest.approx([0.0, 4.0, 9.0])
+        assert limiter.waits == 2
+
+    def test_throughput_holds_at_limit(self):
+        clock = FakeClock()
+        limiter = RateScheduler(clock=clock).limiter(
+            "k", RateLimit(requests_per_minute=120)
+        )
+
+        delays = [limiter.reserve() for _ in range(132)]
+
+        # 12-request burst, then exactly 2 per second
+        assert delays[-1] == pytest.approx(60.0)
+
+    def test_settle_refunds_overestimate(self, registry):
+        clock = FakeClock()
+        limiter = RateScheduler(clock=clock).for_model(registry.model("acme-2"))
+        limiter.reserve(tokens=120)
+
+        limiter.settle(estimated=120, actual=20)
+
+        assert limiter.reserve(tokens=100) == 0.0
+
+    def test_async_acquire(self):
+        limiter = RateScheduler().limiter("k", RateLimit(requests_per_minute=6000))
+
+        waited = asyncio.run(limiter.acquire_async())
+
+        assert waited == 0.0
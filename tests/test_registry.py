@@ -0,0 +1,254 @@
+"""
+Tests for the compiled provider registry and model_requirement resolver.
+
+Usage:
+    pytest tests/test_registry.py -v
+"""
+
+import pytest
+import yaml
+
+from scripts.local.catalog import EVALUATORS_DIR, EvaluatorCatalog
+from scripts.local.registry import (
+    REGISTRY_PATH,
+    CompiledRegistry,
+    RegistryError,
+    main,
+    merge_registry,
+    parse_version,
+)
+
+REGISTRY = {
+    "schema_version": "1.0.4",
+    "providers": {
+        "acme": {
+            "litellm_prefix": "acme/",
+            "auth_env_default": "ACME_API_KEY",
+            "tiers": {
+                "big": {
+                    "capability_level": 5,
+                    "models": [
+                        {"id": "acme-2", "version": "2", "status": "legacy"},
+                        {"id": "acme-3.1", "version": "3.1", "status": "active"},
+                        {"id": "acme-4", "version": "4", "status": "deprecated"},
+                        {"id": "acme-3", "version": "3", "status": "active"},
+                        {"id": "acme-3-nano", "version": "3-nano", "status": "active"},
+                    ],
+                }
+            },
+        }
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo():
+    CompiledRegistry._loaded.clear()
+    yield
+    CompiledRegistry._loaded.clear()
+
+
+@pytest.fixture
+def compiled():
+    return CompiledRegistry.compile(REGISTRY)
+
+
+class TestParseVersion:
+    @pytest.mark.parametrize(
+        "version,expected",
+        [
+            ("4.7", ("", (4, 7))),
+            ("5.4-nano", ("nano", (5, 4))),
+            ("large-2512", ("large", (2512,))),
+            ("latest", ("latest", ())),
+            (4, ("", (4,))),
+        ],
+    )
+    def test_lines_and_numbers(self, version, expected):
+        assert parse_version(version) == expected
+
+
+class TestResolve:
+    """Best-match resolution over compiled tables."""
+
+    def test_newest_active_wins(self, compiled):
+        model = compiled.resolve("acme", "big", min_version="3")
+
+        assert model.id == "acme-3.1"
+        assert model.litellm_id == "acme/acme-3.1"
+        assert model.auth_env == "ACME_API_KEY"
+
+    def test_min_version_above_all_active(self, compiled):
+        assert compiled.resolve("acme", "big", min_version="3.2") is None
+
+    def test_status_fallback_order(self, compiled):
+        model = compiled.resolve(
+            "acme", "big", min_version="3.2", statuses=("active", "deprecated")
+        )
+
+        assert (model.id, model.status) == ("acme-4", "deprecated")
+
+    def test_version_lines_do_not_mix(self, compiled):
+        assert compiled.resolve("acme", "big", "3-nano").id == "acme-3-nano"
+        assert compiled.resolve("acme", "big", "3").id == "acme-3.1"
+
+    def test_no_min_version_takes_newest(self, compiled):
+        assert compiled.resolve("acme", "big").id == "acme-3.1"
+
+    def test_unknown_tier(self, compiled):
+        assert compiled.resolve("acme", "tiny") is None
+        assert compiled.resolve("nope", "big") is None
+
+    def test_models_partitioned_by_status(self, compiled):
+        assert [m["id"] for m in compiled.models("acme", "big", "active")] == [
+            "acme-3.1",
+            "acme-3",
+            "acme-3-nano",
+        ]
+        assert compiled.versions("acme", "big")[0] == "4"
+
+
+class TestDiskCache:
+    """Compiled tables are cached by schema_version and file hash."""
+
+    def test_cache_file_reused(self, tmp_path):
+        source = tmp_path / "registry.yml"
+        source.write_text(yaml.safe_dump(REGISTRY))
+        cache_dir = tmp_path / "cache"
+
+        first = CompiledRegistry.load(source, cache_dir)
+        CompiledRegistry._loaded.clear()
+        second = CompiledRegistry.load(source, cache_dir)
+
+        assert not first.from_cache
+        assert second.from_cache
+        assert [p.name for p in cache_dir.iterdir()][0].startswith("registry-1.0.4-")
+        assert second.resolve("acme", "big").id == "acme-3.1"
+
+    def test_edit_invalidates(self, tmp_path):
+        source = tmp_path / "registry.yml"
+        source.write_text(yaml.safe_dump(REGISTRY))
+        CompiledRegistry.load(source, tmp_path)
+        CompiledRegistry._loaded.clear()
+
+        source.write_text(source.read_text().replace("acme-3.1", "acme-3.2"))
+        reloaded = CompiledRegistry.load(source, tmp_path)
+
+        assert not reloaded.from_cache
+        assert reloaded.resolve("acme", "big").id == "acme-3.2"
+
+    def test_cached_equals_fresh(self, tmp_path):
+        fresh = CompiledRegistry.load(REGISTRY_PATH, tmp_path)
+        CompiledRegistry._loaded.clear()
+        cached = CompiledRegistry.load(REGISTRY_PATH, tmp_path)
+
+        assert cached.models("claude", "opus") == fresh.models("claude", "opus")
+
+
+class TestOverrides:
+    """ADR-0005 override merge: deep at provider level, by id at model level."""
+
+    OVERRIDES = {
+        "providers": {
+            "acme": {
+                "auth_env_default": "ACME_TOKEN",
+                "tiers": {
+                    "big": {
+                        "models": [
+                            {"id": "acme-3.1", "status": "deprecated"},
+                            {"id": "acme-5", "version": "5", "status": "active"},
+                        ]
+                    }
+                },
+            },
+            "newco": {"tiers": {"std": {"models": [{"id": "n-1", "version": "1"}]}}},
+        }
+    }
+
+    def test_merge_rules(self):
+        merged = merge_registry(REGISTRY, self.OVERRIDES)
+        acme = merged["providers"]["acme"]
+        models = {m["id"]: m for m in acme["tiers"]["big"]["models"]}
+
+        assert acme["litellm_prefix"] == "acme/"  # Untouched sibling key kept
+        assert acme["auth_env_default"] == "ACME_TOKEN"
+        assert models["acme-3.1"] == {
+            "id": "acme-3.1",
+            "version": "3.1",
+            "status": "deprecated",
+        }
+        assert list(models)[-1] == "acme-5"
+        assert len(models) == 6
+        assert "newco" in merged["providers"]
+
+    def test_inputs_not_mutated(self):
+        before = yaml.safe_dump(REGISTRY)
+
+        merge_registry(REGISTRY, self.OVERRIDES)
+
+        assert yaml.safe_dump(REGISTRY) == before
+
+    def test_model_without_id_rejected(self):
+        bad = {"providers": {"acme": {"tiers": {"big": {"models": [{"v": 1}]}}}}}
+
+        with pytest.raises(RegistryError, match="id"):
+            merge_registry(REGISTRY, bad)
+
+    def test_load_resolves_through_merged_view(self, tmp_path):
+        source = tmp_path / "registry.yml"
+        source.write_text(yaml.safe_dump(REGISTRY))
+        overrides = tmp_path / "registry-overrides.yml"
+        overrides.write_text(yaml.safe_dump(self.OVERRIDES))
+
+        registry = CompiledRegistry.load(source, tmp_path / "cache", overrides)
+
+        assert registry.resolve("acme", "big").id == "acme-5"
+        assert registry.resolve("acme", "big", "3").auth_env == "ACME_TOKEN"
+        assert registry.resolve("newco", "std").id == "n-1"
+
+    def test_memoised_by_both_hashes(self, tmp_path):
+        source = tmp_path / "registry.yml"
+        source.write_text(yaml.safe_dump(REGISTRY))
+        overrides = tmp_path / "registry-overrides.yml"
+        overrides.write_text(yaml.safe_dump(self.OVERRIDES))
+        cache_dir = tmp_path / "cache"
+
+        merged = CompiledRegistry.load(source, cache_dir, overrides)
+        plain = CompiledRegistry.load(source, cache_dir, None)
+        again = CompiledRegistry.load(source, cache_dir, overrides)
+        CompiledRegistry._loaded.clear()
+        from_disk = CompiledRegistry.load(source, cache_dir, overrides)
+
+        assert again is merged
+        assert plain is not merged
+        assert from_disk.from_cache
+        assert from_disk.overrides_sha256 == merged.overrides_sha256
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_missing_overrides_file_is_ignored(self, tmp_path):
+        registry = CompiledRegistry.load(REGISTRY_PATH, None, tmp_path / "nope.yml")
+
+        assert registry.overrides_sha256 is None
+
+
+class TestLibraryRegistry:
+    """Every library evaluator's model_requirement resolves."""
+
+    def test_all_requirements_resolve(self, tmp_path):
+        registry = CompiledRegistry.load(REGISTRY_PATH, None)
+        catalog = EvaluatorCatalog.load(EVALUATORS_DIR, tmp_path / "catalog.json")
+
+        for entry in catalog.entries():
+            requirement = entry.config["model_requirement"]
+            assert registry.resolve_requirement(requirement), entry.name
+
+    def test_claude_quick_resolves_to_explicit_model(self):
+        registry = CompiledRegistry.load(REGISTRY_PATH, None)
+
+        model = registry.resolve("claude", "haiku", "4.5")
+
+        assert model.litellm_id == "anthropic/claude-haiku-4-5"
+
+    def test_cli_resolve(self, capsys):
+        assert main(["resolve", "claude", "opus", "4.5"]) == 0
+        assert "anthropic/claude-opus-4-7" in capsys.readouterr().out
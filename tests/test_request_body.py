@@ -0,0 +1,130 @@
+"""
+Tests for streaming request body assembly.
+
+Usage:
+    pytest tests/test_request_body.py -v
+"""
+
+import io
+import json
+
+import pytest
+
+from scripts.local.prompt_template import LAYOUT_STATIC_FIRST, compile_prompt
+from scripts.local.request_body import PromptBody, escape_json_bytes, escaped_length
+
+TEMPLATE = 'Role line.\n\n{content}\n\n## Framework\n- "quoted" \\ rules\n'
+
+
+def _envelope(prompt):
+    return {
+        "model": "gemini/gemini-3.1-pro-preview",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0,
+    }
+
+
+def _expected(template, text, layout="as-written"):
+    rendered = compile_prompt(template, layout).render(content=text)
+    return json.dumps(_envelope(rendered), ensure_ascii=False).encode("utf-8")
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "doc.md"
+    text = (
+        '# Title\n\tTabbed "quotes" and \\backslashes\\\r\n'
+        "Control \x01\x1f chars, unicode: é ü 漢字 🚀\n"
+    ) * 50
+    path.write_text(text, encoding="utf-8", newline="")
+    return path, text
+
+
+class TestEscaping:
+    """Byte-level JSON escaping matches json.dumps."""
+
+    @pytest.mark.parametrize(
+        "text",
+        ["plain", 'q"uote', "back\\slash", "\n\r\t\b\f", "\x00\x07\x1f", "é🚀"],
+    )
+    def test_matches_json_dumps(self, text):
+        expected = json.dumps(text, ensure_ascii=False)[1:-1].encode("utf-8")
+        raw = text.encode("utf-8")
+
+        assert escape_json_bytes(raw) == expected
+        assert escaped_length(raw) == len(expected)
+
+
+class TestPromptBody:
+    """Streaming body equals the naive format + dumps path."""
+
+    @pytest.mark.parametrize("window", [1, 7, 64, 1 << 20])
+    def test_identical_to_naive_path(self, document, window):
+        path, text = document
+        body = PromptBody(
+            compile_prompt(TEMPLATE), path, _envelope(PromptBody.PROMPT), window
+        )
+
+        assert b"".join(body) == _expected(TEMPLATE, text)
+        assert len(body) == len(_expected(TEMPLATE, text))
+
+    def test_in_memory_content(self, document):
+        _, text = document
+        body = PromptBody(
+            compile_prompt(TEMPLATE),
+            text.encode("utf-8"),
+            _envelope(PromptBody.PROMPT),
+            7,
+        )
+
+        assert b"".join(body) == _expected(TEMPLATE, text)
+        assert len(body) == len(_expected(TEMPLATE, text))
+
+    def test_static_first_layout(self, document):
+        path, text = document
+        compiled = compile_prompt(TEMPLATE, LAYOUT_STATIC_FIRST)
+        body = PromptBody(compiled, path, _envelope(PromptBody.PROMPT))
+
+        assert b"".join(body) == _expected(TEMPLATE, text, LAYOUT_STATIC_FIRST)
+
+    def test_chunks_bounded_by_window(self, document):
+        path, _ = document
+        window = 256
+        body = PromptBody(
+            compile_prompt(TEMPLATE), path, _envelope(PromptBody.PROMPT), window
+        )
+
+        # Worst case every byte expands to a 6-byte \\u escape
+        assert max(len(chunk) for chunk in body) <= 6 * window
+
+    def test_output_parses_as_json(self, document):
+        path, text = document
+        stream = io.BytesIO()
+        body = PromptBody(compile_prompt(TEMPLATE), path, _envelope(PromptBody.PROMPT))
+
+        written = body.write_to(stream)
+
+        payload = json.loads(stream.getvalue())
+        assert written == len(body)
+        assert text in payload["messages"][0]["content"]
+
+    def test_empty_document(self, tmp_path):
+        path = tmp_path / "empty.md"
+        path.write_bytes(b"")
+        body = PromptBody(compile_prompt(TEMPLATE), path, _envelope(PromptBody.PROMPT))
+
+        assert b"".join(body) == _expected(TEMPLATE, "")
+
+    def test_invalid_utf8_is_rejected(self, tmp_path):
+        path = tmp_path / "bad.md"
+        path.write_bytes(b"ok \xff\xfe not utf-8")
+        body = PromptBody(compile_prompt(TEMPLATE), path, _envelope(PromptBody.PROMPT))
+
+        with pytest.raises(UnicodeDecodeError):
+            b"".join(body)
+
+    def test_envelope_requires_marker(self, document):
+        path, _ = document
+
+        with pytest.raises(ValueError, match="exactly once"):
+            PromptBody(compile_prompt(TEMPLATE), path, {"messages": []})
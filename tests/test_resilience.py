@@ -0,0 +1,416 @@
+"""
+Tests for provider retries and circuit breakers, against a local
+fault-injecting server.
+
+Usage:
+    pytest tests/test_resilience.py -v
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.local.http_pool import HttpPool
+from scripts.local.providers import (
+    CONNECTION,
+    SERVER,
+    TIMEOUT,
+    ApiCall,
+    ProviderError,
+    send,
+    urllib_transport,
+)
+from scripts.local.rate_limit import RateLimit, RateLimiter
+from scripts.local.resilience import (
+    CLOSED,
+    FATAL,
+    HALF_OPEN,
+    OPEN,
+    RATE_LIMIT,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    Resilience,
+    RetryPolicy,
+    classify,
+    retry_after,
+)
+from scripts.local.runner import thread_backend
+
+ANTHROPIC = json.dumps(
+    {
+        "content": [{"type": "text", "text": "**Verdict**: APPROVED"}],
+        "usage": {"input_tokens": 10, "output_tokens": 2},
+    }
+).encode()
+
+SSE = (
+    b'event: content_block_delta\ndata: {"type": "content_block_delta", '
+    b'"delta": {"type": "text_delta", "text": "**Verdict**: APPROVED"}}\n\n'
+)
+
+
+class FaultServer:
+    """
+    Stand-in provider that replies according to a script of faults.
+
+    Each request pops the next fault: ``429`` / ``503`` / ``400`` (status
+    codes, 429 with ``Retry-After: 2``), ``"hang"`` (no reply before the
+    client times out), ``"drop"`` (closes the socket without replying) or
+    ``"partial"`` (sends part of a stream, then drops it). An empty script answers
+    normally.
+    """
+
+    def __init__(self, *faults):
+        self.faults = list(faults)
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status, payload, **headers):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name.replace("_", "-"), value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                fault = server.next_fault()
+                if fault == "hang":
+                    time.sleep(0.5)
+                    self.close_connection = True
+                elif fault == "drop":
+                    self.close_connection = True
+                elif fault == "partial":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Content-Length", str(len(SSE) + 100))
+                    self.end_headers()
+                    self.wfile.write(SSE)
+                    self.close_connection = True
+                elif fault == 429:
+                    self._reply(429, b'{"error": "rate"}', Retry_After="2")
+                elif fault is not None:
+                    self._reply(fault, b'{"error": "fault"}')
+                elif b'"stream": true' in body:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Content-Length", str(len(SSE)))
+                    self.end_headers()
+                    self.wfile.write(SSE)
+                else:
+                    self._reply(200, ANTHROPIC)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def next_fault(self):
+        with self._lock:
+            self.requests += 1
+            return self.faults.pop(0) if self.faults else None
+
+    def __enter__(self):
+        threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+
+
+class Sleeps(list):
+    """Records backoff delays instead of sleeping."""
+
+    async def __call__(self, seconds):
+        self.append(seconds)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_resilience(**policy):
+    sleeps = Sleeps()
+    resilience = Resilience(
+        RetryPolicy(**policy),
+        breakers=CircuitBreakers(failure_threshold=3),
+        sleep=sleeps,
+        rng=random.Random(0),
+    )
+    return resilience, sleeps
+
+
+def api_call(server, timeout=5.0):
+    body = b'{"model": "m", "messages": []}'
+    headers = {"Content-Type": "application/json", "Content-Length": str(len(body))}
+    return ApiCall(
+        "anthropic", "m", server.url + "/v1/messages", headers, body, timeout
+    )
+
+
+def run(resilience, server, transport, timeout=5.0, limiter=None):
+    call = api_call(server, timeout)
+
+    async def attempt():
+        return await asyncio.to_thread(send, call, transport)
+
+    return asyncio.run(resilience.run("anthropic", attempt, limiter))
+
+
+class TestClassify:
+    @pytest.mark.parametrize(
+        "error, kind",
+        [
+            (ProviderError("x", status=429), RATE_LIMIT),
+            (ProviderError("x", status=503), SERVER),
+            (ProviderError("x", status=529), SERVER),
+            (ProviderError("x", status=408), TIMEOUT),
+            (ProviderError("x", status=400), FATAL),
+            (ProviderError("x", kind=TIMEOUT), TIMEOUT),
+            (ProviderError("x", kind=CONNECTION), CONNECTION),
+            (ProviderError("API key not set"), FATAL),
+        ],
+    )
+    def test_classify(self, error, kind):
+        assert classify(error) == kind
+
+    def test_retry_after_forms(self):
+        assert retry_after({"retry-after": "7"}) == 7.0
+        assert retry_after({"retry-after-ms": "1500", "retry-after": "9"}) == 1.5
+        date = "Wed, 21 Oct 2026 07:28:30 GMT"
+        assert retry_after({"retry-after": date}, now=1792567700.0) == 10.0
+        assert retry_after({"retry-after": "soon"}) is None
+        assert retry_after({}) is None
+
+
+class TestBackoff:
+    def test_full_jitter_within_exponential_cap(self):
+        policy = RetryPolicy(base=1.0, cap=5.0)
+        rng = random.Random(1)
+
+        for attempt, ceiling in [(0, 1.0), (1, 2.0), (2, 4.0), (6, 5.0)]:
+            delays = [policy.delay(attempt, None, rng) for _ in range(200)]
+            assert all(0 <= d <= ceiling for d in delays)
+            assert max(delays) > ceiling * 0.8  # Jitter spans the range
+
+    def test_retry_after_is_the_floor(self):
+        policy = RetryPolicy(base=1.0)
+        rng = random.Random(2)
+
+        delays = [policy.delay(0, 10.0, rng) for _ in range(50)]
+
+        assert all(10.0 <= d <= 11.0 for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestCircuitBreaker:
+    def test_opens_then_half_opens_for_one_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+        breaker.failure()
+        assert breaker.allow() is None
+        breaker.failure()
+
+        assert breaker.state == OPEN and breaker.trips == 1
+        assert breaker.allow() == 30
+
+        clock.now = 30
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is None  # The probe
+        assert breaker.allow() is not None  # Everyone else waits
+
+        breaker.success()
+        assert breaker.state == CLOSED
+        assert breaker.allow() is None
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.failure()
+        clock.now = 10
+        breaker.allow()
+
+        breaker.failure()
+
+        assert breaker.state == OPEN and breaker.trips == 2
+        assert breaker.allow() == 10
+
+    def test_success_resets_consecutive_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.failure()
+        breaker.success()
+        breaker.failure()
+
+        assert breaker.state == CLOSED
+
+
+class TestFaultInjection:
+    def test_transient_faults_are_retried(self):
+        resilience, sleeps = make_resilience()
+
+        with FaultServer(503, 502) as server:
+            completion = run(resilience, server, HttpPool().transport)
+
+        assert completion.text == "**Verdict**: APPROVED"
+        assert server.requests == 3
+        assert len(sleeps) == 2 and resilience.retries == {"anthropic": 2}
+        assert resilience.breakers.states() == {"anthropic": CLOSED}
+
+    def test_dropped_connection_is_retried(self):
+        # Without a pool: HttpPool already replaces one stale connection itself
+        resilience, sleeps = make_resilience()
+
+        with FaultServer("drop", "drop") as server:
+            completion = run(resilience, server, urllib_transport)
+
+        assert completion.output_tokens == 2
+        assert server.requests == 3 and len(sleeps) == 2
+
+    def test_timeout_is_retried(self):
+        resilience, _ = make_resilience()
+
+        with FaultServer("hang") as server:
+            completion = run(resilience, server, HttpPool().transport, timeout=0.2)
+
+        assert completion.output_tokens == 2
+        assert server.requests == 2
+
+    def test_429_honours_retry_after_and_pauses_limiter(self):
+        resilience, sleeps = make_resilience()
+        clock = FakeClock()
+        limiter = RateLimiter("k", RateLimit(requests_per_minute=60), clock=clock)
+
+        with FaultServer(429) as server:
+            run(resilience, server, HttpPool().transport, limiter=limiter)
+
+        (delay,) = sleeps
+        assert 2.0 <= delay <= 3.0
+        assert limiter.reserve() >= 2.0  # Other callers back off too
+        # Rate limiting says nothing about provider health
+        assert resilience.breakers.for_provider("anthropic").trips == 0
+
+    def test_excessive_retry_after_gives_up(self):
+        resilience, sleeps = make_resilience(max_retry_after=1)
+
+        with FaultServer(429) as server:
+            with pytest.raises(ProviderError, match="429"):
+                run(resilience, server, HttpPool().transport)
+
+        assert sleeps == [] and server.requests == 1
+
+    def test_client_errors_are_not_retried(self):
+        resilience, sleeps = make_resilience()
+
+        with FaultServer(400) as server:
+            with pytest.raises(ProviderError, match="400"):
+                run(resilience, server, HttpPool().transport)
+
+        assert server.requests == 1 and sleeps == []
+
+    def test_attempts_are_bounded(self):
+        resilience, sleeps = make_resilience(max_attempts=2)
+
+        with FaultServer(503, 503, 503) as server:
+            with pytest.raises(ProviderError, match="503"):
+                run(resilience, server, HttpPool().transport)
+
+        assert server.requests == 2 and len(sleeps) == 1
+
+    def test_open_circuit_fails_fast_until_probe(self):
+        resilience, _ = make_resilience(max_attempts=3)
+        clock = FakeClock()
+        resilience.breakers = CircuitBreakers(3, reset_timeout=30, clock=clock)
+
+        with FaultServer(503, 503, 503) as server:
+            with pytest.raises(ProviderError, match="503"):
+                run(resilience, server, HttpPool().transport)
+            with pytest.raises(CircuitOpenError, match="circuit open"):
+                run(resilience, server, HttpPool().transport)
+            assert server.requests == 3
+
+            clock.now = 30
+            run(resilience, server, HttpPool().transport)
+
+        assert server.requests == 4
+        assert resilience.breakers.states() == {"anthropic": CLOSED}
+
+
+def server_runner(make_runner, server, monkeypatch, **kwargs):
+    monkeypatch.setenv("ADVERSARIAL_ANTHROPIC_BASE_URL", server.url)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "k")
+    pool = HttpPool()
+    resilience, _ = make_resilience()
+    return make_runner(
+        thread_backend(pool.transport, pool.stream),
+        concurrency={"anthropic": 1},
+        resilience=resilience,
+        **kwargs,
+    )
+
+
+def documents(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"doc{i}.md"
+        path.write_text(f"# Doc {i}\n")
+        paths.append(path)
+    return paths
+
+
+class TestRunner:
+    def test_jobs_survive_transient_faults(self, make_runner, tmp_path, monkeypatch):
+        with FaultServer(503, 429, 500) as server:
+            runner = server_runner(make_runner, server, monkeypatch)
+            results = runner.run_sync(["claude-quick"], documents(tmp_path, 2))
+
+        assert all(r.ok for r in results)
+        assert server.requests == 5
+        assert runner.resilience.retries == {"anthropic": 3}
+
+    def test_breaker_shared_across_jobs(self, make_runner, tmp_path, monkeypatch):
+        with FaultServer(*[503] * 10) as server:
+            runner = server_runner(make_runner, server, monkeypatch)
+            results = runner.run_sync(["claude-quick"], documents(tmp_path, 3))
+
+        # The first job trips the breaker; the others never reach the server
+        assert server.requests == 3
+        errors = [r.error for r in results]
+        assert sum("HTTP 503" in error for error in errors) == 1
+        assert sum("circuit open" in error for error in errors) == 2
+
+    def test_started_stream_not_retried(self, make_runner, tmp_path, monkeypatch):
+        with FaultServer("partial") as server:
+            runner = server_runner(make_runner, server, monkeypatch, stream=True)
+            (result,) = runner.run_sync(["claude-quick"], documents(tmp_path, 1))
+
+        assert not result.ok
+        assert server.requests == 1
+        assert result.output == "**Verdict**: APPROVED"
+
+    def test_stream_failing_before_text_is_retried(
+        self, make_runner, tmp_path, monkeypatch
+    ):
+        with FaultServer(503) as server:
+            runner = server_runner(make_runner, server, monkeypatch, stream=True)
+            (result,) = runner.run_sync(["claude-quick"], documents(tmp_path, 1))
+
+        assert result.ok and result.verdict == "APPROVED"
+        assert server.requests == 2
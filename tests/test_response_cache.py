@@ -0,0 +1,107 @@
+"""
+Tests for the provider response cache.
+
+Usage:
+    pytest tests/test_response_cache.py -v
+"""
+
+import os
+import time
+
+import pytest
+
+from scripts.local.response_cache import ResponseCache, document_hash, main
+
+CONFIG = {"name": "demo", "prompt": "Review:\n{content}", "model": "gpt-5.4"}
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("# Doc\n\nBody.\n")
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "responses")
+
+
+class TestKey:
+    def test_stable_for_same_inputs(self, document):
+        first = ResponseCache.key(CONFIG, "gpt-5.4", 4000, document)
+
+        assert first == ResponseCache.key(dict(CONFIG), "gpt-5.4", 4000, document)
+        assert first == ResponseCache.key(
+            CONFIG, "gpt-5.4", 4000, document.read_bytes()
+        )
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda c, m, t, d: ({**c, "prompt": "Other {content}"}, m, t, d),
+            lambda c, m, t, d: ({**c, "prompt_layout": "static-first"}, m, t, d),
+            lambda c, m, t, d: (c, "gpt-5.4-mini", t, d),
+            lambda c, m, t, d: (c, m, 8000, d),
+            lambda c, m, t, d: (c, m, t, d.read_bytes() + b"!"),
+        ],
+    )
+    def test_any_input_change_misses(self, document, change):
+        base = (CONFIG, "gpt-5.4", 4000, document)
+
+        assert ResponseCache.key(*change(*base)) != ResponseCache.key(*base)
+
+    def test_document_hash_reads_in_blocks(self, tmp_path):
+        path = tmp_path / "big.md"
+        path.write_bytes(b"x" * (3 << 20))
+
+        assert document_hash(path) == document_hash(path.read_bytes())
+
+
+class TestCache:
+    def test_put_then_get(self, cache):
+        cache.put("ab" * 32, "**Verdict**: APPROVED", "demo", "gpt-5.4", 10, 2)
+
+        entry = cache.get("ab" * 32)
+
+        assert entry.text == "**Verdict**: APPROVED"
+        assert (entry.input_tokens, entry.output_tokens) == (10, 2)
+        assert (cache.hits, cache.misses) == (1, 0)
+        assert entry.marker().startswith("<!-- adversarial-cache: hit key=abab")
+
+    def test_ttl_expires(self, cache):
+        cache.put("cd" * 32, "old", "demo", "gpt-5.4")
+        cache.ttl = 0.0
+        time.sleep(0.01)
+
+        assert cache.get("cd" * 32) is None
+        assert cache.size() == 0
+
+    def test_bypass_skips_lookup(self, cache):
+        cache.put("ef" * 32, "text", "demo", "gpt-5.4")
+        cache.bypass = True
+
+        assert cache.get("ef" * 32) is None
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ResponseCache(tmp_path / "responses", max_bytes=10**9)
+        keys = [f"{i:02d}" * 32 for i in range(4)]
+        for age, key in enumerate(keys):
+            entry = cache.put(key, "x" * 1000, "demo", "m")
+            path = cache._path(key)
+            os.utime(path, (entry.created - 100 + age, entry.created - 100 + age))
+        cache.get(keys[0])  # Most recently used now
+
+        cache.max_bytes = cache.size() // 2 + 500  # Room for two entries + new
+        cache.put("ff" * 32, "x" * 10, "demo", "m")
+
+        remaining = {key for key in keys + ["ff" * 32] if cache._path(key).exists()}
+        assert remaining == {keys[0], keys[3], "ff" * 32}
+        assert cache.size() <= cache.max_bytes
+
+    def test_cli_clear(self, cache, capsys):
+        cache.put("aa" * 32, "x", "demo", "m")
+
+        assert main(["--cache-dir", str(cache.root), "clear"]) == 0
+        assert "Removed 1" in capsys.readouterr().out
+        assert cache.get("aa" * 32) is None
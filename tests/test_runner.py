@@ -0,0 +1,394 @@
+"""
+Tests for the asyncio evaluation runner.
+
+Usage:
+    pytest tests/test_runner.py -v
+"""
+
+import asyncio
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from scripts.local.cost import SpendLog
+from scripts.local.providers import Completion, ProviderError
+from scripts.local.registry import CompiledRegistry
+from scripts.local.resilience import CircuitBreakers, Resilience
+from scripts.local.response_cache import ResponseCache
+from scripts.local.runner import output_path
+
+pytestmark = pytest.mark.usefixtures("api_keys")
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / "docs" / f"doc{i}.md"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(f"# Doc {i}\n\nSome content.\n")
+        paths.append(path)
+    return paths
+
+
+class FakeBackend:
+    """Async backend that records peak in-flight calls per provider."""
+
+    def __init__(self, fail_on=None):
+        self.active = Counter()
+        self.peak = Counter()
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def __call__(self, call):
+        self.active[call.provider] += 1
+        self.peak[call.provider] = max(
+            self.peak[call.provider], self.active[call.provider]
+        )
+        try:
+            await asyncio.sleep(0.01)
+            self.calls.append(call)
+            if self.fail_on and self.fail_on in b"".join(call.body_chunks()):
+                raise ProviderError("HTTP 500", status=500)
+            return Completion("**Verdict**: APPROVED", input_tokens=50, output_tokens=5)
+        finally:
+            self.active[call.provider] -= 1
+
+
+class StreamingBackend:
+    """Async backend that delivers a response in small deltas."""
+
+    def __init__(self, text, size=8, fail_after=None):
+        self.text = text
+        self.size = size
+        self.fail_after = fail_after
+        self.sent = 0  # Characters delivered
+
+    async def __call__(self, call, on_text=None):
+        assert call.stream
+        for i in range(0, len(self.text), self.size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ProviderError("stream dropped")
+            await asyncio.to_thread(on_text, self.text[i : i + self.size])
+            self.sent = i + self.size
+        return Completion(self.text, input_tokens=50, output_tokens=5)
+
+
+STREAMED = """### [HIGH]: Unbounded retries
+- **Issue**: Loops forever
+
+**Verdict**: NEEDS_REVISION
+
+Closing remarks.
+"""
+
+
+def limited_registry():
+    """claude-quick's model with a tokens-per-minute limit."""
+    return CompiledRegistry.compile(
+        {
+            "providers": {
+                "claude": {
+                    "auth_env_default": "ANTHROPIC_API_KEY",
+                    "rate_limits": {"tokens_per_minute": 600000},
+                    "tiers": {
+                        "haiku": {
+                            "models": [{"id": "claude-haiku-4-5", "version": "4.5"}]
+                        }
+                    },
+                }
+            }
+        }
+    )
+
+
+class TestRunner:
+    def test_outputs_written_to_suffix_paths(self, make_runner, tmp_path, documents):
+        backend = FakeBackend()
+        runner = make_runner(backend)
+
+        results = runner.run_sync(["claude-quick", "gemini-flash"], documents[:2])
+
+        assert all(r.ok for r in results)
+        assert [r.verdict for r in results] == ["APPROVED"] * 4
+        assert (tmp_path / "logs" / "doc0-claude-quick.md").read_text() == (
+            "**Verdict**: APPROVED"
+        )
+        assert (tmp_path / "logs" / "doc1-gemini-flash.md").exists()
+        assert {r.provider for r in results} == {"anthropic", "gemini"}
+
+    def test_per_provider_concurrency(self, make_runner, tmp_path, documents):
+        backend = FakeBackend()
+        runner = make_runner(
+            backend,
+            concurrency={"anthropic": 2, "gemini": 3},
+        )
+
+        runner.run_sync(["claude-quick", "gemini-flash"], documents)
+
+        assert backend.peak == {"anthropic": 2, "gemini": 3}
+        assert len(backend.calls) == 12
+
+    def test_failures_are_isolated(self, make_runner, tmp_path, documents, monkeypatch):
+        monkeypatch.delenv("GEMINI_API_KEY")
+        backend = FakeBackend(fail_on=b"# Doc 1")
+        runner = make_runner(backend)
+
+        results = runner.run_sync(["claude-quick", "gemini-flash"], documents[:3])
+
+        errors = {(r.job.evaluator, r.job.document.name): r.error for r in results}
+        assert "GEMINI_API_KEY" in errors[("gemini-flash", "doc0.md")]
+        assert "HTTP 500" in errors[("claude-quick", "doc1.md")]
+        assert errors[("claude-quick", "doc2.md")] is None
+        assert not (tmp_path / "logs" / "doc1-claude-quick.md").exists()
+
+    def test_spend_recorded(self, make_runner, tmp_path, documents):
+        runner = make_runner(FakeBackend())
+
+        runner.run_sync(["claude-quick"], documents[:3])
+
+        records = SpendLog(tmp_path / "spend.jsonl").records()
+        assert len(records) == 3
+        assert records[0].evaluator == "claude-quick"
+        assert records[0].input_tokens == 50
+
+    def test_rate_limiter_settled(self, make_runner, tmp_path, documents):
+        runner = make_runner(FakeBackend(), registry=limited_registry())
+
+        results = runner.run_sync(["claude-quick"], documents[:2])
+
+        (limiter,) = runner.scheduler.limiters()
+        assert all(r.ok for r in results)
+        assert limiter.waits == 0
+
+    def test_rate_estimate_streams_the_body(
+        self, make_runner, tmp_path, documents, monkeypatch
+    ):
+        runner = make_runner(FakeBackend(), registry=limited_registry())
+
+        def no_whole_reads(self):
+            raise AssertionError(f"read whole {self}")
+
+        monkeypatch.setattr(Path, "read_bytes", no_whole_reads)
+        (result,) = runner.run_sync(["claude-quick"], documents[:1])
+
+        assert result.ok, result.error
+
+
+def test_output_path_defaults_to_name(tmp_path):
+    path = output_path({"name": "x"}, tmp_path / "a" / "plan.md", tmp_path)
+
+    assert path == tmp_path / "plan-x.md"
+
+
+class FlakyBackend:
+    """Fails each document's first call with a 503, then succeeds."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, call):
+        document = b"".join(call.body_chunks()).split(b"# Doc ")[1][:1].decode()
+        first = document not in [d for d, _ in self.calls]
+        self.calls.append((document, first))
+        await asyncio.sleep(0.01)
+        if first:
+            raise ProviderError("HTTP 503", status=503)
+        return Completion("**Verdict**: APPROVED", input_tokens=50, output_tokens=5)
+
+
+class TestRetries:
+    def test_backoff_releases_the_provider_slot(self, make_runner, tmp_path, documents):
+        backend = FlakyBackend()
+
+        async def backoff(seconds):
+            await asyncio.sleep(0.05)
+
+        runner = make_runner(
+            backend,
+            concurrency={"anthropic": 1},
+            resilience=Resilience(breakers=CircuitBreakers(), sleep=backoff),
+        )
+
+        results = runner.run_sync(["claude-quick"], documents[:2])
+
+        assert all(r.ok for r in results)
+        # doc1 runs while doc0 waits to retry
+        assert backend.calls[:2] == [("0", True), ("1", True)]
+
+    def test_each_attempt_reserves_and_settles(
+        self, make_runner, tmp_path, documents, monkeypatch
+    ):
+        runner = make_runner(FlakyBackend(), registry=limited_registry())
+        model = runner.job("claude-quick", documents[0]).model
+        limiter = runner.scheduler.for_model(model)
+        reserved, settled = [], []
+        acquire, settle = limiter.acquire_async, limiter.settle
+
+        async def spy_acquire(tokens=0):
+            reserved.append(tokens)
+            return await acquire(tokens)
+
+        def spy_settle(estimated, actual):
+            settled.append(actual)
+            settle(estimated, actual)
+
+        monkeypatch.setattr(limiter, "acquire_async", spy_acquire)
+        monkeypatch.setattr(limiter, "settle", spy_settle)
+
+        (result,) = runner.run_sync(["claude-quick"], documents[:1])
+
+        assert result.ok
+        assert len(reserved) == 2
+        assert settled == [0, 55]  # Failed attempt refunded, retry charged
+
+    def test_rate_wait_does_not_hold_the_provider_slot(
+        self, make_runner, tmp_path, documents, monkeypatch
+    ):
+        backend = FakeBackend()
+        runner = make_runner(
+            backend, registry=limited_registry(), concurrency={"anthropic": 1}
+        )
+        limiter = runner.scheduler.for_model(
+            runner.job("claude-quick", documents[0]).model
+        )
+        acquire, waits = limiter.acquire_async, []
+
+        async def slow_first(tokens=0):
+            waits.append(tokens)
+            if len(waits) == 1:  # First job waits on its bucket
+                await asyncio.sleep(0.1)
+            return await acquire(tokens)
+
+        monkeypatch.setattr(limiter, "acquire_async", slow_first)
+
+        results = runner.run_sync(["claude-quick"], documents[:2])
+
+        assert all(r.ok for r in results)
+        # doc1 runs while doc0 waits for tokens
+        first = b"".join(backend.calls[0].body_chunks())
+        assert b"# Doc 1" in first
+
+
+class TestResponseCache:
+    def test_second_run_served_from_cache(
+        self, make_runner, tmp_path, documents, monkeypatch
+    ):
+        cache = ResponseCache(tmp_path / "responses")
+        backend = FakeBackend()
+        runner = make_runner(backend, cache=cache)
+        runner.run_sync(["claude-quick"], documents[:2])
+        monkeypatch.delenv("ANTHROPIC_API_KEY")  # Hits need no provider access
+
+        results = runner.run_sync(["claude-quick"], documents[:2])
+
+        assert all(r.ok and r.cached for r in results)
+        assert results[0].verdict == "APPROVED"
+        assert len(backend.calls) == 2
+        log = (tmp_path / "logs" / "doc0-claude-quick.md").read_text()
+        assert log.startswith("<!-- adversarial-cache: hit")
+        assert len(SpendLog(tmp_path / "spend.jsonl").records()) == 2
+
+    def test_changed_document_and_refresh_miss(self, make_runner, tmp_path, documents):
+        cache = ResponseCache(tmp_path / "responses")
+        backend = FakeBackend()
+        runner = make_runner(backend, cache=cache)
+        runner.run_sync(["claude-quick"], documents[:1])
+
+        documents[0].write_text("# Doc 0\n\nEdited.\n")
+        assert not runner.run_sync(["claude-quick"], documents[:1])[0].cached
+        cache.bypass = True
+        assert not runner.run_sync(["claude-quick"], documents[:1])[0].cached
+        assert len(backend.calls) == 3
+
+
+class TestStreaming:
+    def test_events_and_log_arrive_before_completion(
+        self, make_runner, tmp_path, documents
+    ):
+        seen = []
+        backend = StreamingBackend(STREAMED)
+        log = tmp_path / "logs" / "doc0-claude-quick.md"
+
+        def on_event(job, event):
+            seen.append((event.kind, len(log.read_text())))
+
+        runner = make_runner(backend, stream=True, on_event=on_event)
+        result = runner.run_sync(["claude-quick"], documents[:1])[0]
+
+        assert result.ok and result.verdict == "NEEDS_REVISION"
+        assert [kind for kind, _ in seen] == ["finding", "verdict"]
+        assert all(size < len(STREAMED) for _, size in seen)
+        assert log.read_text() == STREAMED
+
+    def test_partial_output_kept_on_failure(self, make_runner, tmp_path, documents):
+        backend = StreamingBackend(STREAMED, fail_after=16)
+        runner = make_runner(backend, stream=True)
+
+        result = runner.run_sync(["claude-quick"], documents[:1])[0]
+
+        assert "stream dropped" in result.error
+        assert result.output == STREAMED[:16]
+        log = tmp_path / "logs" / "doc0-claude-quick.md"
+        assert log.read_text() == STREAMED[:16]
+
+    def test_cache_hit_replays_events(self, make_runner, tmp_path, documents):
+        seen = []
+        cache = ResponseCache(tmp_path / "responses")
+        runner = make_runner(
+            StreamingBackend(STREAMED),
+            stream=True,
+            cache=cache,
+            on_event=lambda job, event: seen.append(event.kind),
+        )
+        runner.run_sync(["claude-quick"], documents[:1])
+
+        assert runner.run_sync(["claude-quick"], documents[:1])[0].cached
+        assert seen == ["finding", "verdict"] * 2
+
+
+class TestGateMode:
+    LONG = "### [MEDIUM]: Vague wording\n### [HIGH]: No rollback\n" + "x" * 400
+
+    def test_stops_at_blocking_finding(self, make_runner, tmp_path, documents):
+        backend = StreamingBackend(self.LONG, size=10)
+        cache = ResponseCache(tmp_path / "responses")
+        runner = make_runner(backend, fail_at="HIGH", cache=cache)
+
+        result = runner.run_sync(["claude-quick"], documents[:1])[0]
+
+        assert result.ok and result.verdict == "FAIL" and result.failed
+        assert result.stopped_by.title == "No rollback"
+        assert backend.sent < len(self.LONG) // 2
+        log = (tmp_path / "logs" / "doc0-claude-quick.md").read_text()
+        assert log == result.output
+        assert "**Verdict**: FAIL" in log and "x" * 50 not in log
+        assert result.input_tokens > 0 and result.output_tokens > 0
+        assert len(SpendLog(tmp_path / "spend.jsonl").records()) == 1
+        assert cache.size() == 0
+
+    def test_cache_hit_gives_the_live_gate_verdict(
+        self, make_runner, tmp_path, documents
+    ):
+        text = self.LONG + "\n**Verdict**: NEEDS_REVISION\n"
+        cache = ResponseCache(tmp_path / "responses")
+        plain = make_runner(StreamingBackend(text), stream=True, cache=cache)
+        plain.run_sync(["claude-quick"], documents[:1])
+        gated = make_runner(StreamingBackend(text), fail_at="HIGH", cache=cache)
+
+        result = gated.run_sync(["claude-quick"], documents[:1])[0]
+
+        assert result.cached and result.stopped_by.title == "No rollback"
+        assert result.verdict == "FAIL" and result.failed
+        log = (tmp_path / "logs" / "doc0-claude-quick.md").read_text()
+        assert log.endswith(result.output) and "**Verdict**: FAIL" in log
+
+    def test_below_threshold_runs_to_completion(self, make_runner, tmp_path, documents):
+        backend = StreamingBackend(self.LONG, size=10)
+        runner = make_runner(backend, fail_at="CRITICAL")
+
+        result = runner.run_sync(["claude-quick"], documents[:1])[0]
+
+        assert result.stopped_by is None and not result.failed
+        assert result.output == self.LONG
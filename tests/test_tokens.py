@@ -0,0 +1,124 @@
+"""
+Tests for the offline per-family token estimator.
+
+Usage:
+    pytest tests/test_tokens.py -v
+"""
+
+import time
+
+import pytest
+
+from scripts.local.tokens import (
+    TextStats,
+    TokenCalibration,
+    TokenEstimator,
+    estimator_for,
+    main,
+    tokenizer_family,
+)
+
+PROSE = (
+    "The evaluator reviews a specification and reports findings, "
+    "each with a severity, a location and a remediation.\n"
+)
+
+
+class TestTextStats:
+    def test_byte_classes(self):
+        stats = TextStats.of("Hello, world 42!\nnaïve")
+
+        assert stats.words == 5  # Hello world 42 na ve
+        assert stats.word_bytes == 16
+        assert stats.punctuation == 2
+        assert stats.newlines == 1
+        assert stats.non_ascii_bytes == 2
+
+    def test_str_and_bytes_agree(self):
+        assert TextStats.of(PROSE) == TextStats.of(PROSE.encode("utf-8"))
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 4096])
+    def test_scan_matches_whole_text(self, size):
+        data = (PROSE * 5 + "naïve café\n").encode("utf-8")
+        chunks = [data[i : i + size] for i in range(0, len(data), size)]
+
+        assert TextStats.scan(chunks) == TextStats.of(data)
+        assert TokenEstimator("claude").count_chunks(chunks) == TokenEstimator(
+            "claude"
+        )(data)
+
+
+class TestEstimator:
+    def test_english_prose_is_plausible(self):
+        tokens = TokenEstimator("gpt")(PROSE * 100)
+
+        # ~4 characters per token for English prose
+        assert 0.75 < tokens / (len(PROSE) * 100 / 4) < 1.35
+
+    def test_family_profiles_differ(self):
+        text = PROSE * 50
+
+        assert TokenEstimator("gemini")(text) < TokenEstimator("gpt")(text)
+        assert TokenEstimator("gpt")(text) < TokenEstimator("claude")(text)
+
+    @pytest.mark.parametrize(
+        "family,expected",
+        [("o", "gpt"), ("codestral", "mistral"), ("claude", "claude"), ("x", "gpt")],
+    )
+    def test_registry_family_aliases(self, family, expected):
+        assert tokenizer_family(family) == expected
+
+    def test_empty_and_tiny_text(self):
+        count = TokenEstimator()
+
+        assert count("") == 0
+        assert count("a") == 1
+
+    def test_throughput(self):
+        text = (PROSE * 20_000).encode("utf-8")  # ~2.4 MB
+        count = TokenEstimator("claude")
+
+        started = time.perf_counter()
+        count(text)
+        elapsed = time.perf_counter() - started
+
+        assert len(text) / elapsed > 2_000_000  # Comfortably above 2 MB/s
+
+
+class TestCalibration:
+    def test_factor_converges_to_observed_ratio(self, tmp_path):
+        calibration = TokenCalibration(tmp_path / "calibration.json")
+        estimate = TokenEstimator("claude")(PROSE)
+
+        calibration.record("claude", PROSE, int(estimate * 1.2))
+        calibration.save()
+
+        reloaded = TokenCalibration(tmp_path / "calibration.json")
+        assert reloaded.factor("claude") == pytest.approx(1.2, rel=0.05)
+        assert reloaded.factor("gpt") == 1.0
+        assert reloaded.samples("claude") == 1
+
+    def test_estimator_applies_calibration(self, tmp_path):
+        calibration = TokenCalibration(tmp_path / "calibration.json")
+        text = PROSE * 10
+        calibration.record("mistral", text, TokenEstimator("mistral")(text) * 2)
+
+        calibrated = estimator_for("codestral", calibration)
+
+        assert calibrated(text) == pytest.approx(
+            2 * TokenEstimator("mistral")(text), abs=2
+        )
+
+    def test_cli_calibrate_and_count(self, tmp_path, capsys):
+        sample = tmp_path / "prompt.md"
+        sample.write_text(PROSE * 10)
+        store = str(tmp_path / "calibration.json")
+
+        assert (
+            main(["--calibration", store, "calibrate", "gpt", str(sample), "500"]) == 0
+        )
+        assert main(["--calibration", store, "count", str(sample)]) == 0
+
+        out = capsys.readouterr().out
+        assert "factor now" in out
+        assert "500  total" in out
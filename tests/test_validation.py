@@ -0,0 +1,174 @@
+"""
+Tests for the single-pass validation engine.
+
+Usage:
+    pytest tests/test_validation.py -v
+"""
+
+import json
+import shutil
+
+import pytest
+
+from scripts.local.catalog import EVALUATORS_DIR, EvaluatorCatalog
+from scripts.local.validation import REGISTRY_PATH, main, validate
+
+EVALUATORS = ["openai/fast-check", "anthropic/claude-quick"]
+
+
+@pytest.fixture
+def evaluators_dir(tmp_path):
+    """Two real evaluators with an index.json listing only them."""
+    root = tmp_path / "evaluators"
+    for rel in EVALUATORS:
+        shutil.copytree(EVALUATORS_DIR / rel, root / rel)
+    index = json.loads((EVALUATORS_DIR / "index.json").read_text())
+    index["evaluators"] = [
+        e for e in index["evaluators"] if e["path"].rsplit("/", 1)[0] in EVALUATORS
+    ]
+    (root / "index.json").write_text(json.dumps(index))
+    return root
+
+
+@pytest.fixture
+def run(tmp_path, evaluators_dir):
+    """Validate the temp tree with temp snapshot and results cache."""
+
+    def _run(registry_path=REGISTRY_PATH):
+        catalog = EvaluatorCatalog.load(evaluators_dir, tmp_path / "catalog.json")
+        return validate(catalog, registry_path, tmp_path / "validation.json")
+
+    return _run
+
+
+def _edit(evaluators_dir, rel, old, new):
+    path = evaluators_dir / rel / "evaluator.yml"
+    path.write_text(path.read_text().replace(old, new))
+
+
+class TestChecks:
+    """Each check reports against the right evaluator."""
+
+    def test_clean_tree(self, run):
+        report = run()
+
+        assert report.ok, [str(i) for i in report.issues]
+        assert report.checked == 2
+
+    def test_invalid_yaml(self, run, evaluators_dir):
+        (evaluators_dir / "openai/fast-check/evaluator.yml").write_text("a: [unclosed")
+
+        issues = run().issues_for("openai/fast-check/evaluator.yml")
+
+        assert [i.check for i in issues] == ["yaml_valid"]
+
+    def test_missing_field_and_placeholder(self, run, evaluators_dir):
+        _edit(evaluators_dir, "openai/fast-check", "api_key_env:", "api_key_envx:")
+        _edit(evaluators_dir, "openai/fast-check", "{content}", "{document}")
+
+        checks = {i.check for i in run().issues_for("openai/fast-check/evaluator.yml")}
+
+        assert checks == {"required_fields", "content_placeholder", "prompt_compiles"}
+
+    def test_min_version_not_in_registry(self, run, evaluators_dir):
+        _edit(evaluators_dir, "anthropic/claude-quick", '"4.5"', '"9.9"')
+
+        issues = run().by_check("min_version")
+
+        assert len(issues) == 1
+        assert "9.9 not found" in issues[0].message
+
+    def test_unknown_tier(self, run, evaluators_dir):
+        _edit(evaluators_dir, "anthropic/claude-quick", "tier: haiku", "tier: sonnet2")
+
+        assert [i.path for i in run().by_check("registry_tier")] == [
+            "anthropic/claude-quick/evaluator.yml"
+        ]
+
+    def test_model_requirement_not_a_mapping(self, run, evaluators_dir):
+        path = evaluators_dir / "openai/fast-check/evaluator.yml"
+        lines = path.read_text().splitlines()
+        start = lines.index("model_requirement:")
+        end = start + 1
+        while lines[end].startswith(" "):
+            end += 1
+        lines[start:end] = ['model_requirement: "openai"']
+        path.write_text("\n".join(lines) + "\n")
+
+        issues = run().by_check("registry_family")
+
+        assert [(i.path, i.message) for i in issues] == [
+            (
+                "openai/fast-check/evaluator.yml",
+                "model_requirement must be a mapping",
+            )
+        ]
+
+    def test_index_consistency(self, run, evaluators_dir):
+        shutil.rmtree(evaluators_dir / "anthropic/claude-quick")
+        shutil.copytree(
+            EVALUATORS_DIR / "google/gemini-flash",
+            evaluators_dir / "google/gemini-flash",
+        )
+
+        report = run()
+
+        assert len(report.by_check("index_path")) == 1
+        assert [i.path for i in report.by_check("in_index")] == [
+            "google/gemini-flash/evaluator.yml"
+        ]
+
+    def test_missing_docs(self, run, evaluators_dir):
+        (evaluators_dir / "openai/fast-check/README.md").unlink()
+
+        assert [i.check for i in run().issues] == ["readme"]
+
+
+class TestResultCache:
+    """Per-file results are reused while the file hash is unchanged."""
+
+    def test_second_run_uses_cache(self, run):
+        run()
+        report = run()
+
+        assert report.from_cache == 2
+
+    def test_other_tree_keeps_library_results(self, run, catalog, tmp_path):
+        library = validate(catalog, cache_path=tmp_path / "validation.json")
+        run()
+
+        again = validate(catalog, cache_path=tmp_path / "validation.json")
+
+        assert again.from_cache == again.checked == library.checked
+        assert len(list(tmp_path.glob("validation*.json"))) == 2
+
+    def test_changed_file_is_rechecked(self, run, evaluators_dir):
+        run()
+        _edit(evaluators_dir, "openai/fast-check", "{content}", "{document}")
+
+        report = run()
+
+        assert report.from_cache == 1
+        assert report.by_check("content_placeholder")
+
+    def test_cached_issues_are_reported(self, run, evaluators_dir):
+        _edit(evaluators_dir, "openai/fast-check", "{content}", "{document}")
+        run()
+
+        report = run()
+
+        assert report.from_cache == 2
+        assert report.by_check("content_placeholder")
+
+
+class TestCLI:
+    def test_library_is_valid(self, capsys):
+        assert main(["--no-cache"]) == 0
+        assert "✅" in capsys.readouterr().out
+
+    def test_issues_exit_nonzero(self, tmp_path, evaluators_dir, capsys, monkeypatch):
+        monkeypatch.setenv("EVALUATOR_CATALOG_CACHE", str(tmp_path / "catalog.json"))
+        (evaluators_dir / "openai/fast-check/CHANGELOG.md").unlink()
+
+        assert main([str(evaluators_dir), "--no-cache", "--json"]) == 1
+        assert json.loads(capsys.readouterr().out)[0]["check"] == "changelog"